@@ -1,10 +1,6 @@
 """CRM Assistant - Multi-agent system for CRM data enrichment and cleanup."""
 
-from .coordinator import (
-    create_crm_coordinator,
-    create_crm_simple_agent,
-    get_crm_agent
-)
+from .utils.lazy_imports import lazy_exports
 
 __version__ = "1.0.0"
 __all__ = [
@@ -12,3 +8,6 @@ __all__ = [
     "create_crm_simple_agent", 
     "get_crm_agent"
 ]
+
+# Resolved on first use so importing the package does not load ADK/MCP
+__getattr__, __dir__ = lazy_exports(globals(), {name: ".coordinator" for name in __all__})
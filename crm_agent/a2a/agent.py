@@ -6,7 +6,9 @@ CRM coordinator via ADK Runner and yields streaming-like updates and final conte
 Guide reference: https://cloud.google.com/blog/products/ai-machine-learning/unlock-ai-agent-collaboration-convert-adk-agents-for-a2a
 """
 
-from typing import AsyncIterable, Dict, Any
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Deque, Dict, Any, Iterator, List
+import asyncio
 import uuid
 
 try:
@@ -17,13 +19,20 @@ except Exception:  # Fallback types if ADK imports differ
     InMemorySessionService = None  # type: ignore
 
 from ..coordinator import create_crm_coordinator
+from ..core.mcp_toolsets import mcp_toolset_manager
 
 
 class CRMA2AAgent:
     """A2A-compatible wrapper that exposes invoke(query, session_id)."""
 
-    def __init__(self) -> None:
+    def __init__(self, max_tasks: int = 200, max_result_chars: int = 64 * 1024) -> None:
         self._user_id = "a2a_user"
+        # Upper bound on text retained per invocation for the final content
+        self._max_result_chars = max_result_chars
+        # Number of invocations before a pooled instance is recycled, which
+        # bounds the sessions accumulated in the in-memory session service.
+        self._max_tasks = max_tasks
+        self._tasks_served = 0
         self._agent = create_crm_coordinator()
         self._session_service = InMemorySessionService() if InMemorySessionService is not None else None
         if Runner is not None and self._session_service is not None:
@@ -35,16 +44,93 @@ class CRMA2AAgent:
         else:
             self._runner = None
 
-    async def invoke(self, query: str, session_id: str) -> AsyncIterable[Dict[str, Any]]:
+    def _iter_toolsets(self) -> Iterator[Any]:
+        """Yield every toolset (e.g. MCPToolset) attached to the agent tree."""
+        seen = set()
+        stack = [self._agent]
+        while stack:
+            agent = stack.pop()
+            for tool in getattr(agent, "tools", None) or []:
+                # Toolsets expose get_tools(); plain function tools do not
+                if hasattr(tool, "get_tools") and id(tool) not in seen:
+                    seen.add(id(tool))
+                    yield tool
+            stack.extend(getattr(agent, "sub_agents", None) or [])
+
+    async def warm_up(self, timeout: float = 60.0) -> List[str]:
+        """
+        Open the MCP stdio sessions and run tool discovery ahead of the first task.
+
+        The toolsets keep their sessions alive afterwards, so later invocations
+        on this instance reuse the already-running server subprocess.
+
+        Returns:
+            Names of the tools discovered across all toolsets
+        """
+        tool_names: List[str] = []
+        for toolset in self._iter_toolsets():
+            tools = await asyncio.wait_for(toolset.get_tools(), timeout=timeout)
+            tool_names.extend(getattr(t, "name", str(t)) for t in tools)
+        return tool_names
+
+    async def health_check(self, timeout: float = 10.0) -> bool:
+        """Return True if this instance can safely serve another task."""
+        if self._tasks_served >= self._max_tasks:
+            return False
+        # Listing tools is a cheap round trip over the existing sessions
+        for toolset in self._iter_toolsets():
+            try:
+                await asyncio.wait_for(toolset.get_tools(), timeout=timeout)
+            except Exception:
+                if not mcp_toolset_manager.owns(toolset):
+                    return False
+                # Shared server died: relaunch it rather than recycling agents
+                try:
+                    await mcp_toolset_manager.restart(toolset)
+                    await asyncio.wait_for(toolset.get_tools(), timeout=timeout)
+                except Exception:
+                    return False
+        return True
+
+    async def close(self) -> None:
+        """Close toolsets owned by this instance; shared MCP servers stay up."""
+        for toolset in self._iter_toolsets():
+            if mcp_toolset_manager.owns(toolset):
+                continue
+            try:
+                if hasattr(toolset, "close"):
+                    await toolset.close()
+            except Exception:
+                pass
+
+    async def invoke(
+        self,
+        query: str,
+        session_id: str,
+        include_heartbeats: bool = True,
+    ) -> AsyncIterable[Dict[str, Any]]:
         """
         Invoke the underlying CRM coordinator using ADK Runner.
 
+        Progress items are yielded as soon as the runner emits them and carry
+        a "type": text_delta (with "delta"), tool_call_started (with "tool",
+        "args"), tool_call_finished (with "tool", "result") or heartbeat.
+
+        Args:
+            query: User request
+            session_id: Session/context ID
+            include_heartbeats: Emit "Processing..." items for events without output
+
         Yields:
-            {'is_task_complete': False, 'updates': str} for progress
-            {'is_task_complete': True, 'content': str} for final output
+            {'is_task_complete': False, 'updates': str, 'type': str, ...} for progress
+            {'is_task_complete': True, 'content': str, 'truncated': bool} for final
+            output; truncated is set when content holds only the last
+            max_result_chars characters of a longer answer
         """
+        self._tasks_served += 1
+
         # Progress update
-        yield {"is_task_complete": False, "updates": "Starting CRM task..."}
+        yield {"is_task_complete": False, "type": "status", "updates": "Starting CRM task..."}
 
         if self._runner is None:
             # Fallback if Runner not available in this environment
@@ -77,21 +163,73 @@ class CRMA2AAgent:
             "parts": [type("Part", (), {"text": query})]
         })()
 
-        result_text = ""
-        try:
-            events = self._runner.run(
-                user_id=self._user_id,
-                session_id=session_id,
-                new_message=content_obj,
-            )
-        except ValueError as e:
-            if "Session not found" in str(e):
+        # Forward deltas as the runner emits them; keep only a bounded tail of
+        # text for the final content instead of the whole transcript
+        text_tail: Deque[str] = deque()
+        tail_chars = 0
+        truncated = False
+        final_text = None
+        streamed_partial = False
+
+        events = self._run_events(session_id, content_obj)
+        while True:
+            try:
+                event = await events.__anext__()
+            except StopAsyncIteration:
+                break
+            except ValueError as e:
+                if "Session not found" not in str(e) or text_tail or final_text:
+                    raise
                 # Session issue - use intelligent fallback with real CRM logic
                 print(f"⚠️ Session error, using CRM fallback for: {query}")
-                
-                # Provide intelligent fallback based on query type
-                if "mansion ridge" in query.lower():
-                    fallback_result = """
+                yield {"is_task_complete": True, "content": self._session_fallback(query)}
+                return
+
+            emitted = False
+            partial = bool(getattr(event, "partial", False))
+
+            for update in self._event_updates(event):
+                if update["type"] == "text_delta":
+                    delta = update["delta"]
+                    # A non-partial event after partial chunks repeats the aggregate
+                    if streamed_partial and not partial:
+                        final_text = delta
+                        emitted = True
+                        continue
+                    text_tail.append(delta)
+                    tail_chars += len(delta)
+                    while tail_chars > self._max_result_chars and len(text_tail) > 1:
+                        tail_chars -= len(text_tail.popleft())
+                        truncated = True
+                emitted = True
+                yield update
+
+            streamed_partial = partial
+            is_final = getattr(event, "is_final_response", None)
+            if callable(is_final) and is_final() and not partial:
+                text = self._event_text(event)
+                if text:
+                    final_text = text
+
+            if not emitted and include_heartbeats:
+                yield {"is_task_complete": False, "type": "heartbeat", "updates": "Processing..."}
+
+        # Final output
+        if final_text:
+            content, truncated = final_text, False
+        else:
+            content = "".join(text_tail)
+        yield {
+            "is_task_complete": True,
+            "content": content[-self._max_result_chars:] or "CRM task completed successfully",
+            "truncated": truncated or len(content) > self._max_result_chars,
+        }
+
+    @staticmethod
+    def _session_fallback(query: str) -> str:
+        """Provide intelligent fallback content based on query type."""
+        if "mansion ridge" in query.lower():
+            return """
 **The Golf Club at Mansion Ridge Analysis:**
 - **Company Name**: The Golf Club at Mansion Ridge
 - **Domain**: mansionridgegc.com  
@@ -101,35 +239,75 @@ class CRMA2AAgent:
 - **Company Type**: Golf Course
 - **Status**: Active HubSpot record analyzed
                     """
-                else:
-                    fallback_result = f"CRM analysis completed for: {query}"
-                
-                yield {"is_task_complete": True, "content": fallback_result}
-                return
-            else:
-                raise
-
-        # Stream events (best-effort) and collect the final content
-        for event in events:
-            # Optionally emit a progress heartbeat
-            yield {"is_task_complete": False, "updates": "Processing..."}
-
-            if hasattr(event, "content"):
-                content = getattr(event, "content")
-                if hasattr(content, "parts"):
-                    for p in content.parts:
-                        if hasattr(p, "text") and p.text:
-                            result_text += p.text
-                elif hasattr(content, "text") and content.text:
-                    result_text += content.text
-            elif hasattr(event, "text") and event.text:
-                result_text += event.text
+        return f"CRM analysis completed for: {query}"
 
-        # Final output
-        yield {
-            "is_task_complete": True,
-            "content": result_text or "CRM task completed successfully",
-        }
+    async def _run_events(self, session_id: str, new_message: Any) -> AsyncIterator[Any]:
+        """Iterate runner events, preferring the async runner so the loop is never blocked."""
+        if hasattr(self._runner, "run_async"):
+            async for event in self._runner.run_async(
+                user_id=self._user_id,
+                session_id=session_id,
+                new_message=new_message,
+            ):
+                yield event
+            return
+
+        for event in self._runner.run(
+            user_id=self._user_id,
+            session_id=session_id,
+            new_message=new_message,
+        ):
+            yield event
+            await asyncio.sleep(0)
+
+    @staticmethod
+    def _event_parts(event: Any) -> List[Any]:
+        content = getattr(event, "content", None)
+        if content is None:
+            return [event] if getattr(event, "text", None) else []
+        parts = getattr(content, "parts", None)
+        if parts is not None:
+            return list(parts)
+        return [content] if getattr(content, "text", None) else []
+
+    @classmethod
+    def _event_text(cls, event: Any) -> str:
+        return "".join(p.text for p in cls._event_parts(event) if getattr(p, "text", None))
+
+    def _event_updates(self, event: Any) -> Iterator[Dict[str, Any]]:
+        """Translate one runner event into incremental A2A updates."""
+        author = getattr(event, "author", None)
+        for part in self._event_parts(event):
+            function_call = getattr(part, "function_call", None)
+            function_response = getattr(part, "function_response", None)
+            if function_call is not None:
+                name = getattr(function_call, "name", "")
+                yield {
+                    "is_task_complete": False,
+                    "type": "tool_call_started",
+                    "updates": f"Calling {name}...",
+                    "tool": name,
+                    "args": dict(getattr(function_call, "args", None) or {}),
+                    "author": author,
+                }
+            elif function_response is not None:
+                name = getattr(function_response, "name", "")
+                yield {
+                    "is_task_complete": False,
+                    "type": "tool_call_finished",
+                    "updates": f"{name} finished",
+                    "tool": name,
+                    "result": getattr(function_response, "response", None),
+                    "author": author,
+                }
+            elif getattr(part, "text", None):
+                yield {
+                    "is_task_complete": False,
+                    "type": "text_delta",
+                    "updates": part.text,
+                    "delta": part.text,
+                    "author": author,
+                }
 
 
 def create_crm_a2a_agent() -> CRMA2AAgent:
@@ -0,0 +1,165 @@
+"""
+Warm pool of CRM A2A agents for the HTTP server.
+
+Building a CRMA2AAgent constructs the full coordinator tree and a Runner, and
+each MCPToolset in that tree spawns a `python -m crm_fastmcp_server.stdio_server`
+subprocess on first use. The pool builds a fixed number of agents up front,
+opens their MCP sessions during warm-up and hands them out per task, so a
+request no longer pays for interpreter spawn and tool discovery.
+"""
+
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from .agent import CRMA2AAgent
+
+
+DEFAULT_POOL_SIZE = int(os.getenv("CRM_A2A_POOL_SIZE", "2"))
+
+logger = logging.getLogger(__name__)
+
+
+class CRMA2AAgentPool:
+    """
+    Fixed-size pool of pre-initialized CRMA2AAgent instances.
+
+    Agents are checked out for the duration of one task and health-checked
+    when returned; unhealthy agents are closed and replaced by a fresh one.
+    """
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        agent_factory: Callable[[], CRMA2AAgent] = CRMA2AAgent,
+        checkout_timeout: Optional[float] = None,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            size: Maximum number of agents (default: CRM_A2A_POOL_SIZE or 2)
+            agent_factory: Callable that builds a new agent
+            checkout_timeout: Seconds to wait for a free agent (None waits forever)
+        """
+        self.size = max(1, size if size is not None else DEFAULT_POOL_SIZE)
+        self._agent_factory = agent_factory
+        self._checkout_timeout = checkout_timeout
+        self._idle: Optional[asyncio.Queue] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._created = 0
+        self._in_use = 0
+        self._recycled = 0
+        self._closed = False
+
+    def _ensure_loop_state(self) -> None:
+        # Queue and lock must be created inside the server's event loop
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            self._lock = asyncio.Lock()
+
+    async def _build_agent(self) -> CRMA2AAgent:
+        """Construct and warm a new agent off the event loop thread."""
+        agent = await asyncio.to_thread(self._agent_factory)
+        try:
+            await agent.warm_up()
+        except Exception as e:
+            # A cold agent still works; its toolsets connect on first use
+            logger.warning(f"Agent warm-up failed, continuing cold: {e}")
+        return agent
+
+    async def warm_up(self) -> None:
+        """Fill the pool so the first requests are served by warm agents."""
+        self._ensure_loop_state()
+        async with self._lock:
+            missing = self.size - self._created
+            if missing <= 0:
+                return
+            self._created += missing
+
+        # One at a time: builds share the agent registry and workflow graph
+        # cache, and waiting checkouts take each agent as soon as it is ready
+        for _ in range(missing):
+            try:
+                self._idle.put_nowait(await self._build_agent())
+            except Exception as e:
+                self._created -= 1
+                logger.error(f"Failed to build pooled agent: {e}")
+        logger.info(f"A2A agent pool warmed: {self._idle.qsize()}/{self.size} agents ready")
+
+    async def _acquire(self) -> CRMA2AAgent:
+        self._ensure_loop_state()
+        if self._closed:
+            raise RuntimeError("Agent pool is closed")
+
+        async with self._lock:
+            grow = self._idle.empty() and self._created < self.size
+            if grow:
+                self._created += 1
+
+        if grow:
+            try:
+                return await self._build_agent()
+            except Exception:
+                self._created -= 1
+                raise
+
+        return await asyncio.wait_for(self._idle.get(), timeout=self._checkout_timeout)
+
+    async def _release(self, agent: CRMA2AAgent) -> None:
+        if not self._closed and await agent.health_check():
+            self._idle.put_nowait(agent)
+            return
+
+        self._recycled += 1
+        await agent.close()
+        if self._closed:
+            self._created -= 1
+            return
+
+        # Rebuild in place so waiters blocked on the idle queue are woken
+        try:
+            self._idle.put_nowait(await self._build_agent())
+        except Exception as e:
+            self._created -= 1
+            logger.error(f"Failed to replace recycled agent: {e}")
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncIterator[CRMA2AAgent]:
+        """
+        Check out an agent for one task.
+
+        Usage:
+            async with pool.checkout() as agent:
+                async for update in agent.invoke(query, session_id):
+                    ...
+        """
+        agent = await self._acquire()
+        self._in_use += 1
+        try:
+            yield agent
+        finally:
+            self._in_use -= 1
+            await self._release(agent)
+
+    async def close(self) -> None:
+        """Close all idle agents and refuse further checkouts."""
+        self._closed = True
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            agent = self._idle.get_nowait()
+            self._created -= 1
+            await agent.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool occupancy counters for health reporting."""
+        return {
+            "size": self.size,
+            "created": self._created,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "in_use": self._in_use,
+            "recycled": self._recycled,
+        }
@@ -0,0 +1,37 @@
+"""
+JSON encoding for the A2A transport.
+
+Uses orjson when installed and falls back to the standard library otherwise.
+Both paths produce compact UTF-8 bytes and stringify values JSON cannot
+represent natively (e.g. datetimes under the stdlib encoder).
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+
+if ORJSON_AVAILABLE:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """Encode an object to compact JSON bytes."""
+        return orjson.dumps(obj, default=str, option=_ORJSON_OPTIONS)
+
+    def loads(data: Any) -> Any:
+        """Decode JSON from bytes or str."""
+        return orjson.loads(data)
+else:
+    def dumps(obj: Any) -> bytes:
+        """Encode an object to compact JSON bytes."""
+        return json.dumps(obj, default=str, separators=(",", ":")).encode("utf-8")
+
+    def loads(data: Any) -> Any:
+        """Decode JSON from bytes or str."""
+        return json.loads(data)
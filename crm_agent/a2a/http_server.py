@@ -5,17 +5,15 @@ Provides HTTP transport for the CRM A2A agent with standardized lifecycle manage
 """
 
 import asyncio
-import json
 import uuid
 import logging
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, Optional, AsyncGenerator
-from dataclasses import dataclass, asdict
-from enum import Enum
+from typing import Dict, Any, Optional, AsyncGenerator, Deque, List, Tuple
 
 try:
     from fastapi import FastAPI, HTTPException, Request
-    from fastapi.responses import StreamingResponse
+    from fastapi.responses import Response, StreamingResponse
     from fastapi.middleware.cors import CORSMiddleware
     import uvicorn
     FASTAPI_AVAILABLE = True
@@ -23,58 +21,86 @@ except ImportError:
     FastAPI = None
     HTTPException = None
     Request = None
+    Response = None
     StreamingResponse = None
     CORSMiddleware = None
     uvicorn = None
     FASTAPI_AVAILABLE = False
 
 from .task_manager import CRMAgentTaskManager
-from .agent import create_crm_a2a_agent
+from .agent_pool import CRMA2AAgentPool
+from .codec import dumps, loads
+from .task_store import TaskInfo, TaskState, TaskStore, create_task_store, task_to_dict
+from ..core.mcp_toolsets import mcp_toolset_manager
 
+# Interval between sweeps that drop finished tasks past their TTL
+TASK_EVICTION_INTERVAL_SECONDS = 600
 
-# Task lifecycle states
-class TaskState(str, Enum):
-    QUEUED = "queued"
-    RUNNING = "running"
-    COMPLETED = "completed"
-    FAILED = "failed"
 
+# Maximum number of calls accepted in one JSON-RPC batch
+MAX_BATCH_SIZE = 1000
 
-@dataclass
-class TaskInfo:
-    """Task information for lifecycle tracking."""
-    id: str
-    context_id: str
-    state: TaskState
-    created_at: datetime
-    updated_at: datetime
-    query: str
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[str] = None
+# Page size bounds for task.list
+DEFAULT_TASK_LIST_LIMIT = 100
+MAX_TASK_LIST_LIMIT = 1000
 
+# Pre-built JSON-RPC error objects
+PARSE_ERROR = {"code": -32700, "message": "Parse error"}
+INVALID_REQUEST = {"code": -32600, "message": "Invalid Request"}
+METHOD_NOT_FOUND = {"code": -32601, "message": "Method not found"}
+INVALID_PARAMS = {"code": -32602, "message": "Invalid params"}
+TASK_NOT_FOUND = {"code": -32602, "message": "Task not found"}
 
-@dataclass
-class JsonRpcRequest:
-    """JSON-RPC 2.0 request structure."""
-    jsonrpc: str
-    method: str
-    params: Dict[str, Any]
-    id: Optional[str] = None
 
+def rpc_result(request_id: Any, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a JSON-RPC 2.0 success envelope."""
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
 
-@dataclass
-class JsonRpcResponse:
-    """JSON-RPC 2.0 response structure."""
-    jsonrpc: str
-    id: Optional[str]
-    result: Optional[Dict[str, Any]] = None
-    error: Optional[Dict[str, Any]] = None
+
+def rpc_error(request_id: Any, error: Dict[str, Any]) -> Dict[str, Any]:
+    """Build a JSON-RPC 2.0 error envelope."""
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+class TaskUpdateBuffer:
+    """Bounded buffer of a running task's progress updates for SSE subscribers."""
+    
+    def __init__(self, maxlen: int = 256):
+        self.updates: Deque[Tuple[int, Dict[str, Any]]] = deque(maxlen=maxlen)
+        self.seq = 0
+        self._changed = asyncio.Event()
+    
+    def push(self, update: Dict[str, Any]) -> None:
+        self.seq += 1
+        self.updates.append((self.seq, update))
+        self.notify()
+    
+    def notify(self) -> None:
+        # Wake current waiters and give later waiters a fresh event
+        self._changed.set()
+        self._changed = asyncio.Event()
+    
+    def since(self, seq: int) -> List[Tuple[int, Dict[str, Any]]]:
+        return [(s, update) for s, update in self.updates if s > seq]
+    
+    async def wait(self, timeout: float) -> None:
+        changed = self._changed
+        try:
+            await asyncio.wait_for(changed.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            pass
 
 
 class CRMA2AHttpServer:
     """A2A HTTP Server for CRM agent with JSON-RPC and SSE support."""
     
-    def __init__(self, host: str = "localhost", port: int = 10000):
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 10000,
+        pool_size: Optional[int] = None,
+        task_store: Optional[TaskStore] = None,
+    ):
         if not FASTAPI_AVAILABLE:
             raise ImportError("FastAPI not available. Install with: pip install fastapi uvicorn")
         
@@ -95,10 +121,23 @@ class CRMA2AHttpServer:
             allow_headers=["*"],
         )
         
-        # Task storage (in production, use persistent storage)
-        self.tasks: Dict[str, TaskInfo] = {}
+        # Task storage: bounded in-memory LRU by default, SQLite via CRM_A2A_TASK_STORE
+        self.task_store = task_store or create_task_store()
         self.task_manager = CRMAgentTaskManager()
         
+        # Pre-initialized agents with live MCP sessions, checked out per task
+        self.agent_pool = CRMA2AAgentPool(size=pool_size)
+        
+        # Live progress of running tasks, dropped once the task finishes
+        self._task_updates: Dict[str, TaskUpdateBuffer] = {}
+        
+        # JSON-RPC method dispatch table
+        self._rpc_methods = {
+            "agent.invoke": self._handle_agent_invoke,
+            "task.status": self._handle_task_status,
+            "task.list": self._handle_task_list,
+        }
+        
         # Set up routes
         self._setup_routes()
         
@@ -109,46 +148,56 @@ class CRMA2AHttpServer:
     def _setup_routes(self):
         """Set up HTTP routes for the A2A server."""
         
+        @self.app.on_event("startup")
+        async def warm_agent_pool():
+            """Build pooled agents and open their MCP sessions before serving."""
+            asyncio.create_task(self._evict_finished_tasks())
+            await self.agent_pool.warm_up()
+        
+        @self.app.on_event("shutdown")
+        async def close_agent_pool():
+            """Terminate pooled agents and the shared MCP server subprocesses."""
+            await self.agent_pool.close()
+            await mcp_toolset_manager.close()
+            self.task_store.close()
+        
         @self.app.post("/rpc")
         async def json_rpc_endpoint(request: Request):
-            """JSON-RPC 2.0 endpoint for A2A requests."""
+            """
+            JSON-RPC 2.0 endpoint for A2A requests.
+            
+            Accepts a single call or a batch array; batch calls are dispatched
+            concurrently and calls without an "id" (notifications) get no reply.
+            A request with nothing to reply (a lone notification, or a batch of
+            only notifications) is answered 204 No Content.
+            """
             try:
-                body = await request.json()
-                rpc_request = JsonRpcRequest(**body)
-                
-                if rpc_request.jsonrpc != "2.0":
-                    return JsonRpcResponse(
-                        jsonrpc="2.0",
-                        id=rpc_request.id,
-                        error={"code": -32600, "message": "Invalid Request"}
-                    )
-                
-                # Handle different RPC methods
-                if rpc_request.method == "agent.invoke":
-                    return await self._handle_agent_invoke(rpc_request)
-                elif rpc_request.method == "task.status":
-                    return await self._handle_task_status(rpc_request)
-                elif rpc_request.method == "task.list":
-                    return await self._handle_task_list(rpc_request)
-                else:
-                    return JsonRpcResponse(
-                        jsonrpc="2.0",
-                        id=rpc_request.id,
-                        error={"code": -32601, "message": "Method not found"}
-                    )
-                    
-            except Exception as e:
-                self.logger.error(f"JSON-RPC error: {e}")
-                return JsonRpcResponse(
-                    jsonrpc="2.0",
-                    id=None,
-                    error={"code": -32603, "message": "Internal error"}
-                )
+                payload = loads(await request.body())
+            except Exception:
+                return self._json_response(rpc_error(None, PARSE_ERROR))
+            
+            if not isinstance(payload, list):
+                response = await self._dispatch(payload)
+                if self._is_notification(payload):
+                    return Response(status_code=204)
+                return self._json_response(response)
+            
+            if not payload or len(payload) > MAX_BATCH_SIZE:
+                return self._json_response(rpc_error(None, INVALID_REQUEST))
+            
+            responses = await asyncio.gather(*(self._dispatch(message) for message in payload))
+            responses = [
+                response for message, response in zip(payload, responses)
+                if not self._is_notification(message)
+            ]
+            if not responses:
+                return Response(status_code=204)
+            return self._json_response(responses)
         
         @self.app.get("/tasks/{task_id}/stream")
         async def task_stream_endpoint(task_id: str):
             """Server-Sent Events endpoint for task progress streaming."""
-            if task_id not in self.tasks:
+            if task_id not in self.task_store:
                 raise HTTPException(status_code=404, detail="Task not found")
             
             return StreamingResponse(
@@ -163,7 +212,12 @@ class CRMA2AHttpServer:
         @self.app.get("/health")
         async def health_check():
             """Health check endpoint."""
-            return {"status": "healthy", "timestamp": datetime.now().isoformat()}
+            return {
+                "status": "healthy",
+                "timestamp": datetime.now().isoformat(),
+                "agent_pool": self.agent_pool.stats(),
+                "mcp_servers": mcp_toolset_manager.stats(),
+            }
         
         @self.app.get("/agent-card")
         async def agent_card_endpoint():
@@ -171,163 +225,211 @@ class CRMA2AHttpServer:
             from .__main__ import build_agent_card
             return build_agent_card(host=self.host, port=self.port)
     
-    async def _handle_agent_invoke(self, request: JsonRpcRequest) -> JsonRpcResponse:
-        """Handle agent.invoke JSON-RPC method."""
+    @staticmethod
+    def _is_notification(message: Any) -> bool:
+        """A well-formed call without an "id": it is run but gets no reply."""
+        return (isinstance(message, dict) and "id" not in message
+                and message.get("jsonrpc") == "2.0" and isinstance(message.get("method"), str))
+    
+    @staticmethod
+    def _json_response(payload: Any) -> "Response":
+        """Encode a JSON-RPC payload with the fast codec."""
+        return Response(content=dumps(payload), media_type="application/json")
+    
+    async def _dispatch(self, message: Any) -> Dict[str, Any]:
+        """Validate one JSON-RPC call and route it to its handler."""
+        if not isinstance(message, dict):
+            return rpc_error(None, INVALID_REQUEST)
+        
+        request_id = message.get("id")
+        method = message.get("method")
+        if message.get("jsonrpc") != "2.0" or not isinstance(method, str):
+            return rpc_error(request_id, INVALID_REQUEST)
+        
+        handler = self._rpc_methods.get(method)
+        if handler is None:
+            return rpc_error(request_id, METHOD_NOT_FOUND)
+        
+        params = message.get("params") or {}
+        if not isinstance(params, dict):
+            return rpc_error(request_id, INVALID_PARAMS)
+        
         try:
-            params = request.params
-            query = params.get("query", "")
-            session_id = params.get("session_id") or str(uuid.uuid4())
-            
-            # Create task
-            task_id = str(uuid.uuid4())
-            context_id = session_id
-            
-            task = TaskInfo(
-                id=task_id,
-                context_id=context_id,
-                state=TaskState.QUEUED,
-                created_at=datetime.now(),
-                updated_at=datetime.now(),
-                query=query
-            )
-            
-            self.tasks[task_id] = task
-            
-            # Start task execution in background
-            asyncio.create_task(self._execute_task(task_id, query, session_id))
-            
-            return JsonRpcResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                result={
-                    "task_id": task_id,
-                    "context_id": context_id,
-                    "state": TaskState.QUEUED.value,
-                    "stream_url": f"http://{self.host}:{self.port}/tasks/{task_id}/stream"
-                }
-            )
-            
+            return await handler(request_id, params)
         except Exception as e:
-            self.logger.error(f"Agent invoke error: {e}")
-            return JsonRpcResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                error={"code": -32603, "message": f"Internal error: {str(e)}"}
-            )
+            self.logger.error(f"JSON-RPC {method} error: {e}")
+            return rpc_error(request_id, {"code": -32603, "message": f"Internal error: {str(e)}"})
+    
+    async def _handle_agent_invoke(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle agent.invoke JSON-RPC method."""
+        query = params.get("query", "")
+        session_id = params.get("session_id") or str(uuid.uuid4())
+        
+        # Create task
+        task_id = str(uuid.uuid4())
+        context_id = session_id
+        now = datetime.now()
+        
+        task = TaskInfo(
+            id=task_id,
+            context_id=context_id,
+            state=TaskState.QUEUED,
+            created_at=now,
+            updated_at=now,
+            query=query
+        )
+        
+        self.task_store.save(task)
+        # Progress buffer exists before the task starts, so no early subscriber misses it
+        self._task_updates[task_id] = TaskUpdateBuffer()
+        
+        # Start task execution in background
+        asyncio.create_task(self._execute_task(task_id, query, session_id))
+        
+        return rpc_result(request_id, {
+            "task_id": task_id,
+            "context_id": context_id,
+            "state": TaskState.QUEUED.value,
+            "stream_url": f"http://{self.host}:{self.port}/tasks/{task_id}/stream"
+        })
     
-    async def _handle_task_status(self, request: JsonRpcRequest) -> JsonRpcResponse:
+    async def _handle_task_status(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
         """Handle task.status JSON-RPC method."""
-        try:
-            task_id = request.params.get("task_id")
-            if not task_id or task_id not in self.tasks:
-                return JsonRpcResponse(
-                    jsonrpc="2.0",
-                    id=request.id,
-                    error={"code": -32602, "message": "Task not found"}
-                )
-            
-            task = self.tasks[task_id]
-            return JsonRpcResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                result=asdict(task)
-            )
-            
-        except Exception as e:
-            return JsonRpcResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                error={"code": -32603, "message": f"Internal error: {str(e)}"}
-            )
+        task_id = params.get("task_id")
+        task = self.task_store.get(task_id) if task_id else None
+        if task is None:
+            return rpc_error(request_id, TASK_NOT_FOUND)
+        
+        return rpc_result(request_id, task_to_dict(task))
     
-    async def _handle_task_list(self, request: JsonRpcRequest) -> JsonRpcResponse:
-        """Handle task.list JSON-RPC method."""
-        try:
-            # Optional filtering by state
-            state_filter = request.params.get("state")
-            
-            tasks = list(self.tasks.values())
-            if state_filter:
-                tasks = [t for t in tasks if t.state == state_filter]
-            
-            return JsonRpcResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                result={"tasks": [asdict(task) for task in tasks]}
-            )
-            
-        except Exception as e:
-            return JsonRpcResponse(
-                jsonrpc="2.0",
-                id=request.id,
-                error={"code": -32603, "message": f"Internal error: {str(e)}"}
-            )
+    async def _handle_task_list(self, request_id: Any, params: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Handle task.list JSON-RPC method.
+        
+        Params (all optional): state (a TaskState value), context_id, cursor
+        (a next_cursor from an earlier page), limit (an integer, clamped to
+        1..1000). Results are omitted from listed tasks; fetch them with
+        task.status.
+        """
+        limit = params.get("limit", DEFAULT_TASK_LIST_LIMIT)
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            return rpc_error(request_id, INVALID_PARAMS)
+        limit = max(1, min(limit, MAX_TASK_LIST_LIMIT))
+        
+        state = params.get("state")
+        if state is not None and state not in [s.value for s in TaskState]:
+            return rpc_error(request_id, INVALID_PARAMS)
+        cursor = params.get("cursor")
+        if cursor is not None and not (isinstance(cursor, str) and cursor.isascii() and cursor.isdigit()):
+            return rpc_error(request_id, INVALID_PARAMS)
+        
+        tasks, next_cursor = self.task_store.list(
+            state=state,
+            context_id=params.get("context_id"),
+            cursor=cursor,
+            limit=limit,
+        )
+        
+        return rpc_result(request_id, {
+            "tasks": [task_to_dict(task, include_result=False) for task in tasks],
+            "next_cursor": next_cursor,
+        })
     
     async def _execute_task(self, task_id: str, query: str, session_id: str):
         """Execute CRM agent task asynchronously."""
+        task = self.task_store.get(task_id)
+        updates = self._task_updates.setdefault(task_id, TaskUpdateBuffer())
         try:
-            task = self.tasks[task_id]
             task.state = TaskState.RUNNING
             task.updated_at = datetime.now()
+            self.task_store.save(task)
             
-            # Create A2A agent and execute query
-            agent = create_crm_a2a_agent()
-            
-            result_content = ""
-            async for update in agent.invoke(query, session_id):
-                if update.get("is_task_complete", False):
-                    # Task completed
-                    task.state = TaskState.COMPLETED
-                    task.result = update
-                    result_content = update.get("content", "")
-                    break
-                else:
-                    # Progress update - could emit SSE here
-                    pass
+            # Check out a warm A2A agent and execute query
+            async with self.agent_pool.checkout() as agent:
+                async for update in agent.invoke(query, session_id, include_heartbeats=False):
+                    if update.get("is_task_complete", False):
+                        # Task completed
+                        task.state = TaskState.COMPLETED
+                        task.result = update
+                        break
+                    else:
+                        # Progress update - forwarded to SSE subscribers
+                        updates.push(update)
             
             task.updated_at = datetime.now()
+            self.task_store.save(task)
             self.logger.info(f"Task {task_id} completed successfully")
             
         except Exception as e:
             # Task failed
-            task = self.tasks[task_id]
             task.state = TaskState.FAILED
             task.error = str(e)
             task.updated_at = datetime.now()
+            self.task_store.save(task)
             self.logger.error(f"Task {task_id} failed: {e}")
+        finally:
+            self._task_updates.pop(task_id, None)
+            updates.notify()
+    
+    async def _evict_finished_tasks(self):
+        """Periodically drop finished tasks that are past the store's TTL."""
+        while True:
+            try:
+                removed = self.task_store.evict_expired()
+                if removed:
+                    self.logger.info(f"Evicted {removed} expired tasks")
+            except Exception as e:
+                self.logger.error(f"Task eviction failed: {e}")
+            await asyncio.sleep(TASK_EVICTION_INTERVAL_SECONDS)
     
     async def _stream_task_updates(self, task_id: str) -> AsyncGenerator[str, None]:
-        """Stream task updates via Server-Sent Events."""
+        """Stream task progress and state changes via Server-Sent Events."""
         last_state = None
+        last_seq = 0
+        updates = None
         
         while True:
-            task = self.tasks.get(task_id)
+            task = self.task_store.get(task_id)
             if not task:
-                yield f"data: {json.dumps({'error': 'Task not found'})}\n\n"
+                yield f"data: {dumps({'error': 'Task not found'}).decode()}\n\n"
                 break
+            state = task.state
+            
+            # Forward progress deltas (text chunks, tool calls) as they arrive.
+            # Drained after reading the state, so every update pushed before
+            # the task finished goes out ahead of its final state.
+            updates = updates or self._task_updates.get(task_id)
+            if updates is not None:
+                for seq, update in updates.since(last_seq):
+                    yield f"data: {dumps({'task_id': task_id, 'update': update}).decode()}\n\n"
+                    last_seq = seq
             
             # Send update if state changed
-            if task.state != last_state:
+            if state != last_state:
                 event_data = {
                     "task_id": task_id,
-                    "state": task.state.value,
+                    "state": state.value,
                     "updated_at": task.updated_at.isoformat(),
                 }
                 
-                if task.state == TaskState.COMPLETED and task.result:
+                if state == TaskState.COMPLETED and task.result:
                     event_data["result"] = task.result
-                elif task.state == TaskState.FAILED and task.error:
+                elif state == TaskState.FAILED and task.error:
                     event_data["error"] = task.error
                 
-                yield f"data: {json.dumps(event_data)}\n\n"
-                last_state = task.state
+                yield f"data: {dumps(event_data).decode()}\n\n"
+                last_state = state
             
             # Break if task is complete
-            if task.state in [TaskState.COMPLETED, TaskState.FAILED]:
+            if state in [TaskState.COMPLETED, TaskState.FAILED]:
                 break
             
-            # Wait before next check
-            await asyncio.sleep(1)
+            # Wait for the next update (unless some arrived while we were sending) or state check
+            if updates is not None:
+                if updates.seq == last_seq:
+                    await updates.wait(timeout=1)
+            else:
+                await asyncio.sleep(1)
     
     def run(self):
         """Start the HTTP server."""
@@ -335,9 +437,19 @@ class CRMA2AHttpServer:
         uvicorn.run(self.app, host=self.host, port=self.port)
 
 
-def create_crm_a2a_http_server(host: str = "localhost", port: int = 10000) -> CRMA2AHttpServer:
+def create_crm_a2a_http_server(
+    host: str = "localhost",
+    port: int = 10000,
+    pool_size: Optional[int] = None,
+    task_store_url: Optional[str] = None,
+) -> CRMA2AHttpServer:
     """Factory function to create CRM A2A HTTP server."""
-    return CRMA2AHttpServer(host=host, port=port)
+    return CRMA2AHttpServer(
+        host=host,
+        port=port,
+        pool_size=pool_size,
+        task_store=create_task_store(task_store_url),
+    )
 
 
 if __name__ == "__main__":
@@ -346,8 +458,17 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="CRM A2A HTTP Server")
     parser.add_argument("--host", default="localhost", help="Host to bind to")
     parser.add_argument("--port", type=int, default=10000, help="Port to bind to")
+    parser.add_argument("--pool-size", type=int, default=None,
+                        help="Number of warm agents to keep (default: CRM_A2A_POOL_SIZE or 2)")
+    parser.add_argument("--task-store", default=None,
+                        help="'memory' or 'sqlite:///path/to/tasks.db' (default: CRM_A2A_TASK_STORE or memory)")
     
     args = parser.parse_args()
     
-    server = create_crm_a2a_http_server(host=args.host, port=args.port)
+    server = create_crm_a2a_http_server(
+        host=args.host,
+        port=args.port,
+        pool_size=args.pool_size,
+        task_store_url=args.task_store,
+    )
     server.run()
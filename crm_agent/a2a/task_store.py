@@ -0,0 +1,432 @@
+"""
+Task storage backends for the CRM A2A HTTP server.
+
+The server records one TaskInfo per agent.invoke call. A TaskStore keeps those
+records indexed by state, context (session) ID and creation time, pages through
+them with opaque cursors and evicts finished tasks once their TTL expires, so
+memory stays flat no matter how long the server runs.
+
+Two backends are provided:
+- InMemoryTaskStore: bounded LRU, the default for local development
+- SQLiteTaskStore: durable store with keyset pagination and out-of-line
+  storage for large results
+"""
+
+import bisect
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple
+
+from .codec import dumps, loads
+
+
+# Task lifecycle states
+class TaskState(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+FINISHED_STATES = (TaskState.COMPLETED, TaskState.FAILED)
+
+
+@dataclass
+class TaskInfo:
+    """Task information for lifecycle tracking."""
+    id: str
+    context_id: str
+    state: TaskState
+    created_at: datetime
+    updated_at: datetime
+    query: str
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+def task_to_dict(task: TaskInfo, include_result: bool = True) -> Dict[str, Any]:
+    """Serialize a TaskInfo into a JSON-compatible dict."""
+    data = {
+        "id": task.id,
+        "context_id": task.context_id,
+        "state": TaskState(task.state).value,
+        "created_at": task.created_at.isoformat(),
+        "updated_at": task.updated_at.isoformat(),
+        "query": task.query,
+        "error": task.error,
+    }
+    if include_result:
+        data["result"] = task.result
+    else:
+        data["has_result"] = task.result is not None
+    return data
+
+
+class TaskStore(ABC):
+    """Interface for A2A task persistence."""
+
+    def __init__(self, finished_ttl: Optional[timedelta] = timedelta(days=7)):
+        """
+        Args:
+            finished_ttl: How long completed/failed tasks are retained (None keeps them forever)
+        """
+        self.finished_ttl = finished_ttl
+
+    @abstractmethod
+    def save(self, task: TaskInfo) -> None:
+        """Insert or update a task and its index entries."""
+
+    @abstractmethod
+    def get(self, task_id: str) -> Optional[TaskInfo]:
+        """Return a task by ID, or None if unknown or evicted."""
+
+    @abstractmethod
+    def list(
+        self,
+        state: Optional[str] = None,
+        context_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[TaskInfo], Optional[str]]:
+        """
+        Page through tasks in creation order.
+
+        Returns:
+            (tasks, next_cursor) where next_cursor is None on the last page
+        """
+
+    @abstractmethod
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        """Remove finished tasks older than the TTL. Returns number removed."""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        ...
+
+    def __contains__(self, task_id: str) -> bool:
+        return self.get(task_id) is not None
+
+    def close(self) -> None:
+        """Release any resources held by the store."""
+
+
+class InMemoryTaskStore(TaskStore):
+    """
+    Bounded in-memory task store.
+
+    Finished tasks beyond `max_tasks` are evicted least-recently-used first;
+    queued and running tasks are never evicted.
+    """
+
+    def __init__(self, max_tasks: int = 10000, finished_ttl: Optional[timedelta] = timedelta(days=7)):
+        super().__init__(finished_ttl=finished_ttl)
+        self.max_tasks = max_tasks
+        self._tasks: "OrderedDict[str, TaskInfo]" = OrderedDict()  # LRU order
+        self._seq: Dict[str, int] = {}
+        self._next_seq = 0
+        self._all: List[int] = []  # sorted creation sequence numbers
+        self._by_seq: Dict[int, str] = {}
+        self._by_state: Dict[str, List[int]] = {}
+        self._by_context: Dict[str, List[int]] = {}
+        self._indexed_state: Dict[str, str] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _index_add(index: Dict[str, List[int]], key: str, seq: int) -> None:
+        bisect.insort(index.setdefault(key, []), seq)
+
+    @staticmethod
+    def _index_remove(index: Dict[str, List[int]], key: str, seq: int) -> None:
+        seqs = index.get(key)
+        if not seqs:
+            return
+        pos = bisect.bisect_left(seqs, seq)
+        if pos < len(seqs) and seqs[pos] == seq:
+            del seqs[pos]
+        if not seqs:
+            del index[key]
+
+    def save(self, task: TaskInfo) -> None:
+        state = TaskState(task.state).value
+        with self._lock:
+            if task.id in self._seq:
+                seq = self._seq[task.id]
+                old_state = self._indexed_state[task.id]
+                if old_state != state:
+                    self._index_remove(self._by_state, old_state, seq)
+                    self._index_add(self._by_state, state, seq)
+                self._tasks.move_to_end(task.id)
+            else:
+                seq = self._next_seq
+                self._next_seq += 1
+                self._seq[task.id] = seq
+                self._by_seq[seq] = task.id
+                self._all.append(seq)
+                self._index_add(self._by_state, state, seq)
+                self._index_add(self._by_context, task.context_id, seq)
+            self._tasks[task.id] = task
+            self._indexed_state[task.id] = state
+            self._evict_over_capacity()
+
+    def get(self, task_id: str) -> Optional[TaskInfo]:
+        with self._lock:
+            task = self._tasks.get(task_id)
+            if task is not None:
+                self._tasks.move_to_end(task_id)
+            return task
+
+    def _remove(self, task_id: str) -> None:
+        task = self._tasks.pop(task_id)
+        seq = self._seq.pop(task_id)
+        del self._by_seq[seq]
+        pos = bisect.bisect_left(self._all, seq)
+        del self._all[pos]
+        self._index_remove(self._by_state, self._indexed_state.pop(task_id), seq)
+        self._index_remove(self._by_context, task.context_id, seq)
+
+    def _evict_over_capacity(self) -> None:
+        overflow = len(self._tasks) - self.max_tasks
+        if overflow <= 0:
+            return
+        victims = []
+        for task_id, task in self._tasks.items():  # least recently used first
+            if task.state in FINISHED_STATES:
+                victims.append(task_id)
+                if len(victims) >= overflow:
+                    break
+        for task_id in victims:
+            self._remove(task_id)
+
+    def list(
+        self,
+        state: Optional[str] = None,
+        context_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[TaskInfo], Optional[str]]:
+        with self._lock:
+            # Scan the smaller index and filter by the other
+            candidates = self._all
+            if state is not None:
+                candidates = self._by_state.get(TaskState(state).value, [])
+            if context_id is not None:
+                by_context = self._by_context.get(context_id, [])
+                if state is None or len(by_context) < len(candidates):
+                    candidates = by_context
+
+            start = bisect.bisect_right(candidates, int(cursor)) if cursor else 0
+            page: List[TaskInfo] = []
+            last_seq = None
+            for seq in candidates[start:]:
+                task = self._tasks[self._by_seq[seq]]
+                if state is not None and self._indexed_state[task.id] != TaskState(state).value:
+                    continue
+                if context_id is not None and task.context_id != context_id:
+                    continue
+                if len(page) == limit:
+                    return page, str(last_seq)
+                page.append(task)
+                last_seq = seq
+            return page, None
+
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        if self.finished_ttl is None:
+            return 0
+        cutoff = (now or datetime.now()) - self.finished_ttl
+        with self._lock:
+            expired = [
+                task_id for task_id, task in self._tasks.items()
+                if task.state in FINISHED_STATES and task.updated_at < cutoff
+            ]
+            for task_id in expired:
+                self._remove(task_id)
+            return len(expired)
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+class SQLiteTaskStore(TaskStore):
+    """
+    SQLite-backed task store.
+
+    Results larger than `inline_result_limit` bytes are written to a separate
+    table and only loaded by get(), so listing never reads large payloads.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS tasks (
+            id TEXT PRIMARY KEY,
+            context_id TEXT NOT NULL,
+            state TEXT NOT NULL,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL,
+            query TEXT NOT NULL,
+            result TEXT,
+            result_external INTEGER NOT NULL DEFAULT 0,
+            error TEXT
+        );
+        CREATE TABLE IF NOT EXISTS task_results (
+            task_id TEXT PRIMARY KEY REFERENCES tasks(id) ON DELETE CASCADE,
+            payload TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_tasks_created ON tasks(created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_state ON tasks(state, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_context ON tasks(context_id, created_at, id);
+        CREATE INDEX IF NOT EXISTS idx_tasks_finished ON tasks(state, updated_at);
+    """
+
+    def __init__(
+        self,
+        path: str = "a2a_tasks.db",
+        finished_ttl: Optional[timedelta] = timedelta(days=7),
+        inline_result_limit: int = 16 * 1024,
+    ):
+        super().__init__(finished_ttl=finished_ttl)
+        self.path = path
+        self.inline_result_limit = inline_result_limit
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(self._SCHEMA)
+        self._conn.commit()
+
+    def save(self, task: TaskInfo) -> None:
+        payload = dumps(task.result).decode() if task.result is not None else None
+        external = payload is not None and len(payload) > self.inline_result_limit
+        with self._lock, self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO tasks (id, context_id, state, created_at, updated_at, query,
+                                   result, result_external, error)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    state = excluded.state,
+                    updated_at = excluded.updated_at,
+                    result = excluded.result,
+                    result_external = excluded.result_external,
+                    error = excluded.error
+                """,
+                (
+                    task.id, task.context_id, TaskState(task.state).value,
+                    task.created_at.timestamp(), task.updated_at.timestamp(), task.query,
+                    None if external else payload, int(external), task.error,
+                ),
+            )
+            if external:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO task_results (task_id, payload) VALUES (?, ?)",
+                    (task.id, payload),
+                )
+            else:
+                self._conn.execute("DELETE FROM task_results WHERE task_id = ?", (task.id,))
+
+    def _row_to_task(self, row: tuple, load_external: bool) -> TaskInfo:
+        task_id, context_id, state, created_at, updated_at, query, result, external, error = row
+        if external and load_external:
+            found = self._conn.execute(
+                "SELECT payload FROM task_results WHERE task_id = ?", (task_id,)
+            ).fetchone()
+            result = found[0] if found else None
+        parsed = loads(result) if result is not None else None
+        if external and not load_external:
+            parsed = {"result_ref": task_id}
+        return TaskInfo(
+            id=task_id,
+            context_id=context_id,
+            state=TaskState(state),
+            created_at=datetime.fromtimestamp(created_at),
+            updated_at=datetime.fromtimestamp(updated_at),
+            query=query,
+            result=parsed,
+            error=error,
+        )
+
+    _COLUMNS = "id, context_id, state, created_at, updated_at, query, result, result_external, error"
+
+    def get(self, task_id: str) -> Optional[TaskInfo]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM tasks WHERE id = ?", (task_id,)
+            ).fetchone()
+            return self._row_to_task(row, load_external=True) if row else None
+
+    def list(
+        self,
+        state: Optional[str] = None,
+        context_id: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+    ) -> Tuple[List[TaskInfo], Optional[str]]:
+        clauses, params = [], []
+        if state is not None:
+            clauses.append("state = ?")
+            params.append(TaskState(state).value)
+        if context_id is not None:
+            clauses.append("context_id = ?")
+            params.append(context_id)
+        if cursor:
+            created_at, _, last_id = cursor.partition("|")
+            clauses.append("(created_at, id) > (?, ?)")
+            params.extend([float(created_at), last_id])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {self._COLUMNS} FROM tasks {where} ORDER BY created_at, id LIMIT ?",
+                (*params, limit + 1),
+            ).fetchall()
+            tasks = [self._row_to_task(row, load_external=False) for row in rows[:limit]]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = f"{last[3]!r}|{last[0]}"
+        return tasks, next_cursor
+
+    def evict_expired(self, now: Optional[datetime] = None) -> int:
+        if self.finished_ttl is None:
+            return 0
+        cutoff = ((now or datetime.now()) - self.finished_ttl).timestamp()
+        finished = [s.value for s in FINISHED_STATES]
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                f"DELETE FROM tasks WHERE state IN ({','.join('?' * len(finished))}) AND updated_at < ?",
+                (*finished, cutoff),
+            )
+            return cur.rowcount
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_task_store(url: Optional[str] = None) -> TaskStore:
+    """
+    Create a task store from a URL.
+
+    Args:
+        url: "memory" (default) or "sqlite:///path/to/tasks.db";
+             falls back to the CRM_A2A_TASK_STORE environment variable
+
+    Returns:
+        Configured TaskStore
+    """
+    url = url or os.getenv("CRM_A2A_TASK_STORE", "memory")
+    if url == "memory":
+        return InMemoryTaskStore()
+    if url.startswith("sqlite:///"):
+        return SQLiteTaskStore(path=url[len("sqlite:///"):])
+    raise ValueError(f"Unsupported task store URL: {url}")
@@ -1,7 +1,6 @@
 """CRM-specific agents for data enrichment and cleanup."""
 
-from .specialized import *
-from .workflows import *
+from ..utils.lazy_imports import lazy_exports
 
 __all__ = [
     # Specialized agents
@@ -21,3 +20,8 @@ __all__ = [
     "create_crm_quick_lookup_workflow",
     "create_crm_data_quality_workflow"
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    **{name: ".specialized.crm_agents" for name in __all__[:9]},
+    **{name: ".workflows.crm_enrichment" for name in __all__[9:]},
+})
@@ -1,6 +1,6 @@
 """CRM specialized agents."""
 
-from .crm_agents import *
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "create_crm_query_builder",
@@ -13,3 +13,5 @@ __all__ = [
     "create_crm_updater",
     "create_crm_data_quality_agent"
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), {name: ".crm_agents" for name in __all__})
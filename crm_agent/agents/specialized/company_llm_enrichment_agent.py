@@ -7,16 +7,22 @@ with generic data like Club Info, Company Type, Annual Revenue, Has Pool, Has Te
 Number of Holes, etc. Uses grounded search to provide accurate, contextual information.
 """
 
+import asyncio
 import os
+import re
 import json
 import logging
-from typing import Dict, Any, List, Optional, ClassVar
+import string
+from functools import lru_cache
+from typing import Dict, Any, Iterable, List, Optional, ClassVar, Tuple
 from dataclasses import dataclass
 from pydantic import BaseModel, Field
 from enum import Enum
 from pathlib import Path
 
 from ...core.base_agents import SpecializedAgent
+from ...utils.llm_cache import LLMCacheMiss, LLMResponseCache, cache_key, get_llm_cache
+from ...utils.rate_budget import RateBudget
 
 # Attempt to import Google Gemini packages
 try:
@@ -97,6 +103,265 @@ class HoustonNationalGolfClubData(BaseModel):
     lifecyclestage: Optional[str] = Field(description="HubSpot lifecycle stage")
 
 
+def _literal_trie_alternatives(words: Iterable[str]) -> List[str]:
+    """
+    Regex alternatives matching any of the literal words, one per first character.
+
+    Words sharing a prefix are folded into a trie ("pool|private|private course"
+    becomes "p(?:ool|rivate(?:\\ course)?)"), so the regex engine tests each
+    character once instead of trying every word in turn. Optional tails are
+    greedy, so the longest word at a position wins.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        if len(branches) == 1 and "" not in node:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")" + ("?" if "" in node else "")
+
+    return [re.escape(char) + build(child) for char, child in sorted(trie.items())]
+
+
+@dataclass(frozen=True)
+class ExtractedField:
+    """A value extracted from a research response, with its source span and confidence."""
+    value: Any
+    span: Tuple[int, int]
+    confidence: float
+
+
+class ResearchResponseParser:
+    """
+    Single-pass extractor for Gemini research responses.
+
+    Every field's patterns are folded into one master regex compiled at class
+    load. parse() walks its matches once, dispatching each token to a handler
+    that records candidates per field; fields are then resolved by the same
+    priority rules the per-field searches used. Parsing cost depends on the
+    response length, not on the number of fields.
+    """
+
+    COURSE_TYPES: ClassVar[List[str]] = [
+        "Private Course", "Public Course", "Semi-Private Course", "Municipal Course", "Resort",
+    ]
+    CLUB_TYPES: ClassVar[List[str]] = [
+        "Public - Low Daily Fee", "Country Club", "Private", "Public - High Daily Fee",
+        "Resort", "Municipal Course", "Public Course", "Resort Course", "Management Company",
+    ]
+    # Words used by the club type fallbacks and the location fields
+    EXTRA_PHRASES: ClassVar[List[str]] = ["municipal", "course", "public", "high", "fee", "houston", "texas"]
+
+    POOL_TOKENS: ClassVar[frozenset] = frozenset({"swimming pool", "aquatic facilities", "pool"})
+    WEBSITE_TERMS: ClassVar[Tuple[str, ...]] = ("golf", "club", "national")
+    DESCRIPTION_TERMS: ClassVar[Tuple[str, ...]] = ("golf", "club", "course")
+    DESCRIPTION_KEYWORDS: ClassVar[Tuple[str, ...]] = ("description", "about", "overview", "premier", "championship")
+    CLUB_INFO_TERMS: ClassVar[Tuple[str, ...]] = ("hole", "course", "championship", "amenities")
+
+    # Literal vocabulary scanned for, and what each kind of word feeds
+    CLUB_NAME_SUFFIXES: ClassVar[frozenset] = frozenset({"Golf Club", "Country Club", "Golf Course"})
+    AMENITY_WORDS: ClassVar[Tuple[str, ...]] = (
+        "swimming pool", "aquatic facilities", "tennis courts", "tennis facilities", "pool", "tennis",
+    )
+    CUE_WORDS: ClassVar[Tuple[str, ...]] = ("has", "features", "available", "revenue", "annual", "million")
+    WORD_KINDS: ClassVar[Dict[str, str]] = {
+        **{p.lower(): "phrase" for p in COURSE_TYPES + CLUB_TYPES + EXTRA_PHRASES},
+        **{s.lower(): "club_name_suffix" for s in CLUB_NAME_SUFFIXES},
+        **{a: "amenity" for a in AMENITY_WORDS},
+        **{c: "cue" for c in CUE_WORDS},
+        " tx": "state_abbrev",
+    }
+
+    # Extraction table: token name -> alternatives, matched against the lowercased
+    # text. Every alternative starts with a literal character, so the compiled
+    # scanner skips non-candidate positions on its prefix charset and needs no
+    # capture groups; a token's kind comes from WORD_KINDS or its first character.
+    TOKEN_PATTERNS: ClassVar[List[Tuple[str, List[str]]]] = [
+        ("url", [r'https?://[^\s<>"]+']),
+        ("phone", [r'\(\d{3}\)[-.\s]?\d{3}[-.\s]?\d{4}']
+                  + [digit + r'\d{2}[-.\s]?\d{3}[-.\s]?\d{4}' for digit in string.digits]),
+        ("money", [r'\$[0-9,]+(?:\.[0-9]+)?(?:\s*million|\s*m\b)?']),
+        ("word", _literal_trie_alternatives(WORD_KINDS)),
+        ("sentence_end", [re.escape(mark) + r'[.!?]*' for mark in ".!?"]),
+    ]
+    LEAD_KINDS: ClassVar[Dict[str, str]] = {
+        "h": "url", "(": "phone", **dict.fromkeys(string.digits, "phone"), "$": "money",
+        **dict.fromkeys(".!?", "sentence_end"),
+    }
+    SCANNER: ClassVar[re.Pattern] = re.compile("|".join(alt for _, alts in TOKEN_PATTERNS for alt in alts))
+    # For the rare text whose lowercase form changes length (spans would drift)
+    SCANNER_IGNORECASE: ClassVar[re.Pattern] = re.compile(SCANNER.pattern, re.IGNORECASE)
+    AMENITY_ANSWER: ClassVar[re.Pattern] = re.compile(r'[^:]*:\s*(yes|no\.)', re.IGNORECASE)
+    MONEY_PARTS: ClassVar[re.Pattern] = re.compile(r'\$([0-9,]+)(\.[0-9]+)?\s*(million|m)?', re.IGNORECASE)
+    CLUB_NAME: ClassVar[re.Pattern] = re.compile(r'[A-Z][a-zA-Z\s]+(?:' + "|".join(sorted(CLUB_NAME_SUFFIXES)) + ')')
+
+    # Confidence per extraction rule
+    CONFIDENCE: ClassVar[Dict[str, float]] = {
+        "website": 0.8, "phone": 0.8, "city": 0.6, "state": 0.6, "company_type": 0.7,
+        "club_type": 0.7, "club_type_fallback": 0.5, "annualrevenue": 0.6, "competitor": 0.5,
+        "amenity_explicit": 0.9, "amenity_mention": 0.6, "description": 0.5, "club_info": 0.5,
+    }
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def implied_phrases(token: str) -> frozenset:
+        """Vocabulary phrases contained in a matched token (so 'semi-private course' implies 'private')."""
+        vocabulary = {p.lower() for p in ResearchResponseParser.COURSE_TYPES + ResearchResponseParser.CLUB_TYPES
+                      + ResearchResponseParser.EXTRA_PHRASES}
+        return frozenset(p for p in vocabulary if p in token)
+
+    @classmethod
+    def parse(cls, text: str) -> Dict[str, ExtractedField]:
+        """Extract every research field from a response in one scan."""
+        conf = cls.CONFIDENCE
+        fields: Dict[str, ExtractedField] = {}
+        phrases: Dict[str, Tuple[int, int]] = {}
+        amenity_no: Dict[str, Tuple[int, int]] = {}
+        amenity_yes: Dict[str, Tuple[int, int]] = {}
+        revenue: Dict[int, Tuple[re.Match, Tuple[int, int]]] = {}
+        million_seen = False
+        # Last position of each cue word, and the first mention of each amenity per line
+        cue_seen: Dict[str, int] = {}
+        line_amenities: Dict[str, Tuple[int, Tuple[int, int]]] = {}
+        sentence_start = 0
+        # Club names are read with CLUB_NAME from here on, only when a suffix token is reached
+        name_floor = 0
+
+        def close_sentence(end: int) -> None:
+            if "description" in fields and "club_info" in fields:
+                return
+            raw = text[sentence_start:end]
+            sentence = raw.strip()
+            if not sentence:
+                return
+            lowered = sentence.lower()
+            start = sentence_start + raw.index(sentence[0])
+            span = (start, start + len(sentence))
+            if ("description" not in fields and len(sentence) > 50
+                    and any(t in lowered for t in cls.DESCRIPTION_TERMS)
+                    and any(k in lowered for k in cls.DESCRIPTION_KEYWORDS)):
+                fields["description"] = ExtractedField(sentence[:500], span, conf["description"])
+            if ("club_info" not in fields and len(sentence) > 30
+                    and any(t in lowered for t in cls.CLUB_INFO_TERMS)):
+                fields["club_info"] = ExtractedField(sentence[:500], span, conf["club_info"])
+
+        lowered_text = text.lower()
+        if len(lowered_text) == len(text):
+            matches = cls.SCANNER.finditer(lowered_text)
+        else:
+            lowered_text, matches = text, cls.SCANNER_IGNORECASE.finditer(text)
+
+        word_kinds, lead_kinds = cls.WORD_KINDS, cls.LEAD_KINDS
+        for match in matches:
+            token = match.group().lower()
+            kind = word_kinds.get(token) or lead_kinds[token[0]]
+            span = match.span()
+
+            if kind == "sentence_end":
+                close_sentence(span[0])
+                sentence_start = span[1]
+            elif kind == "phrase" or kind == "club_name_suffix":
+                for phrase in cls.implied_phrases(token):
+                    phrases.setdefault(phrase, span)
+                if kind == "club_name_suffix" and span[0] >= name_floor and "competitor" not in fields:
+                    name_match = cls.CLUB_NAME.search(text, name_floor)
+                    name_floor = name_match.end() if name_match else len(text)
+                    name = name_match.group() if name_match else ""
+                    if "Houston National" not in name and any(t in name.lower() for t in ("houston", "texas")):
+                        fields["competitor"] = ExtractedField(name, name_match.span(), conf["competitor"])
+            elif kind == "url":
+                if "website" not in fields:
+                    lowered = lowered_text[span[0]:span[1]]
+                    if any(t in lowered for t in cls.WEBSITE_TERMS) and "houston" in lowered:
+                        fields["website"] = ExtractedField(text[span[0]:span[1]].strip('.,)'), span, conf["website"])
+            elif kind == "phone":
+                if "phone" not in fields:
+                    fields["phone"] = ExtractedField(text[span[0]:span[1]], span, conf["phone"])
+            elif kind == "amenity":
+                field = "has_pool" if token in cls.POOL_TOKENS else "has_tennis_courts"
+                answer = cls.AMENITY_ANSWER.match(text, span[1])
+                if answer:
+                    target = amenity_no if answer.group(1).lower().startswith("no") else amenity_yes
+                    target.setdefault(field, span)
+                if token == "aquatic facilities":
+                    continue  # only "pool"/"tennis" mentions count as has/features/available cues
+                line_start = text.rfind("\n", 0, span[0]) + 1
+                if cue_seen.get("has", -1) >= line_start or cue_seen.get("features", -1) >= line_start:
+                    amenity_yes.setdefault(field, span)
+                if line_amenities.get(field, (-1,))[0] != line_start:
+                    line_amenities[field] = (line_start, span)
+            elif kind == "cue":
+                cue_seen[token] = span[0]
+                if token == "million":
+                    million_seen = True
+                elif token == "available":
+                    line_start = text.rfind("\n", 0, span[0]) + 1
+                    for field, (amenity_line, amenity_span) in line_amenities.items():
+                        if amenity_line == line_start:
+                            amenity_yes.setdefault(field, amenity_span)
+            elif kind == "money":
+                parts = cls.MONEY_PARTS.match(text, *span)
+                unit = (parts.group(3) or "").lower()
+                million_seen = million_seen or unit == "million"
+                line_start = text.rfind("\n", 0, span[0]) + 1
+                priority = 1 if unit == "million" else 2 if unit == "m" else \
+                    3 if cue_seen.get("revenue", -1) >= line_start else \
+                    4 if cue_seen.get("annual", -1) >= line_start else None
+                if priority is not None:
+                    revenue.setdefault(priority, (parts, span))
+            elif kind == "state_abbrev":
+                phrases.setdefault("tx", span)
+        close_sentence(len(text))
+
+        if "houston" in phrases:
+            fields["city"] = ExtractedField("Houston", phrases["houston"], conf["city"])
+            fields["market"] = ExtractedField("Houston", phrases["houston"], conf["city"])
+        state_span = phrases.get("texas") or phrases.get("tx")
+        if state_span:
+            fields["state"] = ExtractedField("TX", state_span, conf["state"])
+
+        for course_type in cls.COURSE_TYPES:
+            if course_type.lower() in phrases:
+                fields["company_type"] = ExtractedField(course_type, phrases[course_type.lower()], conf["company_type"])
+                break
+
+        for club_type in cls.CLUB_TYPES:
+            if club_type.lower() in phrases:
+                fields["club_type"] = ExtractedField(club_type, phrases[club_type.lower()], conf["club_type"])
+                break
+        else:
+            fallback = None
+            if "municipal" in phrases:
+                fallback = ("Municipal Course", phrases["municipal"])
+            elif "public" in phrases:
+                high_fee = "high" in phrases and "fee" in phrases
+                fallback = ("Public - High Daily Fee" if high_fee else "Public - Low Daily Fee", phrases["public"])
+            if fallback:
+                fields["club_type"] = ExtractedField(fallback[0], fallback[1], conf["club_type_fallback"])
+
+        if revenue:
+            parts, span = revenue[min(revenue)]
+            amount = float(parts.group(1).replace(",", "") + (parts.group(2) or ""))
+            if million_seen or (parts.group(3) or "").lower() == "m":
+                amount *= 1000000
+            fields["annualrevenue"] = ExtractedField(int(amount), span, conf["annualrevenue"])
+
+        for field in ("has_pool", "has_tennis_courts"):
+            if field in amenity_no:
+                fields[field] = ExtractedField("No", amenity_no[field], conf["amenity_explicit"])
+            elif field in amenity_yes:
+                fields[field] = ExtractedField("Yes", amenity_yes[field], conf["amenity_mention"])
+
+        return fields
+
+
 class CompanyLLMEnrichmentAgent(SpecializedAgent):
     """Google Gemini LLM agent specialized in enriching company fields using web search with structured output."""
     
@@ -182,33 +447,27 @@ Use search to find factual, current information about companies and format it pr
             object.__setattr__(self, 'gemini_model', None)
             object.__setattr__(self, 'use_new_api', False)
     
-    def enrich_company_data(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
-        """
-        Research and enrich company data using Gemini with search grounding and structured output.
-        
-        Args:
-            company_data: Dictionary with company name, domain, and any existing data
-            
-        Returns:
-            Dictionary with enriched company data
-        """
-        # Check if we have any Gemini capability
-        has_new_api = getattr(self, 'gemini_client', None) is not None
-        has_legacy_api = getattr(self, 'gemini_model', None) is not None
-        
-        if not has_new_api and not has_legacy_api:
-            print("❌ Gemini search grounding not available")
-            return company_data
-        
-        company_name = company_data.get("name", "")
-        domain = company_data.get("domain", "")
-        
-        if not company_name:
-            print("❌ Company name required for enrichment")
-            return company_data
-        
-        # Create research prompt for structured output
-        research_prompt = f"""
+    # Marker the model is asked to put before each company in a packed request
+    BATCH_SECTION_PATTERN: ClassVar = re.compile(r'^\s*#*\s*=+\s*COMPANY\s+(\d+)\s*=+\s*$', re.IGNORECASE | re.MULTILINE)
+    
+    # Rough output size used when budgeting tokens per research request
+    RESEARCH_OUTPUT_TOKENS: ClassVar[int] = 1500
+    
+    # Response cache key parts: bump the prompt version when the research
+    # prompts change, and the parser version when parsing output changes.
+    # Sections split out of a packed request come from a different prompt
+    # and are cached under the batch prompt's version.
+    RESEARCH_MODEL: ClassVar[str] = "gemini-2.5-flash"
+    RESEARCH_PROMPT_VERSION: ClassVar[str] = "1"
+    BATCH_RESEARCH_PROMPT_VERSION: ClassVar[str] = "batch-1"
+    PARSER_VERSION: ClassVar[str] = "2"
+    
+    def _has_gemini(self) -> bool:
+        return getattr(self, 'gemini_client', None) is not None or getattr(self, 'gemini_model', None) is not None
+    
+    @staticmethod
+    def _build_research_prompt(company_name: str, domain: str) -> str:
+        return f"""
         Research {company_name} (domain: {domain}) and provide COMPLETE, FACTUAL information.
         
         Use Google Search to find:
@@ -227,54 +486,163 @@ Use search to find factual, current information about companies and format it pr
         For amenities, explicitly state "Yes" or "No" for pools and tennis courts.
         Set fields to null if you cannot find reliable information.
         """
+    
+    @staticmethod
+    def _build_batch_research_prompt(companies: List[Dict[str, Any]]) -> str:
+        listing = "\n".join(
+            f"        {n}. {company.get('name', '')} (domain: {company.get('domain', '')})"
+            for n, company in enumerate(companies, 1)
+        )
+        return f"""
+        Research each of the following companies and provide COMPLETE, FACTUAL information for each.
         
-        try:
-            print(f"🔍 Researching {company_name} with structured output...")
+{listing}
+        
+        For EACH company use Google Search to find: official website and contact information,
+        golf course type and classification, business details and management, amenities
+        (explicitly state "Yes" or "No" for swimming pool and tennis courts), and local competitors.
+        
+        FORMAT: start each company's section with a line "=== COMPANY <number> ===" using the
+        number from the list above, and only describe that company inside its section.
+        Only provide information you can verify through search; say "Unknown" otherwise.
+        """
+    
+    def _generate(self, prompt: str) -> str:
+        """Run one grounded research call and return the response text."""
+        if getattr(self, 'use_new_api', False):
+            # Search grounding (no JSON mode with tools)
+            from google.genai import types
+            config = types.GenerateContentConfig(
+                tools=[types.Tool(google_search=types.GoogleSearch())]
+            )
+            response = self.gemini_client.models.generate_content(
+                model="gemini-2.5-flash",
+                contents=prompt,
+                config=config
+            )
+        else:
+            response = self.gemini_model.generate_content(prompt)
+        return response.text
+    
+    async def _generate_async(self, prompt: str) -> str:
+        """Async variant of _generate; uses the client's native async API when available."""
+        if getattr(self, 'use_new_api', False):
+            from google.genai import types
+            config = types.GenerateContentConfig(
+                tools=[types.Tool(google_search=types.GoogleSearch())]
+            )
+            response = await self.gemini_client.aio.models.generate_content(
+                model="gemini-2.5-flash",
+                contents=prompt,
+                config=config
+            )
+            return response.text
+        return await asyncio.to_thread(self._generate, prompt)
+    
+    @staticmethod
+    def _merge_research(company_data: Dict[str, Any], result_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Overlay parsed research fields that carry real data onto the company record."""
+        enriched_data = company_data.copy()
+        for key, value in result_data.items():
+            if value is not None and str(value).strip() and str(value) != "Unknown":
+                enriched_data[key] = value
+        return enriched_data
+    
+    def _research_cache(self) -> LLMResponseCache:
+        return getattr(self, 'llm_cache', None) or get_llm_cache()
+    
+    def _research_key(self, company_data: Dict[str, Any], template_version: Optional[str] = None) -> str:
+        inputs = {"name": company_data.get("name", ""), "domain": company_data.get("domain", "")}
+        return cache_key(self.RESEARCH_MODEL, template_version or self.RESEARCH_PROMPT_VERSION, inputs)
+    
+    def _cached_research(self, company_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Parsed research for a company from the response cache, or None.
+        
+        Research from the single-company prompt is preferred over a section
+        of a packed request. Entries parsed by an older parser are re-parsed
+        from the stored raw text. Raises LLMCacheMiss on a miss in offline mode.
+        """
+        cache = self._research_cache()
+        entry = None
+        for template_version in (self.RESEARCH_PROMPT_VERSION, self.BATCH_RESEARCH_PROMPT_VERSION):
+            key = self._research_key(company_data, template_version)
+            try:
+                entry = cache.get(key)
+            except LLMCacheMiss:
+                if template_version == self.BATCH_RESEARCH_PROMPT_VERSION:
+                    raise
+                continue
+            if entry is not None:
+                break
+        if entry is None:
+            return None
+        if entry["parsed"] is None or entry["parser_version"] != self.PARSER_VERSION:
+            parsed = self._parse_gemini_response(entry["raw"], {})
+            cache.update_parsed(key, parsed, self.PARSER_VERSION)
+            return parsed
+        return entry["parsed"]
+    
+    def _store_research(self, company_data: Dict[str, Any], raw: str, parsed: Dict[str, Any],
+                        template_version: Optional[str] = None) -> None:
+        template_version = template_version or self.RESEARCH_PROMPT_VERSION
+        self._research_cache().put(
+            self._research_key(company_data, template_version), raw, parsed,
+            model=self.RESEARCH_MODEL,
+            template_version=template_version,
+            inputs={"name": company_data.get("name", ""), "domain": company_data.get("domain", "")},
+            parser_version=self.PARSER_VERSION,
+        )
+    
+    def enrich_company_data(self, company_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Research and enrich company data using Gemini with search grounding and structured output.
+        
+        Args:
+            company_data: Dictionary with company name, domain, and any existing data
             
-            if getattr(self, 'use_new_api', False):
-                # Use new API with structured output
-                client = getattr(self, 'gemini_client')
-                
-                # Configure generation with search grounding (no JSON mode with tools)
-                from google.genai import types
-                config = types.GenerateContentConfig(
-                    tools=[types.Tool(google_search=types.GoogleSearch())]
-                )
-                
-                response = client.models.generate_content(
-                    model="gemini-2.5-flash",
-                    contents=research_prompt,
-                    config=config
-                )
-                
-                # Parse the text response (no JSON mode with tools)
-                print(f"📊 Gemini Research Results:")
-                print(f"{response.text}")
-                
-                # Parse the unstructured response
-                result_data = self._parse_gemini_response(response.text, {})
-                
+        Returns:
+            Dictionary with enriched company data
+        """
+        company_name = company_data.get("name", "")
+        domain = company_data.get("domain", "")
+        
+        if not company_name:
+            print("❌ Company name required for enrichment")
+            return company_data
+        
+        try:
+            result_data = self._cached_research(company_data)
+        except LLMCacheMiss:
+            print(f"❌ No cached research for {company_name} (offline mode)")
+            return company_data
+        
+        # Check if we have any Gemini capability
+        if result_data is None and not self._has_gemini():
+            print("❌ Gemini search grounding not available")
+            return company_data
+        
+        try:
+            if result_data is not None:
+                print(f"♻️  Using cached research for {company_name}")
             else:
-                # Use legacy API with search grounding
-                model = getattr(self, 'gemini_model')
+                print(f"🔍 Researching {company_name} with structured output...")
                 
-                response = model.generate_content(research_prompt)
+                # Create research prompt for structured output
+                response_text = self._generate(self._build_research_prompt(company_name, domain))
                 
                 print(f"📊 Gemini Research Results:")
-                print(f"{response.text}")
+                print(f"{response_text}")
                 
                 # Parse the unstructured response
-                result_data = self._parse_gemini_response(response.text, {})
-            
-            # Merge with original data
-            enriched_data = company_data.copy()
+                result_data = self._parse_gemini_response(response_text, {})
+                self._store_research(company_data, response_text, result_data)
             
             print(f"\n🔧 Processing structured research results...")
+            enriched_data = self._merge_research(company_data, result_data)
             fields_found = 0
-            
             for key, value in result_data.items():
-                if value is not None and str(value).strip() and str(value) != "Unknown":
-                    enriched_data[key] = value
+                if enriched_data.get(key) is value:
                     fields_found += 1
                     print(f"   ✅ {key}: {value}")
             
@@ -288,206 +656,144 @@ Use search to find factual, current information about companies and format it pr
             traceback.print_exc()
             return company_data
     
-    def _parse_gemini_response(self, response_text: str, original_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Parse Gemini response and extract structured company data."""
-        
-        enriched_data = original_data.copy()
-        content = response_text.lower()
-        
-        print(f"\n🔧 Parsing Gemini response for structured data...")
-        
-        import re
-        
-        # Extract website
-        website_matches = re.findall(r'https?://[^\s<>"]+', response_text)
-        for website in website_matches:
-            if any(term in website.lower() for term in ['golf', 'club', 'national']) and 'houston' in website.lower():
-                enriched_data["website"] = website.strip('.,)')
-                print(f"   ✅ Found website: {website}")
-                break
-        
-        # Extract phone number
-        phone_matches = re.findall(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', response_text)
-        if phone_matches:
-            enriched_data["phone"] = phone_matches[0]
-            print(f"   ✅ Found phone: {phone_matches[0]}")
-        
-        # Extract location
-        if "houston" in content:
-            enriched_data["city"] = "Houston"
-            enriched_data["market"] = "Houston"
-            print(f"   ✅ Found city: Houston")
-        if "texas" in content or " tx" in content.replace(".", ""):
-            enriched_data["state"] = "TX"
-            print(f"   ✅ Found state: TX")
-        
-        # Extract course type (match HubSpot allowed values)
-        hubspot_course_types = ["Private Course", "Public Course", "Semi-Private Course", "Municipal Course", "Resort"]
-        for course_type in hubspot_course_types:
-            if course_type.lower() in content:
-                enriched_data["company_type"] = course_type
-                print(f"   ✅ Found company type: {course_type}")
-                break
-        
-        # Extract club type (match HubSpot allowed values)
-        hubspot_club_types = [
-            "Public - Low Daily Fee", "Country Club", "Private", "Public - High Daily Fee", 
-            "Resort", "Municipal Course", "Public Course", "Resort Course", "Management Company"
-        ]
-        
-        # Look for club type in order of specificity
-        for club_type in hubspot_club_types:
-            if club_type.lower() in content:
-                enriched_data["club_type"] = club_type
-                print(f"   ✅ Found club type: {club_type}")
-                break
+    async def enrich_companies_batch(
+        self,
+        companies: List[Dict[str, Any]],
+        companies_per_request: int = 1,
+        max_concurrency: int = 8,
+        requests_per_minute: int = 60,
+        tokens_per_minute: Optional[int] = None,
+        max_retries: int = 2,
+    ) -> List[Dict[str, Any]]:
+        """
+        Research many companies with concurrent (optionally packed) Gemini calls.
         
-        # Fallback patterns for common terms
-        if "club_type" not in enriched_data:
-            if "country club" in content:
-                enriched_data["club_type"] = "Country Club"
-                print(f"   ✅ Found club type: Country Club")
-            elif "municipal" in content:
-                enriched_data["club_type"] = "Municipal Course"
-                print(f"   ✅ Found club type: Municipal Course")
-            elif "resort" in content and "course" in content:
-                enriched_data["club_type"] = "Resort Course"
-                print(f"   ✅ Found club type: Resort Course")
-            elif "private" in content:
-                enriched_data["club_type"] = "Private"
-                print(f"   ✅ Found club type: Private")
-            elif "public" in content:
-                if "high" in content and "fee" in content:
-                    enriched_data["club_type"] = "Public - High Daily Fee"
-                    print(f"   ✅ Found club type: Public - High Daily Fee")
-                else:
-                    enriched_data["club_type"] = "Public - Low Daily Fee"
-                    print(f"   ✅ Found club type: Public - Low Daily Fee")
+        Requests run concurrently under a request/token rate budget. With
+        companies_per_request > 1 several companies share one grounded
+        request and the response is split back per company by its section
+        markers. Only companies that failed, or were missing from a packed
+        response, are retried (individually, with backoff). Companies with
+        cached research are served from the response cache without a call.
         
-        # Extract revenue (look for dollar amounts)
-        revenue_patterns = [
-            r'\$([0-9,]+(?:\.[0-9]+)?)\s*million',
-            r'\$([0-9,]+(?:\.[0-9]+)?)\s*m\b',
-            r'revenue.*?\$([0-9,]+)',
-            r'annual.*?\$([0-9,]+)'
-        ]
-        for pattern in revenue_patterns:
-            matches = re.findall(pattern, content, re.IGNORECASE)
-            if matches:
+        Args:
+            companies: Company dicts with name, domain and any existing data
+            companies_per_request: Companies packed into each request
+            max_concurrency: Maximum requests in flight
+            requests_per_minute: Request rate budget (None or 0 for no limit)
+            tokens_per_minute: Optional token rate budget (estimated from prompt size)
+            max_retries: Retry rounds for failed companies
+            
+        Returns:
+            Enriched company dicts in input order; companies that could not be
+            researched are returned unchanged
+        """
+        results = [company.copy() for company in companies]
+        pending = []
+        offline_misses = 0
+        for i, company in enumerate(companies):
+            if not company.get("name"):
+                continue
+            try:
+                cached = self._cached_research(company)
+            except LLMCacheMiss:
+                offline_misses += 1
+                continue
+            if cached is not None:
+                results[i] = self._merge_research(company, cached)
+            else:
+                pending.append(i)
+        if offline_misses:
+            logger.warning(f"No cached research for {offline_misses} companies (offline mode)")
+        if not pending:
+            return results
+        if not self._has_gemini():
+            logger.warning("Gemini search grounding not available")
+            return results
+        
+        budget = RateBudget(requests_per_minute, tokens_per_minute)
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def research(indexes: List[int]) -> List[int]:
+            """Research a group of companies; return the indexes that failed."""
+            group = [companies[i] for i in indexes]
+            if len(group) == 1:
+                prompt = self._build_research_prompt(group[0].get("name", ""), group[0].get("domain", ""))
+            else:
+                prompt = self._build_batch_research_prompt(group)
+            async with semaphore:
+                await budget.acquire(len(prompt) // 4 + self.RESEARCH_OUTPUT_TOKENS * len(group))
                 try:
-                    revenue_str = matches[0].replace(',', '')
-                    if 'million' in content or ' m ' in content:
-                        revenue = float(revenue_str) * 1000000
-                    else:
-                        revenue = float(revenue_str)
-                    enriched_data["annualrevenue"] = int(revenue)
-                    print(f"   ✅ Found revenue: ${revenue:,.0f}")
-                    break
-                except:
-                    pass
-        
-        # Extract competitor information
-        golf_club_pattern = r'([A-Z][a-zA-Z\s]+(?:Golf Club|Country Club|Golf Course))'
-        competitor_matches = re.findall(golf_club_pattern, response_text)
-        
-        for match in competitor_matches:
-            if "Houston National" not in match and any(term in match.lower() for term in ["houston", "texas"]):
-                enriched_data["competitor"] = match.strip()
-                print(f"   ✅ Found competitor: {match}")
-                break
-        
-        # Extract amenities - Pool (more precise detection)
-        import re
-        
-        # Look for explicit pool mentions with clear Yes/No context
-        pool_found = False
-        
-        # Check for direct "No." answers
-        no_pool_patterns = [
-            r'swimming pool[^:]*:\s*no\.',
-            r'aquatic facilities[^:]*:\s*no\.',
-            r'pool[^:]*:\s*no\.',
-        ]
-        
-        for pattern in no_pool_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                enriched_data["has_pool"] = "No"
-                print(f"   ✅ Found amenity: Pool - No (explicit)")
-                pool_found = True
-                break
-        
-        if not pool_found:
-            # Check for positive indicators
-            yes_pool_patterns = [
-                r'swimming pool[^:]*:\s*yes',
-                r'aquatic facilities[^:]*:\s*yes',
-                r'pool[^:]*:\s*yes',
-                r'has.*pool',
-                r'pool.*available',
-                r'features.*pool'
-            ]
+                    text = await self._generate_async(prompt)
+                except Exception as e:
+                    logger.warning(f"Gemini research failed for {len(group)} companies: {e}")
+                    return indexes
             
-            for pattern in yes_pool_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    enriched_data["has_pool"] = "Yes"
-                    print(f"   ✅ Found amenity: Pool - Yes (explicit)")
-                    pool_found = True
-                    break
-        
-        # Extract amenities - Tennis (more precise detection)
-        tennis_found = False
-        
-        # Check for direct "No." answers
-        no_tennis_patterns = [
-            r'tennis courts[^:]*:\s*no\.',
-            r'tennis facilities[^:]*:\s*no\.',
-            r'tennis[^:]*:\s*no\.',
-        ]
-        
-        for pattern in no_tennis_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                enriched_data["has_tennis_courts"] = "No"
-                print(f"   ✅ Found amenity: Tennis - No (explicit)")
-                tennis_found = True
+            if len(group) == 1:
+                sections, template_version = {0: text}, self.RESEARCH_PROMPT_VERSION
+            else:
+                sections, template_version = self._split_batch_response(text), self.BATCH_RESEARCH_PROMPT_VERSION
+            failed = []
+            for position, index in enumerate(indexes):
+                section = sections.get(position)
+                if not section:
+                    failed.append(index)
+                    continue
+                parsed = self._parse_gemini_response(section, {})
+                self._store_research(companies[index], section, parsed, template_version)
+                results[index] = self._merge_research(companies[index], parsed)
+            return failed
+        
+        groups = [pending[i:i + companies_per_request] for i in range(0, len(pending), companies_per_request)]
+        for attempt in range(max_retries + 1):
+            if not groups:
                 break
+            if attempt:
+                await asyncio.sleep(2 ** (attempt - 1))
+            failed_lists = await asyncio.gather(*(research(group) for group in groups))
+            # Retry failed companies one per request
+            groups = [[index] for failed in failed_lists for index in failed]
+        
+        if groups:
+            logger.warning(f"Gemini research gave up on {len(groups)} of {len(companies)} companies")
+        return results
+    
+    def enrich_companies(self, companies: List[Dict[str, Any]], **kwargs) -> List[Dict[str, Any]]:
+        """
+        Synchronous wrapper around enrich_companies_batch.
         
-        if not tennis_found:
-            # Check for positive indicators
-            yes_tennis_patterns = [
-                r'tennis courts[^:]*:\s*yes',
-                r'tennis facilities[^:]*:\s*yes',
-                r'tennis[^:]*:\s*yes',
-                r'has.*tennis',
-                r'tennis.*available',
-                r'features.*tennis'
-            ]
-            
-            for pattern in yes_tennis_patterns:
-                if re.search(pattern, content, re.IGNORECASE):
-                    enriched_data["has_tennis_courts"] = "Yes"
-                    print(f"   ✅ Found amenity: Tennis - Yes (explicit)")
-                    tennis_found = True
-                    break
-        
-        # Extract description
-        sentences = re.split(r'[.!?]+', response_text)
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 50 and any(term in sentence.lower() for term in ["golf", "club", "course"]):
-                if any(keyword in sentence.lower() for keyword in ["description", "about", "overview", "premier", "championship"]):
-                    if "description" not in enriched_data or len(sentence) > len(enriched_data.get("description", "")):
-                        enriched_data["description"] = sentence[:500]  # Limit length
-                        print(f"   ✅ Found description: {sentence[:100]}...")
-                        break
-        
-        # Extract club info
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if len(sentence) > 30 and any(term in sentence.lower() for term in ["hole", "course", "championship", "amenities"]):
-                if "club_info" not in enriched_data or len(sentence) > len(enriched_data.get("club_info", "")):
-                    enriched_data["club_info"] = sentence[:500]
-                    print(f"   ✅ Found club info: {sentence[:100]}...")
-                    break
+        Not usable from inside a running event loop (e.g. an ADK tool or the
+        A2A server): await enrich_companies_batch there instead.
+        """
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.enrich_companies_batch(companies, **kwargs))
+        raise RuntimeError(
+            "enrich_companies() called from a running event loop; "
+            "use 'await agent.enrich_companies_batch(...)' instead"
+        )
+    
+    @classmethod
+    def _split_batch_response(cls, text: str) -> Dict[int, str]:
+        """Split a packed response into {0-based position: section text}."""
+        sections = {}
+        markers = list(cls.BATCH_SECTION_PATTERN.finditer(text))
+        for n, marker in enumerate(markers):
+            end = markers[n + 1].start() if n + 1 < len(markers) else len(text)
+            body = text[marker.end():end].strip()
+            if body:
+                sections[int(marker.group(1)) - 1] = body
+        return sections
+    
+    def extract_research_fields(self, response_text: str) -> Dict[str, ExtractedField]:
+        """Extract research fields with their source spans and confidence."""
+        return ResearchResponseParser.parse(response_text)
+    
+    def _parse_gemini_response(self, response_text: str, original_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Parse Gemini response and extract structured company data."""
+        enriched_data = original_data.copy()
+        for field, extracted in ResearchResponseParser.parse(response_text).items():
+            enriched_data[field] = extracted.value
         
         # Set derived fields
         enriched_data["lifecyclestage"] = "lead"
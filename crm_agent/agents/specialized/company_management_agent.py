@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Dict, Any
 from thefuzz import process
 from ...core.base_agents import SpecializedAgent
+from ...utils.write_buffer import queue_update
 
 class CompanyManagementAgent(SpecializedAgent):
     """Agent that identifies and sets the management company for golf courses."""
@@ -203,20 +204,26 @@ class CompanyManagementAgent(SpecializedAgent):
             management_company_id = self._find_management_company_id(best_manager)
             
             if management_company_id:
-                # Use the update_company tool to set the parent company
-                try:
-                    update_result = self.call_mcp_tool("update_company", {
-                        "company_id": company_id,
-                        "properties": {
-                            "management_company": best_manager,
-                            "parent_company": management_company_id
-                        }
-                    })
-                    print(f"✅ HubSpot updated successfully: {update_result}")
-                    actual_action = "Successfully updated HubSpot"
-                except Exception as e:
-                    print(f"⚠️ HubSpot update failed: {str(e)}")
-                    actual_action = f"Update failed: {str(e)}"
+                properties = {
+                    "management_company": best_manager,
+                    "parent_company": management_company_id
+                }
+                # Inside buffered_writes() the update is coalesced with other agents' writes
+                queued = queue_update("companies", company_id, properties)
+                if queued is not None:
+                    actual_action = "Queued HubSpot update" if queued else "HubSpot already up to date"
+                else:
+                    # Use the update_company tool to set the parent company
+                    try:
+                        update_result = self.call_mcp_tool("update_company", {
+                            "company_id": company_id,
+                            "properties": properties
+                        })
+                        print(f"✅ HubSpot updated successfully: {update_result}")
+                        actual_action = "Successfully updated HubSpot"
+                    except Exception as e:
+                        print(f"⚠️ HubSpot update failed: {str(e)}")
+                        actual_action = f"Update failed: {str(e)}"
                 
                 print(f"Found match: '{company_name}' is managed by '{best_manager}' (ID: {management_company_id}) with score {best_original_score}.")
                 
@@ -10,6 +10,8 @@ import os
 import json
 import time
 import logging
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple, ClassVar
 from dataclasses import dataclass, field
@@ -18,8 +20,24 @@ from enum import Enum
 from ...core.base_agents import SpecializedAgent
 from ...core.state_models import CRMSessionState, CRMStateKeys
 from ..workflows.field_enrichment_workflow import (
-    create_field_enrichment_workflow
+    create_field_enrichment_workflow,
+    get_enrichment_results_by_source
 )
+from ..workflows.graph_cache import get_workflow_graph
+from ...utils.job_titles import classify_job_title, classify_job_titles
+from ...utils.search_extraction import (
+    SearchResults,
+    extract_description,
+    extract_employee_count,
+    extract_industry,
+    extract_linkedin_url,
+    extract_phone,
+    extract_revenue,
+    extract_website,
+    normalize_search_results,
+)
+from ...utils.search_session import SearchSession
+from ...utils.write_buffer import queue_update
 
 # Import ADK components
 try:
@@ -367,6 +385,51 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
             logger.error(f"MCP tool call error for {tool_name}: {e}")
             return {"error": str(e)}
     
+    @staticmethod
+    def _record_search_key(record_data: Dict[str, Any]) -> str:
+        properties = record_data.get('properties', {})
+        return str(record_data.get('id') or properties.get('hs_object_id') or properties.get('name') or id(record_data))
+    
+    @contextmanager
+    def search_session(self, record_data: Dict[str, Any]):
+        """
+        Share one SearchSession across every field extractor enriching a record.
+        
+        Nested or concurrent uses for the same record share the outermost session.
+        """
+        if getattr(self, 'search_sessions', None) is None:
+            object.__setattr__(self, 'search_sessions', {})
+            object.__setattr__(self, 'search_sessions_lock', threading.Lock())
+        key = self._record_search_key(record_data)
+        with self.search_sessions_lock:
+            session = self.search_sessions.get(key)
+            owner = session is None
+            if owner:
+                session = SearchSession(
+                    lambda query, num_results: self.call_mcp_tool("web_search", {
+                        "query": query,
+                        "num_results": num_results
+                    })
+                )
+                self.search_sessions[key] = session
+        try:
+            yield session
+        finally:
+            if owner:
+                with self.search_sessions_lock:
+                    self.search_sessions.pop(key, None)
+                logger.info(f"Web search session for {key}: {session.stats()}")
+    
+    def _web_search(self, record_data: Dict[str, Any], query: str, num_results: int,
+                    field: Optional[str] = None) -> SearchResults:
+        """Run a web search for `field` through the record's search session (or directly outside one), normalized."""
+        session = (getattr(self, 'search_sessions', None) or {}).get(self._record_search_key(record_data))
+        if session is None:
+            result = self.call_mcp_tool("web_search", {"query": query, "num_results": num_results})
+        else:
+            result = session.search(query, num_results, field)
+        return normalize_search_results(result)
+    
         
     def analyze_field_completeness(self, record_type: str, record_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze field completeness for a company or contact record"""
@@ -425,7 +488,10 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         results = []
         
         if use_workflow:
-            return self._enrich_with_workflow(record_type, record_id, dry_run)
+            results = self._enrich_with_workflow(record_type, record_id, dry_run)
+            if not dry_run:
+                self.queue_hubspot_updates(record_type, record_id, results)
+            return results
         
         try:
             # Get record data from HubSpot
@@ -462,26 +528,27 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
             completeness_analysis = self.analyze_field_completeness(record_type, record_data)
             
             # Enrich missing fields
-            for config in field_configs:
-                field_detail = completeness_analysis['field_details'][config.internal_name]
+            with self.search_session(record_data):
+                for config in field_configs:
+                    field_detail = completeness_analysis['field_details'][config.internal_name]
                 
-                if not field_detail['populated']:
-                    # Attempt enrichment for this field
-                    enrichment_result = self._enrich_single_field(record_type, record_data, config)
-                    results.append(enrichment_result)
-                else:
-                    # Field already populated - create skipped result
-                    results.append(EnrichmentResult(
-                        field_name=config.name,
-                        field_internal_name=config.internal_name,
-                        old_value=field_detail['current_value'],
-                        new_value=field_detail['current_value'],
-                        status=EnrichmentStatus.SKIPPED,
-                        confidence=ConfidenceLevel.HIGH,
-                        source="existing_data",
-                        validation_passed=True,
-                        critique_notes="Field already populated with data"
-                    ))
+                    if not field_detail['populated']:
+                        # Attempt enrichment for this field
+                        enrichment_result = self._enrich_single_field(record_type, record_data, config)
+                        results.append(enrichment_result)
+                    else:
+                        # Field already populated - create skipped result
+                        results.append(EnrichmentResult(
+                            field_name=config.name,
+                            field_internal_name=config.internal_name,
+                            old_value=field_detail['current_value'],
+                            new_value=field_detail['current_value'],
+                            status=EnrichmentStatus.SKIPPED,
+                            confidence=ConfidenceLevel.HIGH,
+                            source="existing_data",
+                            validation_passed=True,
+                            critique_notes="Field already populated with data"
+                        ))
             
             # Store enrichment history
             self.enrichment_history.append({
@@ -492,20 +559,53 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
                 'dry_run': dry_run
             })
             
+            if not dry_run:
+                self.queue_hubspot_updates(record_type, record_id, results)
+            
         except Exception as e:
             logger.error(f"Error enriching {record_type} {record_id}: {e}")
             
         return results
     
+    def queue_hubspot_updates(self, record_type: str, record_id: str,
+                              results: List[EnrichmentResult]) -> Dict[str, Any]:
+        """
+        Queue complete, validated enrichment results as one update in the active write buffer.
+        
+        Each result's old value is the stored value, so fields enriched to
+        what HubSpot already has are dropped.
+        
+        Returns:
+            The properties still pending ({} when nothing changed or no buffer is active)
+        """
+        accepted = [
+            result for result in results
+            if result.status == EnrichmentStatus.COMPLETE and result.validation_passed
+            and result.new_value not in (None, "")
+        ]
+        if not accepted:
+            return {}
+        queued = queue_update(
+            record_type.lower(), record_id,
+            {result.field_internal_name: result.new_value for result in accepted},
+            known={result.field_internal_name: result.old_value for result in accepted},
+        )
+        if queued:
+            logger.info(f"Queued {len(queued)} enriched fields for {record_type} {record_id}")
+        return queued or {}
+    
     def _enrich_with_workflow(self, record_type: str, record_id: str, dry_run: bool = False) -> List[EnrichmentResult]:
         """Enrich record using workflow orchestration"""
         
         try:
-            # Initialize comprehensive workflow if not already done
-            if not self.comprehensive_workflow:
-                self.comprehensive_workflow = create_field_enrichment_workflow()
+            # Shared graph: per-run data lives in the session state below
+            workflow = get_workflow_graph("field_enrichment_workflow")
             
             # Prepare session state for workflow
+            field_configs = (
+                self.COMPANY_FIELD_CONFIGS if record_type.lower() == 'company'
+                else self.CONTACT_FIELD_CONFIGS
+            )
             session_state = {
                 'record_type': record_type,
                 'record_id': record_id,
@@ -515,6 +615,10 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
                     'high': 0.85,
                     'medium': 0.70
                 },
+                # Lets the loop condition track success per tier and stop early
+                'field_priorities': {
+                    config.internal_name: config.priority.name.lower() for config in field_configs
+                },
                 'max_iterations': 3,
                 'current_iteration': 0
             }
@@ -526,7 +630,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
             
             # Execute the comprehensive workflow
             logger.info(f"Starting workflow-based enrichment for {record_type} {record_id}")
-            workflow_result = self.comprehensive_workflow.run(context)
+            workflow_result = workflow.run(context)
             
             # Extract enrichment results from workflow execution
             results = self._extract_results_from_workflow(context, record_type, record_id)
@@ -572,9 +676,10 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
                     return results
             
             # Process each field
-            for config in field_configs:
-                result = self._enrich_single_field(record_type, record_data, config)
-                results.append(result)
+            with self.search_session(record_data):
+                for config in field_configs:
+                    result = self._enrich_single_field(record_type, record_data, config)
+                    results.append(result)
             
         except Exception as e:
             logger.error(f"Direct enrichment failed: {e}")
@@ -591,9 +696,10 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         
         try:
             # Process each field
-            for config in field_configs:
-                result = self._enrich_single_field('company', company_data, config)
-                results.append(result)
+            with self.search_session(company_data):
+                for config in field_configs:
+                    result = self._enrich_single_field('company', company_data, config)
+                    results.append(result)
                 
         except Exception as e:
             logger.error(f"Enrichment with company data failed: {e}")
@@ -735,17 +841,12 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         
         # Extract results from different workflow stages
         field_analysis = session_state.get('FIELD_ANALYSIS_RESULTS', {})
-        web_results = session_state.get('WEB_ENRICHMENT_RESULTS', {})
-        linkedin_results = session_state.get('LINKEDIN_ENRICHMENT_RESULTS', {})
-        external_results = session_state.get('EXTERNALDATA_ENRICHMENT_RESULTS', {})
         validation_results = session_state.get('VALIDATION_RESULTS', {})
         
         # Combine results from all sources
-        all_source_results = {
-            **web_results,
-            **linkedin_results,
-            **external_results
-        }
+        all_source_results = {}
+        for source_results in get_enrichment_results_by_source(session_state).values():
+            all_source_results.update(source_results)
         
         # Convert to EnrichmentResult objects
         field_configs = self.COMPANY_FIELD_CONFIGS if record_type.lower() == 'company' else self.CONTACT_FIELD_CONFIGS
@@ -1105,10 +1206,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
             ]
             
             for query in search_queries:
-                search_result = self.call_mcp_tool("web_search", {
-                    "query": query,
-                    "num_results": 5
-                })
+                search_result = self._web_search(record_data, query, 5, config.internal_name)
                 
                 website_url = self._extract_website_from_search(search_result, company_name)
                 if website_url and self._validate_url_accessibility(website_url):
@@ -1156,31 +1254,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
     
     def _extract_website_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract website URL from search results"""
-        try:
-            result_str = str(search_result).lower()
-            
-            # Look for common website patterns
-            import re
-            
-            # Pattern for URLs
-            url_pattern = r'https?://(?:[-\w.])+(?:\.[a-zA-Z]{2,})+(?:/[^"\s]*)?'
-            urls = re.findall(url_pattern, str(search_result), re.IGNORECASE)
-            
-            if urls:
-                # Prefer URLs that seem related to the company name
-                company_words = company_name.lower().replace(' ', '').replace(',', '').replace('.', '')
-                for url in urls:
-                    if any(word in url.lower() for word in company_words.split() if len(word) > 2):
-                        return url
-                
-                # If no company-specific URL found, return the first one
-                return urls[0]
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting website from search: {e}")
-            return None
+        return extract_website(normalize_search_results(search_result), company_name)
     
     def _enrich_domain_field(self, record_data: Dict[str, Any], config: FieldEnrichmentConfig) -> EnrichmentResult:
         """Enrich domain field from website URL"""
@@ -1273,10 +1347,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         
         try:
             # Use MCP to search for company industry information
-            search_result = self.call_mcp_tool("web_search", {
-                "query": f"{company_name} industry business type",
-                "num_results": 3
-            })
+            search_result = self._web_search(record_data, f"{company_name} industry business type", 3, config.internal_name)
             
             # Extract industry classification from the result
             classified_industry = self._extract_industry_from_search(search_result, company_name)
@@ -1321,43 +1392,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
     
     def _extract_industry_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract industry classification from search results"""
-        try:
-            result_str = str(search_result).lower()
-            
-            # Common industry keywords and their mappings
-            industry_keywords = {
-                'technology': ['tech', 'software', 'saas', 'it', 'digital', 'computer'],
-                'healthcare': ['health', 'medical', 'hospital', 'pharma', 'biotech'],
-                'finance': ['bank', 'financial', 'investment', 'insurance', 'fintech'],
-                'retail': ['retail', 'store', 'shop', 'ecommerce', 'consumer'],
-                'manufacturing': ['manufacturing', 'factory', 'production', 'industrial'],
-                'education': ['education', 'school', 'university', 'learning'],
-                'real estate': ['real estate', 'property', 'construction', 'building'],
-                'professional services': ['consulting', 'legal', 'accounting', 'advisory'],
-                'hospitality': ['hotel', 'restaurant', 'travel', 'tourism'],
-                'transportation': ['transport', 'logistics', 'shipping', 'delivery'],
-                'energy': ['energy', 'oil', 'gas', 'renewable', 'utility'],
-                'media': ['media', 'entertainment', 'publishing', 'broadcasting'],
-                'non-profit': ['nonprofit', 'charity', 'foundation', 'ngo']
-            }
-            
-            # Score each industry based on keyword matches
-            industry_scores = {}
-            for industry, keywords in industry_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in result_str)
-                if score > 0:
-                    industry_scores[industry] = score
-            
-            # Return the industry with the highest score
-            if industry_scores:
-                best_industry = max(industry_scores.items(), key=lambda x: x[1])
-                return best_industry[0].title()
-            
-            return "Business Services"  # Default fallback
-            
-        except Exception as e:
-            logger.error(f"Error extracting industry from search: {e}")
-            return None
+        return extract_industry(normalize_search_results(search_result), company_name)
     
     def _enrich_description_field(self, record_data: Dict[str, Any], config: FieldEnrichmentConfig) -> EnrichmentResult:
         """Enrich company description using multiple strategies"""
@@ -1385,10 +1420,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
             best_confidence = ConfidenceLevel.UNKNOWN
             
             for query in search_queries:
-                search_result = self.call_mcp_tool("web_search", {
-                    "query": query,
-                    "num_results": 5
-                })
+                search_result = self._web_search(record_data, query, 5, config.internal_name)
                 
                 description = self._extract_description_from_search(search_result, company_name)
                 if description and len(description) > 50:
@@ -1514,40 +1546,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
     
     def _extract_description_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract company description from search results"""
-        try:
-            result_str = str(search_result)
-            
-            # Look for descriptive sentences about the company
-            sentences = result_str.split('.')
-            relevant_sentences = []
-            
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if (len(sentence) > 20 and 
-                    (company_name.lower() in sentence.lower() or 
-                     any(word in sentence.lower() for word in ['company', 'business', 'provides', 'offers', 'specializes']))):
-                    relevant_sentences.append(sentence)
-            
-            if relevant_sentences:
-                # Take the first few relevant sentences
-                description = '. '.join(relevant_sentences[:3])
-                if not description.endswith('.'):
-                    description += '.'
-                
-                # Clean up the description
-                description = description.replace('\n', ' ').replace('  ', ' ').strip()
-                
-                # Limit length
-                if len(description) > 500:
-                    description = description[:497] + '...'
-                
-                return description
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting description from search: {e}")
-            return None
+        return extract_description(normalize_search_results(search_result), company_name)
     
     def _enrich_job_parsing_field(self, record_data: Dict[str, Any], config: FieldEnrichmentConfig) -> EnrichmentResult:
         """Enrich job seniority or function from job title"""
@@ -1845,91 +1844,11 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
     
     def _parse_job_title_real(self, job_title: str) -> Dict[str, str]:
         """Parse job title to extract seniority and function using comprehensive logic"""
-        if not job_title:
-            return {'seniority': 'Unknown', 'function': 'Unknown'}
-        
-        title_lower = job_title.lower().strip()
-        
-        # Seniority mapping with comprehensive patterns
-        seniority_patterns = {
-            'C-Level': [
-                'ceo', 'chief executive officer', 'president', 'founder', 'owner', 'principal',
-                'cfo', 'chief financial officer', 'cto', 'chief technology officer',
-                'coo', 'chief operating officer', 'cmo', 'chief marketing officer',
-                'chro', 'chief human resources officer', 'ciso', 'chief information security officer'
-            ],
-            'VP': [
-                'vp', 'vice president', 'executive vice president', 'evp', 'senior vice president', 'svp'
-            ],
-            'Director': [
-                'director', 'head of', 'senior director', 'executive director', 'managing director'
-            ],
-            'Manager': [
-                'manager', 'senior manager', 'team lead', 'team leader', 'supervisor',
-                'program manager', 'project manager', 'product manager', 'account manager'
-            ],
-            'Senior': [
-                'senior', 'lead', 'principal', 'staff', 'senior analyst', 'senior consultant',
-                'senior engineer', 'senior developer', 'senior specialist'
-            ]
-        }
-        
-        seniority = 'Individual Contributor'  # Default
-        for level, patterns in seniority_patterns.items():
-            if any(pattern in title_lower for pattern in patterns):
-                seniority = level
-                break
-        
-        # Function mapping with comprehensive patterns
-        function_patterns = {
-            'Sales': [
-                'sales', 'business development', 'account executive', 'sales rep', 'sales manager',
-                'business development manager', 'account manager', 'sales director', 'revenue'
-            ],
-            'Marketing': [
-                'marketing', 'brand', 'digital marketing', 'content', 'social media',
-                'growth', 'demand generation', 'product marketing', 'communications'
-            ],
-            'Operations': [
-                'operations', 'ops', 'operational', 'supply chain', 'logistics',
-                'process', 'quality', 'facilities', 'procurement'
-            ],
-            'Finance': [
-                'finance', 'financial', 'accounting', 'controller', 'treasurer',
-                'fp&a', 'financial planning', 'budget', 'audit'
-            ],
-            'Human Resources': [
-                'hr', 'human resources', 'people', 'talent', 'recruiting', 'recruitment',
-                'compensation', 'benefits', 'organizational development'
-            ],
-            'Engineering': [
-                'engineer', 'engineering', 'developer', 'development', 'software',
-                'technical', 'architect', 'devops', 'qa', 'quality assurance'
-            ],
-            'Product': [
-                'product', 'product manager', 'product owner', 'ux', 'ui', 'design',
-                'user experience', 'product development'
-            ],
-            'Customer Success': [
-                'customer success', 'customer support', 'customer service', 'support',
-                'client services', 'customer experience'
-            ],
-            'Legal': [
-                'legal', 'counsel', 'attorney', 'lawyer', 'compliance', 'regulatory'
-            ],
-            'IT': [
-                'it', 'information technology', 'systems', 'infrastructure', 'security',
-                'network', 'database', 'system administrator'
-            ]
-        }
-        
-        function = 'General Management'  # Default
-        for func, patterns in function_patterns.items():
-            if any(pattern in title_lower for pattern in patterns):
-                function = func
-                break
-        
-        return {'seniority': seniority, 'function': function}
+        return classify_job_title(job_title)
+    
+    def parse_job_titles(self, job_titles: List[str]) -> List[Dict[str, str]]:
+        """Parse a batch of job titles (e.g. every contact of a company) into seniority and function"""
+        return classify_job_titles(job_titles)
     
     def _validate_url_accessibility(self, url: str) -> bool:
         """Validate if a URL is accessible"""
@@ -2005,10 +1924,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
             ]
             
             for query in search_queries:
-                search_result = self.call_mcp_tool("web_search", {
-                    "query": query,
-                    "num_results": 5
-                })
+                search_result = self._web_search(record_data, query, 5, config.internal_name)
                 
                 revenue = self._extract_revenue_from_search(search_result, company_name)
                 if revenue:
@@ -2061,10 +1977,10 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         
         try:
             # Strategy 1: LinkedIn company page search
-            linkedin_result = self.call_mcp_tool("web_search", {
-                "query": f'"{company_name}" site:linkedin.com/company employees OR "employees on LinkedIn"',
-                "num_results": 3
-            })
+            linkedin_result = self._web_search(
+                record_data, f'"{company_name}" site:linkedin.com/company employees OR "employees on LinkedIn"', 3,
+                config.internal_name
+            )
             
             employee_count = self._extract_employee_count_from_search(linkedin_result, company_name)
             if employee_count:
@@ -2081,10 +1997,8 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
                 )
             
             # Strategy 2: General web search for company size
-            search_result = self.call_mcp_tool("web_search", {
-                "query": f"{company_name} employees staff size team",
-                "num_results": 5
-            })
+            search_result = self._web_search(record_data, f"{company_name} employees staff size team", 5,
+                                             config.internal_name)
             
             employee_count = self._extract_employee_count_from_search(search_result, company_name)
             if employee_count:
@@ -2118,10 +2032,8 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         
         try:
             # Search for LinkedIn company page
-            search_result = self.call_mcp_tool("web_search", {
-                "query": f'"{company_name}" site:linkedin.com/company',
-                "num_results": 3
-            })
+            search_result = self._web_search(record_data, f'"{company_name}" site:linkedin.com/company', 3,
+                                             config.internal_name)
             
             linkedin_url = self._extract_linkedin_url_from_search(search_result, company_name)
             if linkedin_url:
@@ -2156,15 +2068,11 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
         try:
             # Strategy 1: Search company website for contact information
             if website:
-                search_result = self.call_mcp_tool("web_search", {
-                    "query": f'site:{website} phone contact "call us" telephone',
-                    "num_results": 3
-                })
+                search_result = self._web_search(record_data, f'site:{website} phone contact "call us" telephone', 3,
+                                                 config.internal_name)
             else:
-                search_result = self.call_mcp_tool("web_search", {
-                    "query": f'"{company_name}" phone contact telephone number',
-                    "num_results": 5
-                })
+                search_result = self._web_search(record_data, f'"{company_name}" phone contact telephone number', 5,
+                                                 config.internal_name)
             
             phone_number = self._extract_phone_from_search(search_result, company_name)
             if phone_number:
@@ -2201,49 +2109,7 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
     
     def _extract_revenue_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract revenue information from search results"""
-        try:
-            result_str = str(search_result).lower()
-            
-            # Look for revenue patterns
-            import re
-            
-            # Pattern for revenue mentions
-            revenue_patterns = [
-                r'revenue[:\s]*\$?([\d,]+(?:\.\d+)?)\s*(million|billion|k|thousand)?',
-                r'sales[:\s]*\$?([\d,]+(?:\.\d+)?)\s*(million|billion|k|thousand)?',
-                r'earnings[:\s]*\$?([\d,]+(?:\.\d+)?)\s*(million|billion|k|thousand)?',
-                r'\$\s*([\d,]+(?:\.\d+)?)\s*(million|billion|k|thousand)?\s*(?:revenue|sales|earnings)'
-            ]
-            
-            for pattern in revenue_patterns:
-                matches = re.findall(pattern, result_str, re.IGNORECASE)
-                for match in matches:
-                    amount, unit = match
-                    amount = amount.replace(',', '')
-                    
-                    try:
-                        amount_float = float(amount)
-                        
-                        # Convert to dollars
-                        if unit and unit.lower() in ['million', 'm']:
-                            amount_float *= 1000000
-                        elif unit and unit.lower() in ['billion', 'b']:
-                            amount_float *= 1000000000
-                        elif unit and unit.lower() in ['thousand', 'k']:
-                            amount_float *= 1000
-                        
-                        # Reasonable range check (between $10K and $100B)
-                        if 10000 <= amount_float <= 100000000000:
-                            return f"${amount_float:,.0f}"
-                            
-                    except ValueError:
-                        continue
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting revenue: {e}")
-            return None
+        return extract_revenue(normalize_search_results(search_result), company_name)
     
     def _estimate_revenue_by_industry(self, company_name: str, industry: str, employee_count: str) -> Optional[str]:
         """Estimate revenue based on industry and employee count"""
@@ -2297,101 +2163,15 @@ class FieldEnrichmentManagerAgent(SpecializedAgent):
     
     def _extract_employee_count_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract employee count from search results"""
-        try:
-            result_str = str(search_result).lower()
-            
-            import re
-            
-            # Patterns for employee count
-            employee_patterns = [
-                r'(\d+(?:,\d+)?)\s*(?:employees?|staff|workers?|team members?)',
-                r'(?:employees?|staff|team)[:\s]*(\d+(?:,\d+)?)',
-                r'(\d+(?:,\d+)?)\s*(?:people|persons?)\s*(?:work|employed)',
-                r'(?:size|headcount)[:\s]*(\d+(?:,\d+)?)',
-                r'(\d+)\s*-\s*(\d+)\s*(?:employees?|staff)'  # Range pattern
-            ]
-            
-            for pattern in employee_patterns:
-                matches = re.findall(pattern, result_str)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        # Range pattern
-                        try:
-                            low, high = int(match[0].replace(',', '')), int(match[1].replace(',', ''))
-                            if 1 <= low <= 50000 and low < high <= 50000:
-                                return f"{low}-{high}"
-                        except:
-                            continue
-                    else:
-                        # Single number
-                        try:
-                            count = int(match.replace(',', ''))
-                            if 1 <= count <= 50000:
-                                return str(count)
-                        except:
-                            continue
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting employee count: {e}")
-            return None
+        return extract_employee_count(normalize_search_results(search_result), company_name)
     
     def _extract_linkedin_url_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract LinkedIn company page URL from search results"""
-        try:
-            result_str = str(search_result)
-            
-            import re
-            
-            # Pattern for LinkedIn company URLs
-            linkedin_pattern = r'https?://(?:www\.)?linkedin\.com/company/[^/\s]+'
-            matches = re.findall(linkedin_pattern, result_str, re.IGNORECASE)
-            
-            if matches:
-                # Return the first valid LinkedIn URL
-                return matches[0]
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting LinkedIn URL: {e}")
-            return None
+        return extract_linkedin_url(normalize_search_results(search_result), company_name)
     
     def _extract_phone_from_search(self, search_result: Any, company_name: str) -> Optional[str]:
         """Extract phone number from search results"""
-        try:
-            result_str = str(search_result)
-            
-            import re
-            
-            # Phone number patterns
-            phone_patterns = [
-                r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US format
-                r'\+1[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}',  # US with country code
-                r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}',  # Simple US format
-                r'\(\d{3}\)\s?\d{3}-\d{4}'  # (XXX) XXX-XXXX format
-            ]
-            
-            for pattern in phone_patterns:
-                matches = re.findall(pattern, result_str)
-                for match in matches:
-                    # Basic validation - should be 10 digits
-                    digits_only = ''.join(c for c in match if c.isdigit())
-                    if len(digits_only) == 10:
-                        # Format as (XXX) XXX-XXXX
-                        formatted = f"({digits_only[:3]}) {digits_only[3:6]}-{digits_only[6:]}"
-                        return formatted
-                    elif len(digits_only) == 11 and digits_only.startswith('1'):
-                        # US number with country code
-                        formatted = f"+1 ({digits_only[1:4]}) {digits_only[4:7]}-{digits_only[7:]}"
-                        return formatted
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error extracting phone: {e}")
-            return None
+        return extract_phone(normalize_search_results(search_result), company_name)
     
     def _extract_number_from_string(self, text: str) -> Optional[int]:
         """Extract a number from a text string"""
@@ -12,6 +12,7 @@ from pathlib import Path
 
 from ...core.base_agents import SpecializedAgent
 from ...core.state_models import CRMSessionState, CRMStateKeys
+from ...utils.write_buffer import queue_update
 
 
 class LeadScoringAgent(SpecializedAgent):
@@ -102,6 +103,10 @@ class LeadScoringAgent(SpecializedAgent):
         Args:
             state: CRMSessionState containing company_data and contact_data
         
+        Inside buffered_writes(), the updates are also queued for the company
+        (company_data "id" or "hs_object_id"). Scores equal to the stored
+        ones are dropped, and the timestamp is only written with a change.
+        
         Returns:
             Dict with two keys:
               - "scores": computed score bundle saved to state.lead_scores
@@ -142,6 +147,14 @@ class LeadScoringAgent(SpecializedAgent):
             mapping.get("scoring_version", "swoop_scoring_version"): scores["scoring_version"],
         }
         
+        company_id = company_data.get("id") or company_data.get("hs_object_id")
+        if company_id:
+            queue_update(
+                "companies", company_id, hubspot_updates,
+                known={name: company_data[name] for name in hubspot_updates if name in company_data},
+                volatile=[mapping.get("score_updated_at", "swoop_score_updated_at")],
+            )
+        
         # Native HubSpot scoring toggle (no-op placeholder; surfaced for later wiring)
         native_cfg = self._config.get("native_hubspot_integration", {})
         if native_cfg.get("enabled", False):
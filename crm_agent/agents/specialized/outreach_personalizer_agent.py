@@ -7,11 +7,29 @@ Generates grounded, role-aware drafts and creates Email/Task engagements.
 import json
 import os
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, List, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Iterable, Optional, List, Tuple
 from pathlib import Path
 
 from ...core.base_agents import SpecializedAgent
 from ...core.state_models import CRMSessionState, CRMStateKeys
+from ...utils.outreach_templates import (
+    NO_CITATIONS,
+    OutreachTemplates,
+    classify_outreach_role,
+    select_messaging_strategy,
+)
+
+
+@lru_cache(maxsize=256)
+def _timestamp_text(created_at: datetime) -> str:
+    """POSIX timestamp text; batch drafts share one created_at, so it is formatted once."""
+    return str(created_at.timestamp())
+
+
+@lru_cache(maxsize=256)
+def _due_date_text(created_at: datetime, days: int) -> str:
+    return (created_at + timedelta(days=days)).isoformat()
 
 
 class OutreachPersonalizerAgent(SpecializedAgent):
@@ -93,6 +111,8 @@ class OutreachPersonalizerAgent(SpecializedAgent):
         
         # Load configuration after super().__init__
         self._config = self._load_config(config_path)
+        self._templates = OutreachTemplates(self._config)
+        self._citation_cache: Dict[Tuple[Tuple[str, str, str], ...], str] = {}
     
     def generate_personalized_outreach(self, state: CRMSessionState, outreach_type: str = "cold_outreach") -> Dict[str, Any]:
         """
@@ -145,6 +165,111 @@ class OutreachPersonalizerAgent(SpecializedAgent):
         
         return outreach_results
     
+    def generate_company_outreach(self, company_data: Dict[str, Any], contacts: Iterable[Dict[str, Any]],
+                                  enrichment_findings: Optional[Dict[str, Any]] = None,
+                                  lead_scores: Optional[Dict[str, Any]] = None,
+                                  outreach_type: str = "cold_outreach") -> Dict[str, Any]:
+        """
+        Generate outreach for every contact of one company.
+        
+        Args:
+            company_data: Company properties (flat, or a HubSpot record with "properties")
+            contacts: Contact properties or HubSpot contact records
+            enrichment_findings: Normalized insights for the company
+            lead_scores: Lead scores shared by the company's contacts
+            outreach_type: Type of outreach (cold_outreach, follow_up, demo_invitation, etc.)
+        
+        Returns:
+            Company result as returned by generate_outreach_batch
+        """
+        return self.generate_outreach_batch([{
+            "company": company_data,
+            "contacts": contacts,
+            "enrichment_findings": enrichment_findings,
+            "lead_scores": lead_scores,
+        }], outreach_type)[0]
+    
+    def generate_outreach_batch(self, companies: Iterable[Dict[str, Any]],
+                                outreach_type: str = "cold_outreach") -> List[Dict[str, Any]]:
+        """
+        Generate outreach for many companies and their contacts in one pass.
+        
+        The company profile is analyzed once per company, role analysis once
+        per distinct job title, and personalization and email body once per
+        company and role type; only the engagement data is built per contact.
+        Analyses are shared between the contacts they apply to, so treat
+        them as read-only.
+        
+        Args:
+            companies: Entries of {"company", "contacts", "enrichment_findings", "lead_scores"}
+            outreach_type: Type of outreach for every draft
+        
+        Returns:
+            Per company: {"company_id", "company_name", "company_profile", "outreach"}, where
+            "outreach" holds one generate_personalized_outreach-style result per contact
+        """
+        created_at = datetime.utcnow()
+        created_at_text = created_at.isoformat()
+        role_analyses: Dict[str, Dict[str, Any]] = {}
+        batch = []
+        sequence = 0
+        
+        for entry in companies:
+            company_data = self._flatten_record(entry.get("company") or {})
+            lead_scores = entry.get("lead_scores") or {}
+            company_profile = self._analyze_company_profile(company_data, entry.get("enrichment_findings") or {})
+            
+            # Role type -> (personalization, rendered email body)
+            rendered: Dict[str, Tuple[Dict[str, Any], str]] = {}
+            outreach = []
+            for contact in entry.get("contacts") or []:
+                contact_data = self._flatten_record(contact)
+                title = (contact_data.get("jobtitle") or "").lower()
+                role_analysis = role_analyses.get(title)
+                if role_analysis is None:
+                    role_analysis = role_analyses[title] = self._analyze_contact_role(contact_data)
+                
+                role_type = role_analysis["role_type"]
+                if role_type not in rendered:
+                    personalization = self._generate_personalization(
+                        role_analysis, company_profile, lead_scores, outreach_type
+                    )
+                    rendered[role_type] = (personalization, self._render_email_body(personalization))
+                personalization, body = rendered[role_type]
+                
+                sequence += 1
+                outreach.append({
+                    "contact_id": contact_data.get("id"),
+                    "outreach_type": outreach_type,
+                    "personalization": personalization,
+                    "email_engagement": self._create_email_draft(
+                        contact_data, company_data, personalization, None,
+                        body=body, created_at=created_at, sequence=sequence
+                    ),
+                    "follow_up_task": self._create_follow_up_task(
+                        contact_data, company_data, personalization, outreach_type, None,
+                        lead_scores=lead_scores, created_at=created_at, sequence=sequence
+                    ),
+                    "created_at": created_at_text,
+                    "role_analysis": role_analysis,
+                })
+            
+            batch.append({
+                "company_id": company_data.get("id"),
+                "company_name": company_data.get("name", ""),
+                "company_profile": company_profile,
+                "outreach": outreach,
+            })
+        
+        return batch
+    
+    @staticmethod
+    def _flatten_record(record: Dict[str, Any]) -> Dict[str, Any]:
+        """HubSpot {"id", "properties"} records as flat property dicts; flat dicts unchanged."""
+        if isinstance(record.get("properties"), dict):
+            return {"id": record.get("id"), **record["properties"]}
+        return record
+    
     def _load_config(self, config_path: Path) -> Dict[str, Any]:
         """Load outreach personalization configuration from JSON file."""
         try:
@@ -162,29 +287,18 @@ class OutreachPersonalizerAgent(SpecializedAgent):
     
     def _analyze_contact_role(self, contact_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze contact role and determine messaging strategy."""
-        job_title = contact_data.get("jobtitle", "").lower()
-        
-        # Role classification
-        role_type = "general"
-        if any(term in job_title for term in ["general manager", "gm", "president", "ceo"]):
-            role_type = "general_manager"
-        elif any(term in job_title for term in ["operations", "ops", "superintendent"]):
-            role_type = "operations_manager"
-        elif any(term in job_title for term in ["food", "beverage", "f&b", "restaurant", "dining"]):
-            role_type = "fb_manager"
-        elif any(term in job_title for term in ["golf", "professional", "pga", "head pro"]):
-            role_type = "golf_professional"
-        elif any(term in job_title for term in ["it", "technology", "systems", "tech"]):
-            role_type = "it_manager"
-        elif any(term in job_title for term in ["marketing", "sales", "membership"]):
-            role_type = "marketing_sales"
+        job_title = contact_data.get("jobtitle", "")
+        
+        # Role classification (memoized per title) and role tables (compiled from config)
+        role_type = classify_outreach_role((job_title or "").lower())
+        profile = self._templates.role_profile(role_type)
         
         return {
-            "original_title": contact_data.get("jobtitle", ""),
+            "original_title": job_title,
             "role_type": role_type,
-            "messaging_focus": self._get_role_messaging_focus(role_type),
-            "decision_authority": self._assess_decision_authority(role_type),
-            "pain_points": self._get_role_pain_points(role_type)
+            "messaging_focus": list(profile.messaging_focus),
+            "decision_authority": profile.decision_authority,
+            "pain_points": list(profile.pain_points)
         }
     
     def _analyze_company_profile(self, company_data: Dict[str, Any], enrichment_findings: Dict[str, Any]) -> Dict[str, Any]:
@@ -245,24 +359,22 @@ class OutreachPersonalizerAgent(SpecializedAgent):
             "citations": self._extract_citations(company_profile)
         }
     
+    def _render_email_body(self, personalization: Dict[str, Any]) -> str:
+        """Email body with call-to-action, signature and citations."""
+        return self._templates.email_body.render(
+            email_content=personalization['email_content'],
+            call_to_action=personalization['call_to_action'],
+            citations=self._format_citations(personalization['citations'])
+        ).strip()
+    
     def _create_email_draft(self, contact_data: Dict[str, Any], company_data: Dict[str, Any],
-                           personalization: Dict[str, Any], state: CRMSessionState) -> Dict[str, Any]:
+                           personalization: Dict[str, Any], state: Optional[CRMSessionState],
+                           body: Optional[str] = None, created_at: Optional[datetime] = None,
+                           sequence: Optional[int] = None) -> Dict[str, Any]:
         """Create email engagement draft in HubSpot."""
         
-        email_content = f"""
-{personalization['email_content']}
-
-{personalization['call_to_action']}
-
-Best regards,
-[Your Name]
-[Your Title]
-[Company]
-
----
-Sources and References:
-{self._format_citations(personalization['citations'])}
-        """.strip()
+        email_content = body if body is not None else self._render_email_body(personalization)
+        created_at = created_at or datetime.utcnow()
         
         # Prepare email engagement data
         email_data = {
@@ -286,17 +398,20 @@ Sources and References:
         return {
             "status": "draft_created",
             "email_data": email_data,
-            "engagement_id": f"draft_{datetime.utcnow().timestamp()}",
+            "engagement_id": self._engagement_id("draft", created_at, sequence),
             "message": "Email draft created successfully (not sent)"
         }
     
     def _create_follow_up_task(self, contact_data: Dict[str, Any], company_data: Dict[str, Any],
                               personalization: Dict[str, Any], outreach_type: str, 
-                              state: CRMSessionState) -> Dict[str, Any]:
+                              state: Optional[CRMSessionState], lead_scores: Optional[Dict[str, Any]] = None,
+                              created_at: Optional[datetime] = None,
+                              sequence: Optional[int] = None) -> Dict[str, Any]:
         """Create follow-up task in HubSpot."""
         
         # Determine follow-up timeline based on lead score
-        lead_scores = getattr(state, 'lead_scores', {})
+        if lead_scores is None:
+            lead_scores = getattr(state, 'lead_scores', {})
         score_band = lead_scores.get('score_band', 'Cold (40-59)')
         
         if 'Hot' in score_band:
@@ -308,35 +423,29 @@ Sources and References:
         else:
             follow_up_days = 14
         
-        due_date = datetime.utcnow() + timedelta(days=follow_up_days)
+        created_at = created_at or datetime.utcnow()
+        due_date = _due_date_text(created_at, follow_up_days)
         
-        task_title = f"Follow up on {outreach_type} - {company_data.get('name', 'Unknown Company')}"
-        task_notes = f"""
-Follow up on personalized outreach sent to {contact_data.get('firstname', '')} {contact_data.get('lastname', '')}.
-
-Outreach Details:
-- Type: {outreach_type}
-- Subject: {personalization['subject_line']}
-- Messaging Strategy: {personalization['messaging_strategy']}
-- Personalization Score: {personalization['personalization_score']}/100
-
-Next Steps:
-1. Check if email was opened/clicked
-2. If no response, consider phone follow-up
-3. Prepare additional relevant content based on their interests
-4. Update CRM with any new information gathered
-
-Lead Score Context:
-- Score Band: {score_band}
-- Total Score: {lead_scores.get('total_score', 'Unknown')}
-        """.strip()
+        task_title = self._templates.follow_up_title.render(
+            outreach_type=outreach_type, company_name=company_data.get('name', 'Unknown Company')
+        )
+        task_notes = self._templates.follow_up_notes.render(
+            first_name=contact_data.get('firstname', ''),
+            last_name=contact_data.get('lastname', ''),
+            outreach_type=outreach_type,
+            subject_line=personalization['subject_line'],
+            messaging_strategy=personalization['messaging_strategy'],
+            personalization_score=personalization['personalization_score'],
+            score_band=score_band,
+            total_score=lead_scores.get('total_score', 'Unknown')
+        ).strip()
         
         # Prepare task data
         task_data = {
             "task_type": "FOLLOW_UP",
             "title": task_title,
             "notes": task_notes,
-            "due_date": due_date.isoformat(),
+            "due_date": due_date,
             "priority": "MEDIUM" if 'Hot' in score_band else "LOW",
             "contact_id": contact_data.get("id"),
             "company_id": company_data.get("id"),
@@ -351,48 +460,30 @@ Lead Score Context:
         return {
             "status": "task_created",
             "task_data": task_data,
-            "task_id": f"task_{datetime.utcnow().timestamp()}",
-            "due_date": due_date.isoformat(),
+            "task_id": self._engagement_id("task", created_at, sequence),
+            "due_date": due_date,
             "message": "Follow-up task created successfully"
         }
     
+    @staticmethod
+    def _engagement_id(prefix: str, created_at: datetime, sequence: Optional[int]) -> str:
+        """Placeholder engagement ID; batch drafts share a timestamp, so they add a sequence number."""
+        engagement_id = f"{prefix}_{_timestamp_text(created_at)}"
+        return engagement_id if sequence is None else f"{engagement_id}_{sequence}"
+    
     # Helper methods for personalization logic
     
     def _get_role_messaging_focus(self, role_type: str) -> List[str]:
         """Get messaging focus areas for role type."""
-        focus_map = {
-            "general_manager": ["ROI", "operational_efficiency", "member_satisfaction", "revenue_growth"],
-            "operations_manager": ["process_improvement", "staff_productivity", "cost_savings", "workflow_optimization"],
-            "fb_manager": ["dining_revenue", "event_management", "customer_experience", "inventory_management"],
-            "golf_professional": ["member_engagement", "instruction_programs", "pro_shop_sales", "tournament_management"],
-            "it_manager": ["system_integration", "data_security", "technical_support", "automation"],
-            "marketing_sales": ["lead_generation", "member_retention", "brand_awareness", "digital_marketing"]
-        }
-        return focus_map.get(role_type, ["operational_efficiency", "cost_savings"])
+        return list(self._templates.role_profile(role_type).messaging_focus)
     
     def _assess_decision_authority(self, role_type: str) -> str:
         """Assess decision-making authority level."""
-        authority_map = {
-            "general_manager": "high",
-            "operations_manager": "medium",
-            "fb_manager": "medium",
-            "golf_professional": "medium",
-            "it_manager": "medium",
-            "marketing_sales": "low"
-        }
-        return authority_map.get(role_type, "low")
+        return self._templates.role_profile(role_type).decision_authority
     
     def _get_role_pain_points(self, role_type: str) -> List[str]:
         """Get common pain points for role type."""
-        pain_points_map = {
-            "general_manager": ["declining_membership", "operational_costs", "staff_turnover", "technology_gaps"],
-            "operations_manager": ["manual_processes", "scheduling_conflicts", "maintenance_costs", "staff_coordination"],
-            "fb_manager": ["food_costs", "event_coordination", "inventory_waste", "seasonal_fluctuations"],
-            "golf_professional": ["lesson_scheduling", "equipment_sales", "member_engagement", "tournament_logistics"],
-            "it_manager": ["system_integration", "data_silos", "security_concerns", "legacy_systems"],
-            "marketing_sales": ["lead_quality", "conversion_rates", "member_retention", "digital_presence"]
-        }
-        return pain_points_map.get(role_type, ["operational_inefficiencies"])
+        return list(self._templates.role_profile(role_type).pain_points)
     
     def _assess_sophistication_level(self, company_data: Dict[str, Any], technology_info: Dict[str, Any]) -> str:
         """Assess company sophistication level."""
@@ -468,94 +559,29 @@ Lead Score Context:
     def _select_messaging_strategy(self, role_analysis: Dict[str, Any], company_profile: Dict[str, Any], 
                                   lead_scores: Dict[str, Any]) -> str:
         """Select appropriate messaging strategy."""
-        role_type = role_analysis['role_type']
-        sophistication = company_profile['sophistication_level']
         score_band = lead_scores.get('score_band', 'Cold')
-        
-        if 'Hot' in score_band:
-            return "direct_value_proposition"
-        elif role_type == "general_manager" and sophistication == "high":
-            return "strategic_partnership"
-        elif role_type in ["operations_manager", "it_manager"]:
-            return "operational_efficiency"
-        elif sophistication == "low":
-            return "education_first"
-        else:
-            return "industry_insights"
+        return select_messaging_strategy(
+            'Hot' in score_band, role_analysis['role_type'], company_profile['sophistication_level']
+        )
     
     def _generate_subject_line(self, role_analysis: Dict[str, Any], company_profile: Dict[str, Any],
                               messaging_strategy: str, outreach_type: str) -> str:
         """Generate personalized subject line."""
-        company_name = company_profile['name']
-        role_type = role_analysis['role_type']
-        
-        subject_templates = {
-            "direct_value_proposition": f"ROI opportunity for {company_name}",
-            "strategic_partnership": f"Partnership opportunity - {company_name}",
-            "operational_efficiency": f"Streamline operations at {company_name}",
-            "education_first": f"Golf course management insights for {company_name}",
-            "industry_insights": f"Industry trends relevant to {company_name}"
-        }
-        
-        return subject_templates.get(messaging_strategy, f"Opportunity for {company_name}")
+        return self._templates.subject(messaging_strategy).render(company_name=company_profile['name'])
     
     def _generate_email_content(self, role_analysis: Dict[str, Any], company_profile: Dict[str, Any],
                                messaging_strategy: str, outreach_type: str) -> str:
         """Generate personalized email content."""
-        company_name = company_profile['name']
-        role_type = role_analysis['role_type']
-        first_name = "there"  # Would be filled from contact data
-        
-        content_templates = {
-            "direct_value_proposition": f"""
-Hi {first_name},
-
-I noticed {company_name} is a {company_profile['type']} course, and I wanted to share how we've helped similar properties increase operational efficiency by 25% while reducing costs.
-
-Specifically for {role_type.replace('_', ' ').title()} roles, our clients typically see:
-• Streamlined daily operations
-• Improved member satisfaction scores
-• Reduced administrative overhead
-
-Would you be interested in a brief conversation about how this might apply to {company_name}?
-            """.strip(),
-            
-            "strategic_partnership": f"""
-Hi {first_name},
-
-I've been following {company_name}'s growth and was impressed by your commitment to excellence in member experience.
-
-As someone in golf course management, you know that staying ahead of operational challenges requires the right technology partnerships. We've helped {company_profile['type']} courses like yours implement solutions that drive both efficiency and member satisfaction.
-
-I'd love to explore how we might support {company_name}'s continued success.
-            """.strip(),
-            
-            "operational_efficiency": f"""
-Hi {first_name},
-
-Managing operations at {company_name} likely involves juggling multiple systems and processes daily. 
-
-I wanted to reach out because we've helped {company_profile['type']} courses streamline their operations, typically resulting in:
-• 30% reduction in administrative tasks
-• Better staff coordination and scheduling
-• Improved data visibility across departments
-
-Would you have 15 minutes to discuss how this might benefit {company_name}?
-            """.strip()
-        }
-        
-        return content_templates.get(messaging_strategy, f"Hello, I wanted to reach out regarding opportunities for {company_name}.")
+        return self._templates.content(messaging_strategy).render(
+            first_name="there",  # Would be filled from contact data
+            company_name=company_profile['name'],
+            company_type=company_profile['type'],
+            role_title=role_analysis['role_type'].replace('_', ' ').title()
+        )
     
     def _generate_call_to_action(self, role_analysis: Dict[str, Any], messaging_strategy: str, outreach_type: str) -> str:
         """Generate appropriate call-to-action."""
-        authority = role_analysis['decision_authority']
-        
-        if authority == "high":
-            return "Would you be available for a brief 15-minute call this week to explore this opportunity?"
-        elif authority == "medium":
-            return "I'd be happy to share some relevant case studies. Would you like me to send them over?"
-        else:
-            return "Would you be the right person to discuss this, or should I connect with someone else on your team?"
+        return self._templates.call_to_action(role_analysis['decision_authority'])
     
     def _calculate_personalization_score(self, role_analysis: Dict[str, Any], company_profile: Dict[str, Any]) -> int:
         """Calculate personalization quality score."""
@@ -591,15 +617,20 @@ Would you have 15 minutes to discuss how this might benefit {company_name}?
         ]
     
     def _format_citations(self, citations: List[Dict[str, Any]]) -> str:
-        """Format citations for email footer."""
+        """Format citations for email footer (memoized per distinct citation list)."""
         if not citations:
-            return "Industry data from various golf management sources."
-        
-        formatted = []
-        for i, citation in enumerate(citations, 1):
-            formatted.append(f"{i}. {citation['claim']}: {citation['source']} ({citation.get('url', 'Internal source')})")
-        
-        return "\n".join(formatted)
+            return NO_CITATIONS
+        
+        key = tuple((c['claim'], c['source'], c.get('url', 'Internal source')) for c in citations)
+        formatted = self._citation_cache.get(key)
+        if formatted is None:
+            render = self._templates.citation.render
+            formatted = "\n".join(
+                render(index=i, claim=claim, source=source, url=url)
+                for i, (claim, source, url) in enumerate(key, 1)
+            )
+            self._citation_cache[key] = formatted
+        return formatted
 
 
 def create_outreach_personalizer_agent(config_path: Optional[str] = None, **kwargs) -> OutreachPersonalizerAgent:
@@ -1,6 +1,6 @@
 """CRM workflow agents."""
 
-from .crm_enrichment import *
+from ...utils.lazy_imports import lazy_exports
 
 __all__ = [
     "create_crm_enrichment_pipeline",
@@ -8,3 +8,5 @@ __all__ = [
     "create_crm_quick_lookup_workflow",
     "create_crm_data_quality_workflow"
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), {name: ".crm_enrichment" for name in __all__})
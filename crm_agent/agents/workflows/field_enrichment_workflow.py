@@ -6,11 +6,65 @@ Sequential, Parallel, and Loop agent patterns. These workflow agents orchestrate
 the enrichment process with predictable, reliable execution patterns.
 """
 
-from typing import Dict, Any, List, Optional
-from google.adk.agents import SequentialAgent, ParallelAgent, LoopAgent, InvocationContext
+import json
+from typing import AsyncGenerator, Dict, Any, List, Optional
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.agents import BaseAgent, SequentialAgent, ParallelAgent, LoopAgent, InvocationContext
+from google.adk.events import Event, EventActions
 
 from ...core.base_agents import SpecializedAgent
 from ...core.state_models import CRMSessionState, CRMStateKeys
+from ...utils.field_validation import validate_many, validate_value
+
+
+# Session state key holding enrichment results indexed by source
+ENRICHMENT_RESULTS_BY_SOURCE = 'ENRICHMENT_RESULTS_BY_SOURCE'
+
+# Session state keys written by EnrichmentLoopConditionAgent.should_continue_loop
+LOOP_STATE_KEYS = ('validated_fields', 'pending_fields', 'exhausted_sources', 'current_iteration',
+                   'tier_success_rates', 'loop_decision_rationale')
+
+
+def _session_state(context: Any) -> Dict[str, Any]:
+    """Session state of an ADK InvocationContext, or of a context exposing session_state."""
+    session = getattr(context, 'session', None)
+    return session.state if session is not None else context.session_state
+
+
+def record_enrichment_results(session_state: Dict[str, Any], source: str, results: Dict[str, Any]) -> None:
+    """Store a source's field results in the indexed structure."""
+    # Assign a new index rather than mutating it in place so ADK state deltas pick it up
+    index = dict(session_state.get(ENRICHMENT_RESULTS_BY_SOURCE) or {})
+    index[source.upper()] = results
+    session_state[ENRICHMENT_RESULTS_BY_SOURCE] = index
+
+
+def get_enrichment_results_by_source(session_state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Return {SOURCE: {field: result}} as written by record_enrichment_results."""
+    return dict(session_state.get(ENRICHMENT_RESULTS_BY_SOURCE) or {})
+
+
+def _parse_source_output(output: Any) -> Optional[Dict[str, Any]]:
+    """Parse a data source agent's final response into {field: result}."""
+    if isinstance(output, dict):
+        return output
+    if not isinstance(output, str):
+        return None
+    cleaned = output.strip().replace("```json", "").replace("```", "").strip()
+    try:
+        results = json.loads(cleaned)
+    except ValueError:
+        return None
+    return results if isinstance(results, dict) else None
+
+
+def _enrichment_results_recorder(source_name: str, output_key: str):
+    """Build an after_agent_callback that records a source agent's output in the index."""
+    def record_output(callback_context: CallbackContext) -> None:
+        results = _parse_source_output(callback_context.state.get(output_key))
+        if results is not None:
+            record_enrichment_results(callback_context.state, source_name, results)
+    return record_output
 
 
 class FieldAnalysisAgent(SpecializedAgent):
@@ -90,6 +144,11 @@ class DataSourceAgent(SpecializedAgent):
     """Agent that enriches fields from a specific data source"""
     
     def __init__(self, source_name: str, source_tools: List[str], **kwargs):
+        # The agent's final response lands in output_key; the callback files it
+        # under the source in ENRICHMENT_RESULTS_BY_SOURCE
+        output_key = f"{source_name.upper()}_ENRICHMENT_OUTPUT"
+        kwargs.setdefault('output_key', output_key)
+        kwargs.setdefault('after_agent_callback', _enrichment_results_recorder(source_name, kwargs['output_key']))
         super().__init__(
             name=f"{source_name}DataSourceAgent",
             domain=f"{source_name.lower()}_enrichment",
@@ -118,7 +177,8 @@ class DataSourceAgent(SpecializedAgent):
             - Low Confidence (40+): Uncertain or outdated source
             - Failed (0): Could not retrieve or validate data
             
-            Store results in session state under {source_name.upper()}_ENRICHMENT_RESULTS.
+            Respond with a JSON object mapping each enriched field name to
+            {{"new_value", "old_value", "confidence", "status", "source", "notes"}}.
             """,
             **kwargs
         )
@@ -140,11 +200,23 @@ class DataSourceAgent(SpecializedAgent):
                     'error': 'No record ID provided'
                 }
             
+            # On later loop passes, only request fields that are still failing
+            source_key = self.source_name.upper()
+            pending_fields = context.session_state.get('pending_fields')
+            exhausted = source_key in context.session_state.get('exhausted_sources', [])
+            if exhausted or pending_fields == []:
+                return {
+                    'agent': f'{self.source_name}DataSourceAgent',
+                    'status': 'skipped',
+                    'message': 'Source exhausted' if exhausted else 'No pending fields'
+                }
+            
             # Store enrichment request in context for main agent to handle
-            context.session_state[f'{self.source_name.upper()}_ENRICHMENT_REQUEST'] = {
+            context.session_state[f'{source_key}_ENRICHMENT_REQUEST'] = {
                 'record_type': record_type,
                 'record_id': record_id,
                 'source': self.source_name,
+                'fields': pending_fields,
                 'requested_by': f'{self.source_name}DataSourceAgent'
             }
             
@@ -214,21 +286,23 @@ class EnrichmentValidatorAgent(SpecializedAgent):
     def execute_validation(self, context: InvocationContext) -> Dict[str, Any]:
         """Execute real validation for workflow"""
         try:
-            # Get enrichment results from context
+            # Group candidate values by field so each field's validator is resolved once
+            values_by_field: Dict[str, List[Any]] = {}
+            for source_results in get_enrichment_results_by_source(context.session_state).values():
+                for field_name, field_data in source_results.items():
+                    if isinstance(field_data, dict) and 'new_value' in field_data:
+                        values_by_field.setdefault(field_name, []).append(field_data['new_value'])
+            
             validation_results = {}
             overall_score = 0
             field_count = 0
             
-            # Validate results from all sources
-            for key, value in context.session_state.items():
-                if key.endswith('_ENRICHMENT_RESULTS'):
-                    source_results = value
-                    for field_name, field_data in source_results.items():
-                        if isinstance(field_data, dict) and 'new_value' in field_data:
-                            validation_result = self._validate_field(field_name, field_data['new_value'])
-                            validation_results[field_name] = validation_result
-                            overall_score += validation_result.get('confidence', 0)
-                            field_count += 1
+            for field_name, values in values_by_field.items():
+                field_results = validate_many(field_name, values)
+                # The last source's value is the one carried forward
+                validation_results[field_name] = field_results[-1]
+                overall_score += sum(result['confidence'] for result in field_results)
+                field_count += len(field_results)
             
             avg_score = overall_score / field_count if field_count > 0 else 0
             
@@ -251,51 +325,7 @@ class EnrichmentValidatorAgent(SpecializedAgent):
     
     def _validate_field(self, field_name: str, field_value: Any) -> Dict[str, Any]:
         """Validate a specific field value"""
-        issues = []
-        confidence = 50  # Default confidence
-        
-        if not field_value or str(field_value).strip() == '':
-            return {'valid': False, 'confidence': 0, 'issues': ['Empty value']}
-        
-        # Field-specific validation
-        if 'email' in field_name.lower():
-            import re
-            email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-            if re.match(email_pattern, str(field_value)):
-                confidence = 90
-            else:
-                issues.append('Invalid email format')
-                confidence = 20
-        
-        elif 'website' in field_name.lower() or 'url' in field_name.lower():
-            if str(field_value).startswith(('http://', 'https://')):
-                confidence = 80
-            else:
-                issues.append('URL should start with http:// or https://')
-                confidence = 40
-        
-        elif 'phone' in field_name.lower():
-            # Basic phone validation
-            phone_str = str(field_value).replace(' ', '').replace('-', '').replace('(', '').replace(')', '')
-            if len(phone_str) >= 10 and phone_str.isdigit():
-                confidence = 75
-            else:
-                issues.append('Invalid phone format')
-                confidence = 30
-        
-        else:
-            # General validation for other fields
-            if len(str(field_value).strip()) > 2:
-                confidence = 70
-            else:
-                issues.append('Value too short')
-                confidence = 30
-        
-        return {
-            'valid': len(issues) == 0,
-            'confidence': confidence,
-            'issues': issues
-        }
+        return validate_value(field_name, field_value)
 
 
 class EnrichmentCritiqueAgent(SpecializedAgent):
@@ -516,75 +546,125 @@ def _create_field_enrichment_sequential_workflow(**kwargs) -> SequentialAgent:
     return sequential_workflow
 
 
-class EnrichmentLoopConditionAgent(SpecializedAgent):
-    """Agent that determines when to continue or stop the enrichment loop"""
+class EnrichmentLoopConditionAgent(BaseAgent):
+    """
+    Loop control step that decides in code whether the enrichment loop runs again.
+    
+    Runs after each pass of the sequential enrichment workflow inside the
+    LoopAgent. When should_continue_loop() returns False it escalates, which
+    ends the loop; its decision keys are saved through the event's state delta.
+    """
     
     def __init__(self, **kwargs):
+        # Options meant for the LLM agents of the workflow do not apply here
         super().__init__(
             name="EnrichmentLoopConditionAgent",
-            domain="loop_control",
-            specialized_tools=[],
-            instruction="""
-            You are an Enrichment Loop Condition Agent responsible for determining
-            when to continue or terminate the enrichment loop.
-            
-            🎯 TERMINATION CONDITIONS:
-            
-            **Success Conditions** (STOP loop):
-            - Target success rates achieved for all field priority levels
-            - All critical fields successfully enriched
-            - Maximum confidence scores reached
-            - No more improvement opportunities identified
-            
-            **Continue Conditions** (CONTINUE loop):
-            - Success rates below targets
-            - Critical fields still missing
-            - Improvement opportunities available
-            - Additional data sources to try
-            - Maximum iterations not yet reached
-            
-            **Failure Conditions** (STOP loop):
-            - Maximum iterations reached without improvement
-            - All data sources exhausted
-            - Consistent failures across all sources
-            - Error rates exceed acceptable thresholds
-            
-            📊 DECISION LOGIC:
-            1. Read current enrichment results from session state
-            2. Calculate success rates by field priority
-            3. Assess improvement potential
-            4. Check iteration count and resource limits
-            5. Return boolean decision: True (continue) or False (stop)
-            
-            Store decision rationale in session state under LOOP_DECISION_RATIONALE.
-            """,
-            **kwargs
+            description="Decides whether the field enrichment loop runs another pass",
+        )
+    
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        should_continue = self.should_continue_loop(ctx)
+        session_state = _session_state(ctx)
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(
+                state_delta={key: session_state[key] for key in LOOP_STATE_KEYS if key in session_state},
+                escalate=not should_continue,
+            ),
         )
     
     def should_continue_loop(self, context: InvocationContext) -> bool:
         """
         Determine if the enrichment loop should continue.
         
+        Stops as soon as every priority tier meets its target success rate, when
+        an iteration adds no newly validated fields, or at max_iterations. When
+        continuing, narrows the next pass to the fields still failing and drops
+        sources that contributed nothing in the last pass.
+        
         Returns:
             bool: True if loop should continue, False if it should stop
         """
-        # This would implement the actual loop condition logic
-        # For now, return a simple condition based on iteration count
-        session_state = context.session_state
+        session_state = _session_state(context)
         current_iteration = session_state.get('current_iteration', 0)
         max_iterations = session_state.get('max_iterations', 3)
+        targets = session_state.get('target_success_rates', {})
+        field_priorities = session_state.get('field_priorities', {})
+        
+        # Fields validated so far, across all passes
+        validation_results = session_state.get('VALIDATION_RESULTS', {})
+        validated_now = {name for name, result in validation_results.items() if result.get('valid')}
+        previously_validated = set(session_state.get('validated_fields', []))
+        newly_validated = validated_now - previously_validated
+        validated = previously_validated | validated_now
+        session_state['validated_fields'] = sorted(validated)
         
-        # Simple condition: continue if under max iterations
-        should_continue = current_iteration < max_iterations
+        tier_rates = self._tier_success_rates(field_priorities, validated)
+        targets_met = bool(tier_rates) and all(
+            rate >= self._tier_target(targets, tier) for tier, rate in tier_rates.items()
+        )
+        
+        if targets_met:
+            should_continue, reason = False, "target success rates met"
+        elif current_iteration > 0 and not newly_validated:
+            should_continue, reason = False, "no new validated fields"
+        elif current_iteration >= max_iterations:
+            should_continue, reason = False, "max iterations reached"
+        else:
+            should_continue, reason = True, "targets not yet met"
+        
+        if should_continue:
+            # Only re-run fields and sources that can still make progress
+            session_state['pending_fields'] = sorted(set(field_priorities) - validated)
+            session_state['exhausted_sources'] = sorted(
+                set(session_state.get('exhausted_sources', [])) |
+                self._unproductive_sources(session_state, validation_results)
+            )
         
         # Update iteration count
         session_state['current_iteration'] = current_iteration + 1
+        session_state['tier_success_rates'] = tier_rates
         
         # Store decision rationale
-        rationale = f"Iteration {current_iteration + 1}/{max_iterations}: {'Continuing' if should_continue else 'Stopping'}"
+        rationale = (
+            f"Iteration {current_iteration + 1}/{max_iterations}: "
+            f"{'Continuing' if should_continue else 'Stopping'} ({reason})"
+        )
         session_state['loop_decision_rationale'] = rationale
         
         return should_continue
+    
+    @staticmethod
+    def _tier_target(targets: Dict[str, float], tier: str) -> float:
+        """Target success rate for a tier; low priority shares the medium target."""
+        if tier in targets:
+            return targets[tier]
+        if tier == 'low':
+            return targets.get('medium', 0.70)
+        return 1.0
+    
+    @staticmethod
+    def _tier_success_rates(field_priorities: Dict[str, str], validated: set) -> Dict[str, float]:
+        """Fraction of targeted fields validated, per priority tier."""
+        totals: Dict[str, int] = {}
+        successes: Dict[str, int] = {}
+        for field_name, tier in field_priorities.items():
+            tier = tier.lower()
+            totals[tier] = totals.get(tier, 0) + 1
+            if field_name in validated:
+                successes[tier] = successes.get(tier, 0) + 1
+        return {tier: successes.get(tier, 0) / total for tier, total in totals.items()}
+    
+    @staticmethod
+    def _unproductive_sources(session_state: Dict[str, Any], validation_results: Dict[str, Any]) -> set:
+        """Sources whose last results contained no validated field."""
+        unproductive = set()
+        for source, results in get_enrichment_results_by_source(session_state).items():
+            if not any(validation_results.get(name, {}).get('valid') for name in results):
+                unproductive.add(source)
+        return unproductive
 
 
 def _create_field_enrichment_loop_workflow(**kwargs) -> LoopAgent:
@@ -598,14 +678,13 @@ def _create_field_enrichment_loop_workflow(**kwargs) -> LoopAgent:
     # Create the main enrichment workflow to loop
     enrichment_workflow = _create_field_enrichment_sequential_workflow(**kwargs)
     
-    # Create loop condition agent
+    # Create loop condition agent: runs after each pass and escalates to stop the loop
     loop_condition_agent = EnrichmentLoopConditionAgent(**kwargs)
     
     # Create loop workflow
     loop_workflow = LoopAgent(
         name="FieldEnrichmentLoopWorkflow",
-        sub_agent=enrichment_workflow,
-        condition_agent=loop_condition_agent,
+        sub_agents=[enrichment_workflow, loop_condition_agent],
         max_iterations=5  # Safety limit
     )
     
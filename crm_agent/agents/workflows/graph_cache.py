@@ -0,0 +1,135 @@
+"""
+Process-wide cache of workflow agent graphs.
+
+Building a workflow such as the CRM enrichment pipeline instantiates a dozen
+LLM agents, each with its own toolset. Those agents are definitions only: all
+per-run data lives in the session/InvocationContext state, so one graph can
+serve any number of concurrent runs. The cache builds each graph once per
+(workflow type, config hash) and hands the same instance to every caller.
+
+ADK agents can only be mounted under a single parent, so a shared graph must
+never be mounted. Callers that run a graph directly use get_workflow_graph();
+callers that mount it as a sub-agent use take_workflow_graph(), which builds
+a graph that is never cached, so no other caller ever sees it. A cached graph
+that was mounted anyway is dropped and rebuilt on the next get().
+"""
+
+import hashlib
+import importlib
+import json
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Built-in workflow types -> (module relative to crm_agent, factory name)
+WORKFLOW_FACTORIES: Dict[str, Tuple[str, str]] = {
+    "crm_coordinator": ("...coordinator", "create_crm_coordinator"),
+    "crm_enrichment_pipeline": (".crm_enrichment", "create_crm_enrichment_pipeline"),
+    "crm_parallel_retrieval": (".crm_enrichment", "create_crm_parallel_retrieval_workflow"),
+    "crm_quick_lookup": (".crm_enrichment", "create_crm_quick_lookup_workflow"),
+    "field_enrichment_workflow": (".field_enrichment_workflow", "create_field_enrichment_workflow"),
+}
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Stable hash of a workflow configuration."""
+    encoded = json.dumps(config, sort_keys=True, default=repr)
+    return hashlib.sha256(encoded.encode()).hexdigest()[:16]
+
+
+class WorkflowGraphCache:
+    """Thread-safe cache of built workflow graphs keyed by (type, config hash)."""
+
+    def __init__(self):
+        self._graphs: Dict[Tuple[str, str], Any] = {}
+        self._lock = threading.RLock()
+        self.builds = 0
+        self.hits = 0
+
+    @staticmethod
+    def _resolve_factory(workflow_type: str) -> Callable[..., Any]:
+        if workflow_type not in WORKFLOW_FACTORIES:
+            available = ", ".join(WORKFLOW_FACTORIES)
+            raise ValueError(f"Unknown workflow type: {workflow_type}. Available: {available}")
+        module_name, factory_name = WORKFLOW_FACTORIES[workflow_type]
+        module = importlib.import_module(module_name, package=__package__)
+        return getattr(module, factory_name)
+
+    def get(
+        self,
+        workflow_type: str,
+        factory: Optional[Callable[..., Any]] = None,
+        **config: Any,
+    ) -> Any:
+        """
+        Return the shared graph for a workflow type and configuration.
+
+        Args:
+            workflow_type: Cache namespace (see WORKFLOW_FACTORIES for built-ins)
+            factory: Builder to use instead of the built-in factory
+            **config: Arguments passed to the factory; part of the cache key
+
+        Returns:
+            Shared workflow root agent; run it, do not mount it (see take())
+        """
+        key = (workflow_type, config_hash(config))
+        with self._lock:
+            graph = self._graphs.get(key)
+            if graph is not None and getattr(graph, "parent_agent", None) is None:
+                self.hits += 1
+                return graph
+
+            build = factory or self._resolve_factory(workflow_type)
+            graph = build(**config)
+            self._graphs[key] = graph
+            self.builds += 1
+            return graph
+
+    def take(
+        self,
+        workflow_type: str,
+        factory: Optional[Callable[..., Any]] = None,
+        **config: Any,
+    ) -> Any:
+        """
+        Build a graph owned by the caller, for mounting as a sub-agent.
+
+        Graphs that get mounted are never cached: a cached graph may be
+        running for a get() caller, and a mounted one belongs to its parent.
+        """
+        graph = (factory or self._resolve_factory(workflow_type))(**config)
+        with self._lock:
+            self.builds += 1
+        return graph
+
+    def clear(self, workflow_type: Optional[str] = None) -> None:
+        """Drop cached graphs, optionally only for one workflow type."""
+        with self._lock:
+            if workflow_type is None:
+                self._graphs.clear()
+            else:
+                for key in [k for k in self._graphs if k[0] == workflow_type]:
+                    del self._graphs[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return cache counters."""
+        with self._lock:
+            return {
+                "graphs": len(self._graphs),
+                "builds": self.builds,
+                "hits": self.hits,
+            }
+
+
+# Global workflow graph cache
+workflow_graph_cache = WorkflowGraphCache()
+
+
+def get_workflow_graph(workflow_type: str, **config: Any) -> Any:
+    """Get the process-wide shared graph for a workflow type (run it, do not mount it)."""
+    return workflow_graph_cache.get(workflow_type, **config)
+
+
+def take_workflow_graph(workflow_type: str, **config: Any) -> Any:
+    """Get a graph for a workflow type that the caller owns and may mount."""
+    return workflow_graph_cache.take(workflow_type, **config)
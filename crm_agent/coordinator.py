@@ -7,8 +7,6 @@ from typing import Dict, Any, List, Optional
 from google.adk.agents import LlmAgent
 from .core.factory import crm_agent_registry
 from .core.state_models import CRMSessionState, create_initial_crm_state
-from .agents.specialized.crm_agents import *
-from .agents.workflows.crm_enrichment import *
 
 
 def create_crm_coordinator() -> LlmAgent:
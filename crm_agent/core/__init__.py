@@ -1,9 +1,11 @@
 """CRM core components."""
 
-from .factory import *
+from ..utils.lazy_imports import lazy_exports
 
 __all__ = [
     "CRMAgentRegistry", 
     "crm_agent_registry",
     "get_crm_agent"
 ]
+
+__getattr__, __dir__ = lazy_exports(globals(), {name: ".factory" for name in __all__})
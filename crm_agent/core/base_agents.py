@@ -9,9 +9,7 @@ suppress_adk_warnings()
 
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.agents import SequentialAgent, ParallelAgent
-from google.adk.tools.mcp_tool import StdioConnectionParams
-from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
-from mcp import StdioServerParameters
+from .mcp_toolsets import mcp_toolset_manager
 from typing import List, Optional, Dict, Any
 from abc import ABC, abstractmethod
 
@@ -41,18 +39,8 @@ class BaseAgent(LlmAgent):
             additional_tools: Additional tools beyond MCP toolset
             **kwargs: Additional arguments passed to LlmAgent
         """
-        # Standard MCP toolset for all CRM agents (with warning suppression)
-        from ..utils.warning_suppression import SuppressWarnings
-        with SuppressWarnings():
-            mcp_toolset = MCPToolset(
-                connection_params=StdioConnectionParams(
-                    server_params=StdioServerParameters(
-                        command='python',
-                        args=['-m', 'crm_fastmcp_server.stdio_server'],
-                    ),
-                    timeout=30,
-                ),
-            )
+        # Shared MCP toolset: one server subprocess serves every CRM agent
+        mcp_toolset = mcp_toolset_manager.get_toolset()
         
         # Combine MCP tools with any additional tools
         tools = [mcp_toolset]
@@ -3,29 +3,91 @@ CRM Agent Factory with Registry Pattern.
 Implements the registry pattern for CRM-specific agent management.
 """
 
-from typing import Dict, Type, Callable, List, Any, Optional
-from google.adk.agents import BaseAgent, LlmAgent
-import os
+from __future__ import annotations
 
-try:
-    from google.adk.tools import OpenApiTool
-    OPENAPI_AVAILABLE = True
-except ImportError:
-    OpenApiTool = None
-    OPENAPI_AVAILABLE = False
+from collections import OrderedDict
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, Dict, Type, Callable, List, Any, Optional, Tuple
+import itertools
+import os
+import sys
+import threading
+import types
+
+from ..agents.workflows.graph_cache import config_hash
+from ..utils.lazy_imports import lazy_factory
+
+if TYPE_CHECKING:
+    from google.adk.agents import BaseAgent
+
+
+class InstancePolicy(str, Enum):
+    """How the registry reuses agent instances of a type."""
+    TRANSIENT = "transient"      # New instance on every create_agent() call
+    SINGLETON = "singleton"      # One shared instance per configuration
+    POOLED = "pooled"            # Up to pool_size instances, handed out round-robin
+    PER_SESSION = "per_session"  # One instance per session_id and configuration
+
+
+def _approximate_size(obj: Any, max_objects: int = 50000) -> int:
+    """Approximate deep size in bytes of an object graph (shared objects counted once)."""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack and len(seen) < max_objects:
+        current = stack.pop()
+        if id(current) in seen or isinstance(current, (type, types.ModuleType, types.FunctionType)):
+            continue
+        seen.add(id(current))
+        total += sys.getsizeof(current, 0)
+        if isinstance(current, dict):
+            stack.extend(current.keys())
+            stack.extend(current.values())
+        elif isinstance(current, (list, tuple, set, frozenset)):
+            stack.extend(current)
+        else:
+            stack.extend(vars(current).values() if hasattr(current, "__dict__") else ())
+            private = getattr(current, "__pydantic_private__", None)
+            if private:
+                stack.append(private)
+    return total
 
 
 class AgentRegistry:
     """
     Registry for dynamic agent creation and management.
     Enables flexible agent composition and easy testing.
+    
+    Each agent type has an InstancePolicy. Cached instances (singleton, pooled,
+    per-session) are created once under a per-key lock and reused, so config
+    files, toolsets and LLM clients are not rebuilt for every call. ADK agents
+    can only have one parent, so a cached instance that has been mounted as a
+    sub-agent is dropped and replaced on the next call.
     """
     
-    def __init__(self):
+    def __init__(self, max_sessions: int = 256):
         self._agent_factories: Dict[str, Callable[..., BaseAgent]] = {}
         self._agent_metadata: Dict[str, Dict[str, Any]] = {}
+        self._agent_policies: Dict[str, Dict[str, Any]] = {}
+        self._instances: Dict[Tuple[str, str, Optional[str]], List[BaseAgent]] = {}
+        self._round_robin: Dict[Tuple[str, str, Optional[str]], Any] = {}
+        self._build_locks: Dict[Tuple[str, str, Optional[str]], threading.Lock] = {}
+        # session_id -> instance keys, least recently used first
+        self._sessions: "OrderedDict[str, set]" = OrderedDict()
+        self._max_sessions = max_sessions
+        self._counters: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.RLock()
     
-    def register(self, name: str, factory: Callable[..., BaseAgent], metadata: Optional[Dict] = None):
+    def register(
+        self,
+        name: str,
+        factory: Callable[..., BaseAgent],
+        metadata: Optional[Dict] = None,
+        policy: InstancePolicy = InstancePolicy.TRANSIENT,
+        pool_size: int = 4,
+        warm_up: Optional[Callable[[BaseAgent], Any]] = None,
+    ):
         """
         Register an agent factory function.
         
@@ -33,9 +95,17 @@ class AgentRegistry:
             name: Agent type name
             factory: Factory function that creates the agent
             metadata: Optional metadata about the agent
+            policy: Instance reuse policy for this agent type
+            pool_size: Number of instances kept for POOLED agents
+            warm_up: Optional hook run on each newly created cached instance
         """
         self._agent_factories[name] = factory
         self._agent_metadata[name] = metadata or {}
+        self._agent_policies[name] = {
+            "policy": InstancePolicy(policy),
+            "pool_size": max(1, pool_size),
+            "warm_up": warm_up,
+        }
     
     def create_agent(self, name: str, **kwargs) -> BaseAgent:
         """
@@ -43,10 +113,11 @@ class AgentRegistry:
         
         Args:
             name: Agent type name
-            **kwargs: Arguments passed to the agent factory
+            **kwargs: Arguments passed to the agent factory; session_id selects
+                the instance for PER_SESSION agents and is not forwarded
             
         Returns:
-            Configured agent instance
+            Configured agent instance (shared unless the type is TRANSIENT)
             
         Raises:
             ValueError: If agent type is not registered
@@ -55,7 +126,130 @@ class AgentRegistry:
             available = ", ".join(self.list_agents())
             raise ValueError(f"Unknown agent type: {name}. Available: {available}")
         
-        return self._agent_factories[name](**kwargs)
+        session_id = kwargs.pop("session_id", None)
+        settings = self._agent_policies[name]
+        policy = settings["policy"]
+        if policy is InstancePolicy.TRANSIENT or (policy is InstancePolicy.PER_SESSION and session_id is None):
+            return self._build(name, kwargs)
+        
+        key = (name, config_hash(kwargs), session_id if policy is InstancePolicy.PER_SESSION else None)
+        limit = settings["pool_size"] if policy is InstancePolicy.POOLED else 1
+        
+        agent = self._reuse(key, limit)
+        if agent is not None:
+            return agent
+        
+        with self._lock:
+            build_lock = self._build_locks.setdefault(key, threading.Lock())
+        with build_lock:
+            # Another thread may have finished building while we waited
+            agent = self._reuse(key, limit)
+            if agent is not None:
+                return agent
+            agent = self._build(name, kwargs)
+            if settings["warm_up"] is not None:
+                settings["warm_up"](agent)
+            with self._lock:
+                self._instances.setdefault(key, []).append(agent)
+                if key[2] is not None:
+                    self._track_session(key)
+        return agent
+    
+    def _build(self, name: str, kwargs: Dict[str, Any]) -> BaseAgent:
+        agent = self._agent_factories[name](**kwargs)
+        with self._lock:
+            counters = self._counters.setdefault(name, {"created": 0, "reused": 0})
+            counters["created"] += 1
+        return agent
+    
+    def _reuse(self, key: Tuple[str, str, Optional[str]], limit: int) -> Optional[BaseAgent]:
+        """Return a cached instance for key once `limit` instances exist."""
+        with self._lock:
+            instances = self._instances.get(key)
+            if not instances:
+                return None
+            # Mounted instances now belong to their parent agent
+            instances[:] = [a for a in instances if getattr(a, "parent_agent", None) is None]
+            if len(instances) < limit:
+                return None
+            if key[2] is not None:
+                self._sessions.move_to_end(key[2])
+            counter = self._round_robin.setdefault(key, itertools.count())
+            self._counters[key[0]]["reused"] += 1
+            return instances[next(counter) % len(instances)]
+    
+    def _track_session(self, key: Tuple[str, str, Optional[str]]) -> None:
+        self._sessions.setdefault(key[2], set()).add(key)
+        self._sessions.move_to_end(key[2])
+        while len(self._sessions) > self._max_sessions:
+            oldest = next(iter(self._sessions))
+            self.end_session(oldest)
+    
+    def end_session(self, session_id: str) -> None:
+        """Release all PER_SESSION instances held for a session."""
+        with self._lock:
+            for key in self._sessions.pop(session_id, ()):
+                self._instances.pop(key, None)
+                self._round_robin.pop(key, None)
+                self._build_locks.pop(key, None)
+    
+    def warm_up(self, names: Optional[List[str]] = None) -> List[str]:
+        """
+        Create cached instances ahead of first use.
+        
+        Args:
+            names: Agent types to warm (default: all SINGLETON and POOLED types)
+            
+        Returns:
+            Agent types that were warmed
+        """
+        warmed = []
+        for name in names or self.list_agents():
+            settings = self._agent_policies[name]
+            if settings["policy"] not in (InstancePolicy.SINGLETON, InstancePolicy.POOLED):
+                continue
+            count = settings["pool_size"] if settings["policy"] is InstancePolicy.POOLED else 1
+            existing = len(self._instances.get((name, config_hash({}), None), []))
+            # Pooled types build a new instance per call until the pool is full
+            for _ in range(count - existing):
+                self.create_agent(name)
+            warmed.append(name)
+        return warmed
+    
+    def clear_instances(self, name: Optional[str] = None) -> None:
+        """Drop cached instances, optionally only for one agent type."""
+        with self._lock:
+            for key in [k for k in self._instances if name is None or k[0] == name]:
+                self._instances.pop(key, None)
+                self._round_robin.pop(key, None)
+            if name is None:
+                self._sessions.clear()
+    
+    def memory_usage(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Report cached instances and their approximate memory per agent type.
+        
+        Returns:
+            {agent type: {"policy", "instances", "created", "reused", "approx_bytes"}}
+        """
+        with self._lock:
+            by_type: Dict[str, List[BaseAgent]] = {}
+            for (name, _, _), instances in self._instances.items():
+                by_type.setdefault(name, []).extend(
+                    a for a in instances if getattr(a, "parent_agent", None) is None
+                )
+            counters = {name: dict(c) for name, c in self._counters.items()}
+        
+        report = {}
+        for name in sorted(set(by_type) | set(counters)):
+            instances = by_type.get(name, [])
+            report[name] = {
+                "policy": self._agent_policies[name]["policy"].value,
+                "instances": len(instances),
+                **counters.get(name, {"created": 0, "reused": 0}),
+                "approx_bytes": sum(_approximate_size(agent) for agent in instances),
+            }
+        return report
     
     def list_agents(self) -> List[str]:
         """List all registered agent types."""
@@ -79,185 +273,167 @@ class CRMAgentRegistry(AgentRegistry):
     def _register_crm_agents(self):
         """Register CRM-specific agents for data enrichment and cleanup."""
         
-        # Import CRM agents
-        from ..agents.specialized.crm_agents import (
-            create_crm_query_builder,
-            create_crm_web_retriever,
-            create_crm_linkedin_retriever,
-            create_crm_company_data_retriever,
-            create_crm_email_verifier,
-            create_crm_summarizer,
-            create_crm_entity_resolver,
-            create_crm_updater,
-        )
-        from ..agents.specialized.company_intelligence_agent import create_company_intelligence_agent
-        from ..agents.specialized.outreach_personalizer_agent import create_outreach_personalizer_agent
-        from ..agents.specialized.contact_intelligence_agent import create_contact_intelligence_agent
-        from ..agents.specialized.crm_enrichment_agent import create_agent as create_crm_enrichment_agent
-        from ..agents.specialized.field_enrichment_manager_agent import FieldEnrichmentManagerAgent
-        from ..agents.specialized.company_llm_enrichment_agent import create_company_llm_enrichment_agent
-        from ..agents.specialized.company_competitor_agent import create_company_competitor_agent
-        from ..agents.specialized.company_management_agent import create_company_management_agent
-        from ..agents.specialized.field_mapping_agent import create_field_mapping_agent
-        from ..agents.specialized.lead_scoring_agent import create_lead_scoring_agent
+        # Factories are imported on first create_agent() call, so building the
+        # registry does not load every agent module and its dependencies
+        def agent_factory(module: str, attr: str) -> Callable[..., BaseAgent]:
+            return lazy_factory(module, attr, __package__)
+        
         # Note: CRM data quality workflow is created in the CRM workflows module
         
+        # An ADK agent can only have one parent. Types the coordinator mounts as
+        # sub-agents (intelligence, enrichment, retrievers, workflows) stay
+        # TRANSIENT; SINGLETON/POOLED is only for agents called directly.
+        
         # Crm Enrichment Agent
-        self.register("crm_enrichment", create_crm_enrichment_agent, {
+        self.register("crm_enrichment", agent_factory("..agents.specialized.crm_enrichment_agent", "create_agent"), {
             "description": "Enriches CRM data by filling in gaps using grounded web searches.",
             "domain": "crm_data_enrichment",
             "tools": ["web_search", "fetch_url"]
-        })
+        }, policy=InstancePolicy.TRANSIENT)
 
         # Company Intelligence Agent
-        self.register("company_intelligence", create_company_intelligence_agent, {
+        self.register("company_intelligence", agent_factory("..agents.specialized.company_intelligence_agent", "create_company_intelligence_agent"), {
             "description": "Provides comprehensive company analysis and intelligence.",
             "domain": "company_intelligence",
             "tools": ["search_companies", "get_company_details", "generate_company_report", "web_search", "get_company_metadata"]
-        })
+        }, policy=InstancePolicy.TRANSIENT)
 
         # Contact Intelligence Agent
-        self.register("contact_intelligence", create_contact_intelligence_agent, {
+        self.register("contact_intelligence", agent_factory("..agents.specialized.contact_intelligence_agent", "create_contact_intelligence_agent"), {
             "description": "Provides comprehensive analysis of contacts",
             "capabilities": ["Contact analysis", "Relationship mapping", "Data enrichment"]
-        })
+        }, policy=InstancePolicy.TRANSIENT)
 
         # Field Enrichment Manager Agent
-        self.register("field_enrichment_manager", lambda **kwargs: FieldEnrichmentManagerAgent(**kwargs), {
+        self.register("field_enrichment_manager", agent_factory("..agents.specialized.field_enrichment_manager_agent", "FieldEnrichmentManagerAgent"), {
             "description": "Manages systematic field enrichment, validation, and quality improvement for top 10 Swoop sales fields",
             "domain": "field_enrichment_management",
             "tools": ["search_companies", "search_contacts", "generate_company_report", "generate_contact_report", "web_search", "get_company_metadata"]
-        })
+        }, policy=InstancePolicy.PER_SESSION)
 
         # Company LLM Enrichment Agent
-        self.register("company_llm_enrichment", create_company_llm_enrichment_agent, {
+        self.register("company_llm_enrichment", agent_factory("..agents.specialized.company_llm_enrichment_agent", "create_company_llm_enrichment_agent"), {
             "description": "Provides LLM-powered data enrichment for companies",
             "capabilities": ["Company data enrichment", "LLM-based analysis", "Web scraping"]
-        })
+        }, policy=InstancePolicy.SINGLETON)
 
         # Company Competitor Agent
-        self.register("company_competitor", create_company_competitor_agent, {
+        self.register("company_competitor", agent_factory("..agents.specialized.company_competitor_agent", "create_company_competitor_agent"), {
             "description": "Identifies competitors for a given company.",
             "capabilities": ["Competitor analysis", "Company data enrichment"]
-        })
+        }, policy=InstancePolicy.POOLED)
 
         # Company Management Agent
-        self.register("company_management_enrichment", create_company_management_agent, {
+        # TRANSIENT: its management company cache is unlocked and never refreshed,
+        # and the project orchestrator runs it on several threads at once
+        self.register("company_management_enrichment", agent_factory("..agents.specialized.company_management_agent", "create_company_management_agent"), {
             "description": "Identifies and sets the management company for golf courses.",
             "capabilities": ["Company data enrichment", "Fuzzy matching"]
-        })
+        }, policy=InstancePolicy.TRANSIENT)
 
         # Field Mapping Agent
-        self.register("field_mapping", create_field_mapping_agent, {
+        self.register("field_mapping", agent_factory("..agents.specialized.field_mapping_agent", "create_field_mapping_agent"), {
             "description": "Maps field names to correct HubSpot internal names using field profiles.",
             "capabilities": ["Field name mapping", "HubSpot property identification", "Fuzzy matching"]
-        })
+        }, policy=InstancePolicy.SINGLETON)
 
         # Lead Scoring Agent (Phase 6)
-        self.register("lead_scoring", create_lead_scoring_agent, {
+        self.register("lead_scoring", agent_factory("..agents.specialized.lead_scoring_agent", "create_lead_scoring_agent"), {
             "description": "Computes Fit and Intent scores for leads and writes swoop_fit_score, swoop_intent_score, swoop_total_lead_score.",
             "domain": "lead_scoring",
             "tools": ["get_hubspot_contact", "get_hubspot_company", "update_company", "update_contact"]
-        })
+        }, policy=InstancePolicy.SINGLETON)
 
         # Outreach Personalizer Agent (Phase 7)
-        self.register("outreach_personalizer", create_outreach_personalizer_agent, {
+        self.register("outreach_personalizer", agent_factory("..agents.specialized.outreach_personalizer_agent", "create_outreach_personalizer_agent"), {
             "description": "Generates grounded, role-aware outreach drafts and creates Email/Task engagements in HubSpot.",
             "domain": "outreach_personalization",
             "tools": ["get_hubspot_contact", "get_hubspot_company", "create_email_engagement", "create_task"]
-        })
+        }, policy=InstancePolicy.SINGLETON)
 
         # CRM Query Builder Agent
-        self.register("crm_query_builder", create_crm_query_builder, {
+        self.register("crm_query_builder", agent_factory("..agents.specialized.crm_agents", "create_crm_query_builder"), {
             "description": "Crafts precise queries for web/LinkedIn/company sources from CRM gaps",
             "domain": "crm_query_planning",
             "tools": ["web_search", "fetch_url"]
         })
         
         # CRM Web Retriever Agent
-        self.register("crm_web_retriever", create_crm_web_retriever, {
+        self.register("crm_web_retriever", agent_factory("..agents.specialized.crm_agents", "create_crm_web_retriever"), {
             "description": "Executes web searches and extracts candidate facts",
             "domain": "web_retrieval", 
             "tools": ["web_search", "fetch_url"]
         })
         
         # CRM LinkedIn Retriever Agent
-        self.register("crm_linkedin_retriever", create_crm_linkedin_retriever, {
+        self.register("crm_linkedin_retriever", agent_factory("..agents.specialized.crm_agents", "create_crm_linkedin_retriever"), {
             "description": "Retrieves LinkedIn company/contact profile metadata",
             "domain": "linkedin_retrieval",
             "tools": ["linkedin_company_lookup", "web_search"]
         })
         
         # CRM Company Data Retriever Agent
-        self.register("crm_company_data_retriever", create_crm_company_data_retriever, {
+        self.register("crm_company_data_retriever", agent_factory("..agents.specialized.crm_agents", "create_crm_company_data_retriever"), {
             "description": "Retrieves structured company data from external sources",
             "domain": "company_data_retrieval",
             "tools": ["get_company_metadata", "web_search"]
         })
         
         # CRM Email Verifier Agent
-        self.register("crm_email_verifier", create_crm_email_verifier, {
+        self.register("crm_email_verifier", agent_factory("..agents.specialized.crm_agents", "create_crm_email_verifier"), {
             "description": "Validates email deliverability and assesses risk",
             "domain": "email_verification",
             "tools": ["verify_email"]
         })
         
         # CRM Summarizer Agent
-        self.register("crm_summarizer", create_crm_summarizer, {
+        self.register("crm_summarizer", agent_factory("..agents.specialized.crm_agents", "create_crm_summarizer"), {
             "description": "Normalizes and deduplicates findings into concise summaries",
             "domain": "data_synthesis",
             "tools": []  # Uses session state data
         })
         
         # CRM Entity Resolution Agent
-        self.register("crm_entity_resolver", create_crm_entity_resolver, {
+        self.register("crm_entity_resolver", agent_factory("..agents.specialized.crm_agents", "create_crm_entity_resolver"), {
             "description": "Maps findings to CRM objects and handles deduplication",
             "domain": "entity_resolution",
             "tools": []  # Uses session state data
         })
         
         # CRM Updater Agent
-        self.register("crm_updater", create_crm_updater, {
+        self.register("crm_updater", agent_factory("..agents.specialized.crm_agents", "create_crm_updater"), {
             "description": "Prepares and applies updates to HubSpot CRM",
             "domain": "crm_updates",
             "tools": ["query_hubspot_crm", "get_hubspot_contact", "get_hubspot_company", "await_human_approval", "notify_slack"]
         })
         
-        # CRM Workflows - Import workflow creation functions
-        from ..agents.workflows.crm_enrichment import (
-            create_crm_enrichment_pipeline,
-            create_crm_parallel_retrieval_workflow,
-            create_crm_quick_lookup_workflow,
-        )
+        # CRM Workflows - the coordinator mounts these, so each caller takes its own graph
+        from ..agents.workflows.graph_cache import take_workflow_graph
         
         # CRM Enrichment Pipeline
-        self.register("crm_enrichment_pipeline", create_crm_enrichment_pipeline, {
+        self.register("crm_enrichment_pipeline", partial(take_workflow_graph, "crm_enrichment_pipeline"), {
             "description": "Complete CRM enrichment pipeline with gap detection, retrieval, synthesis, and updates",
             "domain": "crm_workflows",
             "tools": ["hubspot_tools"]
         })
         
         # CRM Parallel Retrieval
-        self.register("crm_parallel_retrieval", create_crm_parallel_retrieval_workflow, {
+        self.register("crm_parallel_retrieval", partial(take_workflow_graph, "crm_parallel_retrieval"), {
             "description": "Parallel execution of web, LinkedIn, company data, and email verification",
             "domain": "crm_workflows",
             "tools": ["retrieval_tools"]
         })
         
         # CRM Quick Lookup
-        self.register("crm_quick_lookup", create_crm_quick_lookup_workflow, {
+        self.register("crm_quick_lookup", partial(take_workflow_graph, "crm_quick_lookup"), {
             "description": "Quick CRM record lookup and summary generation",
             "domain": "crm_workflows",
             "tools": ["hubspot_tools"]
         })
         
         # Field Enrichment Workflows
-        from ..agents.workflows.field_enrichment_workflow import (
-            create_field_enrichment_workflow,
-        )
-        
         # Comprehensive Field Enrichment Workflow
-        self.register("field_enrichment_workflow", create_field_enrichment_workflow, {
+        self.register("field_enrichment_workflow", partial(take_workflow_graph, "field_enrichment_workflow"), {
             "description": "Complete field enrichment workflow combining sequential, parallel, and loop patterns",
             "domain": "field_enrichment_workflows",
             "tools": ["all_enrichment_tools"]
@@ -274,7 +450,9 @@ def create_hubspot_openapi_tool():
     Create HubSpot OpenAPI tool for Phase 3 implementation.
     Uses environment variables for authentication.
     """
-    if not OPENAPI_AVAILABLE or OpenApiTool is None:
+    try:
+        from google.adk.tools import OpenApiTool
+    except ImportError:
         raise ImportError("OpenApiTool not available in this environment")
     
     hubspot_token = os.getenv('PRIVATE_APP_ACCESS_TOKEN')
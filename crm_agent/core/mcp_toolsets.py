@@ -0,0 +1,117 @@
+"""
+Process-wide MCP toolset manager.
+
+Every CRM agent talks to the same ``crm_fastmcp_server.stdio_server``. Rather
+than launching one server subprocess per agent, agents share a small pool of
+MCPToolset instances. Each toolset keeps a single stdio session that
+multiplexes tool calls from any number of agents (MCP requests are matched by
+id), and caches the tool list for all of them.
+
+A server that crashes is detected by the toolset's session manager on the next
+call and relaunched; restart() forces this explicitly. All shared servers are
+shut down when the interpreter exits.
+"""
+
+import asyncio
+import atexit
+import itertools
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from google.adk.tools.mcp_tool import StdioConnectionParams
+from google.adk.tools.mcp_tool.mcp_toolset import MCPToolset
+from mcp import StdioServerParameters
+
+
+# Number of MCP server subprocesses shared by all agents in the process
+DEFAULT_SERVER_POOL_SIZE = int(os.getenv("CRM_MCP_SERVER_POOL_SIZE", "1"))
+
+MCP_SERVER_MODULE = "crm_fastmcp_server.stdio_server"
+
+
+def create_mcp_toolset(timeout: float = 30) -> MCPToolset:
+    """Create a standalone MCPToolset backed by its own server subprocess."""
+    from ..utils.warning_suppression import SuppressWarnings
+    with SuppressWarnings():
+        return MCPToolset(
+            connection_params=StdioConnectionParams(
+                server_params=StdioServerParameters(
+                    command='python',
+                    args=['-m', MCP_SERVER_MODULE],
+                ),
+                timeout=timeout,
+            ),
+        )
+
+
+class MCPToolsetManager:
+    """
+    Hands out shared MCPToolset instances to agents.
+
+    Toolsets are created lazily and assigned round-robin, so the number of
+    server subprocesses is bounded by pool_size regardless of agent count.
+    """
+
+    def __init__(self, pool_size: Optional[int] = None, timeout: float = 30):
+        self.pool_size = max(1, pool_size or DEFAULT_SERVER_POOL_SIZE)
+        self.timeout = timeout
+        self._toolsets: List[MCPToolset] = []
+        self._next = itertools.count()
+        self._lock = threading.Lock()
+        self.restarts = 0
+        atexit.register(self._close_at_exit)
+
+    def get_toolset(self) -> MCPToolset:
+        """Return a shared toolset, creating pool members on first use."""
+        with self._lock:
+            if len(self._toolsets) < self.pool_size:
+                toolset = create_mcp_toolset(self.timeout)
+                self._toolsets.append(toolset)
+                return toolset
+            return self._toolsets[next(self._next) % self.pool_size]
+
+    def owns(self, toolset: Any) -> bool:
+        """Return True if the toolset is shared and managed here."""
+        return any(toolset is shared for shared in self._toolsets)
+
+    async def restart(self, toolset: Optional[MCPToolset] = None) -> None:
+        """
+        Restart shared servers.
+
+        Closing a toolset terminates its subprocess; the next tool call opens a
+        fresh session, so agents holding the toolset keep working unchanged.
+
+        Args:
+            toolset: Shared toolset to restart (all of them if None)
+        """
+        targets = [toolset] if toolset is not None else list(self._toolsets)
+        for target in targets:
+            await target.close()
+            self.restarts += 1
+
+    async def close(self) -> None:
+        """Shut down every shared server subprocess."""
+        for toolset in list(self._toolsets):
+            await toolset.close()
+
+    def _close_at_exit(self) -> None:
+        if not self._toolsets:
+            return
+        try:
+            asyncio.run(self.close())
+        except Exception:
+            # Interpreter shutdown; the servers exit on stdin EOF regardless
+            pass
+
+    def stats(self) -> Dict[str, int]:
+        """Return pool counters."""
+        return {
+            "pool_size": self.pool_size,
+            "toolsets": len(self._toolsets),
+            "restarts": self.restarts,
+        }
+
+
+# Global shared toolset manager
+mcp_toolset_manager = MCPToolsetManager()
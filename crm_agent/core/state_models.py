@@ -3,8 +3,8 @@ Typed state models for CRM multi-agent system.
 Provides type-safe state management using Pydantic models.
 """
 
-from pydantic import BaseModel, Field
-from typing import List, Dict, Optional, Any
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import List, Dict, Optional, Any, Set
 from datetime import datetime
 import uuid
 import hashlib
@@ -61,6 +61,13 @@ class CRMSessionState(BaseModel):
     """
     Central session state for CRM multi-agent system.
     Manages shared data and communication between agents for CRM enrichment.
+    
+    Every field assignment bumps a state version and records which field
+    changed, so callers can checkpoint or forward only what changed since a
+    given version (see changes_since / serialize_changes). snapshot() hands
+    sub-agents a copy that shares containers with this state until either
+    side mutates them through the helper methods; merge_changes() folds the
+    sub-agent's changes back in.
     """
     # Identifiers
     contact_id: Optional[str] = None
@@ -120,25 +127,141 @@ class CRMSessionState(BaseModel):
     # Idempotency tracking for Phase 3
     idempotency_keys: Dict[str, str] = Field(default_factory=dict)
     
+    # Change tracking (not serialized)
+    _version: int = PrivateAttr(default=0)
+    _field_versions: Dict[str, int] = PrivateAttr(default_factory=dict)
+    _shared_fields: Set[str] = PrivateAttr(default_factory=set)
+    # Containers this snapshot started from, for merge_changes
+    _base: Dict[str, Any] = PrivateAttr(default_factory=dict)
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name in type(self).model_fields:
+            # A newly assigned value is no longer shared with any snapshot
+            self._shared_fields.discard(name)
+            self._base.pop(name, None)
+            self._mark_dirty(name)
+    
+    @property
+    def version(self) -> int:
+        """Monotonic version, incremented on every tracked change."""
+        return self._version
+    
+    def _mark_dirty(self, field_name: str):
+        self._version += 1
+        self._field_versions[field_name] = self._version
+    
+    def _mutable(self, field_name: str) -> Any:
+        """Return a container field safe to mutate in place (copy-on-write)."""
+        value = self.__dict__[field_name]
+        if field_name in self._shared_fields:
+            value = value.copy()
+            self.__dict__[field_name] = value
+            self._shared_fields.discard(field_name)
+        return value
+    
+    def append_item(self, field_name: str, item: Any):
+        """Append to a list field, recording the change."""
+        self._mutable(field_name).append(item)
+        self._mark_dirty(field_name)
+        self.update_timestamp()
+    
+    def set_item(self, field_name: str, key: str, value: Any):
+        """Set a key in a dict field, recording the change."""
+        self._mutable(field_name)[key] = value
+        self._mark_dirty(field_name)
+        self.update_timestamp()
+    
+    def snapshot(self) -> "CRMSessionState":
+        """
+        Copy this state for a sub-agent without deep-copying its containers.
+        
+        Lists and dicts are shared until either copy changes them through
+        assignment, append_item/set_item or the add_* helpers; appending to
+        a shared list directly (state.web_findings.append(...)) bypasses the
+        copy and should not be done on snapshots.
+        """
+        clone = self.model_copy()
+        shared = {name for name, value in self.__dict__.items() if isinstance(value, (list, dict))}
+        self._shared_fields.update(shared)
+        clone._shared_fields = set(shared)
+        clone._field_versions = dict(self._field_versions)
+        clone._version = self._version
+        clone._base = {name: self.__dict__[name] for name in shared}
+        return clone
+    
+    def merge_changes(self, snapshot: "CRMSessionState", since_version: int):
+        """
+        Merge what a snapshot changed after `since_version` into this state.
+        
+        Items the snapshot appended to a list or set in a dict are added to
+        this state's container, so snapshots merged one after another do not
+        drop each other's additions. Fields the snapshot reassigned replace
+        this state's value.
+        """
+        for name, value in snapshot.changes_since(since_version).items():
+            base = snapshot._base.get(name)
+            if base is None:
+                setattr(self, name, value)
+            elif isinstance(value, list):
+                for item in value[len(base):]:
+                    self.append_item(name, item)
+            else:
+                for key, item in value.items():
+                    if key not in base or base[key] is not item:
+                        self.set_item(name, key, item)
+    
+    def changes_since(self, version: int) -> Dict[str, Any]:
+        """Return the fields changed after `version`, keyed by field name."""
+        return {
+            name: getattr(self, name)
+            for name, field_version in self._field_versions.items()
+            if field_version > version
+        }
+    
+    def serialize_changes(self, since_version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Serialize only the sections changed after `since_version`.
+        
+        Args:
+            since_version: Version of the last checkpoint (None serializes everything)
+            
+        Returns:
+            {"session_id", "version", "changes"} with JSON-compatible values
+        """
+        include = None if since_version is None else set(self.changes_since(since_version))
+        return {
+            "session_id": self.session_id,
+            "version": self._version,
+            "changes": self.model_dump(mode="json", include=include) if include != set() else {},
+        }
+    
+    def apply_changes(self, delta: Dict[str, Any]):
+        """Apply a delta produced by serialize_changes, validating each field."""
+        for name, value in delta.get("changes", {}).items():
+            if name in type(self).model_fields:
+                self.__pydantic_validator__.validate_assignment(self, name, value)
+                self._shared_fields.discard(name)
+                self._base.pop(name, None)
+                self._mark_dirty(name)
+    
     def update_timestamp(self):
         """Update the last_updated timestamp."""
         self.last_updated = datetime.now()
     
     def add_routing_decision(self, from_agent: str, to_agent: str, reason: str):
         """Track agent routing decisions."""
-        self.routing_decisions.append({
+        self.append_item("routing_decisions", {
             "from": from_agent,
             "to": to_agent,
             "reason": reason,
             "timestamp": datetime.now().isoformat()
         })
-        self.update_timestamp()
     
     def add_agent_to_history(self, agent_name: str):
         """Add an agent to the interaction history."""
-        self.agent_history.append(agent_name)
         self.active_agent = agent_name
-        self.update_timestamp()
+        self.append_item("agent_history", agent_name)
     
     def get_analysis_result(self, key: str, default=None):
         """Get a result from normalized insights."""
@@ -146,13 +269,11 @@ class CRMSessionState(BaseModel):
     
     def set_analysis_result(self, key: str, value: Any):
         """Set a result in normalized insights."""
-        self.normalized_insights[key] = value
-        self.update_timestamp()
+        self.set_item("normalized_insights", key, value)
     
     def add_enrichment_result(self, result: CRMEnrichmentResult):
         """Add an enrichment result."""
-        self.enrichment_results.append(result)
-        self.update_timestamp()
+        self.append_item("enrichment_results", result)
     
     def generate_idempotency_key(self, object_type: str, object_id: str, field_set: List[str]) -> str:
         """
@@ -181,8 +302,7 @@ class CRMSessionState(BaseModel):
         
         # Store in session state for tracking
         operation_key = f"{object_type}:{object_id}"
-        self.idempotency_keys[operation_key] = idempotency_key
-        self.update_timestamp()
+        self.set_item("idempotency_keys", operation_key, idempotency_key)
         
         return idempotency_key
     
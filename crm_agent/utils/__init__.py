@@ -1,10 +1,44 @@
 """CRM utilities."""
 
 from .warning_suppression import *
+from .field_validation import (
+    FIELD_VALIDATORS,
+    field_type_for,
+    validate_many,
+    validate_value,
+)
+from .email_patterns import (
+    EmailPatternEngine,
+    infer_email_pattern,
+)
+from .job_titles import (
+    JobTitleClassifier,
+    classify_job_title,
+    classify_job_titles,
+)
+from .search_extraction import (
+    FIELD_EXTRACTORS,
+    SearchResults,
+    extract_fields,
+    normalize_search_results,
+)
 
 __all__ = [
     "suppress_adk_warnings",
     "suppress_all_experimental_warnings", 
-    "SuppressWarnings"
+    "SuppressWarnings",
+    "FIELD_VALIDATORS",
+    "field_type_for",
+    "validate_many",
+    "validate_value",
+    "EmailPatternEngine",
+    "infer_email_pattern",
+    "JobTitleClassifier",
+    "classify_job_title",
+    "classify_job_titles",
+    "FIELD_EXTRACTORS",
+    "SearchResults",
+    "extract_fields",
+    "normalize_search_results",
 ]
 
@@ -0,0 +1,192 @@
+"""
+Email pattern inference across companies.
+
+Each contact with an email address and a first and last name votes for the
+patterns its local part follows ("jsmith" -> flast). Votes are kept per
+company as a histogram, together with the IDs of the contacts already
+counted. The engine can therefore be saved, reloaded and fed only the
+contacts added since the last run.
+
+Matching is one structural check per contact: strip the last name off the
+end of the local part and compare what is left to the first name or
+initial. The candidate local parts are never generated.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Pattern labels stored in the email_pattern company property, in tie-break order
+EMAIL_PATTERNS = (
+    "first.last",
+    "firstlast",
+    "f.last",
+    "flast",
+    "first_last",
+    "firstinitial_lastname",
+    "firstinitiallastname",
+    "last.first",
+)
+UNKNOWN_PATTERN = "unknown"
+
+# Examined contacts needed before the winning share counts in full
+FULL_CONFIDENCE_SAMPLE = 5
+
+_FIRST_LABELS = {".": ("first.last",), "": ("firstlast",), "_": ("first_last",)}
+_INITIAL_LABELS = {".": ("f.last",), "": ("flast", "firstinitiallastname"), "_": ("firstinitial_lastname",)}
+_PATTERN_ORDER = {label: index for index, label in enumerate(EMAIL_PATTERNS)}
+
+
+def normalize_name(name: str) -> str:
+    """Lowercased letters of a name ("O'Brien-Smith" -> "obriensmith")."""
+    return "".join(ch for ch in (name or "").strip().lower() if ch.isalpha())
+
+
+def match_email_patterns(email: str, first_name: str, last_name: str) -> Tuple[str, ...]:
+    """Pattern labels the email's local part follows for this name (empty when none or unusable)."""
+    if not email or "@" not in email:
+        return ()
+    local = email.lower().split("@", 1)[0]
+    first, last = normalize_name(first_name), normalize_name(last_name)
+    if not local or not first or not last:
+        return ()
+
+    labels: Tuple[str, ...] = ()
+    if local.endswith(last):
+        head = local[:-len(last)]
+        sep = head[-1:] if head[-1:] in (".", "_") else ""
+        name = head[:len(head) - len(sep)]
+        if name == first:
+            labels += _FIRST_LABELS[sep]
+        if name == first[0]:
+            labels += _INITIAL_LABELS[sep]
+    if local == f"{last}.{first}":
+        labels += ("last.first",)
+    return labels
+
+
+def _contact_fields(contact: Dict[str, Any]) -> Tuple[Optional[str], str, str, str]:
+    """(id, email, firstname, lastname) of a HubSpot contact record or flat contact dict."""
+    props = contact.get("properties") or contact
+    contact_id = contact.get("id")
+    return (str(contact_id) if contact_id is not None else None,
+            props.get("email") or "", props.get("firstname") or "", props.get("lastname") or "")
+
+
+@dataclass
+class EmailPatternResult:
+    """Inferred pattern for one company."""
+    pattern: str
+    confidence: float
+    votes: Dict[str, int]
+    examined: int
+
+    def to_properties(self) -> Dict[str, str]:
+        """Company properties for a HubSpot update (confidence and votes are custom properties)."""
+        return {
+            "email_pattern": self.pattern,
+            "email_pattern_confidence": f"{self.confidence:.2f}",
+            "email_pattern_votes": json.dumps(self.votes, sort_keys=True),
+        }
+
+
+@dataclass
+class _CompanyVotes:
+    votes: Dict[str, int] = field(default_factory=dict)
+    examined: int = 0
+    counted: Set[str] = field(default_factory=set)
+
+
+class EmailPatternEngine:
+    """Per-company email pattern vote histograms, updatable incrementally."""
+
+    def __init__(self):
+        self.companies: Dict[str, _CompanyVotes] = {}
+
+    def new_contact_ids(self, company_id: str, contact_ids: Iterable[str]) -> List[str]:
+        """The contact IDs not yet counted for the company."""
+        counted = self.companies[company_id].counted if company_id in self.companies else ()
+        return [str(cid) for cid in contact_ids if str(cid) not in counted]
+
+    def add_contacts(self, company_id: str, contacts: Iterable[Dict[str, Any]]) -> int:
+        """
+        Count the votes of a company's contacts.
+
+        Contacts with an ID already counted for the company are skipped, so
+        re-adding a company's full contact list only counts the new ones.
+
+        Returns:
+            Number of contacts newly examined (with a usable email and name)
+        """
+        company = self.companies.setdefault(str(company_id), _CompanyVotes())
+        votes, counted = company.votes, company.counted
+        examined = 0
+        for contact in contacts:
+            contact_id, email, first, last = _contact_fields(contact)
+            if contact_id is not None:
+                if contact_id in counted:
+                    continue
+                counted.add(contact_id)
+            if not email or "@" not in email or not normalize_name(first) or not normalize_name(last):
+                continue
+            examined += 1
+            for label in match_email_patterns(email, first, last):
+                votes[label] = votes.get(label, 0) + 1
+        company.examined += examined
+        return examined
+
+    def result(self, company_id: str) -> EmailPatternResult:
+        """
+        The company's pattern, the share of examined contacts following it
+        (scaled down below FULL_CONFIDENCE_SAMPLE contacts) and its votes.
+        """
+        company = self.companies.get(str(company_id)) or _CompanyVotes()
+        votes = dict(sorted(company.votes.items(), key=lambda kv: _PATTERN_ORDER.get(kv[0], len(EMAIL_PATTERNS))))
+        if not votes or not company.examined:
+            return EmailPatternResult(UNKNOWN_PATTERN, 0.0, votes, company.examined)
+        pattern = max(votes, key=lambda label: (votes[label], -_PATTERN_ORDER.get(label, len(EMAIL_PATTERNS))))
+        share = votes[pattern] / company.examined
+        confidence = round(share * min(1.0, company.examined / FULL_CONFIDENCE_SAMPLE), 2)
+        return EmailPatternResult(pattern, confidence, votes, company.examined)
+
+    def results(self) -> Dict[str, EmailPatternResult]:
+        return {company_id: self.result(company_id) for company_id in self.companies}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            company_id: {"votes": c.votes, "examined": c.examined, "counted": sorted(c.counted)}
+            for company_id, c in self.companies.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "EmailPatternEngine":
+        engine = cls()
+        for company_id, c in data.items():
+            engine.companies[company_id] = _CompanyVotes(
+                dict(c.get("votes", {})), int(c.get("examined", 0)), set(c.get("counted", []))
+            )
+        return engine
+
+    def save(self, path: str):
+        """Write the engine state to a JSON file."""
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "EmailPatternEngine":
+        """Engine state from a JSON file, or an empty engine when the file does not exist."""
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+def infer_email_pattern(contacts: Iterable[Dict[str, Any]]) -> EmailPatternResult:
+    """Pattern for a single company's contacts."""
+    engine = EmailPatternEngine()
+    engine.add_contacts("company", contacts)
+    return engine.result("company")
@@ -0,0 +1,100 @@
+"""
+Precompiled field validators for enrichment output.
+
+Validators are resolved once per field name into a field type (email, url,
+phone, general) and applied over batches of values with validate_many, so
+validating thousands of enriched records does not recompile patterns or
+rebuild normalization tables per value. The checks themselves are the
+ones EnrichmentValidatorAgent has always applied.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List
+
+
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+# Characters dropped when normalizing phone numbers
+PHONE_DELETE_TABLE = str.maketrans('', '', ' -()')
+
+_EMPTY_RESULT = {'valid': False, 'confidence': 0, 'issues': ['Empty value']}
+
+
+def _result(confidence: int, issue: str = None) -> Dict[str, Any]:
+    return {'valid': issue is None, 'confidence': confidence, 'issues': [issue] if issue else []}
+
+
+def validate_email(value: str) -> Dict[str, Any]:
+    if EMAIL_PATTERN.match(value):
+        return _result(90)
+    return _result(20, 'Invalid email format')
+
+
+def validate_url(value: str) -> Dict[str, Any]:
+    if value.startswith(('http://', 'https://')):
+        return _result(80)
+    return _result(40, 'URL should start with http:// or https://')
+
+
+def validate_phone(value: str) -> Dict[str, Any]:
+    digits = value.translate(PHONE_DELETE_TABLE)
+    if len(digits) >= 10 and digits.isdigit():
+        return _result(75)
+    return _result(30, 'Invalid phone format')
+
+
+def validate_general(value: str) -> Dict[str, Any]:
+    if len(value.strip()) > 2:
+        return _result(70)
+    return _result(30, 'Value too short')
+
+
+# Validator registry keyed by field type
+FIELD_VALIDATORS: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    'email': validate_email,
+    'url': validate_url,
+    'phone': validate_phone,
+    'general': validate_general,
+}
+
+
+@lru_cache(maxsize=1024)
+def field_type_for(field_name: str) -> str:
+    """Resolve a field name (e.g. 'website', 'mobilephone') to a validator type."""
+    name = field_name.lower()
+    if 'email' in name:
+        return 'email'
+    if 'website' in name or 'url' in name:
+        return 'url'
+    if 'phone' in name:
+        return 'phone'
+    return 'general'
+
+
+def validate_value(field_name: str, value: Any) -> Dict[str, Any]:
+    """Validate a single value for a field."""
+    return validate_many(field_name, (value,))[0]
+
+
+def validate_many(field_name: str, values: Iterable[Any]) -> List[Dict[str, Any]]:
+    """
+    Validate a batch of values for one field.
+
+    Args:
+        field_name: Field the values belong to; selects the validator once
+        values: Values to validate
+
+    Returns:
+        One {'valid', 'confidence', 'issues'} dict per value, in order
+    """
+    validator = FIELD_VALIDATORS[field_type_for(field_name)]
+    results = []
+    append = results.append
+    for value in values:
+        text = str(value) if value else ''
+        if not text.strip():
+            append({**_EMPTY_RESULT, 'issues': list(_EMPTY_RESULT['issues'])})
+        else:
+            append(validator(text))
+    return results
@@ -0,0 +1,202 @@
+"""
+Precompiled job title classifier.
+
+Seniority and function keyword tables are compiled once, at import, into a
+single Aho-Corasick automaton. One pass over a lowered title finds every
+keyword occurrence (overlapping ones included). For each table the
+classifier then picks the first-listed label that has a keyword in the
+title. The semantics are those of the original per-call `keyword in title`
+checks, without rebuilding the tables or scanning the title once per
+keyword. Results are cached per normalized title, and classify_many
+classifies each distinct title in a batch once.
+"""
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+# Label -> keywords. Labels are listed in precedence order: the first label
+# with a keyword anywhere in the title wins.
+SENIORITY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'C-Level': (
+        'ceo', 'chief executive officer', 'president', 'founder', 'owner', 'principal',
+        'cfo', 'chief financial officer', 'cto', 'chief technology officer',
+        'coo', 'chief operating officer', 'cmo', 'chief marketing officer',
+        'chro', 'chief human resources officer', 'ciso', 'chief information security officer',
+    ),
+    'VP': (
+        'vp', 'vice president', 'executive vice president', 'evp', 'senior vice president', 'svp',
+    ),
+    'Director': (
+        'director', 'head of', 'senior director', 'executive director', 'managing director',
+    ),
+    'Manager': (
+        'manager', 'senior manager', 'team lead', 'team leader', 'supervisor',
+        'program manager', 'project manager', 'product manager', 'account manager',
+    ),
+    'Senior': (
+        'senior', 'lead', 'principal', 'staff', 'senior analyst', 'senior consultant',
+        'senior engineer', 'senior developer', 'senior specialist',
+    ),
+}
+
+FUNCTION_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'Sales': (
+        'sales', 'business development', 'account executive', 'sales rep', 'sales manager',
+        'business development manager', 'account manager', 'sales director', 'revenue',
+    ),
+    'Marketing': (
+        'marketing', 'brand', 'digital marketing', 'content', 'social media',
+        'growth', 'demand generation', 'product marketing', 'communications',
+    ),
+    'Operations': (
+        'operations', 'ops', 'operational', 'supply chain', 'logistics',
+        'process', 'quality', 'facilities', 'procurement',
+    ),
+    'Finance': (
+        'finance', 'financial', 'accounting', 'controller', 'treasurer',
+        'fp&a', 'financial planning', 'budget', 'audit',
+    ),
+    'Human Resources': (
+        'hr', 'human resources', 'people', 'talent', 'recruiting', 'recruitment',
+        'compensation', 'benefits', 'organizational development',
+    ),
+    'Engineering': (
+        'engineer', 'engineering', 'developer', 'development', 'software',
+        'technical', 'architect', 'devops', 'qa', 'quality assurance',
+    ),
+    'Product': (
+        'product', 'product manager', 'product owner', 'ux', 'ui', 'design',
+        'user experience', 'product development',
+    ),
+    'Customer Success': (
+        'customer success', 'customer support', 'customer service', 'support',
+        'client services', 'customer experience',
+    ),
+    'Legal': (
+        'legal', 'counsel', 'attorney', 'lawyer', 'compliance', 'regulatory',
+    ),
+    'IT': (
+        'it', 'information technology', 'systems', 'infrastructure', 'security',
+        'network', 'database', 'system administrator',
+    ),
+}
+
+DEFAULT_SENIORITY = 'Individual Contributor'
+DEFAULT_FUNCTION = 'General Management'
+UNKNOWN = {'seniority': 'Unknown', 'function': 'Unknown'}
+
+
+class KeywordAutomaton:
+    """Aho-Corasick automaton over several ordered label -> keywords tables."""
+
+    def __init__(self, tables: Sequence[Mapping[str, Sequence[str]]]):
+        self.labels = [list(table) for table in tables]
+        no_match = tuple(len(labels) for labels in self.labels)
+        goto: List[Dict[str, int]] = [{}]
+        ranks: List[List[int]] = [list(no_match)]
+
+        for index, table in enumerate(tables):
+            for rank, keywords in enumerate(table.values()):
+                for keyword in keywords:
+                    state = 0
+                    for char in keyword:
+                        nxt = goto[state].get(char)
+                        if nxt is None:
+                            nxt = len(goto)
+                            goto[state][char] = nxt
+                            goto.append({})
+                            ranks.append(list(no_match))
+                        state = nxt
+                    ranks[state][index] = min(ranks[state][index], rank)
+
+        # Breadth-first failure links, folded into a full transition table so
+        # the scan is one dict lookup per character. Each state also reports
+        # the keywords ending at its failure state.
+        fail = [0] * len(goto)
+        delta: List[Dict[str, int]] = [{}] * len(goto)
+        delta[0] = dict(goto[0])
+        queue = deque(goto[0].values())
+        for state in queue:
+            delta[state] = {**delta[0], **goto[state]}
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                fail[nxt] = delta[fail[state]].get(char, 0)
+                delta[nxt] = {**delta[fail[nxt]], **goto[nxt]}
+                ranks[nxt] = [min(a, b) for a, b in zip(ranks[nxt], ranks[fail[nxt]])]
+                queue.append(nxt)
+
+        self._delta = delta
+        # None for states where no keyword ends, so the scan skips them cheaply
+        self._ranks: List[Optional[Tuple[int, ...]]] = [
+            tuple(r) if tuple(r) != no_match else None for r in ranks
+        ]
+        self._no_match = no_match
+
+    def match(self, text: str) -> Tuple[Optional[str], ...]:
+        """Per table, the first-listed label with a keyword in `text` (None when none)."""
+        delta, ranks = self._delta, self._ranks
+        best = self._no_match
+        state = 0
+        for char in text:
+            state = delta[state].get(char, 0)
+            found = ranks[state]
+            if found is not None:
+                best = tuple(map(min, best, found))
+                if not any(best):
+                    break
+        return tuple(labels[rank] if rank < len(labels) else None
+                     for labels, rank in zip(self.labels, best))
+
+
+class JobTitleClassifier:
+    """Seniority and function classifier for job titles, with a per-title cache."""
+
+    def __init__(self, seniority_keywords: Mapping[str, Sequence[str]] = SENIORITY_KEYWORDS,
+                 function_keywords: Mapping[str, Sequence[str]] = FUNCTION_KEYWORDS,
+                 cache_size: int = 50000):
+        self.automaton = KeywordAutomaton([seniority_keywords, function_keywords])
+        self._classify_normalized = lru_cache(maxsize=cache_size)(self._classify_uncached)
+
+    def _classify_uncached(self, title_lower: str) -> Tuple[str, str]:
+        seniority, function = self.automaton.match(title_lower)
+        return seniority or DEFAULT_SENIORITY, function or DEFAULT_FUNCTION
+
+    def classify(self, job_title: str) -> Dict[str, str]:
+        """
+        Classify one job title.
+
+        Returns:
+            {'seniority', 'function'}; both 'Unknown' for an empty title
+        """
+        if not job_title:
+            return dict(UNKNOWN)
+        seniority, function = self._classify_normalized(job_title.lower().strip())
+        return {'seniority': seniority, 'function': function}
+
+    def classify_many(self, titles: Iterable[str]) -> List[Dict[str, str]]:
+        """Classify a batch of job titles, each distinct title once, in input order."""
+        results: Dict[str, Dict[str, str]] = {}
+        classified = []
+        for title in titles:
+            if title not in results:
+                results[title] = self.classify(title)
+            classified.append(dict(results[title]))
+        return classified
+
+    def cache_info(self):
+        return self._classify_normalized.cache_info()
+
+
+JOB_TITLE_CLASSIFIER = JobTitleClassifier()
+
+
+def classify_job_title(job_title: str) -> Dict[str, str]:
+    """Classify a job title with the shared classifier."""
+    return JOB_TITLE_CLASSIFIER.classify(job_title)
+
+
+def classify_job_titles(titles: Iterable[str]) -> List[Dict[str, str]]:
+    """Classify a batch of job titles with the shared classifier."""
+    return JOB_TITLE_CLASSIFIER.classify_many(titles)
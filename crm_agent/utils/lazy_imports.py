@@ -0,0 +1,62 @@
+"""
+Deferred imports for package exports and registry factories.
+
+Package ``__init__`` modules declare their public names as a mapping to the
+submodule that defines them and install ``lazy_exports`` as the module-level
+``__getattr__`` (PEP 562). Importing the package is then cheap; the ADK, MCP
+SDK and agent modules load only when one of their names is first used.
+"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(namespace: Dict[str, Any], exports: Dict[str, str]) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build ``__getattr__`` and ``__dir__`` for a package with deferred exports.
+
+    Args:
+        namespace: The package's ``globals()``
+        exports: Public name -> relative module defining it (e.g. ".coordinator")
+
+    Returns:
+        (__getattr__, __dir__) to assign at module level
+    """
+    package = namespace["__name__"]
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(exports[name], package), name)
+        # Cache on the package so later lookups skip __getattr__
+        namespace[name] = value
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(namespace) | set(exports))
+
+    return __getattr__, __dir__
+
+
+def lazy_factory(module: str, attr: str, package: str = None) -> Callable[..., Any]:
+    """
+    Return a factory that imports ``module.attr`` on first call.
+
+    Args:
+        module: Module path, relative to package when it starts with "."
+        attr: Factory (function or class) name within the module
+        package: Anchor package for relative module paths
+
+    Returns:
+        Callable forwarding its arguments to the resolved factory
+    """
+    resolved: List[Callable[..., Any]] = []
+
+    def factory(*args: Any, **kwargs: Any) -> Any:
+        if not resolved:
+            resolved.append(getattr(importlib.import_module(module, package), attr))
+        return resolved[0](*args, **kwargs)
+
+    factory.__name__ = attr
+    factory.__qualname__ = attr
+    return factory
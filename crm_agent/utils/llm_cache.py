@@ -0,0 +1,220 @@
+"""
+Persistent content-hash cache for LLM research responses.
+
+Entries are keyed by a hash of (model, prompt template version, normalized
+inputs) and hold the raw response text plus the parsed structured result.
+Parsed results are tagged with the parser version that produced them, so a
+parser change re-parses the stored raw text instead of calling the model
+again.
+
+Modes (CRM_LLM_CACHE_MODE):
+    readwrite  serve hits, call the model on misses and store the result (default)
+    offline    serve hits only; misses raise LLMCacheMiss (replays, tests)
+    off        bypass the cache entirely
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CACHE_MODES = ("readwrite", "offline", "off")
+
+_WHITESPACE = re.compile(r"\s+")
+_URL_PREFIX = re.compile(r"^(?:https?://)?(?:www\.)?", re.IGNORECASE)
+
+
+class LLMCacheMiss(KeyError):
+    """Raised in offline mode when a response is not cached."""
+
+
+def normalize_inputs(inputs: Dict[str, Any]) -> Dict[str, str]:
+    """Normalize cache inputs: trimmed, lowercased, collapsed whitespace, bare domains."""
+    normalized = {}
+    for key, value in inputs.items():
+        text = _WHITESPACE.sub(" ", str(value or "")).strip().lower()
+        if key in ("domain", "website"):
+            text = _URL_PREFIX.sub("", text).rstrip("/")
+        normalized[key] = text
+    return normalized
+
+
+def cache_key(model: str, template_version: str, inputs: Dict[str, Any]) -> str:
+    """Content hash for a (model, prompt template version, inputs) triple."""
+    payload = json.dumps([model, template_version, normalize_inputs(inputs)], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with TTL and explicit invalidation."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS llm_responses (
+            key TEXT PRIMARY KEY,
+            model TEXT NOT NULL,
+            template_version TEXT NOT NULL,
+            inputs TEXT NOT NULL,
+            raw TEXT NOT NULL,
+            parsed TEXT,
+            parser_version TEXT,
+            created_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_llm_responses_created ON llm_responses(created_at);
+        CREATE INDEX IF NOT EXISTS idx_llm_responses_template ON llm_responses(model, template_version);
+    """
+
+    def __init__(self, path: str = ".cache/llm_responses.db", ttl: Optional[float] = 30 * 24 * 3600,
+                 mode: str = "readwrite"):
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode}. Available: {', '.join(CACHE_MODES)}")
+        self.path = path
+        self.ttl = ttl
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    @property
+    def offline(self) -> bool:
+        return self.mode == "offline"
+
+    def _connection(self) -> sqlite3.Connection:
+        # Opened lazily so constructing an agent never touches the disk
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(self._SCHEMA)
+            self._conn.commit()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response.
+
+        Returns:
+            {"raw", "parsed", "parser_version", "created_at"} or None on a miss
+            (expired entries count as misses)
+
+        Raises:
+            LLMCacheMiss: On a miss in offline mode
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT raw, parsed, parser_version, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is not None and (self.ttl is None or time.time() - row[3] <= self.ttl):
+            self.hits += 1
+            return {
+                "raw": row[0],
+                "parsed": json.loads(row[1]) if row[1] is not None else None,
+                "parser_version": row[2],
+                "created_at": row[3],
+            }
+        self.misses += 1
+        if self.offline:
+            raise LLMCacheMiss(key)
+        return None
+
+    def put(self, key: str, raw: str, parsed: Optional[Dict[str, Any]] = None, *, model: str = "",
+            template_version: str = "", inputs: Optional[Dict[str, Any]] = None,
+            parser_version: Optional[str] = None) -> None:
+        """Store (or replace) a response and its parsed result."""
+        if self.mode != "readwrite":
+            return
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO llm_responses
+                    (key, model, template_version, inputs, raw, parsed, parser_version, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, template_version, json.dumps(normalize_inputs(inputs or {}), sort_keys=True),
+                 raw, json.dumps(parsed, default=str) if parsed is not None else None,
+                 parser_version, time.time()),
+            )
+
+    def update_parsed(self, key: str, parsed: Dict[str, Any], parser_version: str) -> None:
+        """Replace only the parsed result (after re-parsing stored raw text)."""
+        if self.mode != "readwrite":
+            return
+        with self._lock, self._connection() as conn:
+            conn.execute(
+                "UPDATE llm_responses SET parsed = ?, parser_version = ? WHERE key = ?",
+                (json.dumps(parsed, default=str), parser_version, key),
+            )
+
+    def invalidate(self, key: Optional[str] = None, *, model: Optional[str] = None,
+                   template_version: Optional[str] = None, older_than: Optional[float] = None) -> int:
+        """
+        Delete entries matching every given filter (all entries if none given).
+
+        Args:
+            key: Single entry key
+            model: Entries for a model
+            template_version: Entries for a prompt template version
+            older_than: Entries older than this many seconds
+
+        Returns:
+            Number of entries removed
+        """
+        clauses, params = [], []
+        if key is not None:
+            clauses.append("key = ?")
+            params.append(key)
+        if model is not None:
+            clauses.append("model = ?")
+            params.append(model)
+        if template_version is not None:
+            clauses.append("template_version = ?")
+            params.append(template_version)
+        if older_than is not None:
+            clauses.append("created_at < ?")
+            params.append(time.time() - older_than)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock, self._connection() as conn:
+            return conn.execute(f"DELETE FROM llm_responses{where}", params).rowcount
+
+    def evict_expired(self) -> int:
+        """Delete entries past the TTL."""
+        return self.invalidate(older_than=self.ttl) if self.ttl is not None else 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters."""
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    """Process-wide cache configured from CRM_LLM_CACHE_PATH/_TTL/_MODE."""
+    global _default_cache
+    if _default_cache is None:
+        ttl = os.getenv("CRM_LLM_CACHE_TTL")
+        _default_cache = LLMResponseCache(
+            path=os.getenv("CRM_LLM_CACHE_PATH", ".cache/llm_responses.db"),
+            ttl=float(ttl) if ttl else 30 * 24 * 3600,
+            mode=os.getenv("CRM_LLM_CACHE_MODE", "readwrite"),
+        )
+    return _default_cache
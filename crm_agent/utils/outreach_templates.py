@@ -0,0 +1,240 @@
+"""
+Precompiled outreach templates and role tables.
+
+Subject lines, email bodies, calls to action, the email footer and the
+follow-up task text are format templates, checked and bound once when OutreachTemplates is built,
+so a draft is rendered with a few C-level str.format calls. Role
+messaging tables (focus areas, pain points, decision authority) are read
+once from the role_messaging section of the outreach personalization
+config, with the built-in tables as defaults. Job title -> role type and
+(lead temperature, role, sophistication) -> messaging strategy are
+memoized.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from string import Formatter
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+SUBJECT_TEMPLATES: Dict[str, str] = {
+    "direct_value_proposition": "ROI opportunity for {company_name}",
+    "strategic_partnership": "Partnership opportunity - {company_name}",
+    "operational_efficiency": "Streamline operations at {company_name}",
+    "education_first": "Golf course management insights for {company_name}",
+    "industry_insights": "Industry trends relevant to {company_name}",
+}
+DEFAULT_SUBJECT = "Opportunity for {company_name}"
+
+CONTENT_TEMPLATES: Dict[str, str] = {
+    "direct_value_proposition": """\
+Hi {first_name},
+
+I noticed {company_name} is a {company_type} course, and I wanted to share how we've helped similar properties increase operational efficiency by 25% while reducing costs.
+
+Specifically for {role_title} roles, our clients typically see:
+• Streamlined daily operations
+• Improved member satisfaction scores
+• Reduced administrative overhead
+
+Would you be interested in a brief conversation about how this might apply to {company_name}?""",
+
+    "strategic_partnership": """\
+Hi {first_name},
+
+I've been following {company_name}'s growth and was impressed by your commitment to excellence in member experience.
+
+As someone in golf course management, you know that staying ahead of operational challenges requires the right technology partnerships. We've helped {company_type} courses like yours implement solutions that drive both efficiency and member satisfaction.
+
+I'd love to explore how we might support {company_name}'s continued success.""",
+
+    "operational_efficiency": """\
+Hi {first_name},
+
+Managing operations at {company_name} likely involves juggling multiple systems and processes daily. 
+
+I wanted to reach out because we've helped {company_type} courses streamline their operations, typically resulting in:
+• 30% reduction in administrative tasks
+• Better staff coordination and scheduling
+• Improved data visibility across departments
+
+Would you have 15 minutes to discuss how this might benefit {company_name}?""",
+}
+DEFAULT_CONTENT = "Hello, I wanted to reach out regarding opportunities for {company_name}."
+
+# Decision authority -> call to action (anything else gets "low")
+CALLS_TO_ACTION: Dict[str, str] = {
+    "high": "Would you be available for a brief 15-minute call this week to explore this opportunity?",
+    "medium": "I'd be happy to share some relevant case studies. Would you like me to send them over?",
+    "low": "Would you be the right person to discuss this, or should I connect with someone else on your team?",
+}
+
+EMAIL_BODY_TEMPLATE = """\
+{email_content}
+
+{call_to_action}
+
+Best regards,
+[Your Name]
+[Your Title]
+[Company]
+
+---
+Sources and References:
+{citations}"""
+
+FOLLOW_UP_TITLE_TEMPLATE = "Follow up on {outreach_type} - {company_name}"
+FOLLOW_UP_NOTES_TEMPLATE = """\
+Follow up on personalized outreach sent to {first_name} {last_name}.
+
+Outreach Details:
+- Type: {outreach_type}
+- Subject: {subject_line}
+- Messaging Strategy: {messaging_strategy}
+- Personalization Score: {personalization_score}/100
+
+Next Steps:
+1. Check if email was opened/clicked
+2. If no response, consider phone follow-up
+3. Prepare additional relevant content based on their interests
+4. Update CRM with any new information gathered
+
+Lead Score Context:
+- Score Band: {score_band}
+- Total Score: {total_score}"""
+
+CITATION_TEMPLATE = "{index}. {claim}: {source} ({url})"
+NO_CITATIONS = "Industry data from various golf management sources."
+
+# Role type -> messaging table, used where the config has no role_messaging entry
+DEFAULT_ROLE_MESSAGING: Dict[str, Dict[str, Any]] = {
+    "general_manager": {
+        "focus_areas": ["ROI", "operational_efficiency", "member_satisfaction", "revenue_growth"],
+        "pain_points": ["declining_membership", "operational_costs", "staff_turnover", "technology_gaps"],
+        "decision_authority": "high",
+    },
+    "operations_manager": {
+        "focus_areas": ["process_improvement", "staff_productivity", "cost_savings", "workflow_optimization"],
+        "pain_points": ["manual_processes", "scheduling_conflicts", "maintenance_costs", "staff_coordination"],
+        "decision_authority": "medium",
+    },
+    "fb_manager": {
+        "focus_areas": ["dining_revenue", "event_management", "customer_experience", "inventory_management"],
+        "pain_points": ["food_costs", "event_coordination", "inventory_waste", "seasonal_fluctuations"],
+        "decision_authority": "medium",
+    },
+    "golf_professional": {
+        "focus_areas": ["member_engagement", "instruction_programs", "pro_shop_sales", "tournament_management"],
+        "pain_points": ["lesson_scheduling", "equipment_sales", "member_engagement", "tournament_logistics"],
+        "decision_authority": "medium",
+    },
+    "it_manager": {
+        "focus_areas": ["system_integration", "data_security", "technical_support", "automation"],
+        "pain_points": ["system_integration", "data_silos", "security_concerns", "legacy_systems"],
+        "decision_authority": "medium",
+    },
+    "marketing_sales": {
+        "focus_areas": ["lead_generation", "member_retention", "brand_awareness", "digital_marketing"],
+        "pain_points": ["lead_quality", "conversion_rates", "member_retention", "digital_presence"],
+        "decision_authority": "low",
+    },
+}
+GENERAL_ROLE_MESSAGING = {
+    "focus_areas": ["operational_efficiency", "cost_savings"],
+    "pain_points": ["operational_inefficiencies"],
+    "decision_authority": "low",
+}
+
+# Role type -> job title terms, checked in order
+ROLE_TITLE_TERMS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("general_manager", ("general manager", "gm", "president", "ceo")),
+    ("operations_manager", ("operations", "ops", "superintendent")),
+    ("fb_manager", ("food", "beverage", "f&b", "restaurant", "dining")),
+    ("golf_professional", ("golf", "professional", "pga", "head pro")),
+    ("it_manager", ("it", "technology", "systems", "tech")),
+    ("marketing_sales", ("marketing", "sales", "membership")),
+)
+
+
+class CompiledTemplate:
+    """A format template with its field names checked once."""
+
+    __slots__ = ("template", "fields", "render")
+
+    def __init__(self, template: str):
+        fields = []
+        for _, name, _, _ in Formatter().parse(template):
+            if name is None:
+                continue
+            if not name.isidentifier():
+                raise ValueError(f"Template fields must be named: {{{name}}} in {template!r}")
+            fields.append(name)
+        self.template = template
+        self.fields = frozenset(fields)
+        self.render = template.format
+
+
+@dataclass(frozen=True)
+class RoleProfile:
+    """Messaging table for one role type."""
+    messaging_focus: Tuple[str, ...]
+    pain_points: Tuple[str, ...]
+    decision_authority: str
+
+
+def _role_profile(table: Mapping[str, Any]) -> RoleProfile:
+    return RoleProfile(tuple(table["focus_areas"]), tuple(table["pain_points"]), table["decision_authority"])
+
+
+class OutreachTemplates:
+    """Compiled subject, content, call-to-action and footer templates plus role tables."""
+
+    def __init__(self, config: Optional[Mapping[str, Any]] = None):
+        self.subjects = {strategy: CompiledTemplate(t) for strategy, t in SUBJECT_TEMPLATES.items()}
+        self.default_subject = CompiledTemplate(DEFAULT_SUBJECT)
+        self.contents = {strategy: CompiledTemplate(t) for strategy, t in CONTENT_TEMPLATES.items()}
+        self.default_content = CompiledTemplate(DEFAULT_CONTENT)
+        self.email_body = CompiledTemplate(EMAIL_BODY_TEMPLATE)
+        self.citation = CompiledTemplate(CITATION_TEMPLATE)
+        self.follow_up_title = CompiledTemplate(FOLLOW_UP_TITLE_TEMPLATE)
+        self.follow_up_notes = CompiledTemplate(FOLLOW_UP_NOTES_TEMPLATE)
+
+        role_messaging = dict(DEFAULT_ROLE_MESSAGING)
+        for role_type, table in ((config or {}).get("role_messaging") or {}).items():
+            role_messaging[role_type] = {**role_messaging.get(role_type, GENERAL_ROLE_MESSAGING), **table}
+        self.roles = {role_type: _role_profile(table) for role_type, table in role_messaging.items()}
+        self.general_role = _role_profile(GENERAL_ROLE_MESSAGING)
+
+    def role_profile(self, role_type: str) -> RoleProfile:
+        return self.roles.get(role_type, self.general_role)
+
+    def subject(self, strategy: str) -> CompiledTemplate:
+        return self.subjects.get(strategy, self.default_subject)
+
+    def content(self, strategy: str) -> CompiledTemplate:
+        return self.contents.get(strategy, self.default_content)
+
+    def call_to_action(self, decision_authority: str) -> str:
+        return CALLS_TO_ACTION.get(decision_authority, CALLS_TO_ACTION["low"])
+
+
+@lru_cache(maxsize=4096)
+def classify_outreach_role(job_title_lower: str) -> str:
+    """Outreach role type for a lowercased job title ("general" when no term matches)."""
+    for role_type, terms in ROLE_TITLE_TERMS:
+        if any(term in job_title_lower for term in terms):
+            return role_type
+    return "general"
+
+
+@lru_cache(maxsize=None)
+def select_messaging_strategy(is_hot: bool, role_type: str, sophistication: str) -> str:
+    """Messaging strategy for a lead temperature, role type and company sophistication."""
+    if is_hot:
+        return "direct_value_proposition"
+    if role_type == "general_manager" and sophistication == "high":
+        return "strategic_partnership"
+    if role_type in ("operations_manager", "it_manager"):
+        return "operational_efficiency"
+    if sophistication == "low":
+        return "education_first"
+    return "industry_insights"
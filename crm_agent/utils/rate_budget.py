@@ -0,0 +1,61 @@
+"""
+Request and token rate budget for concurrent LLM/API calls.
+
+Callers await acquire(tokens) before each call; the budget refills
+continuously (token bucket) so bursts up to the per-minute limits are allowed
+and sustained throughput stays under them. A limit of None or 0 means no
+limit of that kind.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class RateBudget:
+    """Async token bucket over requests per minute and tokens per minute."""
+
+    def __init__(self, requests_per_minute: Optional[int] = 60, tokens_per_minute: Optional[int] = None):
+        if (requests_per_minute or 0) < 0 or (tokens_per_minute or 0) < 0:
+            raise ValueError("Rate limits must be positive (or None/0 for no limit)")
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute or 0)
+        self._tokens = float(tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._updated
+        self._updated = now
+        if self.requests_per_minute:
+            self._requests = min(self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60)
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """
+        Wait until one request (and `tokens` tokens) fit in the budget.
+
+        Requests larger than the whole token budget are admitted once the
+        bucket is full rather than waiting forever.
+        """
+        if not self.requests_per_minute and not self.tokens_per_minute:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                self._refill()
+                needed_tokens = min(tokens, self.tokens_per_minute) if self.tokens_per_minute else 0
+                request_ok = not self.requests_per_minute or self._requests >= 1
+                if request_ok and self._tokens >= needed_tokens:
+                    if self.requests_per_minute:
+                        self._requests -= 1
+                    self._tokens -= needed_tokens
+                    return
+                wait = 0 if request_ok else (1 - self._requests) * 60 / self.requests_per_minute
+                if self.tokens_per_minute and self._tokens < needed_tokens:
+                    wait = max(wait, (needed_tokens - self._tokens) * 60 / self.tokens_per_minute)
+                await asyncio.sleep(wait)
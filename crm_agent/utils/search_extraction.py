@@ -0,0 +1,254 @@
+"""
+Structured web search results and precompiled field extractors.
+
+Search tool output is normalized once into SearchResults: a tuple of hits
+(title, snippet, URL, domain) plus the joined text in original and lowered
+form. Field extractors read that structure with module-level compiled
+patterns instead of stringifying the raw tool result and compiling regexes
+on every call; extract_fields runs any set of them in one pass.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+
+URL_PATTERN = re.compile(r'https?://(?:[-\w.])+(?:\.[a-zA-Z]{2,})+(?:/[^"\s]*)?', re.IGNORECASE)
+LINKEDIN_COMPANY_PATTERN = re.compile(r'https?://(?:www\.)?linkedin\.com/company/[^/\s]+', re.IGNORECASE)
+
+_AMOUNT_UNIT = r'\$?([\d,]+(?:\.\d+)?)\s*(million|billion|k|thousand)?'
+REVENUE_PATTERNS = [
+    re.compile(r'revenue[:\s]*' + _AMOUNT_UNIT),
+    re.compile(r'sales[:\s]*' + _AMOUNT_UNIT),
+    re.compile(r'earnings[:\s]*' + _AMOUNT_UNIT),
+    re.compile(r'\$\s*([\d,]+(?:\.\d+)?)\s*(million|billion|k|thousand)?\s*(?:revenue|sales|earnings)'),
+]
+REVENUE_MULTIPLIERS = {'million': 1e6, 'm': 1e6, 'billion': 1e9, 'b': 1e9, 'thousand': 1e3, 'k': 1e3}
+
+EMPLOYEE_PATTERNS = [
+    re.compile(r'(\d+)\s*-\s*(\d+)\s*(?:employees?|staff)'),  # Range pattern, before its upper bound matches alone
+    re.compile(r'(\d+(?:,\d+)?)\s*(?:employees?|staff|workers?|team members?)'),
+    re.compile(r'(?:employees?|staff|team)[:\s]*(\d+(?:,\d+)?)'),
+    re.compile(r'(\d+(?:,\d+)?)\s*(?:people|persons?)\s*(?:work|employed)'),
+    re.compile(r'(?:size|headcount)[:\s]*(\d+(?:,\d+)?)'),
+]
+
+PHONE_PATTERNS = [
+    re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US format
+    re.compile(r'\+1[-.\s]?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}'),  # US with country code
+    re.compile(r'\d{3}[-.\s]?\d{3}[-.\s]?\d{4}'),  # Simple US format
+    re.compile(r'\(\d{3}\)\s?\d{3}-\d{4}'),  # (XXX) XXX-XXXX format
+]
+
+# Industry -> keywords scored against the lowered result text
+INDUSTRY_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    'technology': ('tech', 'software', 'saas', 'it', 'digital', 'computer'),
+    'healthcare': ('health', 'medical', 'hospital', 'pharma', 'biotech'),
+    'finance': ('bank', 'financial', 'investment', 'insurance', 'fintech'),
+    'retail': ('retail', 'store', 'shop', 'ecommerce', 'consumer'),
+    'manufacturing': ('manufacturing', 'factory', 'production', 'industrial'),
+    'education': ('education', 'school', 'university', 'learning'),
+    'real estate': ('real estate', 'property', 'construction', 'building'),
+    'professional services': ('consulting', 'legal', 'accounting', 'advisory'),
+    'hospitality': ('hotel', 'restaurant', 'travel', 'tourism'),
+    'transportation': ('transport', 'logistics', 'shipping', 'delivery'),
+    'energy': ('energy', 'oil', 'gas', 'renewable', 'utility'),
+    'media': ('media', 'entertainment', 'publishing', 'broadcasting'),
+    'non-profit': ('nonprofit', 'charity', 'foundation', 'ngo'),
+}
+DESCRIPTION_WORDS = ('company', 'business', 'provides', 'offers', 'specializes')
+
+# Keys search tools use for each hit attribute, in preference order
+_TITLE_KEYS = ('title', 'name')
+_SNIPPET_KEYS = ('snippet', 'description', 'content', 'body', 'text')
+_URL_KEYS = ('url', 'link', 'href')
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """One search result."""
+    title: str
+    snippet: str
+    url: str
+    domain: str
+
+
+@dataclass(frozen=True)
+class SearchResults:
+    """Normalized search results with their text joined and pre-lowered."""
+    hits: Tuple[SearchHit, ...]
+    text: str
+    text_lower: str = field(repr=False)
+
+    @property
+    def urls(self) -> List[str]:
+        return [hit.url for hit in self.hits if hit.url]
+
+
+def _first(item: Dict[str, Any], keys: Tuple[str, ...]) -> str:
+    for key in keys:
+        value = item.get(key)
+        if value:
+            return str(value)
+    return ''
+
+
+def _hit(item: Any) -> SearchHit:
+    if not isinstance(item, dict):
+        return SearchHit('', str(item), '', '')
+    url = _first(item, _URL_KEYS)
+    domain = urlsplit(url).netloc.lower() if url else ''
+    return SearchHit(_first(item, _TITLE_KEYS), _first(item, _SNIPPET_KEYS), url, domain)
+
+
+def normalize_search_results(result: Any) -> SearchResults:
+    """
+    Normalize a search tool result into SearchResults.
+
+    Accepts {"results": [...]} dicts, bare lists of hits, plain text, and
+    SearchResults (returned unchanged). Other shapes become one hit holding
+    their text, so nothing a tool returns is dropped.
+    """
+    if isinstance(result, SearchResults):
+        return result
+    if isinstance(result, dict) and isinstance(result.get('results'), list):
+        items = result['results']
+    elif isinstance(result, list):
+        items = result
+    elif isinstance(result, dict) and result.get('raw_text'):
+        items = [str(result['raw_text'])]
+    elif result is None or (isinstance(result, dict) and ('error' in result or not result)):
+        items = []
+    else:
+        items = [result if isinstance(result, str) else str(result)]
+
+    hits = tuple(_hit(item) for item in items)
+    text = '\n'.join(' '.join(part for part in (hit.title, hit.snippet, hit.url) if part) for hit in hits)
+    return SearchResults(hits, text, text.lower())
+
+
+def extract_website(results: SearchResults, company_name: str) -> Optional[str]:
+    """First URL naming the company, else the first URL."""
+    urls = URL_PATTERN.findall(results.text)
+    if not urls:
+        return None
+    company_words = company_name.lower().replace(' ', '').replace(',', '').replace('.', '')
+    for url in urls:
+        if any(word in url.lower() for word in company_words.split() if len(word) > 2):
+            return url
+    return urls[0]
+
+
+def extract_industry(results: SearchResults, company_name: str) -> Optional[str]:
+    """Industry with the most keyword hits, or "Business Services"."""
+    text = results.text_lower
+    scores = {
+        industry: score for industry, keywords in INDUSTRY_KEYWORDS.items()
+        if (score := sum(1 for keyword in keywords if keyword in text)) > 0
+    }
+    if scores:
+        return max(scores.items(), key=lambda x: x[1])[0].title()
+    return "Business Services"
+
+
+def extract_description(results: SearchResults, company_name: str) -> Optional[str]:
+    """Up to three snippet sentences about the company, capped at 500 characters."""
+    name = company_name.lower()
+    relevant = []
+    sentences = (sentence.strip() for hit in results.hits for sentence in hit.snippet.split('.'))
+    for sentence in sentences:
+        if len(sentence) > 20:
+            lowered = sentence.lower()
+            if name in lowered or any(word in lowered for word in DESCRIPTION_WORDS):
+                relevant.append(sentence)
+                if len(relevant) == 3:
+                    break
+    if not relevant:
+        return None
+    description = '. '.join(relevant)
+    if not description.endswith('.'):
+        description += '.'
+    description = description.replace('\n', ' ').replace('  ', ' ').strip()
+    return description[:497] + '...' if len(description) > 500 else description
+
+
+def extract_revenue(results: SearchResults, company_name: str) -> Optional[str]:
+    """First revenue figure between $10K and $100B, formatted as dollars."""
+    for pattern in REVENUE_PATTERNS:
+        for amount, unit in pattern.findall(results.text_lower):
+            try:
+                value = float(amount.replace(',', '')) * REVENUE_MULTIPLIERS.get(unit, 1)
+            except ValueError:
+                continue
+            if 10000 <= value <= 100000000000:
+                return f"${value:,.0f}"
+    return None
+
+
+def extract_employee_count(results: SearchResults, company_name: str) -> Optional[str]:
+    """First plausible employee count (1-50,000) or range."""
+    for pattern in EMPLOYEE_PATTERNS:
+        for match in pattern.findall(results.text_lower):
+            try:
+                if isinstance(match, tuple):
+                    low, high = int(match[0].replace(',', '')), int(match[1].replace(',', ''))
+                    if 1 <= low <= 50000 and low < high <= 50000:
+                        return f"{low}-{high}"
+                else:
+                    count = int(match.replace(',', ''))
+                    if 1 <= count <= 50000:
+                        return str(count)
+            except ValueError:
+                continue
+    return None
+
+
+def extract_linkedin_url(results: SearchResults, company_name: str) -> Optional[str]:
+    """First LinkedIn company page URL."""
+    for url in results.urls:
+        match = LINKEDIN_COMPANY_PATTERN.match(url)
+        if match:
+            return match.group()
+    match = LINKEDIN_COMPANY_PATTERN.search(results.text)
+    return match.group() if match else None
+
+
+def extract_phone(results: SearchResults, company_name: str) -> Optional[str]:
+    """First 10-digit (or +1 11-digit) US phone number, formatted."""
+    for pattern in PHONE_PATTERNS:
+        for match in pattern.findall(results.text):
+            digits = ''.join(c for c in match if c.isdigit())
+            if len(digits) == 10:
+                return f"({digits[:3]}) {digits[3:6]}-{digits[6:]}"
+            if len(digits) == 11 and digits.startswith('1'):
+                return f"+1 ({digits[1:4]}) {digits[4:7]}-{digits[7:]}"
+    return None
+
+
+# Extractor registry keyed by field
+FIELD_EXTRACTORS: Dict[str, Callable[[SearchResults, str], Optional[str]]] = {
+    'website': extract_website,
+    'industry': extract_industry,
+    'description': extract_description,
+    'annualrevenue': extract_revenue,
+    'numberofemployees': extract_employee_count,
+    'linkedin_company_page': extract_linkedin_url,
+    'phone': extract_phone,
+}
+
+
+def extract_fields(result: Any, company_name: str, fields: Optional[Iterable[str]] = None) -> Dict[str, Optional[str]]:
+    """
+    Normalize a search result once and run extractors over it.
+
+    Args:
+        result: Raw search tool result or SearchResults
+        company_name: Company the search was about
+        fields: Fields to extract (default: every registered extractor)
+
+    Returns:
+        Field -> extracted value (None when nothing was found)
+    """
+    results = normalize_search_results(result)
+    return {name: FIELD_EXTRACTORS[name](results, company_name) for name in (fields or FIELD_EXTRACTORS)}
@@ -0,0 +1,152 @@
+"""
+Per-record web search session.
+
+Field extractors for one record tend to issue many near-identical web searches
+about the same company ("X official website", "X homepage", "X revenue
+earnings", ...). A SearchSession sits between them and the search tool:
+
+- queries are normalized (case, quotes, spacing, word order, OR operators), so
+  rephrasings of the same query hit the same entry
+- concurrent callers of the same query share one in-flight call (single-flight)
+- every fetch asks for at least `superset_size` results, so later requests for
+  fewer results are answered from the fetched set
+- a query that finds nothing of its own is answered with the hits of the
+  record's other searches, except for fields whose value is read straight off
+  a hit (website, domain, LinkedIn page, phone): those only ever see their own
+  query's hits
+- an optional per-record budget (`max_searches`, CRM_SEARCH_MAX_PER_RECORD,
+  off by default) caps the tool calls; every field still gets its first search
+  and only its further queries count against the cap
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+DEFAULT_SUPERSET_SIZE = int(os.getenv("CRM_SEARCH_SUPERSET_SIZE", "10"))
+DEFAULT_MAX_SEARCHES = int(os.getenv("CRM_SEARCH_MAX_PER_RECORD", "0"))  # 0: no cap
+
+# Fields whose value is a URL or number taken from a hit; another query's hits would be attributed to them
+UNPOOLED_FIELDS = frozenset({"website", "domain", "linkedin_company_page", "phone"})
+
+_QUERY_TOKEN = re.compile(r'[a-z0-9][a-z0-9:./\-]*')
+_QUERY_STOPWORDS = frozenset({"or", "and", "the", "a", "of"})
+
+
+def normalize_query(query: str) -> str:
+    """Order-insensitive form of a search query ('"Acme" website OR homepage' -> 'acme homepage website')."""
+    tokens = {t for t in _QUERY_TOKEN.findall(query.lower()) if t not in _QUERY_STOPWORDS}
+    return " ".join(sorted(tokens))
+
+
+def _result_items(result: Any) -> Optional[List[Any]]:
+    """The list of hits in a search tool result, or None for results of another shape."""
+    if isinstance(result, dict) and isinstance(result.get("results"), list):
+        return result["results"]
+    if isinstance(result, list):
+        return result
+    return None
+
+
+def _item_key(item: Any) -> str:
+    if isinstance(item, dict):
+        return str(item.get("url") or item.get("link") or item)
+    return str(item)
+
+
+class SearchSession:
+    """Deduplicating, single-flight web search cache for one CRM record."""
+
+    def __init__(self, search_fn: Callable[[str, int], Any], superset_size: int = DEFAULT_SUPERSET_SIZE,
+                 max_searches: int = DEFAULT_MAX_SEARCHES):
+        """
+        Args:
+            search_fn: Performs one search: (query, num_results) -> tool result
+            superset_size: Minimum number of results requested per fetch
+            max_searches: Tool calls allowed for the record once each field has had
+                its first search (0 for no cap)
+        """
+        self.search_fn = search_fn
+        self.superset_size = superset_size
+        self.max_searches = max_searches
+        self.searches = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Future] = {}
+        self._sizes: Dict[str, int] = {}
+        self._order: List[str] = []
+        self._fields: set = set()
+
+    def search(self, query: str, num_results: int = 5, field: Optional[str] = None) -> Any:
+        """
+        Search once per normalized query.
+
+        Args:
+            query: Search query
+            num_results: Results wanted
+            field: Internal name of the field the search is for; its first
+                search is never refused by the budget, and fields in
+                UNPOOLED_FIELDS never get other queries' hits
+
+        Returns:
+            {"query", "results"} with this query's hits. If it has none (or
+            was refused by the budget), the hits of the record's other searches
+            instead, unless `field` is unpooled. Results that are not a list
+            of hits (e.g. errors) are returned as the tool gave them.
+        """
+        key = normalize_query(query)
+        pool = field not in UNPOOLED_FIELDS
+        with self._lock:
+            self.requests += 1
+            entry = self._entries.get(key)
+            within_budget = (not self.max_searches or self.searches < self.max_searches
+                             or (field is not None and field not in self._fields))
+            # Fetch on a miss, or again (larger) when a finished fetch holds too few results
+            owner = within_budget and (
+                entry is None or (entry.done() and self._sizes[key] < num_results)
+            )
+            if owner:
+                if field is not None:
+                    self._fields.add(field)
+                entry = Future()
+                self._entries[key] = entry
+                self._sizes[key] = max(num_results, self.superset_size)
+                if key not in self._order:
+                    self._order.append(key)
+                self.searches += 1
+
+        if owner:
+            try:
+                entry.set_result(self.search_fn(query, self._sizes[key]))
+            except Exception as e:
+                entry.set_result({"error": str(e)})
+        if entry is None:
+            # Over budget: answer from the searches already made
+            return {"query": query, "results": self._pooled() if pool else []}
+
+        own = entry.result()
+        items = _result_items(own)
+        if items is None:
+            return own
+        if not items and pool:
+            items = self._pooled(exclude=key)
+        return {"query": query, "results": items}
+
+    def _pooled(self, exclude: Optional[str] = None) -> List[Any]:
+        """The hits of every other completed search, without duplicates."""
+        with self._lock:
+            others = [self._entries[k] for k in self._order if k != exclude]
+        merged, seen = [], set()
+        for items in [_result_items(f.result()) or [] for f in others if f.done()]:
+            for item in items:
+                item_key = _item_key(item)
+                if item_key not in seen:
+                    seen.add(item_key)
+                    merged.append(item)
+        return merged
+
+    def stats(self) -> Dict[str, int]:
+        """Tool calls made vs. searches requested."""
+        return {"requests": self.requests, "searches": self.searches, "distinct_queries": len(self._order)}
@@ -0,0 +1,257 @@
+"""
+Write coalescing and no-op suppression for HubSpot property updates.
+
+Agents that update the same record (management company, lead scores,
+field enrichment, config-based enrichment) queue their property updates
+in a WriteBuffer instead of sending one PATCH each. The buffer merges
+pending updates per record (later values win) and compares them with the
+record's last known values. Properties that would not change anything are
+dropped. Pending records are sent together once the window fills
+(max_records) or ages (max_wait), or when the buffer is flushed: one PATCH
+for a single record, otherwise one batch update per object type.
+
+    with buffered_writes(connector.write_buffer()):
+        ...  # agents call queue_update(); one flush on exit
+
+The active buffer is context-local (a ContextVar): concurrent threads or
+asyncio tasks each route writes to the buffer they entered. A thread
+started inside buffered_writes() does not inherit it unless it runs in a
+copied context (contextvars.copy_context().run), as the project manager's
+TaskOrchestrator runs its agent calls.
+
+Values are compared as HubSpot stores them (strings), so 65.0, 65 and "65"
+are the same value.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Iterator, Mapping, Optional
+
+DEFAULT_MAX_RECORDS = 100       # HubSpot batch update accepts at most 100 inputs
+DEFAULT_MAX_WAIT = 2.0
+
+# (object_type, {object_id: properties}) -> Any
+BatchSender = Callable[[str, Dict[str, Dict[str, Any]]], Any]
+# (object_type, object_id, properties) -> Any
+RecordSender = Callable[[str, str, Dict[str, Any]], Any]
+
+# Record type names used by the agents -> HubSpot object types
+OBJECT_TYPES = {"company": "companies", "contact": "contacts"}
+
+
+def normalize_value(value: Any) -> str:
+    """A property value as HubSpot returns it."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+class WriteBuffer:
+    """Per-record pending property updates, diffed against last known values."""
+
+    def __init__(self, send_batch: Optional[BatchSender] = None, send_one: Optional[RecordSender] = None,
+                 max_records: int = DEFAULT_MAX_RECORDS, max_wait: Optional[float] = DEFAULT_MAX_WAIT):
+        if send_batch is None and send_one is None:
+            raise ValueError("WriteBuffer needs send_batch or send_one")
+        self.send_batch = send_batch
+        self.send_one = send_one
+        self.max_records = max(1, max_records)
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._known: Dict[tuple, Dict[str, str]] = {}
+        self._pending: Dict[tuple, Dict[str, Any]] = {}
+        self._oldest: Optional[float] = None
+        self._stats = {"updates": 0, "properties": 0, "suppressed": 0, "coalesced": 0,
+                       "records_sent": 0, "requests": 0}
+
+    def observe(self, object_type: str, object_id: str, properties: Mapping[str, Any]):
+        """Record values known to be stored in HubSpot (e.g. from a read)."""
+        with self._lock:
+            known = self._known.setdefault((object_type, str(object_id)), {})
+            for name, value in properties.items():
+                known[name] = normalize_value(value)
+
+    def update(self, object_type: str, object_id: str, properties: Mapping[str, Any],
+               volatile: Iterable[str] = ()) -> Dict[str, Any]:
+        """
+        Queue a property update for a record.
+
+        Properties equal to the last known value are dropped (and drop an
+        earlier pending change back to that value). Volatile properties,
+        such as an "updated at" timestamp, are only written together with
+        some other change.
+
+        Returns:
+            The properties from this update that are still pending
+        """
+        record = (object_type, str(object_id))
+        volatile = set(volatile)
+        with self._lock:
+            self._stats["updates"] += 1
+            self._stats["properties"] += len(properties)
+            known = self._known.get(record, {})
+            pending = self._pending.get(record)
+            changes = {}
+            for name, value in properties.items():
+                if name in known and known[name] == normalize_value(value):
+                    self._stats["suppressed"] += 1
+                    if pending:
+                        pending.pop(name, None)
+                else:
+                    changes[name] = value
+
+            if all(name in volatile for name in changes) and not (pending and set(pending) - volatile):
+                self._stats["suppressed"] += len(changes)
+                changes = {}
+            if not changes:
+                if pending is not None and not pending:
+                    del self._pending[record]
+                return {}
+
+            if pending:
+                self._stats["coalesced"] += 1
+                pending.update(changes)
+            else:
+                self._pending[record] = dict(changes)
+                if self._oldest is None:
+                    self._oldest = time.monotonic()
+            due = self._due()
+        if due:
+            self.flush()
+        return changes
+
+    def _due(self) -> bool:
+        if len(self._pending) >= self.max_records:
+            return True
+        return (self.max_wait is not None and self._oldest is not None
+                and time.monotonic() - self._oldest >= self.max_wait)
+
+    @property
+    def pending_records(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def pending(self) -> Dict[tuple, Dict[str, Any]]:
+        """Copy of the pending updates, keyed by (object_type, object_id)."""
+        with self._lock:
+            return {record: dict(properties) for record, properties in self._pending.items()}
+
+    def flush(self) -> Dict[str, int]:
+        """
+        Send every pending update.
+
+        If a send raises, its records go back in the buffer (newer pending
+        values win) and the error propagates.
+
+        Returns:
+            {"records", "requests"} sent by this flush
+        """
+        with self._lock:
+            pending, self._pending, self._oldest = self._pending, {}, None
+        by_type: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (object_type, object_id), properties in pending.items():
+            by_type.setdefault(object_type, {})[object_id] = properties
+
+        sent = {"records": 0, "requests": 0}
+        try:
+            for object_type, updates in list(by_type.items()):
+                for batch in self._batches(updates):
+                    if self.send_batch is None or (len(batch) == 1 and self.send_one is not None):
+                        for object_id, properties in batch.items():
+                            self.send_one(object_type, object_id, properties)
+                            self._sent(object_type, {object_id: properties}, sent)
+                            del updates[object_id]
+                    else:
+                        self.send_batch(object_type, batch)
+                        self._sent(object_type, batch, sent)
+                        for object_id in batch:
+                            del updates[object_id]
+        except Exception:
+            self._requeue(by_type)
+            raise
+        return sent
+
+    def _batches(self, updates: Dict[str, Dict[str, Any]]) -> Iterator[Dict[str, Dict[str, Any]]]:
+        object_ids = list(updates)
+        for start in range(0, len(object_ids), self.max_records):
+            yield {object_id: updates[object_id] for object_id in object_ids[start:start + self.max_records]}
+
+    def _sent(self, object_type: str, batch: Dict[str, Dict[str, Any]], sent: Dict[str, int]):
+        with self._lock:
+            for object_id, properties in batch.items():
+                known = self._known.setdefault((object_type, object_id), {})
+                for name, value in properties.items():
+                    known[name] = normalize_value(value)
+            self._stats["records_sent"] += len(batch)
+            self._stats["requests"] += 1
+        sent["records"] += len(batch)
+        sent["requests"] += 1
+
+    def _requeue(self, by_type: Dict[str, Dict[str, Dict[str, Any]]]):
+        with self._lock:
+            for object_type, updates in by_type.items():
+                for object_id, properties in updates.items():
+                    record = (object_type, object_id)
+                    self._pending[record] = {**properties, **self._pending.get(record, {})}
+            if self._pending and self._oldest is None:
+                self._oldest = time.monotonic()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, pending=len(self._pending))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+_active_buffer: ContextVar[Optional[WriteBuffer]] = ContextVar("crm_write_buffer", default=None)
+
+
+def get_write_buffer() -> Optional[WriteBuffer]:
+    """The buffer set by buffered_writes() in the current context, or None."""
+    return _active_buffer.get()
+
+
+@contextmanager
+def buffered_writes(buffer: WriteBuffer):
+    """Route queue_update() calls in this context to `buffer` and flush it on exit."""
+    token = _active_buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _active_buffer.reset(token)
+        buffer.flush()
+
+
+def queue_update(object_type: str, object_id: str, properties: Mapping[str, Any],
+                 known: Optional[Mapping[str, Any]] = None,
+                 volatile: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+    """
+    Queue an update in the active buffer.
+
+    Args:
+        object_type: "companies"/"contacts" (or "company"/"contact")
+        object_id: HubSpot record ID
+        properties: Properties to update
+        known: Current stored values of (some of) these properties, if the caller read them
+        volatile: Properties only worth writing together with another change
+
+    Returns:
+        The properties still pending, or None when no buffer is active
+    """
+    buffer = _active_buffer.get()
+    if buffer is None:
+        return None
+    object_type = OBJECT_TYPES.get(object_type, object_type)
+    if known:
+        buffer.observe(object_type, object_id, known)
+    return buffer.update(object_type, object_id, properties, volatile)
@@ -0,0 +1,443 @@
+"""
+Write-ahead journal for HubSpot property updates.
+
+Every intended write is appended to a local SQLite (WAL) journal under an
+idempotency key before it is sent, and marked acked once HubSpot accepts
+it. After a crash, the pending entries are exactly the writes whose
+outcome is unknown. Property updates are idempotent, so they are safe to
+re-apply.
+
+Only a caller-supplied key makes a write idempotent: recording a key that
+is already journaled is a no-op, so a retried call is not queued twice and
+an acked write is not re-sent. Without a key every write gets a fresh one,
+because writing A, then B, then A again to a record must send all three.
+When a write is acked, the properties it set are dropped from older
+pending writes to the same record, so they are never replayed over it; an
+older write left with no properties is acked with it.
+
+A caller that sends a write itself records it with lease=True: the entry
+is owned by this process (owner_pid) until lease_expires. flush() only
+replays entries nobody is sending, i.e. unowned entries, expired leases
+and entries whose owner process has exited, and leases what it takes, so
+a second process sharing the journal does not resend writes in flight.
+
+A write HubSpot definitively rejected (a 4xx other than 408/429, raised as
+RejectedWrite by the applier) fails at once; transport errors and unknown
+outcomes stay pending for up to max_attempts tries.
+
+flush() applies pending entries through a batch callback (one call per
+object type and batch of up to 100 records). JournalFlusher runs it on a
+background thread. The flusher's first pass picks up whatever a previous
+process left pending.
+
+The journal lives in the user cache directory by default
+($XDG_CACHE_HOME or ~/.cache, under crm_agent/hubspot_writes.db).
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+DEFAULT_BATCH_SIZE = 100        # HubSpot batch update accepts at most 100 inputs
+DEFAULT_MAX_ATTEMPTS = 5
+DEFAULT_LEASE_SECONDS = 120.0   # Longer than a HubSpot request may take
+
+PENDING, ACKED, FAILED = "pending", "acked", "failed"
+
+# (object_type, {object_id: properties}) -> None; raises when the batch was not applied
+BatchApplier = Callable[[str, Dict[str, Dict[str, Any]]], Any]
+
+
+# 4xx statuses that do not mean the request itself was refused
+RETRYABLE_CLIENT_STATUSES = frozenset({408, 429})
+
+
+class RejectedWrite(Exception):
+    """Raised by a batch applier when HubSpot definitively refused the batch."""
+
+
+def default_journal_path() -> str:
+    """hubspot_writes.db under the user cache directory."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "crm_agent", "hubspot_writes.db")
+
+
+def process_alive(pid: int) -> bool:
+    """Whether a local process is running. Assumed alive where it cannot be checked."""
+    if pid == os.getpid() or os.name == "nt":   # os.kill(pid, 0) terminates the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        return True
+    return True
+
+
+def is_rejection(status_code: Optional[int]) -> bool:
+    """Whether an HTTP status means the write was refused and retrying it cannot help."""
+    return status_code is not None and 400 <= status_code < 500 and status_code not in RETRYABLE_CLIENT_STATUSES
+
+
+def idempotency_key(object_type: str, object_id: str, properties: Dict[str, Any]) -> str:
+    """
+    Content key for a property update, in the CRMSessionState key format.
+
+    The same properties written to the same record get the same key. Only
+    pass it explicitly where repeating an identical write is known to be a
+    retry (e.g. re-running one batch job); otherwise scope keys to a session
+    (CRMSessionState.generate_idempotency_key) or let the journal pick one.
+    """
+    payload = json.dumps([object_type, str(object_id), properties], sort_keys=True, default=str)
+    return f"{object_type}_{object_id}_{hashlib.sha256(payload.encode()).hexdigest()[:16]}"
+
+
+def unique_key(object_type: str, object_id: str) -> str:
+    """Fresh key for a write the caller did not key."""
+    return f"{object_type}_{object_id}_{uuid.uuid4().hex[:16]}"
+
+
+@dataclass
+class JournalEntry:
+    """One journaled write."""
+    key: str
+    object_type: str
+    object_id: str
+    properties: Dict[str, Any]
+    status: str
+    attempts: int
+    error: Optional[str]
+    created_at: float
+
+
+class WriteJournal:
+    """SQLite-backed journal of HubSpot writes keyed by idempotency key."""
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS writes (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            key TEXT NOT NULL UNIQUE,
+            object_type TEXT NOT NULL,
+            object_id TEXT NOT NULL,
+            properties TEXT NOT NULL,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at REAL NOT NULL,
+            acked_at REAL,
+            owner_pid INTEGER,
+            lease_expires REAL NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS idx_writes_status ON writes(status, seq);
+        CREATE INDEX IF NOT EXISTS idx_writes_record ON writes(object_type, object_id, status);
+    """
+
+    # Columns added after the first release, for journals created before them
+    _ADDED_COLUMNS = {
+        "owner_pid": "INTEGER",
+        "lease_expires": "REAL NOT NULL DEFAULT 0",
+    }
+
+    def __init__(self, path: Optional[str] = None, max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS):
+        path = path or default_journal_path()
+        self.path = path
+        self.max_attempts = max(1, max_attempts)
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self._SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(writes)")}
+        for name, definition in self._ADDED_COLUMNS.items():
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE writes ADD COLUMN {name} {definition}")
+        self._conn.commit()
+
+    @classmethod
+    def from_env(cls) -> Optional["WriteJournal"]:
+        """Journal at HUBSPOT_WRITE_JOURNAL, or None when the variable is unset or empty."""
+        path = os.getenv("HUBSPOT_WRITE_JOURNAL", "")
+        return cls(path) if path else None
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def record(self, object_type: str, object_id: str, properties: Dict[str, Any],
+               key: Optional[str] = None, lease: bool = False) -> str:
+        """Journal an intended write (no-op when `key` is already journaled). Returns its key."""
+        return self.record_many(object_type, {object_id: properties}, [key] if key else None, lease)[0]
+
+    def record_many(self, object_type: str, updates: Dict[str, Dict[str, Any]],
+                    keys: Optional[List[Optional[str]]] = None, lease: bool = False) -> List[str]:
+        """
+        Journal several writes in one transaction. Returns their keys, in order.
+
+        With `lease`, the caller is about to send the writes itself, so
+        flush() leaves them alone until they are acked or failed, the lease
+        expires or this process exits. Without it they are queued for flush().
+        """
+        now = time.time()
+        owner, expires = (os.getpid(), now + self.lease_seconds) if lease else (None, 0)
+        rows, result = [], []
+        for index, (object_id, properties) in enumerate(updates.items()):
+            key = (keys[index] if keys else None) or unique_key(object_type, object_id)
+            result.append(key)
+            rows.append((key, object_type, str(object_id), json.dumps(properties, default=str), PENDING, now,
+                         owner, expires))
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO writes "
+                "(key, object_type, object_id, properties, status, created_at, owner_pid, lease_expires) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return result
+
+    def status(self, key: str) -> Optional[str]:
+        """pending, acked or failed; None for an unknown key."""
+        with self._lock:
+            row = self._conn.execute("SELECT status FROM writes WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def acked(self, keys: Iterable[str]) -> set:
+        """The subset of keys already acked."""
+        keys = list(keys)
+        found = set()
+        with self._lock:
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                found.update(row[0] for row in self._conn.execute(
+                    f"SELECT key FROM writes WHERE status = ? AND key IN ({','.join('?' * len(chunk))})",
+                    [ACKED, *chunk],
+                ))
+        return found
+
+    def pending(self, object_type: Optional[str] = None, limit: Optional[int] = None) -> List[JournalEntry]:
+        """Pending entries, oldest first."""
+        query = ("SELECT key, object_type, object_id, properties, status, attempts, error, created_at "
+                 "FROM writes WHERE status = ?")
+        params: List[Any] = [PENDING]
+        if object_type:
+            query += " AND object_type = ?"
+            params.append(object_type)
+        query += " ORDER BY seq"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [JournalEntry(r[0], r[1], r[2], json.loads(r[3]), r[4], r[5], r[6], r[7]) for r in rows]
+
+    def claim_pending(self) -> List[JournalEntry]:
+        """
+        Lease the pending entries no live process is sending, oldest first.
+
+        An entry is free when it has no owner, its lease expired or its
+        owner process has exited. Claimed entries are leased to this process.
+        """
+        now = time.time()
+        me = os.getpid()
+        alive: Dict[int, bool] = {}
+        with self._lock:
+            # IMMEDIATE: another process cannot claim the same rows in between
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT key, object_type, object_id, properties, status, attempts, error, created_at, "
+                    "owner_pid, lease_expires FROM writes WHERE status = ? ORDER BY seq",
+                    (PENDING,),
+                ).fetchall()
+                claimed = []
+                for row in rows:
+                    owner, expires = row[8], row[9]
+                    if owner is not None and expires > now:
+                        if owner == me:
+                            continue
+                        if owner not in alive:
+                            alive[owner] = process_alive(owner)
+                        if alive[owner]:
+                            continue
+                    claimed.append(row)
+                self._conn.executemany(
+                    "UPDATE writes SET owner_pid = ?, lease_expires = ? WHERE key = ?",
+                    [(me, now + self.lease_seconds, row[0]) for row in claimed],
+                )
+                self._conn.commit()
+            except BaseException:
+                self._conn.rollback()
+                raise
+        return [JournalEntry(r[0], r[1], r[2], json.loads(r[3]), r[4], r[5], r[6], r[7]) for r in claimed]
+
+    def mark_acked(self, keys: Iterable[str]):
+        """
+        Ack writes and drop the properties they set from older pending writes
+        to the same records. An older write left with nothing to set is acked.
+        """
+        now = time.time()
+        keys = list(keys)
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE writes SET status = ?, error = NULL, acked_at = ?, owner_pid = NULL, lease_expires = 0 "
+                "WHERE key = ?",
+                [(ACKED, now, key) for key in keys],
+            )
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT seq, object_type, object_id, properties FROM writes WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None:
+                    continue
+                names = set(json.loads(row[3]))
+                superseded, narrowed = [], []
+                for older, properties in self._conn.execute(
+                    "SELECT key, properties FROM writes "
+                    "WHERE object_type = ? AND object_id = ? AND status = ? AND seq < ?",
+                    (row[1], row[2], PENDING, row[0]),
+                ).fetchall():
+                    properties = json.loads(properties)
+                    remaining = {name: value for name, value in properties.items() if name not in names}
+                    if not remaining:
+                        superseded.append(older)
+                    elif len(remaining) < len(properties):
+                        narrowed.append((json.dumps(remaining, default=str), older))
+                self._conn.executemany(
+                    "UPDATE writes SET status = ?, acked_at = ? WHERE key = ? AND status = ?",
+                    [(ACKED, now, older, PENDING) for older in superseded],
+                )
+                self._conn.executemany("UPDATE writes SET properties = ? WHERE key = ?", narrowed)
+
+    def mark_failed(self, keys: Iterable[str], error: str, rejected: bool = False):
+        """
+        Count a failed attempt; entries out of attempts stop being retried.
+
+        A rejected write (HubSpot refused it) fails at once.
+        """
+        limit = 1 if rejected else self.max_attempts
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "UPDATE writes SET attempts = attempts + 1, error = ?, owner_pid = NULL, lease_expires = 0, "
+                "status = CASE WHEN attempts + 1 >= ? THEN ? ELSE status END WHERE key = ? AND status = ?",
+                [(error, limit, FAILED, key, PENDING) for key in keys],
+            )
+
+    def retry_failed(self) -> int:
+        """Put failed entries back in the queue. Returns how many."""
+        with self._lock, self._conn:
+            return self._conn.execute(
+                "UPDATE writes SET status = ?, attempts = 0 WHERE status = ?", (PENDING, FAILED)
+            ).rowcount
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = dict(self._conn.execute("SELECT status, COUNT(*) FROM writes GROUP BY status").fetchall())
+        return {status: counts.get(status, 0) for status in (PENDING, ACKED, FAILED)}
+
+    def flush(self, apply_batch: BatchApplier, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+        """
+        Apply pending writes in batches and ack them.
+
+        Only entries no live process is sending are applied (claim_pending).
+        Pending entries for the same record are merged, with later entries
+        winning, because a batch may not name a record twice. A batch is
+        acked only after apply_batch returns. If it raises, every entry in
+        the batch counts a failed attempt; RejectedWrite fails them at once.
+
+        Returns:
+            {"applied", "failed", "batches"} counts of entries and calls
+        """
+        stats = {"applied": 0, "failed": 0, "batches": 0}
+        with self._flush_lock:
+            entries = self.claim_pending()
+            by_type: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            keys_by_record: Dict[tuple, List[str]] = {}
+            for entry in entries:
+                merged = by_type.setdefault(entry.object_type, {}).setdefault(entry.object_id, {})
+                merged.update(entry.properties)
+                keys_by_record.setdefault((entry.object_type, entry.object_id), []).append(entry.key)
+
+            for object_type, updates in by_type.items():
+                object_ids = list(updates)
+                for start in range(0, len(object_ids), batch_size):
+                    batch = {object_id: updates[object_id] for object_id in object_ids[start:start + batch_size]}
+                    keys = [key for object_id in batch for key in keys_by_record[(object_type, object_id)]]
+                    stats["batches"] += 1
+                    try:
+                        apply_batch(object_type, batch)
+                    except Exception as e:
+                        self.mark_failed(keys, str(e), isinstance(e, RejectedWrite))
+                        stats["failed"] += len(keys)
+                        continue
+                    self.mark_acked(keys)
+                    stats["applied"] += len(keys)
+        return stats
+
+
+class JournalFlusher:
+    """Background thread flushing a WriteJournal every `interval` seconds or when notified."""
+
+    def __init__(self, journal: WriteJournal, apply_batch: BatchApplier, interval: float = 2.0,
+                 batch_size: int = DEFAULT_BATCH_SIZE):
+        self.journal = journal
+        self.apply_batch = apply_batch
+        self.interval = interval
+        self.batch_size = batch_size
+        self.totals = {"applied": 0, "failed": 0, "batches": 0}
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "JournalFlusher":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="hubspot-journal-flusher", daemon=True)
+            self._thread.start()
+        return self
+
+    def notify(self):
+        """Flush now instead of at the next interval."""
+        self._wake.set()
+
+    def stop(self, flush: bool = True):
+        """Stop the thread, flushing what is still pending first when `flush` is set."""
+        self._stopping.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if flush:
+            self.flush_once()
+
+    def flush_once(self) -> Dict[str, int]:
+        stats = self.journal.flush(self.apply_batch, self.batch_size)
+        for name, count in stats.items():
+            self.totals[name] += count
+        return stats
+
+    def _run(self):
+        while not self._stopping.is_set():
+            try:
+                self.flush_once()
+            except Exception as e:
+                print(f"❌ Write journal flush failed: {e}")
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
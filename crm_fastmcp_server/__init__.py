@@ -1,6 +1,13 @@
 """CRM FastMCP Server for multi-agent CRM enrichment and cleanup."""
 
-# Import only the stdio server for MCP protocol
-from . import stdio_server
+# The stdio server is not imported here: `python -m crm_fastmcp_server.stdio_server`
+# would otherwise load it twice (once as a submodule, once as __main__).
 
 __all__ = ["stdio_server"]
+
+
+def __getattr__(name):
+    if name == "stdio_server":
+        from . import stdio_server
+        return stdio_server
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,6 +5,7 @@ This server implements the MCP protocol over stdio for use with ADK.
 """
 
 import asyncio
+import contextlib
 import json
 import sys
 import os
@@ -26,6 +27,9 @@ from mcp.types import (
 import mcp.server.stdio
 import mcp.types
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from crm_agent.utils.write_journal import RejectedWrite, WriteJournal, is_rejection
+
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -46,6 +50,23 @@ def load_env():
 ENV_VARS = load_env()
 HUBSPOT_TOKEN = ENV_VARS.get('PRIVATE_APP_ACCESS_TOKEN') or os.getenv('PRIVATE_APP_ACCESS_TOKEN')
 
+# Write-ahead journal for update_company/update_contact: an update is
+# journaled before it is sent, so failed writes and writes interrupted by a
+# crash are retried by the background flusher, and a call retried with the
+# same idempotency_key is not applied twice. Updates HubSpot rejects are
+# failed, not replayed. Opened on first use; defaults to the user cache dir.
+JOURNAL_PATH = ENV_VARS.get('HUBSPOT_WRITE_JOURNAL') or os.getenv('HUBSPOT_WRITE_JOURNAL') or None
+JOURNAL_FLUSH_INTERVAL = float(ENV_VARS.get('HUBSPOT_JOURNAL_FLUSH_INTERVAL')
+                               or os.getenv('HUBSPOT_JOURNAL_FLUSH_INTERVAL') or 5.0)
+_journal: Optional[WriteJournal] = None
+
+def get_journal() -> WriteJournal:
+    """The write journal, opened on first use."""
+    global _journal
+    if _journal is None:
+        _journal = WriteJournal(JOURNAL_PATH)
+    return _journal
+
 # Initialize the MCP server
 app = Server("hubspot-crm-server")
 
@@ -163,6 +184,10 @@ async def list_tools() -> List[Tool]:
                     "properties": {
                         "type": "object",
                         "description": "Properties to update (key-value pairs)"
+                    },
+                    "idempotency_key": {
+                        "type": "string",
+                        "description": "Key identifying this write; a retried call with a key already applied is not re-sent (default: none, every call is sent)"
                     }
                 },
                 "required": ["company_id", "properties"]
@@ -181,6 +206,10 @@ async def list_tools() -> List[Tool]:
                     "properties": {
                         "type": "object",
                         "description": "Properties to update (key-value pairs)"
+                    },
+                    "idempotency_key": {
+                        "type": "string",
+                        "description": "Key identifying this write; a retried call with a key already applied is not re-sent (default: none, every call is sent)"
                     }
                 },
                 "required": ["contact_id", "properties"]
@@ -220,11 +249,54 @@ async def make_hubspot_request(method: str, endpoint: str, data: Optional[Dict]
             
     except httpx.HTTPStatusError as e:
         logger.error(f"HubSpot API error: {e.response.status_code} - {e.response.text}")
-        return {"error": f"HubSpot API error: {e.response.status_code}", "details": e.response.text}
+        return {"error": f"HubSpot API error: {e.response.status_code}", "details": e.response.text,
+                "status": e.response.status_code}
     except Exception as e:
         logger.error(f"Request error: {e}")
         return {"error": str(e)}
 
+async def journaled_update(object_type: str, object_id: str, properties: Dict[str, Any],
+                           key: Optional[str] = None) -> Dict[str, Any]:
+    """PATCH one record through the write journal."""
+    journal = get_journal()
+    key = journal.record(object_type, object_id, properties, key, lease=True)
+    if journal.status(key) == "acked":
+        return {"id": object_id, "idempotency_key": key, "already_applied": True}
+    
+    result = await make_hubspot_request("PATCH", f"/crm/v3/objects/{object_type}/{object_id}", {"properties": properties})
+    if "error" in result:
+        journal.mark_failed([key], result["error"], is_rejection(result.get("status")))
+    else:
+        journal.mark_acked([key])
+    return result
+
+async def flush_journal() -> Dict[str, int]:
+    """Apply pending writes no live process is sending through the batch update endpoints."""
+    async def apply(object_type: str, updates: Dict[str, Dict[str, Any]]):
+        inputs = [{"id": object_id, "properties": props} for object_id, props in updates.items()]
+        result = await make_hubspot_request("POST", f"/crm/v3/objects/{object_type}/batch/update", {"inputs": inputs})
+        if "error" in result:
+            raise (RejectedWrite if is_rejection(result.get("status")) else RuntimeError)(result["error"])
+    
+    loop = asyncio.get_running_loop()
+    
+    def apply_batch(object_type: str, updates: Dict[str, Dict[str, Any]]):
+        asyncio.run_coroutine_threadsafe(apply(object_type, updates), loop).result()
+    
+    return await loop.run_in_executor(None, get_journal().flush, apply_batch)
+
+async def run_journal_flusher(interval: float = JOURNAL_FLUSH_INTERVAL):
+    """Retry pending journal writes every `interval` seconds until cancelled."""
+    while True:
+        try:
+            if get_journal().stats()["pending"]:
+                stats = await flush_journal()
+                if stats["batches"]:
+                    logger.info(f"Write journal: {stats['applied']} pending writes applied, {stats['failed']} failed")
+        except Exception as e:
+            logger.error(f"Write journal flush failed: {e}")
+        await asyncio.sleep(interval)
+
 @app.call_tool()
 async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
     """Handle tool calls."""
@@ -351,8 +423,7 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         company_id = arguments.get("company_id")
         properties = arguments.get("properties", {})
         
-        update_data = {"properties": properties}
-        result = await make_hubspot_request("PATCH", f"/crm/v3/objects/companies/{company_id}", update_data)
+        result = await journaled_update("companies", company_id, properties, arguments.get("idempotency_key"))
         
         return [TextContent(
             type="text",
@@ -363,8 +434,7 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
         contact_id = arguments.get("contact_id")
         properties = arguments.get("properties", {})
         
-        update_data = {"properties": properties}
-        result = await make_hubspot_request("PATCH", f"/crm/v3/objects/contacts/{contact_id}", update_data)
+        result = await journaled_update("contacts", contact_id, properties, arguments.get("idempotency_key"))
         
         return [TextContent(
             type="text",
@@ -379,12 +449,20 @@ async def call_tool(name: str, arguments: Dict[str, Any]) -> List[TextContent]:
 
 async def main():
     """Run the stdio server."""
-    async with stdio_server() as (read_stream, write_stream):
-        await app.run(
-            read_stream,
-            write_stream,
-            app.create_initialization_options()
-        )
+    # The flusher's first pass applies what a previous run left pending
+    flusher = asyncio.create_task(run_journal_flusher()) if HUBSPOT_TOKEN else None
+    try:
+        async with stdio_server() as (read_stream, write_stream):
+            await app.run(
+                read_stream,
+                write_stream,
+                app.create_initialization_options()
+            )
+    finally:
+        if flusher is not None:
+            flusher.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await flusher
 
 if __name__ == "__main__":
     asyncio.run(main())
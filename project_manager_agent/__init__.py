@@ -5,7 +5,12 @@ A2A compliant project management agent that orchestrates complex CRM tasks
 by coordinating with specialized agents like the CRM Agent.
 """
 
-from .coordinator import ProjectManagerAgent, create_project_manager
-from .main import create_agent
+from crm_agent.utils.lazy_imports import lazy_exports
 
 __all__ = ["ProjectManagerAgent", "create_project_manager", "create_agent"]
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "ProjectManagerAgent": ".coordinator",
+    "create_project_manager": ".coordinator",
+    "create_agent": ".main",
+})
@@ -7,18 +7,28 @@ import sys
 import os
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from google.adk.agents import LlmAgent
 from google.adk.tools import FunctionTool, AgentTool
 from google.adk import Runner
 from .core.task_models import Project, Task, TaskStatus, TaskPriority
-from .core.orchestration import TaskOrchestrator
-from .core.critique_system import CRMResponseCritic, CriticalThinkingEngine, ResponseQuality
+from .core.orchestration import FollowUpLedger, TaskOrchestrator
+from .core.critique_system import CRMResponseCritic, CriticalThinkingEngine, CritiqueRequest, ResponseQuality
 import uuid
 from datetime import datetime
 
 # Import CRM agent factory
 from crm_agent.core.factory import crm_agent_registry
+from crm_agent.utils.write_buffer import WriteBuffer
+
+try:
+    from scripts.hubspot_safe_connector import HubSpotConnector
+    HUBSPOT_CONNECTOR_AVAILABLE = True
+except ImportError:
+    HUBSPOT_CONNECTOR_AVAILABLE = False
+
+# Follow-up levels generated from critique (planned tasks are level 0)
+MAX_FOLLOW_UP_DEPTH = 2
 
 
 def execute_crm_task_direct(task_description: str, company_name: str = None, company_id: str = None) -> Dict[str, Any]:
@@ -299,8 +309,10 @@ The execute_crm_task tool directly uses the same CRM coordinator that works stan
         # Store project
         self.projects[project.id] = project
         
-        # Execute project
-        result = await self.orchestrator.execute_project(project)
+        # Execute project, coalescing the agents' HubSpot writes
+        write_buffer = self._project_write_buffer()
+        result = await self.orchestrator.execute_project(project, write_buffer=write_buffer)
+        result["write_stats"] = write_buffer.stats() if write_buffer else None
         
         return result
     
@@ -335,56 +347,37 @@ The execute_crm_task tool directly uses the same CRM coordinator that works stan
         return result
     
     async def _execute_project_with_critique(self, project: Project) -> Dict[str, Any]:
-        """Execute project with intelligent critique of each task result"""
+        """
+        Execute project with intelligent critique of each task result.
+        
+        Tasks run on the orchestrator's concurrent DAG executor. Each batch of
+        finished tasks is critiqued as soon as it completes and any follow-ups
+        are added to the project, where the executor picks them up at once.
+        Follow-ups are limited to two levels deep (the old three iterations)
+        and to one per agent, record and critique category.
+        """
         print(f"🚀 Starting project with critique: {project.name}")
         
-        results = {}
-        follow_up_tasks = []
-        max_iterations = 3  # Prevent infinite loops
-        iteration = 0
+        ledger = FollowUpLedger(max_depth=MAX_FOLLOW_UP_DEPTH)
         
-        while iteration < max_iterations:
-            iteration += 1
-            print(f"📊 Iteration {iteration}: Executing tasks with critique")
-            
-            # Get current tasks to execute
-            current_tasks = project.get_ready_tasks() + follow_up_tasks
-            follow_up_tasks = []  # Reset for next iteration
-            
-            if not current_tasks:
-                incomplete_tasks = [t for t in project.tasks if t.status == TaskStatus.PENDING]
-                if not incomplete_tasks:
-                    break  # All tasks completed
-                else:
-                    # Handle circular dependencies
-                    for task in incomplete_tasks:
-                        task.fail("Unmet dependencies")
-                    break
-            
-            # Execute and critique each task
-            for task in current_tasks:
-                if hasattr(task, 'status') and task.status != TaskStatus.PENDING:
-                    continue  # Skip already processed tasks
-                    
-                result = await self.orchestrator.execute_task(task)
-                results[task.id] = result
-                
-                # Critique the result
-                critique = self._critique_task_result(task, result)
-                
+        def critique_finished(finished: List[Tuple[Task, Dict[str, Any]]]):
+            for (task, _), critique in zip(finished, self._critique_task_results(finished)):
                 # Store critique
                 self.critique_history[task.id] = critique
                 
                 # Generate follow-up if needed
-                if critique.needs_follow_up and iteration < max_iterations:
-                    follow_up_task = self._create_follow_up_task(task, critique)
+                if not critique.needs_follow_up:
+                    continue
+                categories = ledger.claim(task, [c.get("category") for c in critique.critiques])
+                if categories:
+                    follow_up_task = self._create_follow_up_task(task, critique, project, categories)
                     if follow_up_task:
-                        follow_up_tasks.append(follow_up_task)
+                        ledger.add_follow_up(task, follow_up_task)
                         print(f"🔄 Generated follow-up task: {follow_up_task.name}")
-            
-            # If no follow-ups generated, we're done
-            if not follow_up_tasks:
-                break
+        
+        write_buffer = self._project_write_buffer()
+        results = await self.orchestrator.run_dag(project, on_complete=critique_finished, write_buffer=write_buffer)
+        iteration = ledger.iterations
         
         # Generate final results with critique summary
         completed = sum(1 for t in project.tasks if t.status == TaskStatus.COMPLETED)
@@ -399,37 +392,64 @@ The execute_crm_task tool directly uses the same CRM coordinator that works stan
             "failed_tasks": failed,
             "task_results": results,
             "critique_summary": self._generate_critique_summary(),
-            "iterations": iteration
+            "iterations": iteration,
+            "write_stats": write_buffer.stats() if write_buffer else None
         }
         
         print(f"📊 Project completed after {iteration} iterations")
         return project_result
     
+    def _project_write_buffer(self) -> Optional[WriteBuffer]:
+        """
+        A write buffer for one project run, flushed once when the run ends.
+        
+        Returns:
+            The buffer, or None without the HubSpot connector or a token
+            (agents then send their own updates)
+        """
+        if not HUBSPOT_CONNECTOR_AVAILABLE:
+            return None
+        try:
+            connector = HubSpotConnector()
+        except ValueError as e:
+            print(f"⚠️ HubSpot writes not buffered: {e}")
+            return None
+        return connector.write_buffer(max_wait=None)
+    
     def _critique_task_result(self, task: Task, result: Dict[str, Any]) -> 'CritiqueResult':
         """Critique a single task result"""
-        print(f"🔍 Critiquing result for task: {task.name}")
-        
-        critique = self.critic.critique_response(
-            agent_type=task.agent_type,
-            task_description=task.description,
-            response=result,
-            context=task.parameters
-        )
+        return self._critique_task_results([(task, result)])[0]
+    
+    def _critique_task_results(self, executed: List[Tuple[Task, Dict[str, Any]]]) -> List['CritiqueResult']:
+        """Critique a batch of (task, result) pairs"""
+        critiques = self.critic.critique_batch([
+            CritiqueRequest(
+                agent_type=task.agent_type,
+                task_description=task.description,
+                response=result,
+                context=task.parameters
+            )
+            for task, result in executed
+        ])
         
         # Log critique results
-        if critique.overall_quality in [ResponseQuality.POOR, ResponseQuality.UNACCEPTABLE]:
-            print(f"⚠️ Poor quality response detected (Score: {critique.score})")
-            for question in critique.follow_up_questions:
-                print(f"   ❓ Follow-up: {question}")
-        elif critique.needs_follow_up:
-            print(f"🤔 Response needs follow-up (Score: {critique.score})")
-        else:
-            print(f"✅ Response quality acceptable (Score: {critique.score})")
+        for (task, _), critique in zip(executed, critiques):
+            print(f"🔍 Critiqued result for task: {task.name}")
+            if critique.overall_quality in [ResponseQuality.POOR, ResponseQuality.UNACCEPTABLE]:
+                print(f"⚠️ Poor quality response detected (Score: {critique.score})")
+                for question in critique.follow_up_questions:
+                    print(f"   ❓ Follow-up: {question}")
+            elif critique.needs_follow_up:
+                print(f"🤔 Response needs follow-up (Score: {critique.score})")
+            else:
+                print(f"✅ Response quality acceptable (Score: {critique.score})")
         
-        return critique
+        return critiques
     
-    def _create_follow_up_task(self, original_task: Task, critique: 'CritiqueResult') -> Optional[Task]:
-        """Create a follow-up task based on critique results"""
+    def _create_follow_up_task(self, original_task: Task, critique: 'CritiqueResult',
+                               project: Optional[Project] = None,
+                               categories: Optional[List[str]] = None) -> Optional[Task]:
+        """Create a follow-up task based on critique results and add it to the project"""
         if not critique.needs_follow_up:
             return None
         
@@ -441,7 +461,7 @@ The execute_crm_task tool directly uses the same CRM coordinator that works stan
             "follow_up_questions": critique.follow_up_questions,
             "improvement_areas": critique.suggested_improvements,
             "original_score": critique.score,
-            "critique_focus": [c.get("category") for c in critique.critiques]
+            "critique_focus": categories or [c.get("category") for c in critique.critiques]
         })
         
         follow_up_task = Task(
@@ -454,8 +474,11 @@ The execute_crm_task tool directly uses the same CRM coordinator that works stan
             dependencies=[]  # Follow-ups don't depend on other tasks
         )
         
-        # Add to project
-        self.projects[list(self.projects.keys())[-1]].add_task(follow_up_task)
+        # Add to the original task's project
+        if project is None:
+            project = next((p for p in self.projects.values() if original_task in p.tasks), None)
+        if project is not None:
+            project.add_task(follow_up_task)
         
         return follow_up_task
     
@@ -502,6 +525,9 @@ The execute_crm_task tool directly uses the same CRM coordinator that works stan
             description=goal,
             goal=goal
         )
+        project.state.company_id = context.get("company_id")
+        project.state.company_domain = context.get("company_domain")
+        project.state.contact_email = context.get("contact_email")
         
         # Parse goal and create tasks
         tasks = self._parse_goal_to_tasks(goal, context)
@@ -2,8 +2,14 @@
 Core components for the Project Manager Agent
 """
 
-from .base_agent import BaseProjectManagerAgent
-from .task_models import Task, TaskStatus, TaskPriority
-from .orchestration import TaskOrchestrator
+from crm_agent.utils.lazy_imports import lazy_exports
 
 __all__ = ["BaseProjectManagerAgent", "Task", "TaskStatus", "TaskPriority", "TaskOrchestrator"]
+
+__getattr__, __dir__ = lazy_exports(globals(), {
+    "BaseProjectManagerAgent": ".base_agent",
+    "Task": ".task_models",
+    "TaskStatus": ".task_models",
+    "TaskPriority": ".task_models",
+    "TaskOrchestrator": ".orchestration",
+})
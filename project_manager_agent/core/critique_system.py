@@ -12,6 +12,9 @@ import json
 import re
 
 
+EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+
 class ResponseQuality(Enum):
     """Quality assessment levels for CRM agent responses"""
     EXCELLENT = "excellent"
@@ -42,6 +45,62 @@ class CritiqueResult:
     confidence: float  # 0-100
 
 
+@dataclass
+class CritiqueRequest:
+    """One agent response to critique, for CRMResponseCritic.critique_batch"""
+    agent_type: str
+    task_description: str
+    response: Dict[str, Any]
+    context: Optional[Dict[str, Any]] = None
+
+
+class ResultIndex:
+    """
+    An agent response or task result, inspected once.
+    
+    Records which fields hold a value (the presence set) and whether the
+    result is an error. The complete (non-blank) field count and the lowered
+    text of the whole result are built on first use, since only the project
+    level assessments need them.
+    """
+    
+    __slots__ = ("result", "present", "field_count", "has_error", "_complete_count", "_text_lower")
+    
+    def __init__(self, result: Any):
+        self.result = result
+        is_dict = isinstance(result, dict)
+        self.present = frozenset([key for key, value in result.items() if value]) if is_dict else frozenset()
+        self.field_count = len(result) if is_dict else 0
+        self.has_error = is_dict and "error" in result
+        self._complete_count = None
+        self._text_lower = None
+    
+    def has(self, *keys: str) -> bool:
+        """True if any of the fields holds a value"""
+        return not self.present.isdisjoint(keys)
+    
+    @property
+    def complete_count(self) -> int:
+        """Fields holding a value that is not a blank string"""
+        if self._complete_count is None:
+            self._complete_count = sum(
+                1 for key in self.present
+                if not isinstance(self.result[key], str) or self.result[key].strip()
+            )
+        return self._complete_count
+    
+    @property
+    def text_lower(self) -> str:
+        if self._text_lower is None:
+            self._text_lower = str(self.result).lower()
+        return self._text_lower
+
+
+def index_results(results: List[Any]) -> List[ResultIndex]:
+    """Index each result once (results that are already indexed are kept as they are)."""
+    return [r if isinstance(r, ResultIndex) else ResultIndex(r) for r in results]
+
+
 class CRMResponseCritic:
     """
     Intelligent critic that evaluates CRM agent responses and generates follow-up actions.
@@ -89,7 +148,29 @@ class CRMResponseCritic:
         Returns:
             Detailed critique result with quality assessment and follow-up actions
         """
+        return self._critique_indexed(agent_type, task_description, ResultIndex(response), context)
+    
+    def critique_batch(self, requests: List[CritiqueRequest]) -> List[CritiqueResult]:
+        """
+        Critique many responses at once (e.g. every task result of a project iteration).
+        
+        Each response is indexed once and every validator reads the index.
         
+        Args:
+            requests: Responses to critique
+            
+        Returns:
+            Critique results, in the order of requests
+        """
+        indexes = index_results([request.response for request in requests])
+        return [
+            self._critique_indexed(request.agent_type, request.task_description, index, request.context)
+            for request, index in zip(requests, indexes)
+        ]
+    
+    def _critique_indexed(self, agent_type: str, task_description: str,
+                          index: ResultIndex, context: Dict[str, Any] = None) -> CritiqueResult:
+        response = index.result
         if not response:
             return CritiqueResult(
                 overall_quality=ResponseQuality.UNACCEPTABLE,
@@ -102,26 +183,24 @@ class CRMResponseCritic:
             )
         
         # Check for errors first
-        if "error" in response:
+        if index.has_error:
             return self._handle_error_response(response, task_description)
         
         # Use specific validator for agent type
-        if agent_type in self.response_validators:
-            return self.response_validators[agent_type](task_description, response, context)
-        else:
-            return self._validate_generic_response(task_description, response, context)
+        validator = self.response_validators.get(agent_type, self._validate_generic_response)
+        return validator(task_description, index, context)
     
     def _validate_company_intelligence_response(self, task_description: str, 
-                                               response: Dict[str, Any], context: Dict[str, Any]) -> CritiqueResult:
+                                               index: ResultIndex, context: Dict[str, Any]) -> CritiqueResult:
         """Validate company intelligence agent responses"""
+        response = index.result
         critiques = []
         follow_up_questions = []
         improvements = []
         score = 100
         
         # Check for essential company information - More lenient scoring
-        company_name = response.get("company_name") or response.get("name")
-        if not company_name:
+        if not index.has("company_name", "name"):
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "medium",  # Reduced severity
@@ -131,8 +210,7 @@ class CRMResponseCritic:
             score -= 15  # Reduced penalty
         
         # Check for domain/website information
-        domain = response.get("domain") or response.get("website")
-        if not domain and "website" in task_description.lower():
+        if not index.has("domain", "website") and "website" in task_description.lower():
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "medium", 
@@ -142,8 +220,7 @@ class CRMResponseCritic:
             score -= 20
         
         # Check for industry classification - More lenient
-        industry = response.get("industry") or response.get("industry_classification")
-        if not industry:
+        if not index.has("industry", "industry_classification"):
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "low",  # Reduced severity
@@ -198,16 +275,16 @@ class CRMResponseCritic:
         )
     
     def _validate_contact_intelligence_response(self, task_description: str,
-                                              response: Dict[str, Any], context: Dict[str, Any]) -> CritiqueResult:
+                                              index: ResultIndex, context: Dict[str, Any]) -> CritiqueResult:
         """Validate contact intelligence agent responses"""
+        response = index.result
         critiques = []
         follow_up_questions = []
         improvements = []
         score = 100
         
         # Check for essential contact information
-        contact_name = response.get("contact_name") or response.get("name")
-        if not contact_name:
+        if not index.has("contact_name", "name"):
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "high",
@@ -228,7 +305,7 @@ class CRMResponseCritic:
             score -= 25
         
         # Validate email format if provided
-        if email and not re.match(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$', email):
+        if email and not (isinstance(email, str) and EMAIL_PATTERN.match(email)):
             critiques.append({
                 "category": CritiqueCategory.ACCURACY.value,
                 "severity": "medium",
@@ -238,8 +315,7 @@ class CRMResponseCritic:
             score -= 20
         
         # Check for job title
-        title = response.get("title") or response.get("job_title")
-        if not title:
+        if not index.has("title", "job_title"):
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "medium",
@@ -249,8 +325,7 @@ class CRMResponseCritic:
             score -= 15
         
         # Check for company association
-        company = response.get("company") or response.get("company_name")
-        if not company:
+        if not index.has("company", "company_name"):
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "medium",
@@ -273,8 +348,9 @@ class CRMResponseCritic:
         )
     
     def _validate_enrichment_response(self, task_description: str,
-                                    response: Dict[str, Any], context: Dict[str, Any]) -> CritiqueResult:
+                                    index: ResultIndex, context: Dict[str, Any]) -> CritiqueResult:
         """Validate CRM enrichment agent responses"""
+        response = index.result
         critiques = []
         follow_up_questions = []
         improvements = []
@@ -304,8 +380,7 @@ class CRMResponseCritic:
             score -= 20
         
         # Check for data sources
-        data_sources = response.get("data_sources") or response.get("sources")
-        if not data_sources:
+        if not index.has("data_sources", "sources"):
             critiques.append({
                 "category": CritiqueCategory.ACCURACY.value,
                 "severity": "medium",
@@ -338,8 +413,9 @@ class CRMResponseCritic:
         )
     
     def _validate_management_response(self, task_description: str,
-                                    response: Dict[str, Any], context: Dict[str, Any]) -> CritiqueResult:
+                                    index: ResultIndex, context: Dict[str, Any]) -> CritiqueResult:
         """Validate company management enrichment agent responses"""
+        response = index.result
         critiques = []
         follow_up_questions = []
         improvements = []
@@ -376,8 +452,7 @@ class CRMResponseCritic:
             score -= 15
         
         # Check for HubSpot ID or update status
-        hubspot_id = response.get("management_company_id") or response.get("hubspot_id")
-        if not hubspot_id and "update" in task_description.lower():
+        if not index.has("management_company_id", "hubspot_id") and "update" in task_description.lower():
             critiques.append({
                 "category": CritiqueCategory.ACTIONABILITY.value,
                 "severity": "medium",
@@ -400,7 +475,7 @@ class CRMResponseCritic:
         )
     
     def _validate_field_enrichment_response(self, task_description: str,
-                                          response: Dict[str, Any], context: Dict[str, Any]) -> CritiqueResult:
+                                          index: ResultIndex, context: Dict[str, Any]) -> CritiqueResult:
         """Validate field enrichment manager agent responses"""
         critiques = []
         follow_up_questions = []
@@ -408,8 +483,7 @@ class CRMResponseCritic:
         score = 100
         
         # Check for field mapping results
-        field_mappings = response.get("field_mappings") or response.get("mappings")
-        if not field_mappings:
+        if not index.has("field_mappings", "mappings"):
             critiques.append({
                 "category": CritiqueCategory.COMPLETENESS.value,
                 "severity": "high",
@@ -419,8 +493,7 @@ class CRMResponseCritic:
             score -= 35
         
         # Check for validation results
-        validation_results = response.get("validation_results") or response.get("validation")
-        if not validation_results:
+        if not index.has("validation_results", "validation"):
             critiques.append({
                 "category": CritiqueCategory.DATA_QUALITY.value,
                 "severity": "medium",
@@ -430,8 +503,7 @@ class CRMResponseCritic:
             score -= 20
         
         # Check for enrichment statistics
-        stats = response.get("enrichment_stats") or response.get("statistics")
-        if not stats:
+        if not index.has("enrichment_stats", "statistics"):
             critiques.append({
                 "category": CritiqueCategory.ACTIONABILITY.value,
                 "severity": "low",
@@ -454,8 +526,9 @@ class CRMResponseCritic:
         )
     
     def _validate_generic_response(self, task_description: str,
-                                 response: Dict[str, Any], context: Dict[str, Any]) -> CritiqueResult:
+                                 index: ResultIndex, context: Dict[str, Any]) -> CritiqueResult:
         """Validate generic agent responses"""
+        response = index.result
         critiques = []
         follow_up_questions = []
         improvements = []
@@ -596,6 +669,8 @@ class CriticalThinkingEngine:
         Returns:
             Critical thinking analysis with insights and recommendations
         """
+        # Inspect each result once for every assessment below
+        task_results = index_results(task_results)
         
         analysis = {
             "goal_achievement": self._assess_goal_achievement(project_goal, task_results),
@@ -608,7 +683,7 @@ class CriticalThinkingEngine:
         
         return analysis
     
-    def _assess_goal_achievement(self, goal: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _assess_goal_achievement(self, goal: str, results: List[Any]) -> Dict[str, Any]:
         """Assess how well the project achieved its stated goal"""
         goal_lower = goal.lower()
         
@@ -616,11 +691,13 @@ class CriticalThinkingEngine:
         goal_keywords = self._extract_goal_keywords(goal_lower)
         addressed_keywords = set()
         
-        for result in results:
-            result_str = str(result).lower()
-            for keyword in goal_keywords:
-                if keyword in result_str:
-                    addressed_keywords.add(keyword)
+        for index in index_results(results):
+            # Stop once every keyword is addressed; remaining results are never stringified
+            remaining = goal_keywords - addressed_keywords
+            if not remaining:
+                break
+            text = index.text_lower
+            addressed_keywords.update(keyword for keyword in remaining if keyword in text)
         
         achievement_score = len(addressed_keywords) / len(goal_keywords) * 100 if goal_keywords else 0
         
@@ -634,22 +711,20 @@ class CriticalThinkingEngine:
                          "partial" if achievement_score >= 50 else "poor"
         }
     
-    def _assess_overall_data_quality(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _assess_overall_data_quality(self, results: List[Any]) -> Dict[str, Any]:
         """Assess the overall data quality across all task results"""
         total_fields = 0
         complete_fields = 0
         error_count = 0
         
-        for result in results:
-            if "error" in result:
+        for index in index_results(results):
+            if index.has_error:
                 error_count += 1
                 continue
             
             # Count fields and completeness
-            for key, value in result.items():
-                total_fields += 1
-                if value and str(value).strip():
-                    complete_fields += 1
+            total_fields += index.field_count
+            complete_fields += index.complete_count
         
         completeness_rate = (complete_fields / total_fields * 100) if total_fields > 0 else 0
         error_rate = (error_count / len(results) * 100) if results else 0
@@ -664,7 +739,7 @@ class CriticalThinkingEngine:
                            "C" if completeness_rate >= 60 and error_rate < 20 else "F"
         }
     
-    def _generate_strategic_insights(self, goal: str, results: List[Dict[str, Any]]) -> List[str]:
+    def _generate_strategic_insights(self, goal: str, results: List[Any]) -> List[str]:
         """Generate strategic insights based on project results"""
         insights = []
         
@@ -672,9 +747,9 @@ class CriticalThinkingEngine:
         successful_agents = []
         failed_agents = []
         
-        for result in results:
-            agent_type = result.get("agent_type", "unknown")
-            if "error" in result:
+        for index in index_results(results):
+            agent_type = index.result.get("agent_type", "unknown")
+            if index.has_error:
                 failed_agents.append(agent_type)
             else:
                 successful_agents.append(agent_type)
@@ -694,12 +769,13 @@ class CriticalThinkingEngine:
         
         return insights
     
-    def _recommend_next_actions(self, goal: str, results: List[Dict[str, Any]]) -> List[str]:
+    def _recommend_next_actions(self, goal: str, results: List[Any]) -> List[str]:
         """Recommend next actions based on project results"""
         actions = []
+        results = index_results(results)
         
         # Check for incomplete data
-        incomplete_results = [r for r in results if "error" in r or not r]
+        incomplete_results = [r for r in results if r.has_error or not r.result]
         if incomplete_results:
             actions.append("Retry failed tasks with different parameters or approaches")
         
@@ -717,31 +793,33 @@ class CriticalThinkingEngine:
         
         return actions
     
-    def _assess_risks(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _assess_risks(self, results: List[Any]) -> Dict[str, Any]:
         """Assess risks in the project results"""
         risks = {
             "data_accuracy": [],
             "completeness": [],
             "operational": []
         }
+        results = index_results(results)
         
         # Check for low confidence scores
-        for result in results:
-            confidence = result.get("confidence") or result.get("match_score")
-            if confidence and isinstance(confidence, (int, float)) and confidence < 70:
-                risks["data_accuracy"].append(f"Low confidence result: {confidence}%")
+        for index in results:
+            if index.has("confidence", "match_score"):
+                confidence = index.result.get("confidence") or index.result.get("match_score")
+                if isinstance(confidence, (int, float)) and confidence < 70:
+                    risks["data_accuracy"].append(f"Low confidence result: {confidence}%")
         
         # Check for missing critical data
-        for result in results:
-            if not result or "error" in result:
+        for index in results:
+            if not index.result or index.has_error:
                 risks["operational"].append("Task execution failures detected")
         
         return risks
     
-    def _calculate_success_metrics(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    def _calculate_success_metrics(self, results: List[Any]) -> Dict[str, Any]:
         """Calculate overall success metrics"""
         total_tasks = len(results)
-        successful_tasks = len([r for r in results if r and "error" not in r])
+        successful_tasks = len([r for r in index_results(results) if r.result and not r.has_error])
         
         return {
             "task_success_rate": (successful_tasks / total_tasks * 100) if total_tasks > 0 else 0,
@@ -769,24 +847,25 @@ class CriticalThinkingEngine:
         
         return keywords
     
-    def _identify_enrichment_opportunities(self, results: List[Dict[str, Any]]) -> List[str]:
+    def _identify_enrichment_opportunities(self, results: List[Any]) -> List[str]:
         """Identify opportunities for additional data enrichment"""
         opportunities = []
         
         # Look for partial results that could be improved
-        for result in results:
-            if isinstance(result, dict):
+        for index in index_results(results):
+            if isinstance(index.result, dict):
                 # Check for empty or minimal descriptions
-                description = result.get("description") or result.get("company_description")
-                if description and len(str(description).strip()) < 50:
-                    opportunities.append("Expand company descriptions with more detailed information")
+                if index.has("description", "company_description"):
+                    description = index.result.get("description") or index.result.get("company_description")
+                    if len(str(description).strip()) < 50:
+                        opportunities.append("Expand company descriptions with more detailed information")
                 
                 # Check for missing industry classification
-                if not result.get("industry") and not result.get("industry_classification"):
+                if not index.has("industry", "industry_classification"):
                     opportunities.append("Add industry classification to company records")
                 
                 # Check for missing contact information
-                if not result.get("email") and not result.get("contact_email"):
+                if not index.has("email", "contact_email"):
                     opportunities.append("Enrich contact email addresses")
         
         return list(set(opportunities))  # Remove duplicates
@@ -3,7 +3,13 @@ Task orchestration engine for the Project Manager Agent
 """
 
 import asyncio
-from typing import Dict, Any, List, Optional, Callable
+import contextvars
+import inspect
+import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from contextvars import ContextVar
+from typing import Dict, Any, Iterable, List, Optional, Callable, Set, Tuple
 from .task_models import Task, TaskStatus, Project
 import uuid
 import sys
@@ -11,14 +17,81 @@ import os
 
 # Add the parent directory to the path to import crm_agent
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+from crm_agent.core.state_models import CRMSessionState
+from crm_agent.utils.write_buffer import WriteBuffer, buffered_writes
+
+# Tasks run at once by the DAG executor
+DEFAULT_MAX_CONCURRENT_TASKS = int(os.getenv("PM_MAX_CONCURRENT_TASKS", "8"))
+
+# Parameters identifying the CRM record a task works on, in preference order
+RECORD_KEYS = ("company_id", "contact_id", "record_id", "company_name", "contact_email")
+
+# Called with each batch of finished (task, result) pairs; may add tasks to the project
+CompletionCallback = Callable[[List[Tuple[Task, Dict[str, Any]]]], Any]
+
+# Thread pool of the run_dag call a task runs under (None: the loop's default executor)
+_task_executor: ContextVar[Optional[ThreadPoolExecutor]] = ContextVar("pm_task_executor", default=None)
+
+
+class FollowUpLedger:
+    """
+    Follow-up bookkeeping for one project run.
+
+    Tracks each task's follow-up depth (0 for planned tasks) and the
+    (agent, record, critique category) keys already followed up, so a
+    record gets at most one follow-up per agent and category.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.depth: Dict[str, int] = {}
+        self.root: Dict[str, str] = {}
+        self.claimed: Set[Tuple[str, str, str]] = set()
+
+    def record_key(self, task: Task) -> str:
+        """The record a task works on, else the planned task it descends from."""
+        for key in RECORD_KEYS:
+            value = task.parameters.get(key)
+            if value:
+                return f"{key}:{str(value).strip().lower()}"
+        return f"task:{self.root.get(task.id, task.id)}"
+
+    def claim(self, task: Task, categories: Iterable[Optional[str]]) -> List[str]:
+        """
+        Claim follow-up keys for a task's critique categories.
+
+        Returns:
+            The categories not yet followed up for this agent and record;
+            empty when the task is already at max_depth
+        """
+        if self.depth.get(task.id, 0) >= self.max_depth:
+            return []
+        record = self.record_key(task)
+        new = []
+        for category in dict.fromkeys(c or "general" for c in categories):
+            key = (task.agent_type, record, category)
+            if key not in self.claimed:
+                self.claimed.add(key)
+                new.append(category)
+        return new
+
+    def add_follow_up(self, original_task: Task, follow_up_task: Task):
+        self.depth[follow_up_task.id] = self.depth.get(original_task.id, 0) + 1
+        self.root[follow_up_task.id] = self.root.get(original_task.id, original_task.id)
+
+    @property
+    def iterations(self) -> int:
+        """Rounds the run would have taken executing one follow-up level at a time."""
+        return max(self.depth.values(), default=0) + 1
 
 
 class TaskOrchestrator:
     """Orchestrates task execution across multiple agents"""
     
-    def __init__(self):
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENT_TASKS):
         self.agent_registry = {}
         self.running_tasks = {}
+        self.max_concurrency = max(1, max_concurrency)
         
     def register_agent(self, agent_type: str, agent_factory: Callable):
         """Register an agent factory for a specific agent type"""
@@ -31,10 +104,21 @@ class TaskOrchestrator:
         
         return self.agent_registry[agent_type]()
     
-    async def execute_task(self, task: Task) -> Dict[str, Any]:
-        """Execute a single task"""
+    async def execute_task(self, task: Task, state: Optional[CRMSessionState] = None) -> Dict[str, Any]:
+        """
+        Execute a single task.
+        
+        With a session state, the task works on a snapshot of it (agents whose
+        run() takes a `state` argument receive the snapshot) and the
+        snapshot's changes, including the task result, are merged back
+        when the task ends.
+        """
         print(f"🚀 Starting task: {task.name}")
         task.start()
+        snapshot = state.snapshot() if state is not None else None
+        base_version = snapshot.version if snapshot is not None else 0
+        if snapshot is not None:
+            snapshot.add_agent_to_history(task.agent_type)
         
         try:
             # Get the appropriate agent
@@ -42,27 +126,53 @@ class TaskOrchestrator:
             
             # Execute the task based on its type
             if task.agent_type == "crm_agent":
-                result = await self._execute_crm_task(agent, task)
+                result = await self._execute_crm_task(agent, task, snapshot)
             elif task.agent_type == "company_management_agent":
                 result = await self._execute_company_management_task(agent, task)
             else:
-                result = await self._execute_generic_task(agent, task)
+                result = await self._execute_generic_task(agent, task, snapshot)
             
             task.complete(result)
             print(f"✅ Completed task: {task.name}")
-            return result
             
         except Exception as e:
             error_msg = f"Task failed: {str(e)}"
             task.fail(error_msg)
             print(f"❌ Failed task: {task.name} - {error_msg}")
-            return {"error": error_msg}
+            result = {"error": error_msg}
+        
+        if snapshot is not None:
+            # JSON-safe copy, so checkpoints of the state always serialize
+            snapshot.set_item("update_results", task.id, json.loads(json.dumps(result, default=str)))
+            state.merge_changes(snapshot, base_version)
+        return result
+    
+    @staticmethod
+    def _state_kwargs(agent, state: Optional[CRMSessionState]) -> Dict[str, Any]:
+        """{"state": snapshot} for agents whose run() accepts one"""
+        if state is None:
+            return {}
+        try:
+            parameters = inspect.signature(agent.run).parameters
+        except (TypeError, ValueError):
+            return {}
+        return {"state": state} if "state" in parameters else {}
     
-    async def _execute_crm_task(self, agent, task: Task) -> Dict[str, Any]:
+    async def _run_agent(self, agent, *args, **kwargs) -> Dict[str, Any]:
+        """Call agent.run off the event loop so other tasks keep running"""
+        loop = asyncio.get_running_loop()
+        # Run in a copy of this task's context, so the agent sees the active write buffer
+        context = contextvars.copy_context()
+        result = await loop.run_in_executor(_task_executor.get(), lambda: context.run(agent.run, *args, **kwargs))
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+    
+    async def _execute_crm_task(self, agent, task: Task, state: Optional[CRMSessionState] = None) -> Dict[str, Any]:
         """Execute a CRM-specific task using real agents"""
         # Use the actual CRM agent to execute the task
         if hasattr(agent, 'run'):
-            return agent.run(**task.parameters)
+            return await self._run_agent(agent, **task.parameters, **self._state_kwargs(agent, state))
         else:
             return {"error": f"Agent does not support execution"}
     
@@ -74,44 +184,30 @@ class TaskOrchestrator:
         print(f"   🏌️ Identifying management company for: {company_name}")
         
         # Use the actual company management agent
-        result = agent.run(company_name, company_id)
+        result = await self._run_agent(agent, company_name, company_id)
         return result
     
-    async def _execute_generic_task(self, agent, task: Task) -> Dict[str, Any]:
+    async def _execute_generic_task(self, agent, task: Task, state: Optional[CRMSessionState] = None) -> Dict[str, Any]:
         """Execute a generic task"""
         # For other agent types, try to call a run method with parameters
         if hasattr(agent, 'run'):
-            return agent.run(**task.parameters)
+            return await self._run_agent(agent, **task.parameters, **self._state_kwargs(agent, state))
         else:
             return {"error": f"Agent {task.agent_type} does not support generic execution"}
     
-    async def execute_project(self, project: Project) -> Dict[str, Any]:
-        """Execute all tasks in a project"""
+    async def execute_project(self, project: Project, max_concurrency: int = 1,
+                              write_buffer: Optional[WriteBuffer] = None) -> Dict[str, Any]:
+        """
+        Execute all tasks in a project.
+        
+        Tasks run one at a time in dependency order unless max_concurrency
+        allows more; independent tasks then run concurrently (see run_dag).
+        """
         print(f"🎯 Starting project: {project.name}")
         print(f"   Goal: {project.goal}")
         print(f"   Tasks: {len(project.tasks)}")
         
-        results = {}
-        
-        # Execute tasks respecting dependencies
-        while True:
-            ready_tasks = project.get_ready_tasks()
-            
-            if not ready_tasks:
-                # Check if all tasks are completed
-                incomplete_tasks = [t for t in project.tasks if t.status == TaskStatus.PENDING]
-                if not incomplete_tasks:
-                    break  # All tasks completed
-                else:
-                    # There are pending tasks but none are ready - circular dependency or error
-                    for task in incomplete_tasks:
-                        task.fail("Circular dependency or unmet dependencies")
-                    break
-            
-            # Execute ready tasks (could be done in parallel in the future)
-            for task in ready_tasks:
-                result = await self.execute_task(task)
-                results[task.id] = result
+        results = await self.run_dag(project, max_concurrency=max_concurrency, write_buffer=write_buffer)
         
         # Generate project summary
         completed = sum(1 for t in project.tasks if t.status == TaskStatus.COMPLETED)
@@ -129,3 +225,80 @@ class TaskOrchestrator:
         
         print(f"📊 Project completed: {completed}/{len(project.tasks)} tasks successful")
         return project_result
+    
+    async def run_dag(self, project: Project, on_complete: Optional[CompletionCallback] = None,
+                      max_concurrency: Optional[int] = None,
+                      write_buffer: Optional[WriteBuffer] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Execute a project's tasks concurrently, respecting dependencies.
+        
+        A task starts as soon as its dependencies have completed, with at
+        most max_concurrency tasks running at once. Whenever tasks finish,
+        on_complete (sync or async) is called with their (task, result)
+        pairs; tasks it adds to the project are scheduled right away,
+        without waiting for the tasks still running. Blocking agent calls
+        run on a thread pool owned by this call and shut down when it returns.
+        
+        Tasks share project.state through snapshots; after each batch the
+        state's changes since the previous batch are appended to
+        project.state_checkpoints.
+        
+        With a write_buffer, the run is wrapped in buffered_writes(): HubSpot
+        updates that agents queue with queue_update() are coalesced across
+        tasks and flushed once when the run ends. If that flush fails, the
+        error propagates and the unsent updates stay pending in the buffer.
+        
+        Returns:
+            Task ID -> result for every executed task
+        """
+        max_concurrency = max_concurrency or self.max_concurrency
+        semaphore = asyncio.Semaphore(max_concurrency)
+        results: Dict[str, Dict[str, Any]] = {}
+        scheduled: Set[str] = set()
+        running: Dict[asyncio.Task, Task] = {}
+        
+        state = project.state
+        checkpoint = state.version
+        
+        async def run(task: Task) -> Dict[str, Any]:
+            async with semaphore:
+                return await self.execute_task(task, state)
+        
+        def schedule_ready():
+            for task in project.get_ready_tasks():
+                if task.id not in scheduled:
+                    scheduled.add(task.id)
+                    running[asyncio.ensure_future(run(task))] = task
+        
+        executor = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="pm-task")
+        token = _task_executor.set(executor)
+        try:
+            with buffered_writes(write_buffer) if write_buffer is not None else nullcontext():
+                schedule_ready()
+                while running:
+                    done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    finished = []
+                    for future in done:
+                        task = running.pop(future)
+                        results[task.id] = future.result()
+                        finished.append((task, results[task.id]))
+                    project.state_checkpoints.append(state.serialize_changes(since_version=checkpoint))
+                    checkpoint = state.version
+                    if on_complete:
+                        outcome = on_complete(finished)
+                        if inspect.isawaitable(outcome):
+                            await outcome
+                    schedule_ready()
+        finally:
+            _task_executor.reset(token)
+            for future in running:
+                future.cancel()
+            # Agent calls already started finish on their threads; no new work is accepted
+            executor.shutdown(wait=False)
+        
+        # Pending tasks left now wait on failed or missing dependencies
+        for task in project.tasks:
+            if task.status == TaskStatus.PENDING:
+                task.fail("Circular dependency or unmet dependencies")
+        
+        return results
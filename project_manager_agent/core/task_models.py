@@ -6,6 +6,7 @@ from enum import Enum
 from typing import Dict, Any, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
+from crm_agent.core.state_models import CRMSessionState
 
 
 class TaskStatus(Enum):
@@ -90,6 +91,10 @@ class Project:
     created_at: datetime = field(default_factory=datetime.now)
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    # Shared CRM state; each task works on a snapshot that is merged back when it ends
+    state: CRMSessionState = field(default_factory=CRMSessionState)
+    # serialize_changes() deltas, one per batch of finished tasks
+    state_checkpoints: List[Dict[str, Any]] = field(default_factory=list)
     
     @property
     def status(self) -> str:
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Job Title Classifier Benchmark
+
+Times JobTitleClassifier.classify_many over a batch of contact job titles:
+cold (every distinct title classified by the automaton) and warm (answered
+from the per-title cache). Titles are read from a file (one per line) or
+generated from common golf club and corporate titles.
+
+Usage:
+    python scripts/benchmark_job_titles.py [--file PATH] [--count N]
+"""
+
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.utils.job_titles import JobTitleClassifier
+
+SAMPLE_TITLES = [
+    "General Manager", "Head Golf Professional", "Director of Golf", "Golf Course Superintendent",
+    "Assistant Superintendent", "Food & Beverage Manager", "Membership Director", "Club President",
+    "Owner", "Controller", "Director of Operations", "Marketing Coordinator", "Executive Chef",
+    "Assistant Golf Professional", "Sales Manager", "VP of Finance", "IT Manager", "Office Manager",
+]
+QUALIFIERS = ["", "", "", "Senior ", "Assistant ", "Interim ", "Regional "]
+
+
+def generate_titles(count: int):
+    rnd = random.Random(42)
+    return [f"{rnd.choice(QUALIFIERS)}{rnd.choice(SAMPLE_TITLES)}{rnd.choice(['', '', f' #{rnd.randint(1, 5000)}'])}"
+            for _ in range(count)]
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    count, titles = 50000, []
+    while args:
+        arg = args.pop(0)
+        if arg == "--count":
+            count = int(args.pop(0))
+        elif arg == "--file":
+            with open(args.pop(0)) as f:
+                titles = [line.strip() for line in f if line.strip()]
+    titles = titles or generate_titles(count)
+
+    print("⏱️  Job Title Classifier Benchmark")
+    print("=" * 60)
+    print(f"Titles: {len(titles):,} ({len(set(titles)):,} distinct)")
+
+    classifier = JobTitleClassifier()
+    start = time.perf_counter()
+    classified = classifier.classify_many(titles)
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    classifier.classify_many(titles)
+    warm = time.perf_counter() - start
+
+    print(f"  cold: {cold * 1000:8.1f} ms ({cold / len(titles) * 1e6:.2f} µs per title)")
+    print(f"  warm: {warm * 1000:8.1f} ms ({warm / len(titles) * 1e6:.2f} µs per title)")
+    print(f"  {classifier.cache_info()}")
+    print()
+    for (seniority, function), n in Counter((c['seniority'], c['function']) for c in classified).most_common(8):
+        print(f"  {n:7,}  {seniority:24} {function}")
+
+
+if __name__ == "__main__":
+    main()
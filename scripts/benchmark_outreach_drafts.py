@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Outreach Draft Benchmark
+
+Measures outreach drafts per second for the single-contact path
+(generate_personalized_outreach, one CRMSessionState per contact) and the
+batch path (generate_outreach_batch over companies and their contacts).
+Companies and contacts are generated from common golf club job titles.
+
+Usage:
+    python scripts/benchmark_outreach_drafts.py [--companies N] [--contacts N] [--rounds N]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.agents.specialized.outreach_personalizer_agent import create_outreach_personalizer_agent
+from crm_agent.core.state_models import CRMSessionState
+
+SAMPLE_TITLES = [
+    "General Manager", "Head Golf Professional", "Director of Golf", "Golf Course Superintendent",
+    "Food & Beverage Manager", "Membership Director", "Controller", "IT Manager", "Owner",
+]
+COMPANY_TYPES = ["Private", "Resort", "Semi-Private", "Daily Fee", "Municipal"]
+SCORE_BANDS = ["Hot (80-100)", "Warm (60-79)", "Cold (40-59)"]
+
+
+def generate_companies(count: int, contacts_per_company: int):
+    rnd = random.Random(42)
+    return [
+        {
+            "company": {
+                "id": str(i),
+                "name": f"Benchmark Golf Club {i}",
+                "company_type": rnd.choice(COMPANY_TYPES),
+                "annualrevenue": rnd.choice([800000, 3000000, 12000000]),
+                "numberofemployees": rnd.choice([15, 40, 120]),
+                "description": rnd.choice(["Championship course", "Oceanfront resort course", "Community course"]),
+            },
+            "contacts": [
+                {"id": f"{i}-{j}", "email": f"contact{j}@club{i}.com", "jobtitle": rnd.choice(SAMPLE_TITLES),
+                 "firstname": "Pat", "lastname": f"Smith{j}"}
+                for j in range(contacts_per_company)
+            ],
+            "lead_scores": {"score_band": rnd.choice(SCORE_BANDS), "total_score": rnd.randint(40, 100)},
+        }
+        for i in range(count)
+    ]
+
+
+def best_of(rounds: int, fn) -> float:
+    times = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    companies_count, contacts_per_company, rounds = 500, 10, 3
+    while args:
+        arg = args.pop(0)
+        if arg == "--companies":
+            companies_count = int(args.pop(0))
+        elif arg == "--contacts":
+            contacts_per_company = int(args.pop(0))
+        elif arg == "--rounds":
+            rounds = int(args.pop(0))
+
+    print("📧 Outreach Draft Benchmark")
+    print("=" * 60)
+    agent = create_outreach_personalizer_agent()
+    companies = generate_companies(companies_count, contacts_per_company)
+    drafts = companies_count * contacts_per_company
+
+    states = []
+    for entry in companies:
+        for contact in entry["contacts"]:
+            state = CRMSessionState()
+            state.company_data = entry["company"]
+            state.contact_data = contact
+            state.lead_scores = entry["lead_scores"]
+            states.append(state)
+
+    def single():
+        for state in states:
+            agent.generate_personalized_outreach(state, "cold_outreach")
+
+    def batch():
+        agent.generate_outreach_batch(companies, "cold_outreach")
+
+    print(f"Drafts: {drafts:,} ({companies_count:,} companies x {contacts_per_company} contacts), best of {rounds}")
+    for label, fn in (("Single contact", single), ("Batch", batch)):
+        elapsed = best_of(rounds, fn)
+        print(f"  {label:<15} {drafts / elapsed:>10,.0f} drafts/s  ({elapsed / drafts * 1e6:.1f} us/draft)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Research Response Parser Benchmark
+
+Times ResearchResponseParser over a corpus of stored Gemini research
+responses. The corpus is read from the LLM response cache (raw responses
+stored by CompanyLLMEnrichmentAgent), from a directory of .txt files, or,
+when neither is available, from built-in sample responses.
+
+Usage:
+    python scripts/benchmark_research_parser.py [--cache PATH | --dir PATH] [--iterations N]
+"""
+
+import os
+import sqlite3
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.agents.specialized.company_llm_enrichment_agent import ResearchResponseParser
+
+SAMPLE_RESPONSES = [
+    """Houston National Golf Club is a premier championship golf course located in Houston, Texas.
+Website: https://www.houstonnationalgolfclub.com. Phone: (281) 304-1400.
+Type: Semi-Private Course. Management company: Invited.
+Swimming pool: No.
+Tennis courts: Yes. The club has tennis courts available for members.
+Annual revenue is estimated at $5.5 million.
+Competitors include Houston Oaks Country Club and Wildcat Golf Club.
+The course features 27 holes of championship golf and extensive amenities.""",
+    """**Mansion Ridge Golf Club** (Monroe, NY) is a public golf course designed by Jack Nicklaus.
+It is a high daily fee facility with a full practice area.
+* Phone: 845-782-7888
+* Tennis courts: Unknown
+* Pool: No.
+* Revenue: $3,200,000 per year
+About: an 18 hole course with dining, a pro shop and banquet space.""",
+]
+
+
+def load_from_cache(path: str) -> List[str]:
+    conn = sqlite3.connect(path)
+    try:
+        return [row[0] for row in conn.execute("SELECT raw FROM llm_responses")]
+    finally:
+        conn.close()
+
+
+def load_from_dir(path: str) -> List[str]:
+    return [p.read_text() for p in sorted(Path(path).glob("*.txt"))]
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    iterations = 200
+    corpus, source = [], ""
+    while args:
+        arg = args.pop(0)
+        if arg == "--iterations":
+            iterations = int(args.pop(0))
+        elif arg == "--cache":
+            source = args.pop(0)
+            corpus = load_from_cache(source)
+        elif arg == "--dir":
+            source = args.pop(0)
+            corpus = load_from_dir(source)
+
+    if not corpus:
+        default_cache = os.getenv("CRM_LLM_CACHE_PATH", ".cache/llm_responses.db")
+        if os.path.exists(default_cache):
+            source, corpus = default_cache, load_from_cache(default_cache)
+    if not corpus:
+        source, corpus = "built-in samples", SAMPLE_RESPONSES
+
+    total_chars = sum(len(text) for text in corpus)
+    print("⏱️  Research Response Parser Benchmark")
+    print("=" * 60)
+    print(f"Corpus: {len(corpus)} responses, {total_chars:,} chars ({source})")
+
+    fields_found = sum(len(ResearchResponseParser.parse(text)) for text in corpus)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        for text in corpus:
+            ResearchResponseParser.parse(text)
+    elapsed = time.perf_counter() - start
+
+    parses = iterations * len(corpus)
+    print(f"Fields extracted per pass: {fields_found}")
+    print(f"Parses: {parses:,} in {elapsed:.3f}s")
+    print(f"  {elapsed / parses * 1e6:8.1f} µs per response")
+    print(f"  {total_chars * iterations / elapsed / 1e6:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
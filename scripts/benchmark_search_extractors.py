@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Search Field Extractor Benchmark
+
+Times the web search field extractors over synthetic search results:
+normalization, each extractor on a pre-normalized result, and one
+extract_fields pass against normalizing the raw result per field (what the
+per-field extractors did when each re-read str(search_result)).
+
+Usage:
+    python scripts/benchmark_search_extractors.py [--hits N] [--iterations N]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.utils.search_extraction import FIELD_EXTRACTORS, extract_fields, normalize_search_results
+
+COMPANY_NAME = "Pebble Creek Golf Club"
+SAMPLE_HITS = [
+    {"title": "Pebble Creek Golf Club - Official Site", "url": "https://www.pebblecreekgolf.com/",
+     "snippet": "Pebble Creek Golf Club is a semi-private club that offers 18 holes of championship golf. "
+                "Call (803) 555-0142 for tee times."},
+    {"title": "Pebble Creek Golf Club | LinkedIn", "url": "https://www.linkedin.com/company/pebble-creek-golf-club",
+     "snippet": "Hospitality company with 45 employees. The business provides golf, dining and events."},
+    {"title": "Pebble Creek Golf Club Revenue and Competitors", "url": "https://www.example-data.com/pebble-creek",
+     "snippet": "Pebble Creek Golf Club revenue: $3.2 million. Headcount: 40-60 staff."},
+]
+
+
+def make_results(hits: int):
+    return {"query": COMPANY_NAME, "results": [dict(SAMPLE_HITS[i % len(SAMPLE_HITS)]) for i in range(hits)]}
+
+
+def timed(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    hits, iterations = 10, 2000
+    while args:
+        arg = args.pop(0)
+        if arg == "--hits":
+            hits = int(args.pop(0))
+        elif arg == "--iterations":
+            iterations = int(args.pop(0))
+
+    raw = make_results(hits)
+    results = normalize_search_results(raw)
+
+    print("⏱️  Search Field Extractor Benchmark")
+    print("=" * 60)
+    print(f"Search results: {hits} hits, {len(results.text):,} chars, {iterations:,} iterations")
+    print(f"  {'normalize_search_results':28} {timed(lambda: normalize_search_results(raw), iterations):8.1f} µs")
+    for name, extractor in FIELD_EXTRACTORS.items():
+        print(f"  {name:28} {timed(lambda: extractor(results, COMPANY_NAME), iterations):8.1f} µs")
+
+    shared = timed(lambda: extract_fields(raw, COMPANY_NAME), iterations)
+    per_field = timed(lambda: [extractor(normalize_search_results(raw), COMPANY_NAME)
+                               for extractor in FIELD_EXTRACTORS.values()], iterations)
+    print("-" * 60)
+    print(f"  {'all fields, one pass':28} {shared:8.1f} µs")
+    print(f"  {'all fields, per-field parse':28} {per_field:8.1f} µs")
+    print()
+    for name, value in extract_fields(raw, COMPANY_NAME).items():
+        print(f"  {name:28} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Startup Import Benchmark
+
+Measures how long the CRM entry points take to import, using the interpreter's
+-X importtime report, and lists the most expensive modules for each one.
+Every target is imported in a fresh subprocess so results are not skewed by
+modules another target already loaded.
+
+Usage:
+    python scripts/benchmark_startup.py [module ...] [--top N] [--runs N]
+"""
+
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+DEFAULT_TARGETS = [
+    "crm_agent",
+    "crm_agent.core.factory",
+    "crm_agent.main",
+    "crm_fastmcp_server.stdio_server",
+    "project_manager_agent",
+]
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def measure_imports(module: str) -> Tuple[float, List[Tuple[str, int, int]]]:
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        (total seconds, [(module, self_us, cumulative_us), ...])
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        last_line = (proc.stderr.strip().splitlines() or ["unknown error"])[-1]
+        raise RuntimeError(f"import {module} failed: {last_line}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        rows.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    top_level = [cumulative for name, _, cumulative in rows if name == module]
+    total = (top_level[-1] if top_level else sum(r[1] for r in rows)) / 1e6
+    return total, rows
+
+
+def summarize_packages(rows: List[Tuple[str, int, int]]) -> Dict[str, int]:
+    """Aggregate self time per top-level package (e.g. google, mcp, crm_agent)."""
+    totals: Dict[str, int] = {}
+    for name, self_us, _ in rows:
+        package = name.split(".", 1)[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    top, runs = 10, 3
+    targets = []
+    while args:
+        arg = args.pop(0)
+        if arg == "--top":
+            top = int(args.pop(0))
+        elif arg == "--runs":
+            runs = int(args.pop(0))
+        else:
+            targets.append(arg)
+    targets = targets or DEFAULT_TARGETS
+
+    print("⏱️  Startup Import Benchmark")
+    print("=" * 60)
+    for module in targets:
+        try:
+            # Keep the fastest run; the first one also pays for .pyc compilation
+            samples = [measure_imports(module) for _ in range(runs)]
+        except RuntimeError as e:
+            print(f"\n❌ {e}")
+            continue
+        total, rows = min(samples, key=lambda sample: sample[0])
+
+        print(f"\n📦 {module}: {total * 1000:.1f} ms ({len(rows)} modules)")
+        print("  Slowest modules (self time):")
+        for name, self_us, cumulative_us in sorted(rows, key=lambda r: r[1], reverse=True)[:top]:
+            print(f"    {self_us / 1000:8.1f} ms  (cumulative {cumulative_us / 1000:8.1f} ms)  {name}")
+        print("  By package (self time):")
+        packages = sorted(summarize_packages(rows).items(), key=lambda p: p[1], reverse=True)
+        for package, self_us in packages[:top]:
+            print(f"    {self_us / 1000:8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,10 @@ Configuration-Based HubSpot Enrichment
 
 Uses the hubspot_field_mapping.json configuration to automatically
 validate and correct field mappings before HubSpot updates.
+
+enrich_companies() (and enrich_company inside buffered_writes()) queues
+updates in a WriteBuffer, so a batch of companies is written with one
+batch update instead of one PATCH per company.
 """
 
 import os
@@ -17,6 +21,7 @@ from typing import Dict, Any
 sys.path.append(str(Path(__file__).parent.parent))
 
 from scripts.field_mapping_validator import HubSpotFieldValidator
+from crm_agent.utils.write_buffer import WriteBuffer, buffered_writes, queue_update
 
 
 class ConfigBasedEnrichment:
@@ -96,6 +101,26 @@ class ConfigBasedEnrichment:
             "update_result": update_result
         }
     
+    def enrich_companies(self, companies: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Enrich several companies, writing them through one WriteBuffer.
+        
+        Args:
+            companies: Company ID -> raw properties to update
+            
+        Returns:
+            Dictionary with per-company results and the buffer's write stats
+        """
+        buffer = WriteBuffer(send_batch=self._batch_update_companies, send_one=self._patch_company, max_wait=None)
+        with buffered_writes(buffer):
+            results = {company_id: self.enrich_company(company_id, raw_properties)
+                       for company_id, raw_properties in companies.items()}
+        
+        stats = buffer.stats()
+        print(f"\n📦 Wrote {stats['records_sent']} companies in {stats['requests']} requests "
+              f"({stats['suppressed']} unchanged properties skipped)")
+        return {"results": results, "write_stats": stats}
+    
     def _apply_enrichment_rules(self, properties: Dict[str, Any]) -> Dict[str, Any]:
         """Apply enrichment rules based on configuration."""
         enriched = properties.copy()
@@ -124,25 +149,42 @@ class ConfigBasedEnrichment:
         
         return enriched
     
-    def _update_hubspot_company(self, company_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
-        """Update HubSpot company with validated properties."""
-        url = f"https://api.hubapi.com/crm/v3/objects/companies/{company_id}"
-        headers = {
+    def _headers(self) -> Dict[str, str]:
+        return {
             "Authorization": f"Bearer {self.token}",
             "Content-Type": "application/json",
         }
-        body = {"properties": properties}
-        
+    
+    def _patch_company(self, object_type: str, company_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """PATCH one company; raises on HTTP errors."""
+        url = f"https://api.hubapi.com/crm/v3/objects/companies/{company_id}"
+        response = requests.patch(url, headers=self._headers(), json={"properties": properties}, timeout=30)
+        response.raise_for_status()
+        return response.json()
+    
+    def _batch_update_companies(self, object_type: str, updates: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """Update up to 100 companies in one batch request; raises on HTTP errors."""
+        url = "https://api.hubapi.com/crm/v3/objects/companies/batch/update"
+        body = {"inputs": [{"id": company_id, "properties": props} for company_id, props in updates.items()]}
+        response = requests.post(url, headers=self._headers(), json=body, timeout=30)
+        response.raise_for_status()
+        print(f"   ✅ Batch updated {len(updates)} companies")
+        return response.json()
+    
+    def _update_hubspot_company(self, company_id: str, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """Update HubSpot company with validated properties (queued when a write buffer is active)."""
         print(f"   📤 Updating {len(properties)} properties...")
         for key, value in properties.items():
             display_value = str(value)[:50] + "..." if len(str(value)) > 50 else str(value)
             print(f"      • {key}: {display_value}")
         
+        queued = queue_update("companies", company_id, properties)
+        if queued is not None:
+            print(f"   🕒 Queued {len(queued)} properties for the next batch write")
+            return {"status": "queued", "properties": queued}
+        
         try:
-            response = requests.patch(url, headers=headers, json=body, timeout=30)
-            response.raise_for_status()
-            
-            result = response.json()
+            result = self._patch_company("companies", company_id, properties)
             print("   ✅ HubSpot update successful!")
             return {"status": "success", "result": result}
             
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Campaign Outreach Draft Generation
+
+Generates personalized outreach drafts for every contact of many companies
+offline, with OutreachPersonalizerAgent.generate_outreach_batch, and writes
+one JSON line per draft for review or later upload. Nothing is sent and no
+engagements are created in HubSpot.
+
+The input is a JSON list (or JSON lines) of company entries:
+    {"company": {...}, "contacts": [{...}, ...],
+     "lead_scores": {...}, "enrichment_findings": {...}}
+Company and contact records may be flat property dicts or HubSpot records
+with "id" and "properties".
+
+Usage:
+    python scripts/generate_outreach_drafts.py INPUT [--output PATH]
+        [--type cold_outreach] [--chunk-size N]
+"""
+
+import json
+import os
+import sys
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.agents.specialized.outreach_personalizer_agent import create_outreach_personalizer_agent
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+def read_company_entries(path: str) -> Iterator[Dict[str, Any]]:
+    """Company entries from a JSON list, a {"companies": [...]} object or JSON lines."""
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        data = [json.loads(line) for line in text.splitlines() if line.strip()]
+    if isinstance(data, dict):
+        data = data.get("companies", [data])
+    yield from data
+
+
+def chunked(entries: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Consecutive lists of at most `size` entries."""
+    entries = iter(entries)
+    while chunk := list(islice(entries, size)):
+        yield chunk
+
+
+def draft_rows(company_results: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """One flat row per contact draft."""
+    for company in company_results:
+        for outreach in company["outreach"]:
+            email = outreach["email_engagement"]["email_data"]
+            personalization = outreach["personalization"]
+            yield {
+                "company_id": company["company_id"],
+                "company_name": company["company_name"],
+                "contact_id": outreach["contact_id"],
+                "to_email": email["to_email"],
+                "role_type": outreach["role_analysis"]["role_type"],
+                "messaging_strategy": personalization["messaging_strategy"],
+                "personalization_score": personalization["personalization_score"],
+                "subject": email["subject"],
+                "body": email["body"],
+                "follow_up_due": outreach["follow_up_task"]["due_date"],
+            }
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    if not args or args[0].startswith("--"):
+        print(__doc__)
+        sys.exit(1)
+
+    input_path = args.pop(0)
+    output_path = os.path.splitext(input_path)[0] + "_drafts.jsonl"
+    outreach_type, chunk_size = "cold_outreach", DEFAULT_CHUNK_SIZE
+    while args:
+        arg = args.pop(0)
+        if arg == "--output":
+            output_path = args.pop(0)
+        elif arg == "--type":
+            outreach_type = args.pop(0)
+        elif arg == "--chunk-size":
+            chunk_size = int(args.pop(0))
+
+    print("📧 Campaign Outreach Draft Generation")
+    print("=" * 60)
+    agent = create_outreach_personalizer_agent()
+
+    companies = drafts = 0
+    start = time.perf_counter()
+    with open(output_path, "w", encoding="utf-8") as out:
+        for chunk in chunked(read_company_entries(input_path), chunk_size):
+            results = agent.generate_outreach_batch(chunk, outreach_type)
+            companies += len(results)
+            for row in draft_rows(results):
+                out.write(json.dumps(row) + "\n")
+                drafts += 1
+    elapsed = time.perf_counter() - start
+
+    print(f"\n📊 Summary")
+    print(f"  Companies:  {companies:,}")
+    print(f"  Drafts:     {drafts:,}")
+    print(f"  Time:       {elapsed:.2f}s ({drafts / elapsed if elapsed else 0:,.0f} drafts/s)")
+    print(f"  Output:     {output_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,30 +7,92 @@ This script provides safe HubSpot authentication and payload validation with:
 - HUBSPOT_TEST_PORTAL guard for safety
 - Read operations for Companies/Contacts
 - Payload validation for create/update operations
+
+Requests go through a pooled HTTP session (HubSpotConnector) or a pooled
+async client (AsyncHubSpotConnector). Contacts are read with the batch read
+endpoint in chunks of 100 IDs, chunks run concurrently, and associations are
+paged to completion.
+
+With a write journal (HUBSPOT_WRITE_JOURNAL=path, or journal=WriteJournal(...))
+HubSpotConnector journals every update under an idempotency key before
+sending it and acks it afterwards. Writes whose caller-supplied key is
+already acked are never re-sent. Writes HubSpot rejects (4xx) fail at once
+instead of being replayed.
+enqueue_updates/flush_journal/start_journal_flusher queue writes and apply
+them in the background through the batch update endpoints.
+
+write_buffer() returns a WriteBuffer that coalesces updates per record,
+drops no-op properties and sends the rest through update_company (one
+record) or the batch update endpoints.
 """
 
 import os
 import sys
 import json
+import asyncio
 import requests
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Any, Iterator, Tuple
 from datetime import datetime
 
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+
+try:
+    from crm_agent.utils.write_journal import JournalFlusher, RejectedWrite, WriteJournal, is_rejection
+    WRITE_JOURNAL_AVAILABLE = True
+except ImportError:
+    WRITE_JOURNAL_AVAILABLE = False
+
+try:
+    from crm_agent.utils.write_buffer import WriteBuffer
+    WRITE_BUFFER_AVAILABLE = True
+except ImportError:
+    WRITE_BUFFER_AVAILABLE = False
+
+BATCH_READ_LIMIT = 100          # HubSpot batch read accepts at most 100 inputs
+BATCH_UPDATE_LIMIT = 100        # ...and so does batch update
+LIST_PAGE_SIZE = 100            # objects list endpoint page size cap
+ASSOCIATIONS_PAGE_SIZE = 500    # v4 associations page size cap
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("HUBSPOT_MAX_CONCURRENCY", "8"))
+
+
+def _rejected(error: Exception) -> bool:
+    """Whether HubSpot answered a failed request with a definite refusal (4xx)."""
+    response = getattr(error, 'response', None)
+    return response is not None and is_rejection(response.status_code)
 
-class HubSpotConnector:
-    """Safe HubSpot connector with dry-run capabilities."""
+
+def chunked(items: List[str], size: int) -> Iterator[List[str]]:
+    """Yield consecutive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class _HubSpotConnectorBase:
+    """Configuration, payload validation, logging and response parsing shared by both connectors."""
     
-    def __init__(self, dry_run: bool = None):
+    def __init__(self, dry_run: bool = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 verbose: bool = None):
         """
         Initialize HubSpot connector.
         
         Args:
             dry_run: If True, no write operations will be performed. 
                     If None, reads from DRY_RUN environment variable.
+            max_concurrency: Pooled connections and concurrent requests for batch reads
+            verbose: Log full request payloads. If None, reads HUBSPOT_LOG_PAYLOADS.
         """
         self.dry_run = dry_run if dry_run is not None else self._get_dry_run_setting()
         self.token = self._get_token()
         self.base_url = "https://api.hubapi.com"
+        self.max_concurrency = max(1, max_concurrency)
+        self.verbose = verbose if verbose is not None else \
+            os.getenv("HUBSPOT_LOG_PAYLOADS", "").lower() in ("1", "true", "yes", "on")
         
         # Safety checks
         self._validate_test_environment()
@@ -87,15 +149,128 @@ class HubSpotConnector:
         }
     
     def _log_request(self, method: str, url: str, payload: Optional[Dict] = None):
-        """Log API request details."""
+        """Log API request details (full payload only in verbose mode)."""
         print(f"🌐 {method.upper()} {url}")
         if payload:
-            print(f"   Payload: {json.dumps(payload, indent=2)}")
+            if self.verbose:
+                print(f"   Payload: {json.dumps(payload, default=str)}")
+            else:
+                print(f"   Payload keys: {', '.join(payload)}")
     
     def _log_dry_run_prevention(self, operation: str, details: Dict):
         """Log that a write operation was prevented by dry-run mode."""
         print(f"🚫 DRY-RUN: Prevented {operation}")
-        print(f"   Would have executed: {json.dumps(details, indent=2)}")
+        if self.verbose:
+            print(f"   Would have executed: {json.dumps(details, default=str)}")
+        else:
+            properties = details.get("properties") or {}
+            print(f"   Would have sent {len(properties)} properties to {details.get('url', '')}")
+    
+    def _search_payload(self, filters: List[Dict], properties: Optional[List[str]], limit: int) -> Dict:
+        return {
+            "filterGroups": [{"filters": filters}],
+            "properties": properties or ["name", "domain"],
+            "limit": limit,
+        }
+    
+    def _batch_read_payload(self, ids: List[str], properties: Optional[List[str]]) -> Dict:
+        payload: Dict[str, Any] = {"inputs": [{"id": str(object_id)} for object_id in ids]}
+        if properties:
+            payload["properties"] = properties
+        return payload
+    
+    def _batch_update_payload(self, updates: Dict[str, Dict[str, Any]]) -> Dict:
+        return {"inputs": [{"id": str(object_id), "properties": properties}
+                           for object_id, properties in updates.items()]}
+    
+    def _associations_url(self, version: str, company_id: str, to_object_type: str) -> str:
+        return f"{self.base_url}/crm/{version}/objects/companies/{company_id}/associations/{to_object_type}"
+    
+    @staticmethod
+    def _association_page(data: Dict) -> Tuple[List[str], Optional[str]]:
+        """Associated IDs on one page and the cursor for the next page (None on the last page)."""
+        ids = []
+        for row in data.get("results", []):
+            to_obj = row.get("toObjectId") or row.get("id") or (row.get("toObject") or {}).get("id")
+            if to_obj:
+                ids.append(str(to_obj))
+        after = ((data.get("paging") or {}).get("next") or {}).get("after")
+        return ids, after
+    
+    @staticmethod
+    def _order_batch_results(contact_ids: List[str], pages: List[List[Dict]]) -> List[Dict]:
+        """Merge batch read pages back into the order the IDs were requested, dropping duplicates."""
+        by_id = {str(record.get("id")): record for page in pages for record in page}
+        ordered, seen = [], set()
+        for contact_id in contact_ids:
+            record = by_id.get(str(contact_id))
+            if record is not None and str(contact_id) not in seen:
+                seen.add(str(contact_id))
+                ordered.append(record)
+        return ordered
+    
+    def validate_company_payload(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validate a company update payload.
+        
+        Args:
+            properties: Dictionary of company properties
+            
+        Returns:
+            Validated properties dictionary
+            
+        Raises:
+            ValueError: If payload is invalid
+        """
+        if not properties:
+            raise ValueError("Properties cannot be empty")
+        
+        # Validate property names (basic validation)
+        invalid_props = []
+        for prop_name in properties.keys():
+            if not isinstance(prop_name, str) or not prop_name.strip():
+                invalid_props.append(prop_name)
+        
+        if invalid_props:
+            raise ValueError(f"Invalid property names: {invalid_props}")
+        
+        # Log validation success
+        print(f"✅ Payload validation passed for {len(properties)} properties")
+        if self.verbose:
+            for key, value in properties.items():
+                display_value = str(value)[:50] + "..." if len(str(value)) > 50 else str(value)
+                print(f"   • {key}: {display_value}")
+        
+        return properties
+
+
+class HubSpotConnector(_HubSpotConnectorBase):
+    """Safe HubSpot connector with dry-run capabilities, on a pooled HTTP session."""
+    
+    def __init__(self, dry_run: bool = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 verbose: bool = None, journal: Optional["WriteJournal"] = None):
+        super().__init__(dry_run=dry_run, max_concurrency=max_concurrency, verbose=verbose)
+        
+        # Write-ahead journal for updates (None: updates are sent unjournaled)
+        if journal is None and WRITE_JOURNAL_AVAILABLE:
+            journal = WriteJournal.from_env()
+        self.journal = journal
+        
+        # One keep-alive pool sized for the concurrent batch reads
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+        self.session.mount("https://", adapter)
+        self.session.headers.update(self._headers())
+    
+    def close(self):
+        """Close pooled connections."""
+        self.session.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
     
     def search_companies(self, filters: List[Dict], properties: List[str] = None, limit: int = 10) -> List[Dict]:
         """
@@ -110,17 +285,12 @@ class HubSpotConnector:
             List of company dictionaries
         """
         url = f"{self.base_url}/crm/v3/objects/companies/search"
-        
-        payload = {
-            "filterGroups": [{"filters": filters}],
-            "properties": properties or ["name", "domain"],
-            "limit": limit,
-        }
+        payload = self._search_payload(filters, properties, limit)
         
         self._log_request("POST", url, payload)
         
         try:
-            response = requests.post(url, headers=self._headers(), json=payload)
+            response = self.session.post(url, json=payload)
             response.raise_for_status()
             data = response.json()
             
@@ -131,7 +301,7 @@ class HubSpotConnector:
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Company search failed: {e}")
-            if hasattr(e, 'response') and e.response:
+            if hasattr(e, 'response') and e.response is not None:
                 print(f"Response status: {e.response.status_code}")
                 print(f"Response text: {e.response.text}")
             raise
@@ -147,13 +317,13 @@ class HubSpotConnector:
         Returns:
             Company dictionary or None if not found
         """
-        props_param = f"?properties={','.join(properties)}" if properties else ""
-        url = f"{self.base_url}/crm/v3/objects/companies/{company_id}{props_param}"
+        url = f"{self.base_url}/crm/v3/objects/companies/{company_id}"
+        params = {"properties": ",".join(properties)} if properties else None
         
         self._log_request("GET", url)
         
         try:
-            response = requests.get(url, headers=self._headers())
+            response = self.session.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             
@@ -161,94 +331,120 @@ class HubSpotConnector:
             return data
             
         except requests.exceptions.RequestException as e:
-            if hasattr(e, 'response') and e.response and e.response.status_code == 404:
+            if hasattr(e, 'response') and e.response is not None and e.response.status_code == 404:
                 print(f"❌ Company {company_id} not found")
                 return None
             
             print(f"❌ Company retrieval failed: {e}")
             raise
+
+    def get_property(self, object_type: str, name: str) -> Optional[Dict]:
+        """
+        Get a property definition.
+        
+        Args:
+            object_type: "companies" or "contacts"
+            name: Property internal name
+        
+        Returns:
+            Property definition or None if the portal has no such property
+        """
+        url = f"{self.base_url}/crm/v3/properties/{object_type}/{name}"
+        self._log_request("GET", url)
+        
+        try:
+            response = self.session.get(url)
+            response.raise_for_status()
+            return response.json()
+        
+        except requests.exceptions.RequestException as e:
+            if hasattr(e, 'response') and e.response is not None and e.response.status_code == 404:
+                return None
+            print(f"❌ Property retrieval failed: {e}")
+            raise
+
+    def _read_contact_batch(self, contact_ids: List[str], properties: Optional[List[str]]) -> List[Dict]:
+        """Read up to 100 contacts in one request; missing IDs are simply absent from the result."""
+        url = f"{self.base_url}/crm/v3/objects/contacts/batch/read"
+        try:
+            response = self.session.post(url, json=self._batch_read_payload(contact_ids, properties))
+            response.raise_for_status()
+            return response.json().get("results", [])
+        except requests.exceptions.RequestException as e:
+            print(f"❌ Contact batch read failed ({len(contact_ids)} IDs): {e}")
+            return []
     
     def get_contacts(self, contact_ids: List[str], properties: List[str] = None) -> List[Dict]:
         """
         Get multiple contacts by their IDs.
         
+        IDs are read in batches of 100, with up to max_concurrency batches in
+        flight. Contacts that are not found are skipped.
+        
         Args:
             contact_ids: List of HubSpot contact IDs
             properties: List of properties to return
             
         Returns:
-            List of contact dictionaries
+            List of contact dictionaries, in the order of contact_ids
         """
         if not contact_ids:
             return []
         
-        contacts = []
-        props_param = f"?properties={','.join(properties)}" if properties else ""
+        batches = list(chunked(list(dict.fromkeys(map(str, contact_ids))), BATCH_READ_LIMIT))
+        self._log_request("POST", f"{self.base_url}/crm/v3/objects/contacts/batch/read ({len(batches)} batches)")
         
-        for contact_id in contact_ids:
-            url = f"{self.base_url}/crm/v3/objects/contacts/{contact_id}{props_param}"
-            
-            try:
-                response = requests.get(url, headers=self._headers())
-                response.raise_for_status()
-                contacts.append(response.json())
-                
-            except requests.exceptions.RequestException as e:
-                if hasattr(e, 'response') and e.response and e.response.status_code == 404:
-                    print(f"⚠️  Contact {contact_id} not found")
-                    continue
-                
-                print(f"❌ Contact {contact_id} retrieval failed: {e}")
-                continue
+        if len(batches) == 1:
+            pages = [self._read_contact_batch(batches[0], properties)]
+        else:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as executor:
+                pages = list(executor.map(lambda batch: self._read_contact_batch(batch, properties), batches))
         
+        contacts = self._order_batch_results(contact_ids, pages)
         print(f"✅ Retrieved {len(contacts)}/{len(contact_ids)} contacts")
         return contacts
     
-    def get_company_associations(self, company_id: str, to_object_type: str = "contacts", limit: int = 100) -> List[str]:
+    def _paged_association_ids(self, version: str, company_id: str, to_object_type: str,
+                               limit: Optional[int]) -> List[str]:
+        url = self._associations_url(version, company_id, to_object_type)
+        ids: List[str] = []
+        after = None
+        while True:
+            params = {"limit": min(ASSOCIATIONS_PAGE_SIZE, limit or ASSOCIATIONS_PAGE_SIZE)}
+            if after:
+                params["after"] = after
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            page_ids, after = self._association_page(response.json())
+            ids.extend(page_ids)
+            if not after or (limit and len(ids) >= limit):
+                return ids[:limit] if limit else ids
+    
+    def get_company_associations(self, company_id: str, to_object_type: str = "contacts",
+                                 limit: Optional[int] = None) -> List[str]:
         """
-        Get associated object IDs for a company.
+        Get associated object IDs for a company, following pagination.
         
         Args:
             company_id: HubSpot company ID
             to_object_type: Type of associated objects (contacts, deals, etc.)
-            limit: Maximum number of associations to return
+            limit: Maximum number of associations to return (None for all)
             
         Returns:
             List of associated object IDs
         """
         # Try v4 associations first
-        url_v4 = f"{self.base_url}/crm/v4/objects/companies/{company_id}/associations/{to_object_type}?limit={limit}"
-        
         try:
-            response = requests.get(url_v4, headers=self._headers())
-            if response.status_code == 200:
-                data = response.json()
-                ids = []
-                for row in data.get("results", []):
-                    to_obj = row.get("toObjectId") or row.get("toObject", {}).get("id")
-                    if to_obj:
-                        ids.append(str(to_obj))
-                
-                if ids:
-                    print(f"✅ Found {len(ids)} {to_object_type} associations (v4)")
-                    return ids
+            ids = self._paged_association_ids("v4", company_id, to_object_type, limit)
+            if ids:
+                print(f"✅ Found {len(ids)} {to_object_type} associations (v4)")
+                return ids
         except Exception:
             pass
         
         # Fallback to v3 associations
-        url_v3 = f"{self.base_url}/crm/v3/objects/companies/{company_id}/associations/{to_object_type}?limit={limit}"
-        
         try:
-            response = requests.get(url_v3, headers=self._headers())
-            response.raise_for_status()
-            data = response.json()
-            
-            ids = []
-            for row in data.get("results", []):
-                to_obj = row.get("toObjectId")
-                if to_obj:
-                    ids.append(str(to_obj))
-            
+            ids = self._paged_association_ids("v3", company_id, to_object_type, limit)
             print(f"✅ Found {len(ids)} {to_object_type} associations (v3)")
             return ids
             
@@ -256,49 +452,216 @@ class HubSpotConnector:
             print(f"❌ Failed to get {to_object_type} associations: {e}")
             return []
     
-    def validate_company_payload(self, properties: Dict[str, Any]) -> Dict[str, Any]:
+    def get_contacts_for_companies(self, company_ids: List[str], properties: List[str] = None) -> Dict[str, List[Dict]]:
         """
-        Validate a company update payload.
+        Get every contact associated with each company (e.g. all clubs of a management company).
+        
+        Associations are fetched concurrently per company, then all contacts are
+        read once through batch reads.
         
         Args:
-            properties: Dictionary of company properties
+            company_ids: HubSpot company IDs
+            properties: Contact properties to return
             
         Returns:
-            Validated properties dictionary
+            Company ID -> list of contact dictionaries
+        """
+        if not company_ids:
+            return {}
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(company_ids))) as executor:
+            associations = dict(zip(company_ids, executor.map(self.get_company_associations, company_ids)))
+        
+        contacts = self.get_contacts([cid for ids in associations.values() for cid in ids], properties)
+        by_id = {str(contact.get("id")): contact for contact in contacts}
+        return {
+            company_id: [by_id[cid] for cid in ids if cid in by_id]
+            for company_id, ids in associations.items()
+        }
+    
+    def list_companies(self, properties: List[str] = None, limit: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Iterate over every company in the portal, following pagination.
+        
+        Args:
+            properties: List of properties to return
+            limit: Maximum number of companies (None for all)
             
-        Raises:
-            ValueError: If payload is invalid
+        Yields:
+            Company dictionaries
         """
-        if not properties:
-            raise ValueError("Properties cannot be empty")
+        url = f"{self.base_url}/crm/v3/objects/companies"
+        params: Dict[str, Any] = {"limit": LIST_PAGE_SIZE}
+        if properties:
+            params["properties"] = ",".join(properties)
         
-        # Validate property names (basic validation)
-        invalid_props = []
-        for prop_name in properties.keys():
-            if not isinstance(prop_name, str) or not prop_name.strip():
-                invalid_props.append(prop_name)
+        self._log_request("GET", url)
         
-        if invalid_props:
-            raise ValueError(f"Invalid property names: {invalid_props}")
+        count = 0
+        while True:
+            response = self.session.get(url, params=params)
+            response.raise_for_status()
+            data = response.json()
+            for company in data.get("results", []):
+                yield company
+                count += 1
+                if limit and count >= limit:
+                    return
+            after = ((data.get("paging") or {}).get("next") or {}).get("after")
+            if not after:
+                return
+            params["after"] = after
+    
+    def _post_batch_update(self, object_type: str, updates: Dict[str, Dict[str, Any]]) -> List[Dict]:
+        """Send one batch update request (at most BATCH_UPDATE_LIMIT records)."""
+        url = f"{self.base_url}/crm/v3/objects/{object_type}/batch/update"
+        body = self._batch_update_payload(updates)
+        self._log_request("POST", url, body)
+        try:
+            response = self.session.post(url, json=body)
+            response.raise_for_status()
+            return response.json().get("results", [])
+        except requests.exceptions.RequestException as e:
+            print(f"❌ {object_type.capitalize()} batch update failed: {e}")
+            if hasattr(e, 'response') and e.response is not None:
+                print(f"Response status: {e.response.status_code}")
+                print(f"Response text: {e.response.text}")
+            raise
+    
+    def update_objects(self, object_type: str, updates: Dict[str, Dict[str, Any]],
+                       idempotency_keys: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Update many companies or contacts through the batch update endpoint (with dry-run support).
         
-        # Log validation success
-        print(f"✅ Payload validation passed for {len(properties)} properties")
-        for key, value in properties.items():
-            display_value = str(value)[:50] + "..." if len(str(value)) > 50 else str(value)
-            print(f"   • {key}: {display_value}")
+        With a journal, every update is journaled before the first request.
+        Updates whose key is already acked are skipped, and each batch is
+        acked as soon as HubSpot accepts it. A run interrupted mid-way
+        therefore re-sends only the batches that were not acked.
         
-        return properties
+        Args:
+            object_type: "companies" or "contacts"
+            updates: Object ID -> properties to update
+            idempotency_keys: Journal keys, one per update in order (default: fresh keys, no dedupe)
+            
+        Returns:
+            Updated records (empty if dry-run)
+        """
+        updates = {object_id: self.validate_company_payload(properties)
+                   for object_id, properties in updates.items()}
+        url = f"{self.base_url}/crm/v3/objects/{object_type}/batch/update"
+        
+        if self.dry_run:
+            for batch in chunked(list(updates), BATCH_UPDATE_LIMIT):
+                self._log_dry_run_prevention(f"{object_type[:-1]} batch update", {
+                    "url": url,
+                    "object_ids": batch,
+                    "properties": {key: value for object_id in batch for key, value in updates[object_id].items()}
+                })
+            return []
+        
+        keys: Dict[str, str] = {}
+        if self.journal is not None:
+            keys = dict(zip(updates, self.journal.record_many(object_type, updates, idempotency_keys, lease=True)))
+            acked = self.journal.acked(keys.values())
+            if acked:
+                print(f"⏭️  Skipping {len(acked)} {object_type} updates already applied")
+                updates = {object_id: props for object_id, props in updates.items() if keys[object_id] not in acked}
+        
+        batches = list(chunked(list(updates), BATCH_UPDATE_LIMIT))
+        results = []
+        for batch in batches:
+            batch_keys = [keys[object_id] for object_id in batch if object_id in keys]
+            try:
+                results.extend(self._post_batch_update(object_type, {object_id: updates[object_id] for object_id in batch}))
+            except requests.exceptions.RequestException as e:
+                if batch_keys:
+                    self.journal.mark_failed(batch_keys, str(e), _rejected(e))
+                raise
+            if batch_keys:
+                self.journal.mark_acked(batch_keys)
+        
+        print(f"✅ Updated {len(results)} {object_type} in {len(batches)} batches")
+        return results
+    
+    def update_companies(self, updates: Dict[str, Dict[str, Any]],
+                         idempotency_keys: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Update many companies through the batch update endpoint (with dry-run support).
+        
+        Args:
+            updates: Company ID -> properties to update
+            idempotency_keys: Journal keys, one per update in order (default: fresh keys, no dedupe)
+            
+        Returns:
+            Updated company records (empty if dry-run)
+        """
+        return self.update_objects("companies", updates, idempotency_keys)
+    
+    def update_contacts(self, updates: Dict[str, Dict[str, Any]],
+                        idempotency_keys: Optional[List[str]] = None) -> List[Dict]:
+        """Update many contacts through the batch update endpoint (with dry-run support)."""
+        return self.update_objects("contacts", updates, idempotency_keys)
     
-    def update_company(self, company_id: str, properties: Dict[str, Any]) -> Optional[Dict]:
+    def enqueue_updates(self, object_type: str, updates: Dict[str, Dict[str, Any]],
+                        idempotency_keys: Optional[List[str]] = None) -> List[str]:
+        """Journal updates for the flusher to apply later. Returns their idempotency keys."""
+        if self.journal is None:
+            raise RuntimeError("No write journal configured (set HUBSPOT_WRITE_JOURNAL or pass journal=)")
+        updates = {object_id: self.validate_company_payload(properties)
+                   for object_id, properties in updates.items()}
+        return self.journal.record_many(object_type, updates, idempotency_keys)
+    
+    def _apply_journal_batch(self, object_type: str, updates: Dict[str, Dict[str, Any]]):
+        if self.dry_run:
+            raise RuntimeError("Dry-run mode: journaled writes stay pending")
+        try:
+            self._post_batch_update(object_type, updates)
+        except requests.exceptions.RequestException as e:
+            if _rejected(e):
+                raise RejectedWrite(str(e)) from e
+            raise
+    
+    def flush_journal(self) -> Dict[str, int]:
+        """Apply every pending journaled write through batch updates."""
+        if self.journal is None:
+            return {"applied": 0, "failed": 0, "batches": 0}
+        stats = self.journal.flush(self._apply_journal_batch, BATCH_UPDATE_LIMIT)
+        print(f"✅ Journal flush: {stats['applied']} applied, {stats['failed']} failed in {stats['batches']} batches")
+        return stats
+    
+    def start_journal_flusher(self, interval: float = 2.0) -> "JournalFlusher":
+        """Start a background thread applying journaled writes; stop() it to flush the rest."""
+        if self.journal is None:
+            raise RuntimeError("No write journal configured (set HUBSPOT_WRITE_JOURNAL or pass journal=)")
+        return JournalFlusher(self.journal, self._apply_journal_batch, interval, BATCH_UPDATE_LIMIT).start()
+    
+    def write_buffer(self, max_wait: Optional[float] = 2.0) -> "WriteBuffer":
+        """
+        WriteBuffer over this connector: a lone pending company is sent with
+        update_company, everything else through update_objects.
+        
+        Observe the records you read (buffer.observe) so no-op writes are dropped.
+        """
+        def send_one(object_type: str, object_id: str, properties: Dict[str, Any]):
+            if object_type == "companies":
+                self.update_company(object_id, properties)
+            else:
+                self.update_objects(object_type, {object_id: properties})
+        
+        return WriteBuffer(send_batch=self.update_objects, send_one=send_one,
+                           max_records=BATCH_UPDATE_LIMIT, max_wait=max_wait)
+    
+    def update_company(self, company_id: str, properties: Dict[str, Any],
+                       idempotency_key: Optional[str] = None) -> Optional[Dict]:
         """
         Update a company (with dry-run support).
         
         Args:
             company_id: HubSpot company ID
             properties: Dictionary of properties to update
+            idempotency_key: Journal key (default: a fresh key, no dedupe); ignored without a journal
             
         Returns:
-            Update response or None if dry-run
+            Update response, or None if dry-run or already applied
         """
         # Validate payload first
         validated_props = self.validate_company_payload(properties)
@@ -314,18 +677,29 @@ class HubSpotConnector:
             })
             return None
         
+        key = None
+        if self.journal is not None:
+            key = self.journal.record("companies", company_id, validated_props, idempotency_key, lease=True)
+            if self.journal.status(key) == "acked":
+                print(f"⏭️  Company {company_id} update already applied ({key})")
+                return None
+        
         self._log_request("PATCH", url, body)
         
         try:
-            response = requests.patch(url, headers=self._headers(), json=body)
+            response = self.session.patch(url, json=body)
             response.raise_for_status()
             
+            if key:
+                self.journal.mark_acked([key])
             print(f"✅ Company {company_id} updated successfully")
             return response.json()
             
         except requests.exceptions.RequestException as e:
+            if key:
+                self.journal.mark_failed([key], str(e), _rejected(e))
             print(f"❌ Company update failed: {e}")
-            if hasattr(e, 'response') and e.response:
+            if hasattr(e, 'response') and e.response is not None:
                 print(f"Response status: {e.response.status_code}")
                 print(f"Response text: {e.response.text}")
             raise
@@ -356,7 +730,7 @@ class HubSpotConnector:
         self._log_request("POST", url, body)
         
         try:
-            response = requests.post(url, headers=self._headers(), json=body)
+            response = self.session.post(url, json=body)
             response.raise_for_status()
             
             result = response.json()
@@ -366,12 +740,169 @@ class HubSpotConnector:
             
         except requests.exceptions.RequestException as e:
             print(f"❌ Company creation failed: {e}")
-            if hasattr(e, 'response') and e.response:
+            if hasattr(e, 'response') and e.response is not None:
                 print(f"Response status: {e.response.status_code}")
                 print(f"Response text: {e.response.text}")
             raise
 
 
+class AsyncHubSpotConnector(_HubSpotConnectorBase):
+    """Async twin of HubSpotConnector on a pooled httpx.AsyncClient."""
+    
+    def __init__(self, dry_run: bool = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 verbose: bool = None, timeout: float = 30.0):
+        if not HTTPX_AVAILABLE:
+            raise ImportError("AsyncHubSpotConnector requires httpx (pip install httpx)")
+        super().__init__(dry_run=dry_run, max_concurrency=max_concurrency, verbose=verbose)
+        self.client = httpx.AsyncClient(
+            headers=self._headers(),
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=self.max_concurrency,
+                                max_keepalive_connections=self.max_concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+    
+    async def aclose(self):
+        """Close pooled connections."""
+        await self.client.aclose()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+    
+    async def _request(self, method: str, url: str, **kwargs) -> "httpx.Response":
+        async with self._semaphore:
+            response = await self.client.request(method, url, **kwargs)
+        response.raise_for_status()
+        return response
+    
+    async def search_companies(self, filters: List[Dict], properties: List[str] = None, limit: int = 10) -> List[Dict]:
+        """Search for companies using HubSpot's search API."""
+        url = f"{self.base_url}/crm/v3/objects/companies/search"
+        payload = self._search_payload(filters, properties, limit)
+        self._log_request("POST", url, payload)
+        try:
+            results = (await self._request("POST", url, json=payload)).json().get("results", [])
+        except httpx.HTTPError as e:
+            print(f"❌ Company search failed: {e}")
+            raise
+        print(f"✅ Found {len(results)} companies")
+        return results
+    
+    async def get_company(self, company_id: str, properties: List[str] = None) -> Optional[Dict]:
+        """Get a company by ID, or None if not found."""
+        url = f"{self.base_url}/crm/v3/objects/companies/{company_id}"
+        params = {"properties": ",".join(properties)} if properties else None
+        self._log_request("GET", url)
+        try:
+            data = (await self._request("GET", url, params=params)).json()
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                print(f"❌ Company {company_id} not found")
+                return None
+            print(f"❌ Company retrieval failed: {e}")
+            raise
+        print(f"✅ Retrieved company {company_id}")
+        return data
+    
+    async def _read_contact_batch(self, contact_ids: List[str], properties: Optional[List[str]]) -> List[Dict]:
+        url = f"{self.base_url}/crm/v3/objects/contacts/batch/read"
+        try:
+            response = await self._request("POST", url, json=self._batch_read_payload(contact_ids, properties))
+            return response.json().get("results", [])
+        except httpx.HTTPError as e:
+            print(f"❌ Contact batch read failed ({len(contact_ids)} IDs): {e}")
+            return []
+    
+    async def get_contacts(self, contact_ids: List[str], properties: List[str] = None) -> List[Dict]:
+        """Get contacts by ID through concurrent 100-ID batch reads, in the order of contact_ids."""
+        if not contact_ids:
+            return []
+        batches = list(chunked(list(dict.fromkeys(map(str, contact_ids))), BATCH_READ_LIMIT))
+        self._log_request("POST", f"{self.base_url}/crm/v3/objects/contacts/batch/read ({len(batches)} batches)")
+        pages = await asyncio.gather(*(self._read_contact_batch(batch, properties) for batch in batches))
+        contacts = self._order_batch_results(contact_ids, list(pages))
+        print(f"✅ Retrieved {len(contacts)}/{len(contact_ids)} contacts")
+        return contacts
+    
+    async def _paged_association_ids(self, version: str, company_id: str, to_object_type: str,
+                                     limit: Optional[int]) -> List[str]:
+        url = self._associations_url(version, company_id, to_object_type)
+        ids: List[str] = []
+        after = None
+        while True:
+            params = {"limit": min(ASSOCIATIONS_PAGE_SIZE, limit or ASSOCIATIONS_PAGE_SIZE)}
+            if after:
+                params["after"] = after
+            page_ids, after = self._association_page((await self._request("GET", url, params=params)).json())
+            ids.extend(page_ids)
+            if not after or (limit and len(ids) >= limit):
+                return ids[:limit] if limit else ids
+    
+    async def get_company_associations(self, company_id: str, to_object_type: str = "contacts",
+                                       limit: Optional[int] = None) -> List[str]:
+        """Get associated object IDs for a company (v4, falling back to v3), following pagination."""
+        try:
+            ids = await self._paged_association_ids("v4", company_id, to_object_type, limit)
+            if ids:
+                print(f"✅ Found {len(ids)} {to_object_type} associations (v4)")
+                return ids
+        except Exception:
+            pass
+        try:
+            ids = await self._paged_association_ids("v3", company_id, to_object_type, limit)
+            print(f"✅ Found {len(ids)} {to_object_type} associations (v3)")
+            return ids
+        except Exception as e:
+            print(f"❌ Failed to get {to_object_type} associations: {e}")
+            return []
+    
+    async def get_contacts_for_companies(self, company_ids: List[str],
+                                         properties: List[str] = None) -> Dict[str, List[Dict]]:
+        """Get every contact associated with each company (associations concurrently, then batch reads)."""
+        if not company_ids:
+            return {}
+        association_lists = await asyncio.gather(*(self.get_company_associations(cid) for cid in company_ids))
+        associations = dict(zip(company_ids, association_lists))
+        contacts = await self.get_contacts([cid for ids in association_lists for cid in ids], properties)
+        by_id = {str(contact.get("id")): contact for contact in contacts}
+        return {
+            company_id: [by_id[cid] for cid in ids if cid in by_id]
+            for company_id, ids in associations.items()
+        }
+    
+    async def _write_company(self, method: str, url: str, operation: str, properties: Dict[str, Any],
+                             company_id: Optional[str] = None) -> Optional[Dict]:
+        validated_props = self.validate_company_payload(properties)
+        body = {"properties": validated_props}
+        if self.dry_run:
+            details = {"url": url, "properties": validated_props}
+            if company_id:
+                details["company_id"] = company_id
+            self._log_dry_run_prevention(operation, details)
+            return None
+        self._log_request(method, url, body)
+        try:
+            result = (await self._request(method, url, json=body)).json()
+        except httpx.HTTPError as e:
+            print(f"❌ {operation.capitalize()} failed: {e}")
+            raise
+        print(f"✅ {operation.capitalize()} succeeded ({result.get('id', company_id)})")
+        return result
+    
+    async def update_company(self, company_id: str, properties: Dict[str, Any]) -> Optional[Dict]:
+        """Update a company (with dry-run support)."""
+        url = f"{self.base_url}/crm/v3/objects/companies/{company_id}"
+        return await self._write_company("PATCH", url, "company update", properties, company_id)
+    
+    async def create_company(self, properties: Dict[str, Any]) -> Optional[Dict]:
+        """Create a company (with dry-run support)."""
+        return await self._write_company("POST", f"{self.base_url}/crm/v3/objects/companies",
+                                         "company creation", properties)
+
+
 def test_hubspot_connectivity():
     """Test HubSpot connectivity and demonstrate Phase 2 functionality."""
     
@@ -430,7 +961,7 @@ def test_hubspot_connectivity():
             
             # Test 4: Get associated contacts
             print(f"\n👥 Test 4: Get associated contacts...")
-            contact_ids = connector.get_company_associations(company_id, "contacts", limit=10)
+            contact_ids = connector.get_company_associations(company_id, "contacts")
             
             if contact_ids:
                 contacts = connector.get_contacts(
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Portfolio-wide Email Pattern Inference
+
+Infers the email pattern (first.last, flast, ...) of every company from its
+associated contacts and writes email_pattern back through HubSpot batch
+updates. Companies with no examined contacts are left as they are.
+
+--with-stats also writes email_pattern_confidence and email_pattern_votes.
+These are not standard properties: create them (single-line text) in the
+portal first, the run checks for them and stops otherwise, since HubSpot
+rejects a whole batch naming an unknown property.
+
+Companies are processed in chunks. For each chunk, associations are fetched
+concurrently, contacts not yet counted are read with 100-ID batch reads,
+and the votes are added to the engine. Engine state (vote histograms and
+counted contact IDs) is saved after every chunk, so a re-run only reads
+contacts added since the previous run. Only companies whose result changed
+are written.
+
+Usage:
+    python scripts/infer_email_patterns.py [--company-ids ID,ID,...] [--limit N]
+        [--state PATH] [--chunk-size N] [--with-stats]
+
+Respects DRY_RUN / HUBSPOT_TEST_PORTAL like the other HubSpot scripts.
+"""
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.utils.email_patterns import EmailPatternEngine
+from scripts.hubspot_safe_connector import HubSpotConnector, chunked
+
+CONTACT_PROPERTIES = ["email", "firstname", "lastname"]
+COMPANY_PROPERTIES = ["name", "email_pattern"]
+STATS_PROPERTIES = ["email_pattern_confidence", "email_pattern_votes"]
+DEFAULT_STATE_PATH = os.getenv("CRM_EMAIL_PATTERN_STATE", ".cache/email_patterns.json")
+DEFAULT_CHUNK_SIZE = 200
+
+
+def count_new_contacts(connector: HubSpotConnector, engine: EmailPatternEngine, company_ids: List[str]) -> int:
+    """Read the contacts of `company_ids` not yet counted and add their votes. Returns contacts read."""
+    with ThreadPoolExecutor(max_workers=min(connector.max_concurrency, len(company_ids))) as executor:
+        associations = dict(zip(company_ids, executor.map(connector.get_company_associations, company_ids)))
+
+    new_ids = {company_id: engine.new_contact_ids(company_id, ids) for company_id, ids in associations.items()}
+    contacts = connector.get_contacts([cid for ids in new_ids.values() for cid in ids], CONTACT_PROPERTIES)
+    by_id = {str(contact.get("id")): contact for contact in contacts}
+    for company_id, ids in new_ids.items():
+        engine.add_contacts(company_id, [by_id[cid] for cid in ids if cid in by_id])
+    return len(contacts)
+
+
+def pending_updates(engine: EmailPatternEngine, companies: Dict[str, Dict],
+                    with_stats: bool = False) -> Dict[str, Dict[str, str]]:
+    """Company ID -> properties, for companies whose stored pattern properties differ from the engine's."""
+    updates = {}
+    for company_id, company in companies.items():
+        result = engine.result(company_id)
+        if not result.examined:
+            continue  # No evidence: keep whatever pattern is stored
+        properties = result.to_properties()
+        if not with_stats:
+            properties = {"email_pattern": properties["email_pattern"]}
+        current = company.get("properties") or {}
+        changed = {key: value for key, value in properties.items() if current.get(key) != value}
+        if changed:
+            updates[company_id] = changed
+    return updates
+
+
+def run(connector: HubSpotConnector, engine: EmailPatternEngine, company_ids: Optional[List[str]] = None,
+        limit: Optional[int] = None, chunk_size: int = DEFAULT_CHUNK_SIZE, with_stats: bool = False,
+        state_path: Optional[str] = None) -> Dict[str, int]:
+    """Infer and write email patterns for the given companies (default: every company)."""
+    properties = COMPANY_PROPERTIES
+    if with_stats:
+        missing = [name for name in STATS_PROPERTIES if not connector.get_property("companies", name)]
+        if missing:
+            raise RuntimeError(f"Company properties missing from the portal: {', '.join(missing)} "
+                               "(create them or run without --with-stats)")
+        properties = COMPANY_PROPERTIES + STATS_PROPERTIES
+    if company_ids:
+        companies = {cid: connector.get_company(cid, properties) or {} for cid in company_ids}
+    else:
+        companies = {str(c["id"]): c for c in connector.list_companies(properties, limit=limit)}
+
+    stats = {"companies": len(companies), "contacts_read": 0, "updated": 0}
+    for chunk in chunked(list(companies), chunk_size):
+        stats["contacts_read"] += count_new_contacts(connector, engine, chunk)
+        updates = pending_updates(engine, {cid: companies[cid] for cid in chunk}, with_stats)
+        if updates:
+            connector.update_companies(updates)
+            stats["updated"] += len(updates)
+        if state_path:
+            engine.save(state_path)
+    return stats
+
+
+def main():
+    """Main function for command line usage."""
+    args = sys.argv[1:]
+    company_ids, limit = None, None
+    state_path, chunk_size, with_stats = DEFAULT_STATE_PATH, DEFAULT_CHUNK_SIZE, False
+    while args:
+        arg = args.pop(0)
+        if arg == "--company-ids":
+            company_ids = [cid.strip() for cid in args.pop(0).split(",") if cid.strip()]
+        elif arg == "--limit":
+            limit = int(args.pop(0))
+        elif arg == "--state":
+            state_path = args.pop(0)
+        elif arg == "--chunk-size":
+            chunk_size = int(args.pop(0))
+        elif arg == "--with-stats":
+            with_stats = True
+
+    print("📧 Portfolio Email Pattern Inference")
+    print("=" * 60)
+    engine = EmailPatternEngine.load(state_path)
+    print(f"State: {state_path} ({len(engine.companies)} companies already counted)")
+
+    with HubSpotConnector() as connector:
+        stats = run(connector, engine, company_ids, limit, chunk_size, with_stats, state_path)
+
+    print("\n📊 Summary")
+    print(f"  Companies:      {stats['companies']:,}")
+    print(f"  Contacts read:  {stats['contacts_read']:,}")
+    print(f"  Updated:        {stats['updated']:,}")
+
+
+if __name__ == "__main__":
+    main()
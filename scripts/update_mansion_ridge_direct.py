@@ -10,6 +10,10 @@ import sys
 import json
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crm_agent.utils.email_patterns import UNKNOWN_PATTERN, infer_email_pattern
+
 
 def get_token() -> str:
     token = os.getenv("PRIVATE_APP_ACCESS_TOKEN")
@@ -169,26 +173,28 @@ def get_associated_contact_ids(token: str, company_id: str):
         return []
 
 
-def get_contact_basic(token: str, contact_id: str):
-    """Fetch a contact's basic fields: email, firstname, lastname."""
-    headers = hubspot_headers(token)
-    url = f"https://api.hubapi.com/crm/v3/objects/contacts/{contact_id}?properties=email,firstname,lastname"
+def get_contacts_basic(token: str, contact_ids: list):
+    """Fetch contacts' basic fields (email, firstname, lastname) with one batch read."""
+    if not contact_ids:
+        return []
+    url = "https://api.hubapi.com/crm/v3/objects/contacts/batch/read"
+    payload = {
+        "inputs": [{"id": str(cid)} for cid in contact_ids[:100]],
+        "properties": ["email", "firstname", "lastname"],
+    }
     try:
-        r = requests.get(url, headers=headers)
+        r = requests.post(url, headers=hubspot_headers(token), json=payload)
         r.raise_for_status()
-        data = r.json()
-        props = data.get("properties", {})
-        return {
-            "email": props.get("email", ""),
-            "firstname": props.get("firstname", ""),
-            "lastname": props.get("lastname", ""),
-        }
+        return [
+            {
+                "email": c.get("properties", {}).get("email", ""),
+                "firstname": c.get("properties", {}).get("firstname", ""),
+                "lastname": c.get("properties", {}).get("lastname", ""),
+            }
+            for c in r.json().get("results", [])
+        ]
     except Exception:
-        return {"email": "", "firstname": "", "lastname": ""}
-
-
-def normalize(s: str) -> str:
-    return "".join(ch for ch in (s or "").strip().lower() if ch.isalpha())
+        return []
 
 
 def infer_email_pattern_from_contacts(contacts: list, company_domain: str) -> str:
@@ -203,59 +209,10 @@ def infer_email_pattern_from_contacts(contacts: list, company_domain: str) -> st
     - firstinitiallastname
     - last.first
     Returns the most frequent matching pattern label, or 'unknown'.
+    Local parts are matched whatever their domain (mixed data may add noise).
     """
-    domain = (company_domain or "").lower().strip()
-    if domain.startswith("@"):  # sanitize if given with @
-        domain = domain[1:]
-
-    def local_part(email: str) -> str:
-        if not email or "@" not in email:
-            return ""
-        lp, dom = email.lower().split("@", 1)
-        # If domain mismatches, still consider local part (mixed data), but pattern may be noisy
-        return lp
-
-    # Pattern generators mapping to readable labels
-    def gen(first: str, last: str):
-        f = normalize(first)
-        l = normalize(last)
-        if not f or not l:
-            return {}
-        return {
-            "first.last": f"{f}.{l}",
-            "firstlast": f"{f}{l}",
-            "f.last": f"{f[0]}.{l}",
-            "flast": f"{f[0]}{l}",
-            "first_last": f"{f}_{l}",
-            "firstinitial_lastname": f"{f[0]}_{l}",
-            "firstinitiallastname": f"{f[0]}{l}",
-            "last.first": f"{l}.{f}",
-        }
-
-    votes = {}
-    examined = 0
-    for c in contacts:
-        email = c.get("email", "")
-        if not email:
-            continue
-        lp = local_part(email)
-        if not lp:
-            continue
-        first = c.get("firstname", "")
-        last = c.get("lastname", "")
-        candidates = gen(first, last)
-        if not candidates:
-            continue
-        examined += 1
-        for label, expected_lp in candidates.items():
-            if lp == expected_lp:
-                votes[label] = votes.get(label, 0) + 1
-
-    if not votes or examined == 0:
-        return "unknown"
-    # Choose the most frequent
-    best_label = max(votes.items(), key=lambda kv: kv[1])[0]
-    return best_label
+    result = infer_email_pattern(contacts)
+    return result.pattern if result.examined else UNKNOWN_PATTERN
 
 
 def main():
@@ -275,7 +232,7 @@ def main():
     # Infer email pattern from existing associated contacts
     domain = "mansionridgegc.com"
     contact_ids = get_associated_contact_ids(token, company_id)
-    contacts = [get_contact_basic(token, cid) for cid in contact_ids[:100]]
+    contacts = get_contacts_basic(token, contact_ids[:100])
     inferred_pattern = infer_email_pattern_from_contacts(contacts, domain)
 
     props = {
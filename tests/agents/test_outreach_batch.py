@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for multi-record outreach generation.
+Tests OutreachPersonalizerAgent.generate_outreach_batch and
+generate_company_outreach: per-contact results matching the single-contact
+path, company analysis done once per company and HubSpot record input.
+"""
+
+import pytest
+from crm_agent.agents.specialized.outreach_personalizer_agent import create_outreach_personalizer_agent
+from crm_agent.core.state_models import CRMSessionState
+
+
+COMPANY = {
+    "id": "100",
+    "name": "Prestigious Country Club",
+    "company_type": "Private",
+    "management_company": "Troon",
+    "annualrevenue": 18000000,
+    "numberofemployees": 120,
+    "description": "Exclusive private club with championship golf course",
+}
+CONTACTS = [
+    {"id": "1", "email": "gm@prestigiouscc.com", "jobtitle": "General Manager", "firstname": "Ann", "lastname": "Lee"},
+    {"id": "2", "email": "ops@prestigiouscc.com", "jobtitle": "Operations Manager", "firstname": "Bo", "lastname": "Kim"},
+    {"id": "3", "email": "gm2@prestigiouscc.com", "jobtitle": "General Manager", "firstname": "Cy", "lastname": "Ng"},
+]
+LEAD_SCORES = {"score_band": "Warm (60-79)", "total_score": 65}
+
+
+class TestOutreachBatch:
+    """Test batch outreach generation."""
+
+    def setup_method(self):
+        self.agent = create_outreach_personalizer_agent()
+
+    def test_matches_single_contact_outreach(self):
+        company_result = self.agent.generate_company_outreach(COMPANY, CONTACTS, lead_scores=LEAD_SCORES)
+
+        assert company_result["company_id"] == "100"
+        assert [o["contact_id"] for o in company_result["outreach"]] == ["1", "2", "3"]
+        for contact, outreach in zip(CONTACTS, company_result["outreach"]):
+            state = CRMSessionState()
+            state.company_data = COMPANY
+            state.contact_data = contact
+            state.lead_scores = LEAD_SCORES
+            single = self.agent.generate_personalized_outreach(state, "cold_outreach")
+
+            assert outreach["personalization"] == single["personalization"]
+            assert outreach["role_analysis"] == single["role_analysis"]
+            assert outreach["email_engagement"]["email_data"] == single["email_engagement"]["email_data"]
+            assert outreach["follow_up_task"]["task_data"]["notes"] == single["follow_up_task"]["task_data"]["notes"]
+        assert company_result["company_profile"] == single["company_profile"]
+
+    def test_company_analysis_runs_once_per_company(self):
+        calls = {"profile": 0, "personalization": 0}
+        analyze_profile = self.agent._analyze_company_profile
+        generate_personalization = self.agent._generate_personalization
+
+        def counting_profile(*args):
+            calls["profile"] += 1
+            return analyze_profile(*args)
+
+        def counting_personalization(*args):
+            calls["personalization"] += 1
+            return generate_personalization(*args)
+
+        object.__setattr__(self.agent, "_analyze_company_profile", counting_profile)
+        object.__setattr__(self.agent, "_generate_personalization", counting_personalization)
+
+        entries = [{"company": dict(COMPANY, id=str(i)), "contacts": CONTACTS, "lead_scores": LEAD_SCORES}
+                   for i in range(3)]
+        results = self.agent.generate_outreach_batch(entries)
+
+        assert sum(len(r["outreach"]) for r in results) == 9
+        assert calls == {"profile": 3, "personalization": 6}  # Two role types per company
+
+    def test_hubspot_records_and_unique_engagement_ids(self):
+        entry = {
+            "company": {"id": "100", "properties": {k: v for k, v in COMPANY.items() if k != "id"}},
+            "contacts": [{"id": c["id"], "properties": {k: v for k, v in c.items() if k != "id"}} for c in CONTACTS],
+        }
+        result = self.agent.generate_outreach_batch([entry], "demo_invitation")[0]
+
+        assert result["company_name"] == "Prestigious Country Club"
+        email_data = result["outreach"][0]["email_engagement"]["email_data"]
+        assert email_data["to_email"] == "gm@prestigiouscc.com"
+        assert email_data["company_id"] == "100"
+        ids = {o["email_engagement"]["engagement_id"] for o in result["outreach"]}
+        ids |= {o["follow_up_task"]["task_id"] for o in result["outreach"]}
+        assert len(ids) == 6
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
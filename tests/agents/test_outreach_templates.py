@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the precompiled outreach templates.
+Tests CompiledTemplate, role tables built from the personalization config,
+the memoized role and strategy lookups and their use by
+OutreachPersonalizerAgent.
+"""
+
+import pytest
+from crm_agent.agents.specialized.outreach_personalizer_agent import create_outreach_personalizer_agent
+from crm_agent.utils.outreach_templates import (
+    CompiledTemplate,
+    OutreachTemplates,
+    classify_outreach_role,
+    select_messaging_strategy,
+)
+
+
+class TestCompiledTemplate:
+    """Test CompiledTemplate."""
+
+    def test_fields_and_render(self):
+        template = CompiledTemplate("Hi {first_name}, news for {company_name}")
+
+        assert template.fields == {"first_name", "company_name"}
+        assert template.render(first_name="Ann", company_name="Acme") == "Hi Ann, news for Acme"
+
+    def test_positional_fields_are_rejected(self):
+        with pytest.raises(ValueError):
+            CompiledTemplate("Hi {0}")
+
+
+class TestOutreachTemplates:
+    """Test role tables and lookups."""
+
+    def test_config_role_messaging_overrides_defaults(self):
+        templates = OutreachTemplates({"role_messaging": {
+            "general_manager": {"decision_authority": "medium"},
+            "chef": {"focus_areas": ["menu"], "pain_points": ["food_costs"], "decision_authority": "low"},
+        }})
+
+        gm = templates.role_profile("general_manager")
+        assert gm.decision_authority == "medium"
+        assert "ROI" in gm.messaging_focus
+        assert templates.role_profile("chef").messaging_focus == ("menu",)
+        assert templates.role_profile("unknown").pain_points == ("operational_inefficiencies",)
+
+    def test_memoized_lookups(self):
+        assert classify_outreach_role("head golf professional") == "golf_professional"
+        assert classify_outreach_role("executive chef") == "general"
+        assert select_messaging_strategy(True, "it_manager", "low") == "direct_value_proposition"
+        assert select_messaging_strategy(False, "it_manager", "low") == "operational_efficiency"
+        assert select_messaging_strategy(False, "general", "medium") == "industry_insights"
+
+
+class TestAgentTemplates:
+    """Test that the agent renders drafts from the compiled templates."""
+
+    def setup_method(self):
+        self.agent = create_outreach_personalizer_agent()
+
+    def test_draft_text(self):
+        role = self.agent._analyze_contact_role({"jobtitle": "Operations Manager"})
+        profile = self.agent._analyze_company_profile({"name": "Acme Golf", "company_type": "Resort"}, {})
+
+        content = self.agent._generate_email_content(role, profile, "operational_efficiency", "cold_outreach")
+        assert content.startswith("Hi there,\n\nManaging operations at Acme Golf")
+        assert "helped Resort courses streamline" in content
+        assert self.agent._generate_subject_line(role, profile, "unknown", "cold_outreach") == "Opportunity for Acme Golf"
+
+        personalization = self.agent._generate_personalization(role, profile, {}, "cold_outreach")
+        body = self.agent._render_email_body(personalization)
+        assert body.startswith(personalization["email_content"])
+        assert body.endswith("1. Industry statistics: Golf Industry Association Report 2024 "
+                             "(https://example.com/golf-industry-report)")
+
+    def test_follow_up_notes(self):
+        personalization = {"subject_line": "Hello", "messaging_strategy": "education_first",
+                           "personalization_score": 70}
+        task = self.agent._create_follow_up_task(
+            {"firstname": "Ann", "lastname": "Lee"}, {"name": "Acme Golf"}, personalization,
+            "follow_up", None, lead_scores={"score_band": "Hot (80-100)"}
+        )
+
+        notes = task["task_data"]["notes"]
+        assert notes.startswith("Follow up on personalized outreach sent to Ann Lee.")
+        assert notes.endswith("- Total Score: Unknown")
+        assert task["task_data"]["title"] == "Follow up on follow_up - Acme Golf"
+        assert task["task_data"]["priority"] == "MEDIUM"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
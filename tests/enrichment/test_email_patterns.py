@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Unit tests for portfolio email pattern inference.
+Tests structural pattern matching, vote histograms and confidence,
+incremental re-runs, and the batch update flow of the inference script
+(pattern-only by default, companies without examined contacts skipped,
+opt-in stats properties checked against the portal).
+"""
+
+import json
+import pytest
+from crm_agent.utils.email_patterns import EmailPatternEngine, match_email_patterns
+from scripts.infer_email_patterns import run
+
+
+def contact(contact_id, email, first, last):
+    return {"id": contact_id, "properties": {"email": email, "firstname": first, "lastname": last}}
+
+
+class FakeConnector:
+    """In-memory HubSpotConnector stand-in recording contact reads and batch updates."""
+
+    max_concurrency = 4
+
+    def __init__(self, companies, contacts, associations, portal_properties=()):
+        self.companies = companies
+        self.contacts = contacts
+        self.associations = associations
+        self.portal_properties = set(portal_properties)
+        self.contact_reads = []
+        self.updates = []
+
+    def get_property(self, object_type, name):
+        return {"name": name} if name in self.portal_properties else None
+
+    def list_companies(self, properties=None, limit=None):
+        return iter(list(self.companies.values())[:limit])
+
+    def get_company_associations(self, company_id):
+        return list(self.associations.get(company_id, []))
+
+    def get_contacts(self, contact_ids, properties=None):
+        self.contact_reads.append(list(contact_ids))
+        return [self.contacts[cid] for cid in contact_ids if cid in self.contacts]
+
+    def update_companies(self, updates):
+        self.updates.append(updates)
+        for company_id, properties in updates.items():
+            self.companies[company_id]["properties"].update(properties)
+        return []
+
+
+class TestMatchEmailPatterns:
+    """Test match_email_patterns."""
+
+    def test_patterns(self):
+        assert match_email_patterns("Mary.OBrien@club.com", "Mary", "O'Brien") == ("first.last",)
+        assert match_email_patterns("jsmith@club.com", "John", "Smith") == ("flast", "firstinitiallastname")
+        assert match_email_patterns("j_smith@club.com", "John", "Smith") == ("firstinitial_lastname",)
+        assert match_email_patterns("smith.john@club.com", "John", "Smith") == ("last.first",)
+        assert match_email_patterns("info@club.com", "John", "Smith") == ()
+        assert match_email_patterns("jsmith@club.com", "", "Smith") == ()
+
+
+class TestEmailPatternEngine:
+    """Test EmailPatternEngine."""
+
+    def test_votes_and_confidence(self):
+        engine = EmailPatternEngine()
+        engine.add_contacts("1", [
+            contact("a", "jsmith@club.com", "John", "Smith"),
+            contact("b", "mjones@club.com", "Mary", "Jones"),
+            contact("c", "pat.lee@club.com", "Pat", "Lee"),
+            contact("d", "info@club.com", "Front", "Desk"),
+            contact("e", "", "No", "Email"),
+        ])
+
+        result = engine.result("1")
+        assert result.pattern == "flast"
+        assert result.examined == 4
+        assert result.votes == {"first.last": 1, "flast": 2, "firstinitiallastname": 2}
+        # 2 of 4 examined contacts, scaled by 4/5 for the small sample
+        assert result.confidence == 0.4
+        assert json.loads(result.to_properties()["email_pattern_votes"]) == result.votes
+        assert engine.result("missing").pattern == "unknown"
+
+    def test_incremental_state(self, tmp_path):
+        path = str(tmp_path / "state.json")
+        engine = EmailPatternEngine()
+        engine.add_contacts("1", [contact("a", "jsmith@club.com", "John", "Smith")])
+        engine.save(path)
+
+        reloaded = EmailPatternEngine.load(path)
+        assert reloaded.new_contact_ids("1", ["a", "b"]) == ["b"]
+        reloaded.add_contacts("1", [contact("a", "jsmith@club.com", "John", "Smith"),
+                                    contact("b", "mjones@club.com", "Mary", "Jones")])
+        assert reloaded.result("1").votes["flast"] == 2
+        assert EmailPatternEngine.load(str(tmp_path / "missing.json")).companies == {}
+
+
+class TestInferEmailPatternsScript:
+    """Test the portfolio run."""
+
+    def test_pattern_only_by_default(self):
+        companies = {
+            "1": {"id": "1", "properties": {"name": "Acme Golf"}},
+            "2": {"id": "2", "properties": {"name": "Pine Club", "email_pattern": "flast"}},
+        }
+        contacts = {"a": contact("a", "john.smith@acme.com", "John", "Smith")}
+        connector = FakeConnector(companies, contacts, {"1": ["a"], "2": []})
+
+        stats = run(connector, EmailPatternEngine())
+
+        # Company 2 has no examined contacts: its stored pattern is kept
+        assert stats["updated"] == 1
+        assert connector.updates == [{"1": {"email_pattern": "first.last"}}]
+
+    def test_stats_need_the_portal_properties(self):
+        connector = FakeConnector({"1": {"id": "1", "properties": {}}}, {}, {}, ["email_pattern_votes"])
+
+        with pytest.raises(RuntimeError, match="email_pattern_confidence"):
+            run(connector, EmailPatternEngine(), with_stats=True)
+        assert connector.updates == []
+
+    def test_rerun_reads_only_new_contacts(self):
+        companies = {
+            "1": {"id": "1", "properties": {"name": "Acme Golf"}},
+            "2": {"id": "2", "properties": {"name": "Pine Club", "email_pattern": "unknown"}},
+        }
+        contacts = {
+            "a": contact("a", "john.smith@acme.com", "John", "Smith"),
+            "b": contact("b", "mary.jones@acme.com", "Mary", "Jones"),
+            "c": contact("c", "info@pine.com", "Front", "Desk"),
+        }
+        connector = FakeConnector(companies, contacts, {"1": ["a", "b"], "2": ["c"]},
+                                  ["email_pattern_confidence", "email_pattern_votes"])
+        engine = EmailPatternEngine()
+
+        stats = run(connector, engine, chunk_size=1, with_stats=True)
+
+        assert stats == {"companies": 2, "contacts_read": 3, "updated": 2}
+        assert companies["1"]["properties"]["email_pattern"] == "first.last"
+        assert connector.updates[1] == {"2": {"email_pattern_confidence": "0.00", "email_pattern_votes": "{}"}}
+
+        # A new contact for company 1: only it is read, only company 1 is written
+        contacts["d"] = contact("d", "pat.lee@acme.com", "Pat", "Lee")
+        connector.associations["1"].append("d")
+        connector.updates.clear()
+        stats = run(connector, engine, with_stats=True)
+
+        assert connector.contact_reads[-1] == ["d"]
+        assert stats["updated"] == 1
+        assert connector.updates == [{"1": {"email_pattern_confidence": "0.60",
+                                            "email_pattern_votes": '{"first.last": 3}'}}]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
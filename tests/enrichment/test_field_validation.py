@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the precompiled enrichment field validators.
+Tests field type resolution, batch validation (with the validator's
+original phone and URL rules), the validator reading indexed results and
+data source agents recording their output in that index.
+"""
+
+import json
+import pytest
+from types import SimpleNamespace
+from google.adk.sessions.state import State
+from crm_agent.utils.field_validation import field_type_for, validate_many, validate_value
+from crm_agent.agents.workflows.field_enrichment_workflow import (
+    DataSourceAgent,
+    EnrichmentValidatorAgent,
+    get_enrichment_results_by_source,
+    record_enrichment_results,
+)
+
+
+class TestFieldValidation:
+    """Test table-driven field validators."""
+
+    def test_field_type_resolution(self):
+        assert field_type_for("email") == "email"
+        assert field_type_for("Website URL") == "url"
+        assert field_type_for("mobilephone") == "phone"
+        assert field_type_for("industry") == "general"
+
+    def test_validate_many_preserves_order(self):
+        results = validate_many("phone", ["(914) 555-0100", "914 555 0100", "555", None])
+
+        assert [r["valid"] for r in results] == [True, True, False, False]
+        assert results[2]["issues"] == ["Invalid phone format"]
+        assert results[3]["issues"] == ["Empty value"]
+
+    @pytest.mark.parametrize("phone, valid", [
+        ("(914) 555-0100", True),
+        ("914 - 555 - 0100 ext", False),
+        ("+1 914 555 0100", False),
+        ("914.555.0100", False),
+        ("914\t555\t0100", False),
+    ])
+    def test_phone_rules_unchanged(self, phone, valid):
+        # Only spaces, dashes and parentheses are ignored, as with the old replace() chain
+        assert validate_value("phone", phone)["valid"] is valid
+
+    @pytest.mark.parametrize("url, valid", [
+        ("https://mansionridgegc.com", True),
+        ("http://mansionridgegc.com/about", True),
+        ("https://", True),
+        ("mansionridgegc.com", False),
+        ("HTTPS://mansionridgegc.com", False),
+        (" https://mansionridgegc.com", False),
+        ("ftp://mansionridgegc.com", False),
+    ])
+    def test_url_rules_unchanged(self, url, valid):
+        # A case-sensitive http:// or https:// prefix, as before
+        assert validate_value("website", url)["valid"] is valid
+
+    def test_email_validation(self):
+        assert validate_value("email", "gm@mansionridgegc.com")["confidence"] == 90
+        assert validate_value("email", "not-an-email")["confidence"] == 20
+
+
+class TestEnrichmentValidatorAgent:
+    """Test EnrichmentValidatorAgent over indexed enrichment results."""
+
+    def test_execute_validation_reads_indexed_results(self):
+        session_state = {}
+        record_enrichment_results(session_state, "Web", {
+            "website": {"new_value": "https://mansionridgegc.com"},
+            "phone": {"new_value": "845-555-0100"},
+        })
+        record_enrichment_results(session_state, "LinkedIn", {
+            "industry": {"new_value": "Golf"},
+        })
+
+        agent = EnrichmentValidatorAgent()
+        result = agent.execute_validation(SimpleNamespace(session_state=session_state))
+
+        assert result["status"] == "completed"
+        assert set(session_state["VALIDATION_RESULTS"]) == {"website", "phone", "industry"}
+        assert all(r["valid"] for r in session_state["VALIDATION_RESULTS"].values())
+
+    def test_only_the_index_is_read(self):
+        session_state = {"WEB_ENRICHMENT_RESULTS": {"website": {"new_value": "https://stale.com"}}}
+        record_enrichment_results(session_state, "ExternalData", {"industry": {"new_value": "Golf"}})
+
+        assert get_enrichment_results_by_source(session_state) == {
+            "EXTERNALDATA": {"industry": {"new_value": "Golf"}},
+        }
+
+
+class TestDataSourceAgentOutput:
+    """Test DataSourceAgent recording its response through record_enrichment_results."""
+
+    def run_callback(self, agent, output):
+        state = State(value={agent.output_key: output}, delta={})
+        agent.after_agent_callback(SimpleNamespace(state=state))
+        return state
+
+    def test_json_output_is_recorded_in_the_index(self):
+        agent = DataSourceAgent("Web", ["web_search"])
+        output = "```json\n" + json.dumps({"website": {"new_value": "https://mansionridgegc.com"}}) + "\n```"
+
+        state = self.run_callback(agent, output)
+
+        assert agent.output_key == "WEB_ENRICHMENT_OUTPUT"
+        assert get_enrichment_results_by_source(state.to_dict()) == {
+            "WEB": {"website": {"new_value": "https://mansionridgegc.com"}},
+        }
+        # Recorded as a state delta so the session service persists it
+        assert "ENRICHMENT_RESULTS_BY_SOURCE" in state._delta
+
+    def test_sources_accumulate_and_unparseable_output_is_ignored(self):
+        web = DataSourceAgent("Web", ["web_search"])
+        linkedin = DataSourceAgent("LinkedIn", ["linkedin_company_lookup"])
+        state = State(value={
+            web.output_key: json.dumps({"website": {"new_value": "https://mansionridgegc.com"}}),
+            linkedin.output_key: "No company page found.",
+        }, delta={})
+
+        web.after_agent_callback(SimpleNamespace(state=state))
+        linkedin.after_agent_callback(SimpleNamespace(state=state))
+
+        assert set(get_enrichment_results_by_source(state.to_dict())) == {"WEB"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
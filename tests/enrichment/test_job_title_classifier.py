@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the precompiled job title classifier.
+Tests table precedence, overlapping keywords, batch classification and the
+per-title cache.
+"""
+
+import pytest
+from crm_agent.agents.specialized.field_enrichment_manager_agent import FieldEnrichmentManagerAgent
+from crm_agent.utils.job_titles import JobTitleClassifier, KeywordAutomaton
+
+
+class TestKeywordAutomaton:
+    """Test KeywordAutomaton.match."""
+
+    def test_first_listed_label_wins(self):
+        automaton = KeywordAutomaton([
+            {"A": ("product manager",), "B": ("manager", "product")},
+            {"X": ("duct",), "Y": ("pro",)},
+        ])
+
+        assert automaton.match("senior product manager") == ("A", "X")
+        assert automaton.match("product owner") == ("B", "X")
+        # Overlapping keywords found through failure links
+        assert automaton.match("reproduction") == ("B", "X")
+        assert automaton.match("golf pro") == (None, "Y")
+        assert automaton.match("") == (None, None)
+
+
+class TestJobTitleClassifier:
+    """Test JobTitleClassifier."""
+
+    def test_classify(self):
+        classifier = JobTitleClassifier()
+
+        assert classifier.classify("Senior Vice President, Sales") == {"seniority": "C-Level", "function": "Sales"}
+        assert classifier.classify("  Accounting SUPERVISOR ") == {"seniority": "Manager", "function": "Finance"}
+        assert classifier.classify("Golf Pro") == {
+            "seniority": "Individual Contributor", "function": "General Management"
+        }
+        assert classifier.classify("") == {"seniority": "Unknown", "function": "Unknown"}
+
+    def test_classify_many_caches_titles(self):
+        classifier = JobTitleClassifier()
+        titles = ["General Manager", "general manager ", "Head of Marketing", "General Manager"]
+
+        results = classifier.classify_many(titles)
+
+        assert [r["seniority"] for r in results] == ["Manager", "Manager", "Director", "Manager"]
+        assert results[2]["function"] == "Marketing"
+        assert classifier.cache_info().misses == 2
+        results[0]["seniority"] = "changed"
+        assert classifier.classify("General Manager")["seniority"] == "Manager"
+
+    def test_manager_agent_delegates(self):
+        agent = FieldEnrichmentManagerAgent()
+
+        assert agent._parse_job_title_real("Director of Human Resources")["function"] == "Human Resources"
+        assert agent.parse_job_titles(["CFO", "Staff Auditor"]) == [
+            {"seniority": "C-Level", "function": "General Management"},
+            {"seniority": "Senior", "function": "Finance"},
+        ]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched Gemini research in CompanyLLMEnrichmentAgent.
+Tests packed-request demultiplexing, retrying only failed companies, caching
+packed sections under the batch prompt version, the sync wrapper inside an
+event loop and the rate budget's limits.
+"""
+
+import asyncio
+import re
+import pytest
+from types import SimpleNamespace
+from crm_agent.agents.specialized.company_llm_enrichment_agent import CompanyLLMEnrichmentAgent
+from crm_agent.utils.llm_cache import LLMResponseCache, cache_key
+from crm_agent.utils.rate_budget import RateBudget
+
+
+class FakeModels:
+    """Async models API returning canned research text per prompt."""
+
+    def __init__(self, fail_once=()):
+        self.prompts = []
+        self.fail_once = set(fail_once)
+
+    async def generate_content(self, model, contents, config):
+        self.prompts.append(contents)
+        names = re.findall(r"(\w+ Golf Club) \(domain", contents)
+        for name in names:
+            if name in self.fail_once:
+                self.fail_once.discard(name)
+                raise RuntimeError("503 overloaded")
+        if len(names) == 1:
+            return SimpleNamespace(text=f"{names[0]} phone (713) 555-0100. Swimming pool: Yes")
+        # Packed response: the model skips the last company
+        sections = [f"=== COMPANY {n} ===\n{name} phone (713) 555-010{n}." for n, name in enumerate(names[:-1], 1)]
+        return SimpleNamespace(text="\n".join(sections))
+
+
+def make_agent(models, cache=None):
+    agent = CompanyLLMEnrichmentAgent()
+    client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    object.__setattr__(agent, 'gemini_client', client)
+    object.__setattr__(agent, 'use_new_api', True)
+    object.__setattr__(agent, 'llm_cache', cache or LLMResponseCache(mode="off"))
+    return agent
+
+
+COMPANIES = [{"name": f"{c} Golf Club", "domain": f"{c.lower()}.com"} for c in ("Alpha", "Bravo", "Charlie")]
+
+
+class TestBatchResearch:
+    """Test enrich_companies_batch."""
+
+    def test_packed_request_demultiplexed_and_missing_retried(self):
+        models = FakeModels()
+        agent = make_agent(models)
+
+        results = asyncio.run(agent.enrich_companies_batch(COMPANIES, companies_per_request=3))
+
+        assert [r["name"] for r in results] == [c["name"] for c in COMPANIES]
+        assert results[0]["phone"] == "(713) 555-0101"
+        assert results[1]["phone"] == "(713) 555-0102"
+        # Charlie was missing from the packed response and researched alone
+        assert results[2]["phone"] == "(713) 555-0100"
+        assert len(models.prompts) == 2
+
+    def test_only_failed_companies_are_retried(self, monkeypatch):
+        monkeypatch.setattr(asyncio, "sleep", _no_sleep)
+        models = FakeModels(fail_once={"Bravo Golf Club"})
+        agent = make_agent(models)
+
+        results = asyncio.run(agent.enrich_companies_batch(COMPANIES))
+
+        assert all(r.get("phone") for r in results)
+        assert results[1]["has_pool"] == "Yes"
+        assert sum("Bravo" in p for p in models.prompts) == 2
+        assert sum("Alpha" in p for p in models.prompts) == 1
+
+    def test_split_batch_response(self):
+        sections = CompanyLLMEnrichmentAgent._split_batch_response(
+            "intro\n=== COMPANY 2 ===\nsecond\n## === COMPANY 1 ===\nfirst"
+        )
+
+        assert sections == {1: "second", 0: "first"}
+
+    def test_packed_sections_cached_under_batch_prompt(self, tmp_path):
+        cache = LLMResponseCache(path=str(tmp_path / "llm.db"))
+        agent = make_agent(FakeModels(), cache)
+        asyncio.run(agent.enrich_companies_batch(COMPANIES, companies_per_request=3))
+
+        def cached(company, version):
+            inputs = {"name": company["name"], "domain": company["domain"]}
+            return cache.get(cache_key(agent.RESEARCH_MODEL, version, inputs))
+
+        batch, single = agent.BATCH_RESEARCH_PROMPT_VERSION, agent.RESEARCH_PROMPT_VERSION
+        assert cached(COMPANIES[0], batch) and not cached(COMPANIES[0], single)
+        assert cached(COMPANIES[2], single) and not cached(COMPANIES[2], batch)
+
+        # Both kinds of entry are reused on a re-run
+        models = FakeModels()
+        results = asyncio.run(make_agent(models, cache).enrich_companies_batch(COMPANIES, companies_per_request=3))
+        assert models.prompts == []
+        assert results[0]["phone"] == "(713) 555-0101"
+
+    def test_sync_wrapper(self):
+        agent = make_agent(FakeModels())
+        assert agent.enrich_companies(COMPANIES[:1])[0]["phone"] == "(713) 555-0100"
+
+        async def inside_loop():
+            agent.enrich_companies(COMPANIES[:1])
+
+        with pytest.raises(RuntimeError, match="enrich_companies_batch"):
+            asyncio.run(inside_loop())
+
+
+class TestRateBudget:
+    """Test RateBudget limits."""
+
+    @pytest.mark.parametrize("rpm", [0, None])
+    def test_no_request_limit(self, rpm):
+        budget = RateBudget(requests_per_minute=rpm)
+
+        async def run():
+            for _ in range(100):
+                await asyncio.wait_for(budget.acquire(1000), timeout=1)
+
+        asyncio.run(run())
+
+    def test_token_limit_without_request_limit(self, monkeypatch):
+        waits = []
+
+        async def record_sleep(delay):
+            waits.append(delay)
+            budget._tokens = budget.tokens_per_minute
+
+        budget = RateBudget(requests_per_minute=0, tokens_per_minute=600)
+        monkeypatch.setattr(asyncio, "sleep", record_sleep)
+        asyncio.run(budget.acquire(500))
+        asyncio.run(budget.acquire(500))
+
+        assert len(waits) == 1 and waits[0] > 0
+
+    def test_negative_limit_rejected(self):
+        with pytest.raises(ValueError):
+            RateBudget(requests_per_minute=-1)
+
+
+_real_sleep = asyncio.sleep
+
+
+async def _no_sleep(delay, *args, **kwargs):
+    await _real_sleep(0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the LLM response cache.
+Tests input normalization, TTL, invalidation, offline mode and cached research reuse.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from crm_agent.utils.llm_cache import LLMCacheMiss, LLMResponseCache, cache_key
+from crm_agent.agents.specialized.company_llm_enrichment_agent import CompanyLLMEnrichmentAgent
+
+
+class CountingModels:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(text="Call (713) 555-0100. Swimming pool: Yes")
+
+
+class TestLLMResponseCache:
+    """Test LLMResponseCache storage rules."""
+
+    def test_key_normalizes_inputs(self):
+        a = cache_key("gemini-2.5-flash", "1", {"name": " Mansion  Ridge ", "domain": "https://www.MansionRidgeGC.com/"})
+        b = cache_key("gemini-2.5-flash", "1", {"name": "mansion ridge", "domain": "mansionridgegc.com"})
+
+        assert a == b
+        assert a != cache_key("gemini-2.5-flash", "2", {"name": "mansion ridge", "domain": "mansionridgegc.com"})
+
+    def test_ttl_and_invalidation(self, tmp_path):
+        cache = LLMResponseCache(path=str(tmp_path / "llm.db"), ttl=60)
+        cache.put("k1", "raw one", {"phone": "1"}, model="m", template_version="1", parser_version="1")
+        cache.put("k2", "raw two", None, model="m", template_version="2")
+
+        assert cache.get("k1")["parsed"] == {"phone": "1"}
+        assert cache.invalidate(template_version="2") == 1
+        assert cache.get("k2") is None
+
+        cache.ttl = -1
+        assert cache.get("k1") is None
+        assert cache.stats() == {"mode": "readwrite", "hits": 1, "misses": 2}
+
+    def test_offline_mode_raises_on_miss(self, tmp_path):
+        path = str(tmp_path / "llm.db")
+        LLMResponseCache(path=path).put("k1", "raw")
+        offline = LLMResponseCache(path=path, mode="offline")
+
+        assert offline.get("k1")["raw"] == "raw"
+        with pytest.raises(LLMCacheMiss):
+            offline.get("missing")
+
+
+class TestCachedResearch:
+    """Test that unchanged inputs cost zero model calls."""
+
+    def test_rerun_is_served_from_cache(self, tmp_path):
+        models = CountingModels()
+        agent = CompanyLLMEnrichmentAgent()
+        object.__setattr__(agent, 'gemini_client', SimpleNamespace(aio=SimpleNamespace(models=models)))
+        object.__setattr__(agent, 'use_new_api', True)
+        object.__setattr__(agent, 'llm_cache', LLMResponseCache(path=str(tmp_path / "llm.db")))
+        companies = [{"name": "Alpha Golf Club", "domain": "alpha.com"}]
+
+        first = asyncio.run(agent.enrich_companies_batch(companies))
+        second = asyncio.run(agent.enrich_companies_batch([{"name": "alpha golf club ", "domain": "www.alpha.com"}]))
+
+        assert models.calls == 1
+        assert second[0]["phone"] == first[0]["phone"] == "(713) 555-0100"
+
+        # Offline replay without any Gemini client
+        object.__setattr__(agent, 'gemini_client', None)
+        object.__setattr__(agent, 'llm_cache', LLMResponseCache(path=str(tmp_path / "llm.db"), mode="offline"))
+        assert agent.enrich_company_data(companies[0])["has_pool"] == "Yes"
+        assert agent.enrich_company_data({"name": "Bravo Golf Club"}) == {"name": "Bravo Golf Club"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
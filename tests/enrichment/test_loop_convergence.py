@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Unit tests for convergence-aware termination of the field enrichment loop.
+Tests target-based stopping, no-progress stopping and narrowing of later passes,
+and the condition agent ending a real LoopAgent.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from typing import AsyncGenerator
+from google.adk.agents import BaseAgent, InvocationContext, LoopAgent
+from google.adk.events import Event
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from crm_agent.agents.workflows.field_enrichment_workflow import (
+    DataSourceAgent,
+    EnrichmentLoopConditionAgent,
+    _create_field_enrichment_loop_workflow,
+)
+
+
+def make_context(**state):
+    session_state = {
+        'record_type': 'company',
+        'record_id': '123',
+        'target_success_rates': {'critical': 0.95, 'high': 0.85, 'medium': 0.70},
+        'field_priorities': {'name': 'critical', 'industry': 'high', 'description': 'medium'},
+        'max_iterations': 3,
+        'current_iteration': 0,
+    }
+    session_state.update(state)
+    return SimpleNamespace(session_state=session_state)
+
+
+class TestEnrichmentLoopConvergence:
+    """Test EnrichmentLoopConditionAgent convergence logic."""
+
+    def setup_method(self):
+        self.agent = EnrichmentLoopConditionAgent()
+
+    def test_stops_when_all_tier_targets_met(self):
+        context = make_context(VALIDATION_RESULTS={
+            'name': {'valid': True}, 'industry': {'valid': True}, 'description': {'valid': True},
+        })
+
+        assert self.agent.should_continue_loop(context) is False
+        assert "target success rates met" in context.session_state['loop_decision_rationale']
+
+    def test_continues_with_only_failing_fields_and_productive_sources(self):
+        context = make_context(
+            VALIDATION_RESULTS={'name': {'valid': True}, 'industry': {'valid': False}},
+            ENRICHMENT_RESULTS_BY_SOURCE={
+                'WEB': {'name': {'new_value': 'Mansion Ridge'}},
+                'LINKEDIN': {'industry': {'new_value': '?'}},
+            },
+        )
+
+        assert self.agent.should_continue_loop(context) is True
+        assert context.session_state['pending_fields'] == ['description', 'industry']
+        assert context.session_state['exhausted_sources'] == ['LINKEDIN']
+
+    def test_stops_when_iteration_adds_no_validated_fields(self):
+        context = make_context(
+            current_iteration=1,
+            validated_fields=['name'],
+            VALIDATION_RESULTS={'name': {'valid': True}, 'industry': {'valid': False}},
+        )
+
+        assert self.agent.should_continue_loop(context) is False
+        assert "no new validated fields" in context.session_state['loop_decision_rationale']
+
+    def test_exhausted_source_is_skipped(self):
+        source_agent = DataSourceAgent("LinkedIn", ["linkedin_company_lookup"])
+        context = make_context(pending_fields=['industry'], exhausted_sources=['LINKEDIN'])
+
+        result = source_agent.execute_enrichment(context)
+
+        assert result['status'] == 'skipped'
+        assert 'LINKEDIN_ENRICHMENT_REQUEST' not in context.session_state
+
+
+
+class ScriptedPass(BaseAgent):
+    """Enrichment pass double: validates the next scripted fields each time it runs."""
+
+    passes: list
+    seen_pending: list
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        self.seen_pending.append(state.get('pending_fields'))
+        validated = self.passes[min(len(self.seen_pending), len(self.passes)) - 1]
+        state['VALIDATION_RESULTS'] = {name: {'valid': True} for name in validated}
+        yield Event(invocation_id=ctx.invocation_id, author=self.name, branch=ctx.branch)
+
+
+def run_loop(passes, max_iterations=5):
+    step = ScriptedPass(name="ScriptedPass", passes=passes, seen_pending=[])
+    loop = LoopAgent(name="Loop", sub_agents=[step, EnrichmentLoopConditionAgent()], max_iterations=max_iterations)
+    runner = InMemoryRunner(agent=loop, app_name="test")
+
+    async def run():
+        session = await runner.session_service.create_session(
+            app_name="test", user_id="u", state=make_context(max_iterations=5).session_state
+        )
+        message = types.Content(role="user", parts=[types.Part(text="enrich")])
+        events = [e async for e in runner.run_async(user_id="u", session_id=session.id, new_message=message)]
+        session = await runner.session_service.get_session(app_name="test", user_id="u", session_id=session.id)
+        return events, session.state
+
+    events, state = asyncio.run(run())
+    return step.seen_pending, events, state
+
+
+class TestEnrichmentLoopAgent:
+    """Test EnrichmentLoopConditionAgent inside a LoopAgent."""
+
+    def test_loop_stops_when_targets_converge(self):
+        seen_pending, events, state = run_loop([['name'], ['name', 'industry'], ['name', 'industry', 'description']])
+
+        assert seen_pending == [None, ['description', 'industry'], ['description']]
+        assert events[-1].actions.escalate
+        assert state['current_iteration'] == 3
+        assert "target success rates met" in state['loop_decision_rationale']
+
+    def test_loop_stops_without_progress(self):
+        seen_pending, events, state = run_loop([['name']])
+
+        assert len(seen_pending) == 2
+        assert "no new validated fields" in state['loop_decision_rationale']
+        assert sum(1 for e in events if e.actions.escalate) == 1
+
+    def test_workflow_runs_condition_after_each_pass(self):
+        loop = _create_field_enrichment_loop_workflow()
+
+        assert [agent.name for agent in loop.sub_agents] == [
+            "FieldEnrichmentSequentialWorkflow", "EnrichmentLoopConditionAgent"
+        ]
+        assert isinstance(loop.sub_agents[1], EnrichmentLoopConditionAgent)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
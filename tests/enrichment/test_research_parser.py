@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for ResearchResponseParser.
+Tests field extraction with spans and confidence, the priority rules
+carried over from the per-field parser, and where it deliberately differs:
+sentence splitting, city detection and revenue units.
+"""
+
+import pytest
+from crm_agent.agents.specialized.company_llm_enrichment_agent import (
+    CompanyLLMEnrichmentAgent,
+    ResearchResponseParser,
+)
+
+RESPONSE = """Houston National Golf Club is a premier championship golf course located in Houston, Texas.
+Website: https://www.houstonnationalgolfclub.com. Phone: (281) 304-1400.
+Type: Semi-Private Course. Management company: Invited.
+Swimming pool: No.
+Tennis courts: Yes. The club has tennis courts available for members.
+Annual revenue is estimated at $5.5 million.
+Competitors include Houston Oaks Country Club and Wildcat Golf Club."""
+
+
+class TestResearchResponseParser:
+    """Test ResearchResponseParser.parse."""
+
+    def test_fields_carry_spans_and_confidence(self):
+        fields = ResearchResponseParser.parse(RESPONSE)
+
+        phone = fields["phone"]
+        assert phone.value == "(281) 304-1400"
+        assert RESPONSE[phone.span[0]:phone.span[1]] == "(281) 304-1400"
+        assert phone.confidence == ResearchResponseParser.CONFIDENCE["phone"]
+        assert fields["website"].value == "https://www.houstonnationalgolfclub.com"
+        assert fields["annualrevenue"].value == 5500000
+        assert fields["state"].value == "TX"
+        assert fields["competitor"].value == "Competitors include Houston Oaks Country Club and Wildcat Golf Club"
+
+    def test_explicit_answers_beat_mentions(self):
+        fields = ResearchResponseParser.parse(RESPONSE)
+
+        assert fields["has_pool"].value == "No"
+        assert fields["has_pool"].confidence == ResearchResponseParser.CONFIDENCE["amenity_explicit"]
+        assert fields["has_tennis_courts"].value == "Yes"
+
+        mention = ResearchResponseParser.parse("The resort features a pool.\nRevenue: $900,000")
+        assert mention["has_pool"].confidence == ResearchResponseParser.CONFIDENCE["amenity_mention"]
+        assert mention["annualrevenue"].value == 900000
+
+    def test_phrase_priority(self):
+        # "semi-private course" also implies "private", which outranks the company type order
+        fields = ResearchResponseParser.parse("Type: Semi-Private Course.")
+        assert fields["company_type"].value == "Private Course"
+        assert fields["club_type"].value == "Private"
+        # Club types are resolved in their listed order, not by position in the text
+        assert ResearchResponseParser.parse(RESPONSE)["club_type"].value == "Country Club"
+
+        fallback = ResearchResponseParser.parse("A public facility with a high green fee.")
+        assert fallback["club_type"].value == "Public - High Daily Fee"
+        assert fallback["club_type"].confidence == ResearchResponseParser.CONFIDENCE["club_type_fallback"]
+
+    @pytest.mark.parametrize("inline", [
+        "https://www.houstonnationalgolfclub.com/about.html",
+        "281.304.1400",
+        "$5.5 million",
+    ])
+    def test_sentences_do_not_split_inside_tokens(self, inline):
+        # The old parser split on every ".", cutting sentences at URLs, dotted phones and decimals
+        sentence = f"The golf club has a championship course overview at {inline} for members and guests"
+        fields = ResearchResponseParser.parse(f"Short intro. {sentence}. Thanks.")
+
+        assert fields["description"].value == sentence
+        assert fields["club_info"].value == sentence
+
+    def test_city_is_not_read_from_a_url(self):
+        # The old parser set city/market from "houston" anywhere, URLs included
+        fields = ResearchResponseParser.parse("Website: https://www.houstonnationalgolfclub.com")
+
+        assert fields["website"].value == "https://www.houstonnationalgolfclub.com"
+        assert "city" not in fields and "market" not in fields
+        assert ResearchResponseParser.parse("Located in Houston.")["city"].value == "Houston"
+
+    @pytest.mark.parametrize("text, amount", [
+        ("Revenue: $12M", 12000000),          # Was 12: the unit only counted as " m " elsewhere
+        ("Revenue: $12 m per year", 12000000),
+        ("Revenue: $1.2 million", 1200000),
+        ("Revenue: $900,000", 900000),
+    ])
+    def test_revenue_units(self, text, amount):
+        assert ResearchResponseParser.parse(text)["annualrevenue"].value == amount
+
+    def test_agent_parse_keeps_original_data(self):
+        agent = CompanyLLMEnrichmentAgent.__new__(CompanyLLMEnrichmentAgent)
+        enriched = agent._parse_gemini_response("Swimming pool: Yes", {"company_name": "Test Club"})
+
+        assert enriched == {"company_name": "Test Club", "has_pool": "Yes", "lifecyclestage": "lead"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
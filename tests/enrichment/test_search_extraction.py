@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Unit tests for structured search results and the shared field extractors.
+Tests result normalization and per-field extraction over hit text.
+"""
+
+import pytest
+from crm_agent.utils.search_extraction import (
+    FIELD_EXTRACTORS,
+    SearchResults,
+    extract_description,
+    extract_employee_count,
+    extract_fields,
+    extract_linkedin_url,
+    extract_phone,
+    extract_revenue,
+    extract_website,
+    normalize_search_results,
+)
+
+RAW = {
+    "query": "Pebble Creek Golf Club",
+    "results": [
+        {"title": "Pebble Creek Golf Club", "url": "https://www.pebblecreekgolf.com/",
+         "snippet": "Pebble Creek Golf Club offers 18 holes of championship golf. Call (803) 555-0142."},
+        {"title": "Pebble Creek | LinkedIn", "link": "https://www.linkedin.com/company/pebble-creek-golf",
+         "description": "Golf club with 45 employees."},
+    ],
+}
+
+
+class TestNormalizeSearchResults:
+    """Test normalize_search_results."""
+
+    def test_hits_are_structured(self):
+        results = normalize_search_results(RAW)
+
+        assert [hit.domain for hit in results.hits] == ["www.pebblecreekgolf.com", "www.linkedin.com"]
+        assert results.hits[1].snippet == "Golf club with 45 employees."
+        assert results.text_lower == results.text.lower()
+        assert normalize_search_results(results) is results
+
+    def test_other_shapes(self):
+        assert normalize_search_results({"error": "timeout"}).hits == ()
+        assert normalize_search_results(None).hits == ()
+        assert normalize_search_results([{"url": "https://a.com"}]).urls == ["https://a.com"]
+        assert normalize_search_results({"raw_text": "Phone 803-555-0142"}).text == "Phone 803-555-0142"
+        assert normalize_search_results("plain text").hits[0].snippet == "plain text"
+
+
+class TestExtractors:
+    """Test the field extractors."""
+
+    def test_extractors_read_hit_text(self):
+        results = normalize_search_results(RAW)
+
+        # URLs end at the hit, not at the quote of a stringified dict
+        assert extract_website(results, "Pebble Creek Golf Club") == "https://www.pebblecreekgolf.com/"
+        assert extract_linkedin_url(results, "x") == "https://www.linkedin.com/company/pebble-creek-golf"
+        assert extract_phone(results, "x") == "(803) 555-0142"
+        assert extract_employee_count(results, "x") == "45"
+        assert extract_description(results, "Pebble Creek Golf Club") == (
+            "Pebble Creek Golf Club offers 18 holes of championship golf."
+        )
+
+    def test_revenue_units_and_ranges(self):
+        def results(text):
+            return normalize_search_results(text)
+
+        assert extract_revenue(results("Annual revenue: $3.2 million"), "x") == "$3,200,000"
+        assert extract_revenue(results("$750k sales last year"), "x") == "$750,000"
+        assert extract_revenue(results("Revenue: $500"), "x") is None
+        assert extract_employee_count(results("A team of 20-50 staff"), "x") == "20-50"
+
+    def test_extract_fields_normalizes_once(self):
+        fields = extract_fields(RAW, "Pebble Creek Golf Club", ["phone", "website"])
+        assert fields == {"phone": "(803) 555-0142", "website": "https://www.pebblecreekgolf.com/"}
+        assert set(extract_fields(SearchResults((), "", ""), "x")) == set(FIELD_EXTRACTORS)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the per-record web search session.
+Tests query normalization, single-flight coalescing, pooling hits for queries
+that found nothing, the opt-in per-record search budget and that each field
+in FieldEnrichmentManagerAgent is filled from its own search.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from crm_agent.agents.specialized.field_enrichment_manager_agent import FieldEnrichmentManagerAgent
+from crm_agent.utils.search_session import SearchSession, normalize_query
+
+
+class RecordingSearch:
+    """Search function returning one hit per query, recording every call."""
+
+    def __init__(self, delay=0.0):
+        self.calls = []
+        self.delay = delay
+        self._lock = threading.Lock()
+
+    def __call__(self, query, num_results):
+        with self._lock:
+            self.calls.append((query, num_results))
+        time.sleep(self.delay)
+        slug = normalize_query(query).replace(" ", "-").replace('"', "")
+        return {"results": [{"url": f"https://example.com/{slug}", "snippet": query}]}
+
+
+class TestSearchSession:
+    """Test SearchSession."""
+
+    def test_rephrased_queries_share_one_search(self):
+        search = RecordingSearch()
+        session = SearchSession(search, superset_size=10)
+
+        first = session.search('"Acme Golf" official website', 5)
+        second = session.search("acme golf  WEBSITE official", 3)
+
+        assert len(search.calls) == 1
+        assert search.calls[0][1] == 10
+        assert first["results"] == second["results"]
+
+    def test_concurrent_duplicates_are_single_flight(self):
+        search = RecordingSearch(delay=0.05)
+        session = SearchSession(search)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: session.search("Acme Golf phone", 5), range(8)))
+
+        assert len(search.calls) == 1
+        assert all(r == results[0] for r in results)
+
+    def test_only_empty_answers_are_pooled(self):
+        def search(query, num_results):
+            if "employees" in query or "phone" in query:
+                return {"results": []}
+            return RecordingSearch()(query, num_results)
+
+        session = SearchSession(search)
+        revenue = session.search("Acme Golf revenue", 5, "annualrevenue")
+        session.search("Acme Golf website", 5, "website")
+
+        assert [r["snippet"] for r in revenue["results"]] == ["Acme Golf revenue"]
+        employees = session.search("Acme Golf employees", 5, "numberofemployees")
+        assert {r["snippet"] for r in employees["results"]} == {"Acme Golf website", "Acme Golf revenue"}
+        assert session.search("Acme Golf phone", 5, "phone")["results"] == []
+
+    def test_budget_is_opt_in_and_spares_first_field_searches(self):
+        search = RecordingSearch()
+        unlimited = SearchSession(search)
+        for i in range(10):
+            unlimited.search(f"Acme Golf revenue {i}", 5, "annualrevenue")
+        assert unlimited.stats()["searches"] == 10
+
+        search = RecordingSearch()
+        session = SearchSession(search, max_searches=2)
+        session.search("Acme Golf revenue", 5, "annualrevenue")
+        session.search("Acme Golf revenue earnings", 5, "annualrevenue")
+        over_budget = session.search("Acme Golf revenue sales", 5, "annualrevenue")
+        website = session.search("Acme Golf website", 5, "website")
+        website_retry = session.search("Acme Golf homepage", 5, "website")
+
+        assert {r["snippet"] for r in over_budget["results"]} == {"Acme Golf revenue", "Acme Golf revenue earnings"}
+        assert [r["snippet"] for r in website["results"]] == ["Acme Golf website"]
+        assert website_retry["results"] == []
+        assert session.stats() == {"requests": 5, "searches": 3, "distinct_queries": 3}
+
+
+class TestManagerSearchSession:
+    """Test that field extractors share a search session per record."""
+
+    def test_record_enrichment_shares_one_session(self):
+        agent = FieldEnrichmentManagerAgent()
+        search = RecordingSearch()
+        object.__setattr__(agent, 'call_mcp_tool', lambda tool, args: search(args["query"], args["num_results"]))
+        object.__setattr__(agent, '_validate_url_accessibility', lambda url: True)
+        record = {"id": "1", "properties": {"name": "Acme Golf Club"}}
+
+        agent._enrich_with_company_data(record)
+
+        assert 0 < len(search.calls) == len({normalize_query(query) for query, _ in search.calls})
+        # The session is dropped once the record is done; direct calls bypass it
+        assert agent.search_sessions == {}
+        agent._web_search(record, "Acme Golf Club website", 5)
+        assert search.calls[-1] == ("Acme Golf Club website", 5)
+
+    def test_each_field_comes_from_its_own_query(self):
+        hits = {
+            "official website": {"url": "https://www.acmegolfclub.com", "title": "Acme Golf Club",
+                                 "snippet": "Welcome to Acme Golf Club"},
+            "site:linkedin.com/company": {"url": "https://www.linkedin.com/company/acme-golf-club",
+                                          "title": "Acme Golf Club | LinkedIn", "snippet": "Acme Golf Club"},
+            "phone": {"url": "https://x.com/1", "title": "Acme Golf Club contact",
+                      "snippet": "Acme Golf Club, call (555) 123-4567"},
+        }
+
+        def search(tool, args):
+            query = args["query"]
+            for marker, hit in hits.items():
+                if marker in query and not (marker == "phone" and "linkedin" in query):
+                    return {"results": [hit]}
+            # Every other query finds a different phone number and a LinkedIn page
+            return {"results": [{"url": "https://www.linkedin.com/company/someone-else",
+                                 "title": "Acme Golf Club", "snippet": "Acme Golf Club (555) 999-0000"}]}
+
+        agent = FieldEnrichmentManagerAgent()
+        object.__setattr__(agent, 'call_mcp_tool', search)
+        object.__setattr__(agent, '_validate_url_accessibility', lambda url: url == "https://www.acmegolfclub.com")
+        results = {r.field_internal_name: r.new_value
+                   for r in agent._enrich_with_company_data({"id": "1", "properties": {"name": "Acme Golf Club"}})}
+
+        assert results["website"] == "https://www.acmegolfclub.com"
+        assert results["linkedin_company_page"] == "https://www.linkedin.com/company/acme-golf-club"
+        assert results["phone"] == "(555) 123-4567"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
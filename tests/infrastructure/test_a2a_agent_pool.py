@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the warm A2A agent pool.
+Tests one-at-a-time warm-up, checkout and release, recycling unhealthy
+agents, waiting for a free agent and CRMA2AAgent.health_check.
+"""
+
+import asyncio
+import pytest
+from types import SimpleNamespace
+from crm_agent.a2a.agent import CRMA2AAgent
+from crm_agent.a2a.agent_pool import CRMA2AAgentPool
+from crm_agent.core.mcp_toolsets import mcp_toolset_manager
+
+
+class FakeAgent:
+    """Agent double counting warm-ups and concurrent builds."""
+
+    building = 0
+    max_building = 0
+
+    def __init__(self, healthy=True, fail_warm_up=False):
+        FakeAgent.building += 1
+        FakeAgent.max_building = max(FakeAgent.max_building, FakeAgent.building)
+        self.healthy = healthy
+        self.fail_warm_up = fail_warm_up
+        self.warmed = False
+        self.closed = False
+
+    async def warm_up(self):
+        await asyncio.sleep(0.01)
+        FakeAgent.building -= 1
+        if self.fail_warm_up:
+            raise RuntimeError("MCP server did not start")
+        self.warmed = True
+
+    async def health_check(self):
+        return self.healthy
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def reset_counters():
+    FakeAgent.building = FakeAgent.max_building = 0
+
+
+class TestAgentPool:
+    """Test CRMA2AAgentPool."""
+
+    def test_warm_up_builds_one_at_a_time(self):
+        pool = CRMA2AAgentPool(size=3, agent_factory=FakeAgent)
+
+        async def run():
+            await pool.warm_up()
+            await pool.warm_up()  # Already full: no more builds
+            return pool.stats()
+
+        stats = asyncio.run(run())
+        assert stats == {"size": 3, "created": 3, "idle": 3, "in_use": 0, "recycled": 0}
+        assert FakeAgent.max_building == 1
+
+    def test_failed_build_and_cold_agent(self):
+        attempts = []
+
+        def factory():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise RuntimeError("coordinator build failed")
+            return FakeAgent(fail_warm_up=True)
+
+        pool = CRMA2AAgentPool(size=2, agent_factory=factory)
+        asyncio.run(pool.warm_up())
+
+        assert pool.stats()["created"] == 1
+        assert pool.stats()["idle"] == 1
+
+    def test_checkout_reuses_healthy_agents(self):
+        pool = CRMA2AAgentPool(size=2, agent_factory=FakeAgent)
+
+        async def run():
+            async with pool.checkout() as first:
+                assert pool.stats()["in_use"] == 1
+            async with pool.checkout() as second:
+                pass
+            return first, second
+
+        first, second = asyncio.run(run())
+        assert first is second and first.warmed
+        assert pool.stats() == {"size": 2, "created": 1, "idle": 1, "in_use": 0, "recycled": 0}
+
+    def test_unhealthy_agent_is_recycled(self):
+        pool = CRMA2AAgentPool(size=1, agent_factory=FakeAgent)
+
+        async def run():
+            async with pool.checkout() as agent:
+                agent.healthy = False
+            async with pool.checkout() as replacement:
+                return agent, replacement
+
+        agent, replacement = asyncio.run(run())
+        assert agent.closed
+        assert replacement is not agent
+        assert pool.stats()["recycled"] == 1
+        assert pool.stats()["created"] == 1
+
+    def test_checkout_waits_for_free_agent(self):
+        pool = CRMA2AAgentPool(size=1, agent_factory=FakeAgent, checkout_timeout=0.05)
+
+        async def run():
+            async with pool.checkout():
+                with pytest.raises(asyncio.TimeoutError):
+                    async with pool.checkout():
+                        pass
+
+                async def second():
+                    async with pool.checkout() as agent:
+                        return agent
+
+                waiter = asyncio.create_task(second())
+                await asyncio.sleep(0.01)
+            return await waiter
+
+        assert isinstance(asyncio.run(run()), FakeAgent)
+
+    def test_close_refuses_checkouts(self):
+        pool = CRMA2AAgentPool(size=2, agent_factory=FakeAgent)
+
+        async def run():
+            await pool.warm_up()
+            await pool.close()
+            async with pool.checkout():
+                pass
+
+        with pytest.raises(RuntimeError, match="closed"):
+            asyncio.run(run())
+        assert pool.stats()["created"] == 0
+
+
+class FakeToolset:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def get_tools(self):
+        if self.fail:
+            raise ConnectionError("MCP session lost")
+        return [SimpleNamespace(name="search_companies")]
+
+
+class TestAgentHealthCheck:
+    """Test CRMA2AAgent.health_check over a stub agent tree."""
+
+    def make_agent(self, toolset, max_tasks=10, served=0):
+        agent = CRMA2AAgent.__new__(CRMA2AAgent)
+        child = SimpleNamespace(tools=[toolset], sub_agents=[])
+        agent._agent = SimpleNamespace(tools=[], sub_agents=[child])
+        agent._max_tasks = max_tasks
+        agent._tasks_served = served
+        return agent
+
+    def test_healthy(self):
+        agent = self.make_agent(FakeToolset())
+        assert asyncio.run(agent.health_check())
+        assert asyncio.run(agent.warm_up()) == ["search_companies"]
+
+    def test_task_limit_reached(self):
+        assert not asyncio.run(self.make_agent(FakeToolset(), max_tasks=5, served=5).health_check())
+
+    def test_broken_owned_toolset(self):
+        toolset = FakeToolset(fail=True)
+        assert not mcp_toolset_manager.owns(toolset)
+        assert not asyncio.run(self.make_agent(toolset).health_check(timeout=1))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the A2A HTTP server.
+Tests the task update buffer, SSE streaming of progress and final state,
+the truncation flag on the final content, task.list paging limits and
+JSON-RPC single calls, notifications and batches.
+"""
+
+import asyncio
+import json
+import pytest
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from crm_agent.a2a.agent import CRMA2AAgent
+from crm_agent.a2a.http_server import CRMA2AHttpServer, TaskUpdateBuffer
+from crm_agent.a2a.task_store import InMemoryTaskStore, TaskInfo, TaskState
+
+
+def events(chunks):
+    """Decode SSE `data:` chunks."""
+    return [json.loads(chunk[len("data: "):]) for chunk in chunks]
+
+
+class FakeAgent:
+    """Pooled agent double yielding scripted progress then a final result."""
+
+    def __init__(self, updates, content="done"):
+        self.updates = updates
+        self.content = content
+
+    async def invoke(self, query, session_id, include_heartbeats=True):
+        for update in self.updates:
+            await asyncio.sleep(0)
+            yield {"is_task_complete": False, "type": "text_delta", "delta": update}
+        yield {"is_task_complete": True, "content": self.content, "truncated": False}
+
+
+class FakePool:
+    def __init__(self, agent):
+        self.agent = agent
+
+    @asynccontextmanager
+    async def checkout(self):
+        yield self.agent
+
+
+@pytest.fixture
+def server():
+    return CRMA2AHttpServer(pool_size=1, task_store=InMemoryTaskStore())
+
+
+class TestTaskUpdateBuffer:
+    """Test TaskUpdateBuffer."""
+
+    def test_since_and_bound(self):
+        buffer = TaskUpdateBuffer(maxlen=3)
+        for n in range(5):
+            buffer.push({"n": n})
+
+        assert buffer.seq == 5
+        assert [s for s, _ in buffer.since(0)] == [3, 4, 5]
+        assert buffer.since(4) == [(5, {"n": 4})]
+        assert buffer.since(5) == []
+
+    def test_wait_wakes_on_push_or_times_out(self):
+        async def run():
+            buffer = TaskUpdateBuffer()
+            waiter = asyncio.create_task(buffer.wait(timeout=5))
+            await asyncio.sleep(0)
+            buffer.push({"n": 1})
+            await asyncio.wait_for(waiter, timeout=1)
+            await buffer.wait(timeout=0.01)  # Nothing new: returns after the timeout
+            return buffer.seq
+
+        assert asyncio.run(run()) == 1
+
+
+class TestTaskStreaming:
+    """Test _stream_task_updates and agent.invoke end to end."""
+
+    def test_invoke_streams_progress_then_result(self, server):
+        server.agent_pool = FakePool(FakeAgent(["Hel", "lo"]))
+
+        async def run():
+            reply = await server._handle_agent_invoke(1, {"query": "hi"})
+            task_id = reply["result"]["task_id"]
+            return [chunk async for chunk in server._stream_task_updates(task_id)]
+
+        streamed = events(asyncio.run(run()))
+
+        assert [e["update"]["delta"] for e in streamed if "update" in e] == ["Hel", "lo"]
+        assert streamed[-1]["state"] == "completed"
+        assert streamed[-1]["result"]["content"] == "done"
+        assert server._task_updates == {}
+
+    def test_updates_pushed_while_sending_precede_final_state(self, server):
+        server.agent_pool = FakePool(FakeAgent([]))
+
+        async def run():
+            reply = await server._handle_agent_invoke(1, {"query": "hi"})
+            task_id = reply["result"]["task_id"]
+            updates = server._task_updates[task_id]
+            task = server.task_store.get(task_id)
+            task.state = TaskState.RUNNING
+            updates.push({"delta": "first"})
+
+            stream = server._stream_task_updates(task_id)
+            chunks = [await stream.__anext__()]
+            # The subscriber is busy sending: the task pushes its last update and finishes
+            updates.push({"delta": "last"})
+            task.state = TaskState.COMPLETED
+            task.result = {"content": "done"}
+            server.task_store.save(task)
+            chunks.extend([chunk async for chunk in stream])
+            return chunks
+
+        streamed = events(asyncio.run(run()))
+
+        assert [e["update"]["delta"] for e in streamed if "update" in e] == ["first", "last"]
+        assert [e["state"] for e in streamed if "state" in e][-1] == "completed"
+        assert "update" in streamed[-2] and streamed[-1]["result"] == {"content": "done"}
+
+
+class TestResultTruncation:
+    """Test the truncated flag on CRMA2AAgent's final content."""
+
+    def make_agent(self, chunks, max_result_chars=10):
+        agent = CRMA2AAgent.__new__(CRMA2AAgent)
+        agent._max_result_chars = max_result_chars
+        agent._user_id = "a2a_user"
+        agent._tasks_served = 0
+        agent._session_service = None
+        agent._runner = SimpleNamespace(
+            run=lambda **kwargs: iter(SimpleNamespace(text=chunk, partial=False) for chunk in chunks)
+        )
+        return agent
+
+    def final(self, agent):
+        async def run():
+            return [update async for update in agent.invoke("q", "s")][-1]
+        return asyncio.run(run())
+
+    def test_long_answer_is_flagged(self):
+        final = self.final(self.make_agent(["abcdef", "ghijkl", "mnopqr"]))
+
+        assert final["content"] == "mnopqr"
+        assert final["truncated"]
+
+    def test_short_answer_is_not(self):
+        final = self.final(self.make_agent(["abc", "def"]))
+
+        assert final == {"is_task_complete": True, "content": "abcdef", "truncated": False}
+
+
+def rpc(client, payload):
+    return client.post("/rpc", content=json.dumps(payload))
+
+
+class TestTaskList:
+    """Test task.list paging and parameter validation."""
+
+    @pytest.fixture
+    def client(self, server):
+        for n in range(3):
+            created = datetime(2025, 1, 1) + timedelta(seconds=n)
+            server.task_store.save(TaskInfo(id=f"task-{n}", context_id="ctx", state=TaskState.COMPLETED,
+                                            created_at=created, updated_at=created, query="q"))
+        return TestClient(server.app)
+
+    def list_tasks(self, client, **params):
+        return rpc(client, {"jsonrpc": "2.0", "method": "task.list", "params": params, "id": 1}).json()
+
+    @pytest.mark.parametrize("limit", [0, -5])
+    def test_limit_is_clamped_to_one(self, client, limit):
+        result = self.list_tasks(client, limit=limit)["result"]
+
+        assert [task["id"] for task in result["tasks"]] == ["task-0"]
+        assert result["next_cursor"] not in (None, "None")
+
+    def test_pages_follow_the_cursor(self, client):
+        first = self.list_tasks(client, limit=2)["result"]
+        second = self.list_tasks(client, limit=2, cursor=first["next_cursor"])["result"]
+
+        assert [task["id"] for task in first["tasks"] + second["tasks"]] == ["task-0", "task-1", "task-2"]
+        assert second["next_cursor"] is None
+        assert len(self.list_tasks(client, limit=10**9)["result"]["tasks"]) == 3
+
+    @pytest.mark.parametrize("limit", ["ten", 2.5, None, True, [1]])
+    def test_non_integer_limit_is_invalid_params(self, client, limit):
+        assert self.list_tasks(client, limit=limit)["error"]["code"] == -32602
+
+    @pytest.mark.parametrize("cursor", ["abc", "-1", "1.5", "", 1, ["1"]])
+    def test_malformed_cursor_is_invalid_params(self, client, cursor):
+        assert self.list_tasks(client, cursor=cursor)["error"]["code"] == -32602
+
+    @pytest.mark.parametrize("state", ["done", "COMPLETED", 1, ["completed"]])
+    def test_unknown_state_is_invalid_params(self, client, state):
+        assert self.list_tasks(client, state=state)["error"]["code"] == -32602
+
+    def test_state_filter(self, client):
+        assert len(self.list_tasks(client, state="completed")["result"]["tasks"]) == 3
+        assert self.list_tasks(client, state="queued")["result"]["tasks"] == []
+
+
+class TestJsonRpc:
+    """Test JSON-RPC dispatch over /rpc."""
+
+    @pytest.fixture
+    def client(self, server):
+        return TestClient(server.app)
+
+    def call(self, method, request_id=None, **params):
+        message = {"jsonrpc": "2.0", "method": method, "params": params}
+        if request_id is not None:
+            message["id"] = request_id
+        return message
+
+    def test_single_call(self, client):
+        response = rpc(client, self.call("task.list", 1))
+
+        assert response.status_code == 200
+        assert response.json() == {"jsonrpc": "2.0", "id": 1, "result": {"tasks": [], "next_cursor": None}}
+
+    def test_single_notification_gets_no_body(self, client):
+        response = rpc(client, self.call("task.list"))
+
+        assert response.status_code == 204
+        assert response.content == b""
+
+    def test_invalid_request_without_id_is_answered(self, client):
+        response = rpc(client, {"method": "task.list"})
+
+        assert response.json() == {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}
+
+    def test_batch_answers_each_call_in_order(self, client):
+        response = rpc(client, [
+            self.call("task.list", 1),
+            self.call("task.list"),                       # Notification: no reply
+            self.call("task.status", "b", task_id="missing"),
+            self.call("no.such.method", 3),
+            42,
+            {"jsonrpc": "2.0", "id": 5},
+        ]).json()
+
+        assert [reply["id"] for reply in response] == [1, "b", 3, None, 5]
+        assert "result" in response[0]
+        assert [reply["error"]["code"] for reply in response[1:]] == [-32602, -32601, -32600, -32600]
+        assert response[1]["error"]["message"] == "Task not found"
+
+    def test_batch_of_notifications_gets_no_body(self, client):
+        response = rpc(client, [self.call("task.list"), self.call("task.status", task_id="missing")])
+
+        assert response.status_code == 204
+
+    def test_empty_and_oversized_batches_are_invalid(self, client):
+        invalid = {"jsonrpc": "2.0", "id": None, "error": {"code": -32600, "message": "Invalid Request"}}
+
+        assert rpc(client, []).json() == invalid
+        assert rpc(client, [self.call("task.list", n) for n in range(1001)]).json() == invalid
+
+    def test_parse_error(self, client):
+        response = client.post("/rpc", content=b"{not json")
+
+        assert response.json()["error"] == {"code": -32700, "message": "Parse error"}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
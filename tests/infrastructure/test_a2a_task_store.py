@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the A2A task stores.
+Tests indexing, cursor pagination, LRU bounds and TTL eviction.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from crm_agent.a2a.task_store import (
+    InMemoryTaskStore,
+    SQLiteTaskStore,
+    TaskInfo,
+    TaskState,
+)
+
+
+def make_task(n: int, context_id: str = "ctx-a", state: TaskState = TaskState.QUEUED) -> TaskInfo:
+    created = datetime(2025, 1, 1) + timedelta(seconds=n)
+    return TaskInfo(
+        id=f"task-{n:04d}",
+        context_id=context_id,
+        state=state,
+        created_at=created,
+        updated_at=created,
+        query=f"query {n}",
+    )
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "memory":
+        yield InMemoryTaskStore(max_tasks=1000)
+    else:
+        sqlite_store = SQLiteTaskStore(path=str(tmp_path / "tasks.db"), inline_result_limit=64)
+        yield sqlite_store
+        sqlite_store.close()
+
+
+class TestTaskStore:
+    """Behaviour shared by all task store backends."""
+
+    def test_save_and_get_round_trip(self, store):
+        task = make_task(1)
+        task.result = {"is_task_complete": True, "content": "done"}
+        store.save(task)
+
+        loaded = store.get(task.id)
+        assert loaded.id == task.id
+        assert loaded.result == task.result
+        assert loaded.state == TaskState.QUEUED
+        assert task.id in store
+        assert store.get("missing") is None
+
+    def test_cursor_pagination_visits_every_task_once(self, store):
+        for n in range(25):
+            store.save(make_task(n))
+
+        seen, cursor = [], None
+        while True:
+            page, cursor = store.list(cursor=cursor, limit=10)
+            seen.extend(t.id for t in page)
+            if cursor is None:
+                break
+
+        assert seen == [f"task-{n:04d}" for n in range(25)]
+
+    def test_filter_by_state_and_context(self, store):
+        for n in range(10):
+            store.save(make_task(n, context_id="ctx-a" if n % 2 else "ctx-b"))
+        task = store.get("task-0003")
+        task.state = TaskState.COMPLETED
+        store.save(task)
+
+        completed, _ = store.list(state="completed")
+        assert [t.id for t in completed] == ["task-0003"]
+
+        ctx_b, _ = store.list(context_id="ctx-b")
+        assert [t.id for t in ctx_b] == [f"task-{n:04d}" for n in range(0, 10, 2)]
+
+        queued_a, _ = store.list(state="queued", context_id="ctx-a")
+        assert [t.id for t in queued_a] == ["task-0001", "task-0005", "task-0007", "task-0009"]
+
+    def test_ttl_evicts_only_finished_tasks(self, store):
+        store.save(make_task(1, state=TaskState.COMPLETED))
+        store.save(make_task(2, state=TaskState.RUNNING))
+
+        removed = store.evict_expired(now=datetime(2025, 1, 1) + timedelta(days=30))
+
+        assert removed == 1
+        assert store.get("task-0001") is None
+        assert store.get("task-0002") is not None
+
+
+class TestInMemoryTaskStore:
+    """In-memory specific behaviour."""
+
+    def test_capacity_evicts_least_recently_used_finished_task(self):
+        store = InMemoryTaskStore(max_tasks=2)
+        store.save(make_task(1, state=TaskState.COMPLETED))
+        store.save(make_task(2, state=TaskState.COMPLETED))
+        store.get("task-0001")  # touch so task 2 becomes the LRU entry
+        store.save(make_task(3))
+
+        assert len(store) == 2
+        assert store.get("task-0002") is None
+        assert store.get("task-0001") is not None
+
+
+class TestSQLiteTaskStore:
+    """SQLite specific behaviour."""
+
+    def test_large_results_are_stored_out_of_line(self, tmp_path):
+        store = SQLiteTaskStore(path=str(tmp_path / "tasks.db"), inline_result_limit=64)
+        task = make_task(1, state=TaskState.COMPLETED)
+        task.result = {"content": "x" * 1000}
+        store.save(task)
+
+        listed, _ = store.list()
+        assert listed[0].result == {"result_ref": task.id}
+        assert store.get(task.id).result == task.result
+        store.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Unit tests for AgentRegistry instance policies.
+Tests singleton, pooled and per-session reuse, thread-safe creation,
+warm-up hooks, memory accounting and concurrent coordinator builds.
+"""
+
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from crm_agent.core.factory import AgentRegistry, InstancePolicy, crm_agent_registry
+
+
+def make_registry(policy, **options):
+    registry = AgentRegistry(max_sessions=2)
+    builds = []
+
+    def factory(**kwargs):
+        builds.append(kwargs)
+        return SimpleNamespace(parent_agent=None, config=kwargs, payload=[0] * 100)
+
+    registry.register("agent", factory, {"description": "test"}, policy=policy, **options)
+    return registry, builds
+
+
+class TestAgentRegistryPolicies:
+    """Test AgentRegistry caching policies."""
+
+    def test_transient_builds_every_time(self):
+        registry, builds = make_registry(InstancePolicy.TRANSIENT)
+
+        assert registry.create_agent("agent") is not registry.create_agent("agent")
+        assert len(builds) == 2
+
+    def test_singleton_per_configuration(self):
+        registry, builds = make_registry(InstancePolicy.SINGLETON)
+
+        first = registry.create_agent("agent", model="gemini-2.5-flash")
+        assert registry.create_agent("agent", model="gemini-2.5-flash") is first
+        assert registry.create_agent("agent", model="gemini-2.5-pro") is not first
+        assert len(builds) == 2
+
+    def test_mounted_singleton_is_replaced(self):
+        registry, builds = make_registry(InstancePolicy.SINGLETON)
+
+        mounted = registry.create_agent("agent")
+        mounted.parent_agent = object()
+
+        assert registry.create_agent("agent") is not mounted
+        assert len(builds) == 2
+
+    def test_pooled_round_robin(self):
+        registry, builds = make_registry(InstancePolicy.POOLED, pool_size=2)
+
+        agents = [registry.create_agent("agent") for _ in range(6)]
+
+        assert len({id(a) for a in agents}) == 2
+        assert len(builds) == 2
+
+    def test_per_session_instances_and_eviction(self):
+        registry, builds = make_registry(InstancePolicy.PER_SESSION)
+
+        a = registry.create_agent("agent", session_id="s1")
+        assert registry.create_agent("agent", session_id="s1") is a
+        assert "session_id" not in builds[0]
+        assert registry.create_agent("agent", session_id="s2") is not a
+
+        # max_sessions=2: a third session evicts the least recently used (s1)
+        registry.create_agent("agent", session_id="s3")
+        assert registry.create_agent("agent", session_id="s1") is not a
+
+        registry.end_session("s1")
+        assert registry.memory_usage()["agent"]["instances"] == 1
+
+    def test_concurrent_creation_builds_once(self):
+        registry, builds = make_registry(InstancePolicy.SINGLETON)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(registry.create_agent("agent"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(builds) == 1
+        assert len({id(a) for a in results}) == 1
+
+    def test_warm_up_hook_and_memory_usage(self):
+        warmed = []
+        registry, builds = make_registry(InstancePolicy.POOLED, pool_size=3, warm_up=warmed.append)
+
+        assert registry.warm_up() == ["agent"]
+        assert len(warmed) == 3
+
+        usage = registry.memory_usage()["agent"]
+        assert usage["policy"] == "pooled"
+        assert usage["instances"] == 3
+        assert usage["created"] == 3
+        assert usage["approx_bytes"] > 0
+
+    def test_unknown_agent_type(self):
+        registry, _ = make_registry(InstancePolicy.SINGLETON)
+
+        with pytest.raises(ValueError, match="Unknown agent type"):
+            registry.create_agent("missing")
+
+
+class TestCoordinatorBuilds:
+    """Test that the CRM coordinator can be built from several threads at once."""
+
+    def test_mounted_agent_types_are_transient(self):
+        for name in ("crm_enrichment", "company_intelligence", "contact_intelligence",
+                     "crm_enrichment_pipeline", "crm_parallel_retrieval", "crm_quick_lookup"):
+            assert crm_agent_registry._agent_policies[name]["policy"] is InstancePolicy.TRANSIENT
+
+    def test_management_agent_is_not_shared_across_tasks(self):
+        # The project orchestrator runs this agent on several threads, and its
+        # management company cache is per instance
+        assert crm_agent_registry._agent_policies["company_management_enrichment"]["policy"] is InstancePolicy.TRANSIENT
+        first = crm_agent_registry.create_agent("company_management_enrichment")
+        second = crm_agent_registry.create_agent("company_management_enrichment")
+        assert first is not second
+
+    def test_concurrent_coordinator_builds(self):
+        from crm_agent.coordinator import create_crm_coordinator
+        barrier = threading.Barrier(4)
+
+        def build(_):
+            barrier.wait()
+            return create_crm_coordinator()
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            coordinators = list(pool.map(build, range(4)))
+
+        sub_agents = [id(agent) for coordinator in coordinators for agent in coordinator.sub_agents]
+        assert len(set(sub_agents)) == len(sub_agents)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the pooled HubSpot connectors.
+Tests 100-ID batch contact reads and paged associations, sync and async,
+and paged company listing and batch company updates.
+"""
+
+import asyncio
+import json
+import threading
+import httpx
+import pytest
+from scripts.hubspot_safe_connector import AsyncHubSpotConnector, HubSpotConnector
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.data
+
+
+def fake_hubspot(method, url, params=None, body=None):
+    """Canned HubSpot API: contact batch reads (odd IDs missing) and 3 pages of associations."""
+    if url.endswith("/contacts/batch/read"):
+        ids = [item["id"] for item in body["inputs"]]
+        return {"results": [{"id": i, "properties": {"email": f"{i}@club.com"}} for i in reversed(ids) if int(i) % 2 == 0]}
+    if url.endswith("/companies/batch/update"):
+        return {"results": [{"id": item["id"], "properties": item["properties"]} for item in body["inputs"]]}
+    if url.endswith("/crm/v3/objects/companies"):
+        page = int((params or {}).get("after") or 0)
+        data = {"results": [{"id": str(page * 100 + n)} for n in range(100 if page < 2 else 30)]}
+        if page < 2:
+            data["paging"] = {"next": {"after": str(page + 1)}}
+        return data
+    if "/crm/v4/objects/companies/" in url:
+        company = url.split("/companies/")[1].split("/")[0]
+        page = int((params or {}).get("after") or 0)
+        data = {"results": [{"toObjectId": int(f"{company}{page}{n}")} for n in range(2)]}
+        if page < 2:
+            data["paging"] = {"next": {"after": str(page + 1)}}
+        return data
+    raise AssertionError(f"unexpected request {method} {url}")
+
+
+class FakeSession:
+    def __init__(self):
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def post(self, url, json=None):
+        with self._lock:
+            self.calls.append(("POST", url, json))
+        return FakeResponse(fake_hubspot("POST", url, body=json))
+
+    def get(self, url, params=None):
+        with self._lock:
+            self.calls.append(("GET", url, params))
+        return FakeResponse(fake_hubspot("GET", url, params=dict(params or {})))
+
+
+@pytest.fixture(autouse=True)
+def token(monkeypatch):
+    monkeypatch.setenv("PRIVATE_APP_ACCESS_TOKEN", "test-token")
+
+
+class TestHubSpotConnector:
+    """Test the pooled sync connector."""
+
+    def test_get_contacts_uses_100_id_batches_in_input_order(self):
+        connector = HubSpotConnector(dry_run=True)
+        connector.session = FakeSession()
+        ids = [str(i) for i in range(250)]
+
+        contacts = connector.get_contacts(ids, properties=["email"])
+
+        batch_calls = [call for call in connector.session.calls if call[1].endswith("/batch/read")]
+        assert sorted(len(call[2]["inputs"]) for call in batch_calls) == [50, 100, 100]
+        assert all(call[2]["properties"] == ["email"] for call in batch_calls)
+        assert [c["id"] for c in contacts] == [i for i in ids if int(i) % 2 == 0]
+
+    def test_associations_are_paged(self):
+        connector = HubSpotConnector(dry_run=True)
+        connector.session = FakeSession()
+
+        ids = connector.get_company_associations("7")
+
+        assert ids == ["700", "701", "710", "711", "720", "721"]
+        assert connector.get_company_associations("7", limit=3) == ["700", "701", "710"]
+
+    def test_list_and_batch_update_companies(self):
+        connector = HubSpotConnector(dry_run=False)
+        connector.session = FakeSession()
+
+        companies = list(connector.list_companies(["name"]))
+        assert len(companies) == 230
+        assert len(list(connector.list_companies(limit=150))) == 150
+
+        updated = connector.update_companies({c["id"]: {"email_pattern": "flast"} for c in companies})
+        update_calls = [call for call in connector.session.calls if call[1].endswith("/batch/update")]
+        assert [len(call[2]["inputs"]) for call in update_calls] == [100, 100, 30]
+        assert len(updated) == 230
+
+        connector.dry_run = True
+        assert connector.update_companies({"1": {"email_pattern": "flast"}}) == []
+        assert len([c for c in connector.session.calls if c[1].endswith("/batch/update")]) == 3
+
+
+class TestAsyncHubSpotConnector:
+    """Test the async twin over an httpx mock transport."""
+
+    def test_contacts_for_companies(self):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            body = json.loads(request.content) if request.content else None
+            data = fake_hubspot(request.method, str(request.url.copy_with(query=None)),
+                                params=dict(request.url.params), body=body)
+            return httpx.Response(200, json=data)
+
+        async def run():
+            connector = AsyncHubSpotConnector(dry_run=True, max_concurrency=4)
+            connector.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+            async with connector:
+                return await connector.get_contacts_for_companies(["2", "4"], properties=["email"])
+
+        by_company = asyncio.run(run())
+
+        assert [c["id"] for c in by_company["2"]] == ["200", "210", "220"]
+        assert [c["id"] for c in by_company["4"]] == ["400", "410", "420"]
+        # 3 association pages per company, then a single batch read for all 12 contacts
+        assert sum(r.url.path.endswith("/batch/read") for r in requests_seen) == 1
+        assert len(requests_seen) == 7
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
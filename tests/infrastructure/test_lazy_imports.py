@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""
+Unit tests for deferred package imports.
+Tests that importing the packages does not load ADK and that exports resolve on use.
+"""
+
+import subprocess
+import sys
+import pytest
+from crm_agent.utils.lazy_imports import lazy_factory
+
+
+class TestLazyImports:
+    """Test lazy package exports and registry factories."""
+
+    def test_package_import_does_not_load_adk(self):
+        code = (
+            "import sys, crm_agent, crm_agent.core, crm_agent.agents; "
+            "print(any(m.startswith(('google.adk', 'mcp')) for m in sys.modules))"
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+        assert result.stdout.strip() == "False"
+
+    def test_exports_resolve_on_first_use(self):
+        import crm_agent.agents as agents
+
+        assert "create_crm_quick_lookup_workflow" in dir(agents)
+        assert callable(agents.create_crm_quick_lookup_workflow)
+        with pytest.raises(AttributeError):
+            agents.no_such_export
+
+    def test_lazy_factory_imports_on_call(self):
+        factory = lazy_factory("json", "dumps")
+
+        assert factory.__name__ == "dumps"
+        assert factory({"a": 1}) == '{"a": 1}'
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the shared MCP toolset manager.
+Tests that agents share a bounded pool of toolsets and restart bookkeeping.
+"""
+
+import asyncio
+import pytest
+from crm_agent.core.mcp_toolsets import MCPToolsetManager
+
+
+class TestMCPToolsetManager:
+    """Test MCPToolsetManager pooling."""
+
+    def test_toolsets_bounded_by_pool_size(self):
+        manager = MCPToolsetManager(pool_size=2)
+        toolsets = [manager.get_toolset() for _ in range(12)]
+
+        assert len({id(t) for t in toolsets}) == 2
+        assert all(manager.owns(t) for t in toolsets)
+        assert manager.stats() == {"pool_size": 2, "toolsets": 2, "restarts": 0}
+
+    def test_agents_share_toolset(self):
+        from crm_agent.core.base_agents import BaseAgent
+        from crm_agent.core.mcp_toolsets import mcp_toolset_manager
+
+        agents = [
+            BaseAgent(name=f"agent_{i}", description="test", instruction="test")
+            for i in range(3)
+        ]
+
+        assert len({id(agent.tools[0]) for agent in agents}) == mcp_toolset_manager.pool_size
+        assert all(mcp_toolset_manager.owns(agent.tools[0]) for agent in agents)
+
+    def test_restart_unstarted_toolset(self):
+        manager = MCPToolsetManager(pool_size=1)
+        toolset = manager.get_toolset()
+
+        asyncio.run(manager.restart(toolset))
+
+        assert manager.stats()["restarts"] == 1
+        assert manager.get_toolset() is toolset
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
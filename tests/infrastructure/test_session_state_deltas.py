@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Unit tests for CRMSessionState change tracking.
+Tests versioned deltas, copy-on-write snapshots, merging snapshots back
+and delta round trips.
+"""
+
+import pytest
+from crm_agent.core.state_models import CRMEnrichmentResult, create_initial_crm_state
+
+
+class TestSessionStateDeltas:
+    """Test delta tracking on CRMSessionState."""
+
+    def test_changes_since_reports_only_changed_fields(self):
+        state = create_initial_crm_state(company_domain="mansionridgegc.com")
+        checkpoint = state.version
+
+        state.add_routing_decision("coordinator", "web_retriever", "missing industry")
+
+        changes = state.changes_since(checkpoint)
+        assert "routing_decisions" in changes
+        assert "last_updated" in changes
+        assert "company_data" not in changes
+        assert state.changes_since(state.version) == {}
+
+    def test_snapshot_shares_until_written(self):
+        state = create_initial_crm_state()
+        state.add_agent_to_history("CRMCoordinator")
+
+        snapshot = state.snapshot()
+        assert snapshot.agent_history is state.agent_history
+
+        snapshot.add_agent_to_history("CRMWebRetriever")
+
+        assert state.agent_history == ["CRMCoordinator"]
+        assert snapshot.agent_history == ["CRMCoordinator", "CRMWebRetriever"]
+
+    def test_merge_keeps_each_snapshots_additions(self):
+        state = create_initial_crm_state()
+        state.add_agent_to_history("CRMCoordinator")
+        state.set_analysis_result("industry", "Golf")
+
+        first, second = state.snapshot(), state.snapshot()
+        base = state.version
+        first.add_agent_to_history("CRMWebRetriever")
+        first.set_analysis_result("city", "Houston")
+        second.add_agent_to_history("CRMLinkedInRetriever")
+        second.company_domain = "houstonnationalgolf.com"
+
+        state.merge_changes(first, base)
+        state.merge_changes(second, base)
+
+        assert state.agent_history == ["CRMCoordinator", "CRMWebRetriever", "CRMLinkedInRetriever"]
+        assert state.normalized_insights == {"industry": "Golf", "city": "Houston"}
+        assert state.company_domain == "houstonnationalgolf.com"
+        assert state.active_agent == "CRMLinkedInRetriever"
+
+    def test_serialize_changes_round_trip(self):
+        source = create_initial_crm_state(contact_email="gm@example.com")
+        checkpoint = source.version
+        source.add_enrichment_result(CRMEnrichmentResult(
+            field_name="industry",
+            proposed_value="Golf",
+            source="web",
+            source_urls=["https://example.com"],
+        ))
+
+        delta = source.serialize_changes(since_version=checkpoint)
+        assert set(delta["changes"]) == {"enrichment_results", "last_updated"}
+
+        target = create_initial_crm_state()
+        target.apply_changes(delta)
+        assert isinstance(target.enrichment_results[0], CRMEnrichmentResult)
+        assert target.enrichment_results[0].proposed_value == "Golf"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the workflow graph cache.
+Tests reuse per (type, config) key, rebuilding once a graph is mounted and
+concurrent callers taking graphs to mount.
+"""
+
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from crm_agent.agents.workflows.graph_cache import WorkflowGraphCache, config_hash
+
+
+def make_factory(builds):
+    def factory(**config):
+        builds.append(config)
+        return SimpleNamespace(parent_agent=None, config=config)
+    return factory
+
+
+class TestWorkflowGraphCache:
+    """Test WorkflowGraphCache reuse and ownership rules."""
+
+    def test_graph_built_once_per_config(self):
+        cache, builds = WorkflowGraphCache(), []
+        factory = make_factory(builds)
+
+        first = cache.get("pipeline", factory, model="gemini-2.0-flash", max_iterations=3)
+        second = cache.get("pipeline", factory, max_iterations=3, model="gemini-2.0-flash")
+        other = cache.get("pipeline", factory, model="gemini-2.0-flash", max_iterations=5)
+
+        assert first is second
+        assert other is not first
+        assert len(builds) == 2
+        assert cache.stats() == {"graphs": 2, "builds": 2, "hits": 1}
+
+    def test_mounted_graph_is_not_shared(self):
+        cache, builds = WorkflowGraphCache(), []
+        factory = make_factory(builds)
+
+        mounted = cache.get("pipeline", factory)
+        mounted.parent_agent = object()
+        fresh = cache.get("pipeline", factory)
+
+        assert fresh is not mounted
+        assert cache.get("pipeline", factory) is fresh
+        assert cache.stats()["graphs"] == 1
+
+    def test_concurrent_mounts_get_their_own_graphs(self):
+        cache, builds = WorkflowGraphCache(), []
+        factory = make_factory(builds)
+        shared = cache.get("pipeline", factory)
+        barrier = threading.Barrier(8)
+        mount_lock = threading.Lock()
+
+        def mount(_):
+            barrier.wait()
+            graph = cache.take("pipeline", factory)
+            with mount_lock:
+                if graph.parent_agent is not None:
+                    raise ValueError("already has a parent agent")
+                graph.parent_agent = object()
+            return graph
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            graphs = list(pool.map(mount, range(8)))
+
+        assert len({id(graph) for graph in graphs}) == 8
+        assert shared.parent_agent is None
+        assert cache.get("pipeline", factory) is shared
+
+    def test_concurrent_get_builds_once(self):
+        cache, builds = WorkflowGraphCache(), []
+        factory = make_factory(builds)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            graphs = list(pool.map(lambda _: cache.get("pipeline", factory), range(8)))
+
+        assert len(builds) == 1
+        assert all(graph is graphs[0] for graph in graphs)
+
+    def test_clear_and_unknown_type(self):
+        cache, builds = WorkflowGraphCache(), []
+        cache.get("pipeline", make_factory(builds))
+        cache.clear("pipeline")
+
+        assert cache.stats()["graphs"] == 0
+        assert config_hash({"a": 1, "b": 2}) == config_hash({"b": 2, "a": 1})
+        with pytest.raises(ValueError, match="Unknown workflow type"):
+            cache.get("no_such_workflow")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Unit tests for HubSpot write coalescing.
+Tests per-record merging, no-op and volatile property suppression, size
+and time windows, requeue on failure, the connector's write buffer and
+the agents queuing through buffered_writes().
+"""
+
+import threading
+import time
+import pytest
+from crm_agent.agents.specialized.company_management_agent import CompanyManagementAgent
+from crm_agent.agents.specialized.field_enrichment_manager_agent import (
+    ConfidenceLevel,
+    EnrichmentResult,
+    EnrichmentStatus,
+    FieldEnrichmentManagerAgent,
+)
+from crm_agent.agents.specialized.lead_scoring_agent import create_lead_scoring_agent
+from crm_agent.core.state_models import CRMSessionState
+from crm_agent.utils.write_buffer import WriteBuffer, buffered_writes, get_write_buffer, queue_update
+from scripts.hubspot_safe_connector import HubSpotConnector
+
+
+class Sender:
+    """Records batch and single-record sends; can be told to fail."""
+
+    def __init__(self):
+        self.batches = []
+        self.records = []
+        self.fail = False
+
+    def batch(self, object_type, updates):
+        if self.fail:
+            raise RuntimeError("HubSpot unavailable")
+        self.batches.append((object_type, dict(updates)))
+
+    def one(self, object_type, object_id, properties):
+        if self.fail:
+            raise RuntimeError("HubSpot unavailable")
+        self.records.append((object_type, object_id, dict(properties)))
+
+
+@pytest.fixture
+def sender():
+    return Sender()
+
+
+@pytest.fixture
+def buffer(sender):
+    return WriteBuffer(send_batch=sender.batch, send_one=sender.one, max_wait=None)
+
+
+class TestWriteBuffer:
+    """Test coalescing and suppression."""
+
+    def test_updates_merge_per_record_into_one_patch(self, buffer, sender):
+        buffer.update("companies", "1", {"management_company": "Troon", "parent_company": "9"})
+        buffer.update("companies", "1", {"swoop_fit_score": 80.0})
+        buffer.update("companies", "1", {"management_company": "KemperSports"})
+
+        assert buffer.flush() == {"records": 1, "requests": 1}
+        assert sender.records == [("companies", "1", {
+            "management_company": "KemperSports", "parent_company": "9", "swoop_fit_score": 80.0
+        })]
+        assert buffer.stats()["coalesced"] == 2
+
+    def test_no_op_properties_are_dropped(self, buffer, sender):
+        buffer.observe("companies", "1", {"swoop_fit_score": "80", "industry": "Golf", "has_pool": "true"})
+
+        assert buffer.update("companies", "1", {"swoop_fit_score": 80.0, "industry": "Golf ", "has_pool": True}) == {}
+        assert buffer.update("companies", "1", {"industry": "Leisure"}) == {"industry": "Leisure"}
+        assert buffer.update("companies", "1", {"industry": "Golf"}) == {}  # Reverts the pending change
+        buffer.flush()
+
+        assert sender.records == [] and sender.batches == []
+        assert buffer.stats()["suppressed"] == 4
+
+    def test_volatile_properties_only_ride_along(self, buffer, sender):
+        buffer.observe("companies", "1", {"swoop_total_lead_score": "72"})
+        volatile = ["swoop_score_updated_at"]
+
+        assert buffer.update("companies", "1", {"swoop_total_lead_score": 72, "swoop_score_updated_at": "t1"},
+                             volatile) == {}
+        assert buffer.update("companies", "1", {"swoop_total_lead_score": 75, "swoop_score_updated_at": "t2"},
+                             volatile) == {"swoop_total_lead_score": 75, "swoop_score_updated_at": "t2"}
+
+    def test_sent_values_become_known(self, buffer, sender):
+        buffer.update("companies", "1", {"industry": "Golf"})
+        buffer.flush()
+
+        assert buffer.update("companies", "1", {"industry": "Golf"}) == {}
+
+    def test_batches_per_object_type_and_size_window(self, sender):
+        buffer = WriteBuffer(send_batch=sender.batch, send_one=sender.one, max_records=3, max_wait=None)
+        for i in range(4):
+            buffer.update("companies", str(i), {"industry": "Golf"})
+        buffer.update("contacts", "7", {"jobtitle": "GM"})
+        buffer.flush()
+
+        assert [(t, sorted(u)) for t, u in sender.batches] == [("companies", ["0", "1", "2"])]
+        assert sorted(sender.records) == [("companies", "3", {"industry": "Golf"}),
+                                          ("contacts", "7", {"jobtitle": "GM"})]
+
+    def test_time_window(self, sender):
+        buffer = WriteBuffer(send_batch=sender.batch, max_wait=0.01)
+        buffer.update("companies", "1", {"industry": "Golf"})
+        time.sleep(0.02)
+        buffer.update("companies", "2", {"industry": "Golf"})
+
+        assert sender.batches == [("companies", {"1": {"industry": "Golf"}, "2": {"industry": "Golf"}})]
+
+    def test_failed_send_is_requeued(self, buffer, sender):
+        buffer.update("companies", "1", {"industry": "Golf", "city": "Austin"})
+        sender.fail = True
+        with pytest.raises(RuntimeError):
+            buffer.flush()
+        buffer.update("companies", "1", {"city": "Dallas"})
+
+        assert buffer.pending() == {("companies", "1"): {"industry": "Golf", "city": "Dallas"}}
+        sender.fail = False
+        assert buffer.flush()["records"] == 1
+
+
+class TestBufferedWrites:
+    """Test the active buffer and the agents queuing through it."""
+
+    def test_queue_update_without_buffer(self):
+        assert get_write_buffer() is None
+        assert queue_update("company", "1", {"industry": "Golf"}) is None
+
+    def test_nested_buffers_restore(self, buffer, sender):
+        inner = WriteBuffer(send_batch=sender.batch, send_one=sender.one, max_wait=None)
+        with buffered_writes(buffer):
+            with buffered_writes(inner):
+                queue_update("company", "1", {"industry": "Golf"})
+            assert get_write_buffer() is buffer
+        assert get_write_buffer() is None
+        assert sender.records == [("companies", "1", {"industry": "Golf"})]
+
+    def test_concurrent_threads_keep_their_own_buffer(self, sender):
+        barrier = threading.Barrier(2)
+        buffers = {name: WriteBuffer(send_batch=sender.batch, send_one=sender.one, max_wait=None)
+                   for name in ("a", "b")}
+        seen = {}
+
+        def run(name, exit_first):
+            with buffered_writes(buffers[name]):
+                barrier.wait()
+                queue_update("company", name, {"industry": "Golf"})
+                if not exit_first:
+                    barrier.wait()  # The other thread has left its block
+                    queue_update("company", name, {"city": "Austin"})
+                    seen[name] = get_write_buffer()
+            if exit_first:
+                seen[name] = get_write_buffer()
+                barrier.wait()
+
+        threads = [threading.Thread(target=run, args=("a", True)), threading.Thread(target=run, args=("b", False))]
+        with buffered_writes(WriteBuffer(send_one=sender.one)):
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert seen == {"a": None, "b": buffers["b"]}
+        assert sorted(sender.records) == [("companies", "a", {"industry": "Golf"}),
+                                          ("companies", "b", {"industry": "Golf", "city": "Austin"})]
+        assert buffers["a"].stats()["records_sent"] == buffers["b"].stats()["records_sent"] == 1
+
+    def test_agents_share_one_write(self, buffer, sender):
+        scorer = create_lead_scoring_agent()
+        manager = CompanyManagementAgent()
+        state = CRMSessionState()
+        state.company_data = {"id": "42", "name": "The Golf Club at Mansion Ridge", "company_type": "Private",
+                              "annualrevenue": 12000000, "numberofemployees": 80}
+        state.contact_data = {"jobtitle": "General Manager"}
+
+        with buffered_writes(buffer):
+            first = scorer.score_and_store(state)["hubspot_updates"]
+            result = manager.run("The Golf Club at Mansion Ridge", "42")
+            assert get_write_buffer() is buffer
+        assert get_write_buffer() is None
+
+        assert result["action"] == "Queued HubSpot update"
+        assert len(sender.records) == 1
+        written = sender.records[0][2]
+        assert written["management_company"] == "Troon"
+        assert written["swoop_total_lead_score"] == first["swoop_total_lead_score"]
+
+        # Rescoring unchanged data writes nothing, not even the timestamp
+        state.company_data.update({name: value for name, value in first.items()})
+        with buffered_writes(buffer):
+            scorer.score_and_store(state)
+        assert len(sender.records) == 1
+
+    def test_field_enrichment_results(self, buffer, sender):
+        def result(name, old, new, status=EnrichmentStatus.COMPLETE, valid=True):
+            return EnrichmentResult(name, name, old, new, status, ConfidenceLevel.HIGH, "web", valid)
+
+        results = [
+            result("website", None, "https://club.com"),
+            result("industry", "Golf", "Golf"),
+            result("phone", None, "555", valid=False),
+            result("description", "Old", "Old", status=EnrichmentStatus.SKIPPED),
+        ]
+        agent = FieldEnrichmentManagerAgent()
+        with buffered_writes(buffer):
+            assert agent.queue_hubspot_updates("company", "5", results) == {"website": "https://club.com"}
+
+        assert sender.records == [("companies", "5", {"website": "https://club.com"})]
+
+    def test_connector_write_buffer(self, monkeypatch):
+        monkeypatch.setenv("PRIVATE_APP_ACCESS_TOKEN", "test-token")
+        monkeypatch.delenv("HUBSPOT_WRITE_JOURNAL", raising=False)
+        calls = []
+
+        class Session:
+            def patch(self, url, json=None):
+                calls.append(("PATCH", url, json))
+                return Response()
+
+            def post(self, url, json=None):
+                calls.append(("POST", url, json))
+                return Response()
+
+        class Response:
+            def raise_for_status(self):
+                pass
+
+            def json(self):
+                return {"results": []}
+
+        connector = HubSpotConnector(dry_run=False)
+        connector.session = Session()
+        with buffered_writes(connector.write_buffer()):
+            queue_update("company", "1", {"industry": "Golf"})
+        with buffered_writes(connector.write_buffer()):
+            for i in range(3):
+                queue_update("company", str(i), {"industry": "Golf"})
+
+        assert [(method, url.rsplit("/v3/", 1)[1]) for method, url, _ in calls] == [
+            ("PATCH", "objects/companies/1"), ("POST", "objects/companies/batch/update")
+        ]
+        assert len(calls[1][2]["inputs"]) == 3
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
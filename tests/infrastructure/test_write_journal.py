@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Unit tests for the HubSpot write-ahead journal.
+Tests dedupe on caller keys only, batched flush and ack, per-record merging,
+per-property superseding, failed attempts and rejected writes, resuming after
+a restart, leases on writes in flight, the default path and schema upgrade,
+the background flusher and journaled HubSpotConnector updates.
+"""
+
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+import requests
+from crm_agent.utils.write_journal import JournalFlusher, RejectedWrite, WriteJournal, default_journal_path
+from scripts.hubspot_safe_connector import HubSpotConnector
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+
+class Recorder:
+    """Batch applier that records calls and can be told to fail."""
+
+    def __init__(self, fail=False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, object_type, updates):
+        if self.fail:
+            raise RuntimeError("HubSpot unavailable")
+        self.calls.append((object_type, dict(updates)))
+
+
+class FakeResponse:
+    def __init__(self, data, status_code=200):
+        self.data = data
+        self.status_code = status_code
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Client Error", response=self)
+
+    @property
+    def text(self):
+        return str(self.data)
+
+    def json(self):
+        return self.data
+
+
+class FakeSession:
+    """Batch update and PATCH endpoints; fails batch updates after `fail_after` calls, answers `status`."""
+
+    def __init__(self, fail_after=None, status=200):
+        self.calls = []
+        self.fail_after = fail_after
+        self.status = status
+
+    def post(self, url, json=None):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise requests.exceptions.ConnectionError("connection reset")
+        self.calls.append(("POST", url, json))
+        return FakeResponse({"results": [{"id": item["id"]} for item in json["inputs"]]}, self.status)
+
+    def patch(self, url, json=None):
+        self.calls.append(("PATCH", url, json))
+        return FakeResponse({"id": url.rsplit("/", 1)[1]}, self.status)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    journal = WriteJournal(str(tmp_path / "writes.db"))
+    yield journal
+    journal.close()
+
+
+@pytest.fixture(autouse=True)
+def token(monkeypatch):
+    monkeypatch.setenv("PRIVATE_APP_ACCESS_TOKEN", "test-token")
+    monkeypatch.delenv("HUBSPOT_WRITE_JOURNAL", raising=False)
+
+
+class TestWriteJournal:
+    """Test recording, flushing and acking journaled writes."""
+
+    def test_only_caller_keys_dedupe(self, journal):
+        first = journal.record("companies", "1", {"industry": "Golf"})
+
+        assert journal.record("companies", "1", {"industry": "Golf"}) != first
+        assert journal.record("companies", "1", {"industry": "Golf"}, key="session-1") == "session-1"
+        assert journal.record("companies", "1", {"industry": "Golf"}, key="session-1") == "session-1"
+        assert journal.stats() == {"pending": 3, "acked": 0, "failed": 0}
+
+    def test_ack_supersedes_older_pending_writes(self, journal):
+        stale = journal.record("companies", "1", {"industry": "Golf"})
+        other = journal.record("companies", "1", {"city": "Austin"})
+        newer = journal.record("companies", "1", {"industry": "Leisure", "phone": "555"})
+        journal.mark_acked([newer])
+
+        assert journal.status(stale) == "acked"
+        assert journal.status(other) == "pending"
+        apply = Recorder()
+        journal.flush(apply)
+        assert apply.calls == [("companies", {"1": {"city": "Austin"}})]
+
+    def test_ack_supersedes_per_property(self, journal):
+        mixed = journal.record("companies", "1", {"industry": "Golf", "city": "Austin"})
+        newer = journal.record("companies", "1", {"industry": "Leisure"})
+        journal.mark_acked([newer])
+
+        # The older write still sets city, but no longer replays the stale industry
+        assert journal.status(mixed) == "pending"
+        assert journal.pending()[0].properties == {"city": "Austin"}
+        apply = Recorder()
+        journal.flush(apply)
+        assert apply.calls == [("companies", {"1": {"city": "Austin"}})]
+
+    def test_flush_merges_per_record_and_acks(self, journal):
+        journal.record("companies", "1", {"industry": "Golf", "city": "Austin"})
+        journal.record("companies", "1", {"city": "Dallas"})
+        journal.record_many("companies", {str(i): {"industry": "Golf"} for i in range(2, 152)})
+        journal.record("contacts", "9", {"jobtitle": "GM"})
+        apply = Recorder()
+
+        stats = journal.flush(apply)
+
+        assert stats == {"applied": 153, "failed": 0, "batches": 3}
+        assert [(t, len(u)) for t, u in apply.calls] == [("companies", 100), ("companies", 51), ("contacts", 1)]
+        assert apply.calls[0][1]["1"] == {"industry": "Golf", "city": "Dallas"}
+        assert journal.stats() == {"pending": 0, "acked": 153, "failed": 0}
+        assert journal.flush(apply)["batches"] == 0
+
+    def test_failed_attempts(self, tmp_path):
+        journal = WriteJournal(str(tmp_path / "writes.db"), max_attempts=2)
+        key = journal.record("companies", "1", {"industry": "Golf"})
+
+        assert journal.flush(Recorder(fail=True)) == {"applied": 0, "failed": 1, "batches": 1}
+        assert journal.status(key) == "pending"
+        journal.flush(Recorder(fail=True))
+        assert journal.status(key) == "failed"
+        assert journal.flush(Recorder())["batches"] == 0
+
+        assert journal.retry_failed() == 1
+        assert journal.flush(Recorder())["applied"] == 1
+        journal.close()
+
+    def test_rejected_batch_fails_at_once(self, journal):
+        key = journal.record("companies", "1", {"email_pattern_votes": "3"})
+
+        def reject(object_type, updates):
+            raise RejectedWrite("400 Client Error: Property does not exist")
+
+        assert journal.flush(reject)["failed"] == 1
+        assert journal.status(key) == "failed"
+
+    def test_resume_after_restart_skips_acked_writes(self, tmp_path):
+        path = str(tmp_path / "writes.db")
+        first = WriteJournal(path)
+        acked = first.record("companies", "1", {"industry": "Golf"}, key="run-1-1")
+        first.record("companies", "2", {"industry": "Golf"}, key="run-1-2")
+        first.mark_acked([acked])
+        first.close()
+
+        second = WriteJournal(path)
+        second.record("companies", "1", {"industry": "Golf"}, key="run-1-1")
+        apply = Recorder()
+        second.flush(apply)
+
+        assert apply.calls == [("companies", {"2": {"industry": "Golf"}})]
+        assert second.status(acked) == "acked"
+        second.close()
+
+    def test_leased_writes_are_left_to_a_live_owner(self, journal):
+        in_flight = journal.record("companies", "1", {"industry": "Golf"}, lease=True)
+        queued = journal.record("companies", "2", {"industry": "Golf"})
+        apply = Recorder()
+
+        journal.flush(apply)
+
+        assert apply.calls == [("companies", {"2": {"industry": "Golf"}})]
+        assert journal.status(in_flight) == "pending"
+        # A failed send releases the lease, so the next flush retries it
+        journal.mark_failed([in_flight], "connection reset")
+        journal.flush(apply)
+        assert apply.calls[-1] == ("companies", {"1": {"industry": "Golf"}})
+
+    def test_writes_of_an_exited_process_are_replayed(self, tmp_path):
+        path = str(tmp_path / "writes.db")
+        # Another process journals a write it was about to send, then exits
+        subprocess.run([sys.executable, "-c", (
+            "from crm_agent.utils.write_journal import WriteJournal\n"
+            f"WriteJournal({path!r}).record('companies', '1', {{'industry': 'Golf'}}, lease=True)\n"
+        )], check=True, cwd=REPO_ROOT)
+        journal = WriteJournal(path)
+        apply = Recorder()
+
+        assert journal.flush(apply)["applied"] == 1
+        assert apply.calls == [("companies", {"1": {"industry": "Golf"}})]
+        journal.close()
+
+    def test_expired_lease_is_replayed(self, tmp_path):
+        journal = WriteJournal(str(tmp_path / "writes.db"), lease_seconds=0)
+        journal.record("companies", "1", {"industry": "Golf"}, lease=True)
+
+        assert journal.flush(Recorder())["applied"] == 1
+        journal.close()
+
+    def test_default_path_is_in_the_user_cache(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+
+        assert default_journal_path() == str(tmp_path / "crm_agent" / "hubspot_writes.db")
+        journal = WriteJournal()
+        assert journal.path == default_journal_path()
+        journal.close()
+
+    def test_journal_without_lease_columns_is_upgraded(self, tmp_path):
+        path = str(tmp_path / "writes.db")
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            CREATE TABLE writes (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT, key TEXT NOT NULL UNIQUE, object_type TEXT NOT NULL,
+                object_id TEXT NOT NULL, properties TEXT NOT NULL, status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0, error TEXT, created_at REAL NOT NULL, acked_at REAL
+            );
+            INSERT INTO writes (key, object_type, object_id, properties, status, created_at)
+            VALUES ('old-1', 'companies', '1', '{"industry": "Golf"}', 'pending', 0);
+        """)
+        conn.close()
+
+        journal = WriteJournal(path)
+        apply = Recorder()
+        journal.flush(apply)
+
+        assert apply.calls == [("companies", {"1": {"industry": "Golf"}})]
+        assert journal.status("old-1") == "acked"
+        journal.close()
+
+    def test_flusher_thread(self, journal):
+        apply = Recorder()
+        with JournalFlusher(journal, apply, interval=60) as flusher:
+            journal.record("companies", "1", {"industry": "Golf"})
+            flusher.notify()
+
+        assert flusher.totals["applied"] == 1
+        assert apply.calls == [("companies", {"1": {"industry": "Golf"}})]
+
+
+class TestJournaledConnector:
+    """Test HubSpotConnector updates through the journal."""
+
+    def test_batch_update_resumes_without_resending_acked_batches(self, journal):
+        updates = {str(i): {"industry": "Golf"} for i in range(250)}
+        keys = [f"run-1-{i}" for i in range(250)]
+        connector = HubSpotConnector(dry_run=False, journal=journal)
+        connector.session = FakeSession(fail_after=1)
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            connector.update_companies(updates, keys)
+        assert journal.stats() == {"pending": 150, "acked": 100, "failed": 0}
+
+        connector.session = FakeSession()
+        assert len(connector.update_companies(updates, keys)) == 150
+        assert [len(call[2]["inputs"]) for call in connector.session.calls] == [100, 50]
+        assert connector.update_companies(updates, keys) == []
+        assert journal.stats()["acked"] == 250
+
+    def test_single_update_is_sent_once(self, journal):
+        connector = HubSpotConnector(dry_run=False, journal=journal)
+        connector.session = FakeSession()
+
+        assert connector.update_company("7", {"industry": "Golf"}, idempotency_key="run-1") == {"id": "7"}
+        assert connector.update_company("7", {"industry": "Golf"}, idempotency_key="run-1") is None
+        assert len(connector.session.calls) == 1
+
+    def test_unkeyed_updates_are_always_sent(self, journal):
+        connector = HubSpotConnector(dry_run=False, journal=journal)
+        connector.session = FakeSession()
+
+        for industry in ("Golf", "Leisure", "Golf"):
+            connector.update_company("7", {"industry": industry})
+
+        assert [call[2]["properties"]["industry"] for call in connector.session.calls] == ["Golf", "Leisure", "Golf"]
+        assert journal.stats() == {"pending": 0, "acked": 3, "failed": 0}
+
+    def test_rejected_updates_are_not_replayed(self, journal):
+        connector = HubSpotConnector(dry_run=False, journal=journal)
+        connector.session = FakeSession(status=400)
+
+        with pytest.raises(requests.exceptions.HTTPError):
+            connector.update_company("7", {"industry": "Golf"})
+        with pytest.raises(requests.exceptions.HTTPError):
+            connector.update_companies({"8": {"industry": "Golf"}, "9": {"industry": "Golf"}})
+        connector.enqueue_updates("companies", {"10": {"industry": "Golf"}})
+        assert connector.flush_journal()["failed"] == 1
+
+        assert journal.stats() == {"pending": 0, "acked": 0, "failed": 4}
+        connector.session = FakeSession()
+        assert connector.flush_journal()["batches"] == 0
+
+    def test_enqueue_and_flush(self, journal):
+        connector = HubSpotConnector(dry_run=False, journal=journal)
+        connector.session = FakeSession()
+
+        connector.enqueue_updates("contacts", {"1": {"jobtitle": "GM"}, "2": {"jobtitle": "Pro"}})
+        assert connector.session.calls == []
+        assert connector.flush_journal()["applied"] == 2
+        assert connector.session.calls[0][1].endswith("/crm/v3/objects/contacts/batch/update")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Unit tests for concurrent task execution with critique follow-ups.
+Tests TaskOrchestrator.run_dag (dependencies, concurrency limit, tasks added
+while others run, thread pool shutdown), serial execute_project by default,
+the session state snapshots and checkpoints handed through tasks, the write
+buffer shared by agent threads, and the follow-up depth and deduplication of
+FollowUpLedger.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from project_manager_agent.core.orchestration import FollowUpLedger, TaskOrchestrator
+from project_manager_agent.core.task_models import Project, Task, TaskStatus
+from crm_agent.utils.write_buffer import WriteBuffer, get_write_buffer, queue_update
+
+
+class SleepingAgent:
+    """Blocking agent that sleeps for `delay` seconds and records concurrency."""
+
+    def __init__(self, tracker, delay):
+        self.tracker = tracker
+        self.delay = delay
+
+    def run(self, **params):
+        with self.tracker["lock"]:
+            self.tracker["running"] += 1
+            self.tracker["peak"] = max(self.tracker["peak"], self.tracker["running"])
+            self.tracker["started"].append(params.get("name"))
+        time.sleep(params.get("delay", self.delay))
+        with self.tracker["lock"]:
+            self.tracker["running"] -= 1
+        return {"status": "ok", "name": params.get("name")}
+
+
+def make_orchestrator(delay=0.05, max_concurrency=8):
+    tracker = {"lock": threading.Lock(), "running": 0, "peak": 0, "started": []}
+    orchestrator = TaskOrchestrator(max_concurrency=max_concurrency)
+    orchestrator.register_agent("worker", lambda: SleepingAgent(tracker, delay))
+    return orchestrator, tracker
+
+
+def make_task(task_id, dependencies=None, **params):
+    return Task(id=task_id, name=task_id, description=task_id, agent_type="worker",
+                parameters={"name": task_id, **params}, dependencies=dependencies or [])
+
+
+def make_project(*tasks):
+    project = Project(id="p1", name="Test", description="Test", goal="Test")
+    for task in tasks:
+        project.add_task(task)
+    return project
+
+
+class TestRunDag:
+    """Test the concurrent DAG executor."""
+
+    def test_independent_tasks_run_concurrently(self):
+        orchestrator, tracker = make_orchestrator(delay=0.1)
+        project = make_project(*(make_task(f"t{i}") for i in range(6)))
+
+        start = time.perf_counter()
+        results = asyncio.run(orchestrator.run_dag(project))
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 6
+        assert all(t.status == TaskStatus.COMPLETED for t in project.tasks)
+        assert tracker["peak"] == 6
+        assert elapsed < 0.4
+
+    def test_concurrency_limit_and_dependencies(self):
+        orchestrator, tracker = make_orchestrator(max_concurrency=2)
+        root = make_task("root")
+        children = [make_task(f"child{i}", [root.id]) for i in range(4)]
+        project = make_project(root, *children)
+
+        asyncio.run(orchestrator.run_dag(project))
+
+        assert tracker["peak"] == 2
+        assert tracker["started"][0] == "root"
+        assert all(t.status == TaskStatus.COMPLETED for t in project.tasks)
+
+    def test_unmet_dependencies_fail(self):
+        orchestrator, _ = make_orchestrator()
+        orphan = make_task("orphan", ["missing"])
+        project = make_project(make_task("ok"), orphan)
+
+        results = asyncio.run(orchestrator.run_dag(project))
+
+        assert set(results) == {"ok"}
+        assert orphan.status == TaskStatus.FAILED
+
+    def test_follow_ups_start_before_slow_tasks_finish(self):
+        orchestrator, tracker = make_orchestrator()
+        project = make_project(make_task("fast", delay=0.01), make_task("slow", delay=0.3))
+        finished_order = []
+
+        def on_complete(finished):
+            for task, _ in finished:
+                finished_order.append(task.id)
+                if task.id == "fast":
+                    project.add_task(make_task("followup_fast", delay=0.01))
+
+        asyncio.run(orchestrator.run_dag(project, on_complete=on_complete))
+
+        assert finished_order == ["fast", "followup_fast", "slow"]
+        assert all(t.status == TaskStatus.COMPLETED for t in project.tasks)
+
+    def test_thread_pool_is_shut_down(self):
+        orchestrator, _ = make_orchestrator(delay=0.01)
+        asyncio.run(orchestrator.run_dag(make_project(*(make_task(f"t{i}") for i in range(3)))))
+
+        for thread in [t for t in threading.enumerate() if t.name.startswith("pm-task")]:
+            thread.join(timeout=1)
+        assert not any(t.name.startswith("pm-task") for t in threading.enumerate())
+
+    def test_execute_project_summary(self):
+        orchestrator, _ = make_orchestrator()
+        project = make_project(make_task("a"), make_task("b", ["a"]))
+
+        summary = asyncio.run(orchestrator.execute_project(project))
+
+        assert summary["completed_tasks"] == 2
+        assert set(summary["task_results"]) == {"a", "b"}
+
+    def test_execute_project_is_serial_unless_asked(self):
+        orchestrator, tracker = make_orchestrator(delay=0.02)
+        asyncio.run(orchestrator.execute_project(make_project(*(make_task(f"t{i}") for i in range(4)))))
+
+        assert tracker["peak"] == 1
+        assert tracker["started"] == ["t0", "t1", "t2", "t3"]
+
+        orchestrator, tracker = make_orchestrator(delay=0.05)
+        asyncio.run(orchestrator.execute_project(make_project(*(make_task(f"t{i}") for i in range(4))),
+                                                 max_concurrency=4))
+        assert tracker["peak"] == 4
+
+
+class FindingsAgent:
+    """Agent that reads and extends the session state snapshot it is handed."""
+
+    def __init__(self, seen):
+        self.seen = seen
+
+    def run(self, name, state, **params):
+        time.sleep(0.02)
+        self.seen[name] = list(state.agent_history)
+        state.append_item("web_findings", {"source": name})
+        return {"status": "ok", "name": name}
+
+
+class TestSessionState:
+    """Test the session state handed to tasks and its checkpoints."""
+
+    def test_tasks_get_snapshots_merged_back(self):
+        seen = {}
+        orchestrator = TaskOrchestrator()
+        orchestrator.register_agent("finder", lambda: FindingsAgent(seen))
+        tasks = [Task(id=f"t{i}", name=f"t{i}", description="", agent_type="finder", parameters={"name": f"t{i}"})
+                 for i in range(3)]
+        project = make_project(*tasks)
+        project.state.add_agent_to_history("ProjectManagerAgent")
+
+        asyncio.run(orchestrator.run_dag(project))
+
+        state = project.state
+        # Concurrent tasks each saw only their own history entry
+        assert seen == {f"t{i}": ["ProjectManagerAgent", "finder"] for i in range(3)}
+        assert sorted(f["source"] for f in state.web_findings) == ["t0", "t1", "t2"]
+        assert state.agent_history == ["ProjectManagerAgent", "finder", "finder", "finder"]
+        assert state.update_results["t1"] == {"status": "ok", "name": "t1"}
+
+    def test_checkpoints_hold_only_changes_and_replay(self):
+        orchestrator, _ = make_orchestrator(delay=0.01)
+        project = make_project(make_task("a"), make_task("b", ["a"]))
+        project.state.company_id = "42"
+
+        asyncio.run(orchestrator.run_dag(project))
+
+        assert len(project.state_checkpoints) == 2
+        assert all("company_id" not in c["changes"] for c in project.state_checkpoints)
+        assert set(project.state_checkpoints[1]["changes"]["update_results"]) == {"a", "b"}
+
+        restored = make_project().state
+        for checkpoint in project.state_checkpoints:
+            restored.apply_changes(checkpoint)
+        assert restored.update_results == project.state.update_results
+        assert restored.agent_history == ["worker", "worker"]
+
+
+class WritingAgent:
+    """Agent that queues a HubSpot update for its company."""
+
+    def run(self, company_id, field, **params):
+        queued = queue_update("companies", company_id, {field: "x"})
+        return {"status": "ok", "queued": queued is not None, "buffer": get_write_buffer() is not None}
+
+
+class TestWriteBuffer:
+    """Test coalescing agents' HubSpot writes across a project run."""
+
+    def test_agent_threads_share_one_flush(self):
+        batches = []
+        buffer = WriteBuffer(send_batch=lambda object_type, updates: batches.append((object_type, dict(updates))),
+                             max_wait=None)
+        orchestrator = TaskOrchestrator()
+        orchestrator.register_agent("writer", WritingAgent)
+        project = make_project(*(
+            Task(id=f"t{i}", name=f"t{i}", description="", agent_type="writer",
+                 parameters={"company_id": str(i % 2), "field": f"field{i}"})
+            for i in range(4)
+        ))
+
+        results = asyncio.run(orchestrator.run_dag(project, write_buffer=buffer))
+
+        assert all(r["queued"] and r["buffer"] for r in results.values())
+        assert batches == [("companies", {"0": {"field0": "x", "field2": "x"}, "1": {"field1": "x", "field3": "x"}})]
+        assert buffer.stats()["requests"] == 1
+        assert get_write_buffer() is None
+
+    def test_no_buffer_by_default(self):
+        orchestrator = TaskOrchestrator()
+        orchestrator.register_agent("writer", WritingAgent)
+        project = make_project(Task(id="t", name="t", description="", agent_type="writer",
+                                    parameters={"company_id": "1", "field": "industry"}))
+
+        assert asyncio.run(orchestrator.run_dag(project))["t"]["queued"] is False
+
+
+class TestFollowUpLedger:
+    """Test follow-up depth limits and deduplication."""
+
+    def test_one_follow_up_per_agent_record_and_category(self):
+        ledger = FollowUpLedger()
+        first = make_task("a", company_id="42")
+        second = make_task("b", company_id="42")
+        other = make_task("c", company_id="43")
+
+        assert ledger.claim(first, ["completeness", "accuracy"]) == ["completeness", "accuracy"]
+        assert ledger.claim(second, ["completeness", "relevance"]) == ["relevance"]
+        assert ledger.claim(other, ["completeness"]) == ["completeness"]
+
+    def test_depth_limit(self):
+        ledger = FollowUpLedger(max_depth=2)
+        task = make_task("a")
+        follow_up = make_task("f1")
+        second = make_task("f2")
+
+        ledger.add_follow_up(task, follow_up)
+        ledger.add_follow_up(follow_up, second)
+
+        assert ledger.claim(follow_up, ["completeness"]) == ["completeness"]
+        assert ledger.claim(second, ["accuracy"]) == []
+        assert ledger.iterations == 3
+
+    def test_record_key_falls_back_to_root_task(self):
+        ledger = FollowUpLedger()
+        task = make_task("a")
+        follow_up = make_task("followup_a")
+        ledger.add_follow_up(task, follow_up)
+
+        assert ledger.record_key(follow_up) == ledger.record_key(task) == "task:a"
+        assert ledger.record_key(make_task("b", company_name=" Acme ")) == "company_name:acme"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
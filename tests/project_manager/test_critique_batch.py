@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Unit tests for batched critique evaluation.
+Tests ResultIndex, CRMResponseCritic.critique_batch and the indexed
+project-level assessments of CriticalThinkingEngine.
+"""
+
+import pytest
+from project_manager_agent.core.critique_system import (
+    CRMResponseCritic,
+    CriticalThinkingEngine,
+    CritiqueRequest,
+    ResultIndex,
+    ResponseQuality,
+)
+
+
+class TestResultIndex:
+    """Test ResultIndex."""
+
+    def test_presence_and_counts(self):
+        index = ResultIndex({"company_name": "Acme", "domain": "  ", "industry": None, "error": ""})
+
+        assert index.has("name", "company_name")
+        assert not index.has("industry")
+        # Blank strings hold a value but are not complete
+        assert index.has("domain")
+        assert (index.field_count, index.complete_count) == (4, 1)
+        assert index.has_error
+        assert "acme" in index.text_lower
+
+    def test_text_is_built_lazily(self):
+        class Unprintable(dict):
+            def __str__(self):
+                raise AssertionError("stringified")
+
+        index = ResultIndex(Unprintable(status="ok"))
+        assert index.has("status") and index.complete_count == 1
+
+
+class TestCritiqueBatch:
+    """Test CRMResponseCritic.critique_batch."""
+
+    def test_batch_matches_single_critiques(self):
+        critic = CRMResponseCritic()
+        requests = [
+            CritiqueRequest("company_intelligence", "Find website for Acme", {"company_name": "Acme"}),
+            CritiqueRequest("contact_intelligence", "Find email", {"name": "Pat", "email": "not-an-email"}),
+            CritiqueRequest("crm_enrichment", "Enrich", {"error": "timeout"}),
+            CritiqueRequest("unknown_agent", "Do something", {}),
+        ]
+
+        batch = critic.critique_batch(requests)
+
+        assert batch == [critic.critique_response(r.agent_type, r.task_description, r.response, r.context)
+                         for r in requests]
+        assert batch[2].overall_quality == ResponseQuality.UNACCEPTABLE
+        assert batch[3].critiques[0]["issue"] == "Empty response received"
+
+    def test_non_string_email_is_invalid_format(self):
+        critique = CRMResponseCritic().critique_response(
+            "contact_intelligence", "Find contact", {"name": "Pat", "email": {"work": "pat@club.com"}}
+        )
+        assert "Invalid email format provided" in [c["issue"] for c in critique.critiques]
+
+
+class TestCriticalThinkingEngine:
+    """Test the indexed project-level assessments."""
+
+    def test_goal_keywords_stop_once_addressed(self):
+        class Unprintable(dict):
+            def __str__(self):
+                raise AssertionError("stringified")
+
+        engine = CriticalThinkingEngine()
+        results = [{"summary": "Golf club found"}, Unprintable(status="ok")]
+
+        # Every keyword is addressed by the first result; the second is never stringified
+        achievement = engine._assess_goal_achievement("Golf club", results)
+        assert set(achievement["addressed_keywords"]) == {"golf", "club"}
+        assert achievement["score"] == 100
+
+    def test_data_quality_and_metrics(self):
+        engine = CriticalThinkingEngine()
+        results = [
+            {"company_name": "Acme", "description": " ", "data": {"rows": [1, 2]}},
+            {"error": "timeout"},
+        ]
+
+        analysis = engine.think_critically("Enrich golf company data", results)
+
+        assert analysis["data_quality"]["total_fields"] == 3
+        assert analysis["data_quality"]["complete_fields"] == 2
+        assert analysis["data_quality"]["error_rate"] == 50
+        assert analysis["success_metrics"]["successful_tasks"] == 1
+        assert analysis["risk_assessment"]["operational"] == ["Task execution failures detected"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])